@@ -71,7 +71,7 @@ export function PdfViewer({
     setZoom((current) => Math.min(5, Number((current + 0.1).toFixed(2))))
   }
 
-  const pdfUrl = `/pdfdev/${encodeURIComponent(documentRef)}`
+  const pdfUrl = `/api/pdfviewer/documents/${encodeURIComponent(documentRef)}`
 
   return (
     <div className="rounded-md border bg-background p-4 text-sm">
@@ -6,3 +6,7 @@ class AccessRightsConfig(AppConfig):
     name = "sopira_magic.apps.accessrights"
     verbose_name = "Access Rights (ConfigDriven SSOT)"
 
+    def ready(self):
+        # Role → permission tables are compiled once (see compiled.py)
+        from .compiled import compile_access_tables
+        compile_access_tables()
@@ -0,0 +1,124 @@
+"""
+AccessRights compiled tables - role → permission matrix precomputed at startup.
+
+The matrix depends only on the role, so ACCESS_MATRIX + DEFAULT_POLICY are
+compiled once per role (AccessRightsConfig.ready) into frozen lookup tables:
+
+- LOOKUP[(role, view_name, action)] -> bool   (AccessRightsPermission: 1 dict lookup)
+- role_matrix(role) -> {view_name: {action: bool}}  (read-only mappings)
+- role_etag(role) -> digest of the role's matrix + empty state messages
+  (strong ETag of accessrights/matrix/)
+
+Views that are not compiled (custom names) fall back to DEFAULT_POLICY,
+actions outside ACTIONS fall back to the uncompiled services._get_policy.
+Call compile_access_tables() again after changing the config at runtime.
+"""
+
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple, get_args
+
+from .config import ACCESS_MATRIX, DEFAULT_POLICY, EMPTY_STATE_MESSAGES, Action, Role
+
+ROLES: Tuple[str, ...] = get_args(Role)
+ACTIONS: Tuple[str, ...] = ("view", "add", "edit", "delete", "export", "menu")
+
+# Key for users with the is_superuser flag (hard-allow, independent of role)
+SUPERUSER_FLAG = "*"
+
+LOOKUP: Mapping[Tuple[str, str, str], bool] = MappingProxyType({})
+_DEFAULT_LOOKUP: Mapping[Tuple[str, str], bool] = MappingProxyType({})
+_MATRICES: Dict[str, Mapping[str, Mapping[str, bool]]] = {}
+_DEFAULT_ROWS: Dict[str, Mapping[str, bool]] = {}
+_ETAGS: Dict[str, str] = {}
+
+
+def _compiled_view_names():
+    names = list(ACCESS_MATRIX.keys())
+    try:
+        from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+        names.extend(name for name in VIEWS_MATRIX if name not in ACCESS_MATRIX)
+    except Exception:  # pragma: no cover - api app not installed
+        pass
+    return names
+
+
+def compile_access_tables() -> None:
+    """(Re)build all lookup tables from ACCESS_MATRIX + DEFAULT_POLICY."""
+    global LOOKUP, _DEFAULT_LOOKUP
+    from .services import _get_policy
+
+    names = _compiled_view_names()
+    lookup: Dict[Tuple[str, str, str], bool] = {}
+    default_lookup: Dict[Tuple[str, str], bool] = {}
+    matrices, default_rows, etags = {}, {}, {}
+
+    for role in ROLES + (SUPERUSER_FLAG,):
+        def allowed(view_name: Optional[str], action: str) -> bool:
+            if role == SUPERUSER_FLAG:
+                return True
+            policy = _get_policy(view_name, action) if view_name else DEFAULT_POLICY[action]
+            return bool(policy.get(role, False))
+
+        matrix = {}
+        for name in names:
+            row = {action: allowed(name, action) for action in ACTIONS}
+            for action, value in row.items():
+                lookup[(role, name, action)] = value
+            matrix[name] = MappingProxyType(row)
+        default_row = {action: allowed(None, action) for action in ACTIONS}
+        for action, value in default_row.items():
+            default_lookup[(role, action)] = value
+
+        matrices[role] = MappingProxyType(matrix)
+        default_rows[role] = MappingProxyType(default_row)
+        digest = hashlib.sha1(json.dumps(
+            [{name: dict(row) for name, row in matrix.items()}, default_row, EMPTY_STATE_MESSAGES],
+            sort_keys=True,
+        ).encode()).hexdigest()[:16]
+        etags[role] = digest
+
+    _MATRICES.clear()
+    _MATRICES.update(matrices)
+    _DEFAULT_ROWS.clear()
+    _DEFAULT_ROWS.update(default_rows)
+    _ETAGS.clear()
+    _ETAGS.update(etags)
+    _DEFAULT_LOOKUP = MappingProxyType(default_lookup)
+    LOOKUP = MappingProxyType(lookup)
+
+
+def _ensure_compiled() -> None:
+    if not _MATRICES:
+        compile_access_tables()
+
+
+def is_allowed(role: str, view_name: str, action: Action) -> Optional[bool]:
+    """Compiled decision, or None for actions outside ACTIONS."""
+    value = LOOKUP.get((role, view_name, action))
+    if value is not None:
+        return value
+    _ensure_compiled()
+    value = LOOKUP.get((role, view_name, action))
+    if value is not None:
+        return value
+    return _DEFAULT_LOOKUP.get((role, action))
+
+
+def role_matrix(role: str) -> Mapping[str, Mapping[str, bool]]:
+    """Frozen {view_name: {action: bool}} for all compiled views."""
+    _ensure_compiled()
+    return _MATRICES[role]
+
+
+def default_row(role: str) -> Mapping[str, bool]:
+    """Frozen DEFAULT_POLICY row for views that are not compiled."""
+    _ensure_compiled()
+    return _DEFAULT_ROWS[role]
+
+
+def role_etag(role: str) -> str:
+    """Digest of the role's compiled matrix (stable across processes and restarts)."""
+    _ensure_compiled()
+    return _ETAGS[role]
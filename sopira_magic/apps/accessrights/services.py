@@ -1,10 +1,14 @@
 """
 AccessRights services - single source of truth for role/action matrix.
+
+can_access / get_access_matrix_for_user read the per-role tables compiled
+at startup (compiled.py); _get_policy stays the uncompiled source.
 """
 
 from typing import Dict
 from django.contrib.auth import get_user_model
 from .config import ACCESS_MATRIX, DEFAULT_POLICY, Role, Action
+from .compiled import SUPERUSER_FLAG, default_row, is_allowed, role_matrix
 
 User = get_user_model()
 
@@ -41,13 +45,19 @@ def _get_policy(view_name: str, action: Action) -> Dict[Role, bool]:
     return DEFAULT_POLICY.get(action, DEFAULT_POLICY["view"])
 
 
-def can_access(view_name: str, action: Action, user) -> bool:
-    # Superuser hard-allow
+def _effective_role(user) -> str:
+    """Compiled table key: superuser flag hard-allows, otherwise the matrix role."""
     if getattr(user, "is_superuser", False):
-        return True
-    role = _get_role(user)
-    policy = _get_policy(view_name, action)
-    return bool(policy.get(role, False))
+        return SUPERUSER_FLAG
+    return _get_role(user)
+
+
+def can_access(view_name: str, action: Action, user) -> bool:
+    role = _effective_role(user)
+    allowed = is_allowed(role, view_name, action)
+    if allowed is None:  # action outside the compiled set
+        return role == SUPERUSER_FLAG or bool(_get_policy(view_name, action).get(role, False))
+    return allowed
 
 
 def can_view_menu(menu_key: str, user) -> bool:
@@ -65,19 +75,15 @@ def get_access_matrix_for_user(user, view_names: Dict[str, Dict] | None = None)
     Returns:
         dict {view_name: {view/add/edit/delete/export/menu: bool}}
     """
-    actions = ["view", "add", "edit", "delete", "export", "menu"]
-    result: Dict[str, Dict[str, bool]] = {}
-
     names = list(view_names.keys()) if view_names else list(ACCESS_MATRIX.keys())
     # Ak nie sú žiadne view_names ani ACCESS_MATRIX, vráť prázdno
     if not names:
-        return result
+        return {}
 
-    for name in names:
-        result[name] = {}
-        for action in actions:
-            result[name][action] = can_access(name, action, user)
-    return result
+    role = _effective_role(user)
+    matrix = role_matrix(role)
+    fallback = default_row(role)
+    return {name: dict(matrix.get(name, fallback)) for name in names}
 
 
 def check_menu_dependencies(user) -> Dict[str, bool]:
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.accessrights import compiled
+from sopira_magic.apps.accessrights.config import DEFAULT_POLICY
+from sopira_magic.apps.accessrights.services import _get_policy, get_access_matrix_for_user
+from sopira_magic.apps.api.permissions import AccessRightsPermission
+
+
+class CompiledAccessTablesTests(SimpleTestCase):
+    def test_lookup_matches_uncompiled_policy_for_every_role(self):
+        compiled.compile_access_tables()
+        for role in compiled.ROLES:
+            for name, row in compiled.role_matrix(role).items():
+                for action in compiled.ACTIONS:
+                    expected = bool(_get_policy(name, action).get(role, False))
+                    assert row[action] is expected, (role, name, action)
+                    assert compiled.is_allowed(role, name, action) is expected
+
+    def test_unknown_view_uses_default_policy(self):
+        assert compiled.is_allowed("staff", "custom", "export") is DEFAULT_POLICY["export"]["staff"]
+        assert compiled.is_allowed("staff", "custom", "unknown-action") is None
+
+    def test_tables_are_frozen(self):
+        with self.assertRaises(TypeError):
+            compiled.role_matrix("reader")["companies"]["view"] = True
+
+    def test_etag_is_stable_and_role_specific(self):
+        before = compiled.role_etag("reader")
+        compiled.compile_access_tables()
+        assert compiled.role_etag("reader") == before
+        assert compiled.role_etag("reader") != compiled.role_etag("admin")
+
+    def test_matrix_for_user_is_a_copy(self):
+        user = SimpleNamespace(is_authenticated=True, is_superuser=False, role="reader")
+        matrix = get_access_matrix_for_user(user, view_names={"companies": {}})
+        matrix["companies"]["view"] = True
+        assert compiled.role_matrix("reader")["companies"]["view"] is False
+
+
+class AccessRightsPermissionTests(SimpleTestCase):
+    def _check(self, method, user, view_name="companies"):
+        request = SimpleNamespace(method=method, user=user)
+        return AccessRightsPermission().has_permission(request, SimpleNamespace(_view_name=view_name))
+
+    def test_method_maps_to_compiled_action(self):
+        admin = SimpleNamespace(is_authenticated=True, is_superuser=False, role="admin")
+        reader = SimpleNamespace(is_authenticated=True, is_superuser=False, role="reader")
+
+        assert self._check("DELETE", admin) is compiled.is_allowed("admin", "companies", "delete")
+        assert self._check("GET", reader) is False
+        assert self._check("PATCH", reader, "factories") is DEFAULT_POLICY["edit"]["reader"]
+
+    def test_superuser_flag_allows_everything(self):
+        user = SimpleNamespace(is_authenticated=True, is_superuser=True, role="reader")
+        assert self._check("DELETE", user) is True
+
+
+class AccessRightsMatrixEtagTests(TestCase):
+    def test_unchanged_matrix_returns_304(self):
+        from sopira_magic.apps.api.views import accessrights_matrix_view
+
+        user = get_user_model().objects.create_user(username="etag_user", password="testpass123")
+        factory = APIRequestFactory()
+
+        request = factory.get("/api/accessrights/matrix/")
+        force_authenticate(request, user)
+        response = accessrights_matrix_view(request)
+        assert response.status_code == 200
+        assert not response["ETag"].startswith("W/")
+
+        request = factory.get("/api/accessrights/matrix/", HTTP_IF_NONE_MATCH=response["ETag"])
+        force_authenticate(request, user)
+        assert accessrights_matrix_view(request).status_code == 304
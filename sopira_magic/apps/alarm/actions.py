@@ -0,0 +1,65 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/actions.py
+#   Alarm Actions - built-in action handlers
+#   log / email, registered by AlarmConfig.ready()
+#..............................................................
+
+"""
+   Alarm Actions - Built-in Action Handlers.
+
+   log:
+   Writes a warning to the alarm logger.
+   {"type": "log", "message": "optional template"}
+
+   email:
+   Queues one message per recipient in the notification outbox
+   (NotificationOutbox.enqueue, delivered by notification_worker).
+   {"type": "email", "recipients": [...], "subject": "...", "body": "..."}
+
+   subject / body / message are str.format templates over the alarm context
+   ({rule}, {level}, {object_id}, {roi_temp_max_c}, ...); unknown
+   placeholders are left as they are.
+"""
+
+import logging
+from typing import Any, Dict
+
+from .registry import register_action_handler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUBJECT = "[Alarm] {rule} (level {level})"
+DEFAULT_BODY = "Alarm '{rule}' fired for {rule_type} {object_id} at {triggered_at}.\n\nValues: {summary}"
+
+
+class _Template(dict):
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def render(template: str, context: Dict[str, Any]) -> str:
+    return template.format_map(_Template(context))
+
+
+def log_action(action: Dict[str, Any], context: Dict[str, Any]) -> None:
+    logger.warning(f"[ALARM] {render(action.get('message', DEFAULT_SUBJECT), context)}: {context['summary']}")
+
+
+def email_action(action: Dict[str, Any], context: Dict[str, Any]) -> None:
+    from sopira_magic.apps.notification.outbox import NotificationOutbox
+
+    recipients = action.get("recipients") or []
+    if not recipients:
+        raise ValueError("email action requires 'recipients'")
+    NotificationOutbox.enqueue(
+        "alarm",
+        recipients,
+        render(action.get("subject", DEFAULT_SUBJECT), context),
+        render(action.get("body", DEFAULT_BODY), context),
+        context_data={key: context[key] for key in ("rule_id", "event_id", "object_id", "level")},
+    )
+
+
+def register_builtin_actions() -> None:
+    register_action_handler("log", log_action)
+    register_action_handler("email", email_action)
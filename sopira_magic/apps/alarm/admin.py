@@ -8,7 +8,7 @@
    Alarm Admin - Django Admin Configuration.
 
    Django admin interface configuration for alarm models.
-   Provides management interface for alarm rules and escalations.
+   Provides management interface for alarm rules, escalations and fired alarms.
 
    Admin Classes:
 
@@ -21,10 +21,15 @@
       - Displays: rule, level, delay_minutes, created
       - Filters: created
       - Ordering: rule, level
+
+   3. AlarmEventAdmin
+      - Displays: rule, object_id, status, escalation_level, triggered_at, next_escalation_at
+      - Filters: status, rule, triggered_at
+      - Actions: acknowledge, resolve (both stop escalation)
 """
 
 from django.contrib import admin
-from .models import AlarmRule, AlarmEscalation
+from .models import AlarmRule, AlarmEscalation, AlarmEvent
 
 
 @admin.register(AlarmRule)
@@ -41,3 +46,25 @@ class AlarmEscalationAdmin(admin.ModelAdmin):
     list_display = ['rule', 'level', 'delay_minutes', 'created']
     list_filter = ['created']
     ordering = ['rule', 'level']
+
+
+@admin.register(AlarmEvent)
+class AlarmEventAdmin(admin.ModelAdmin):
+    """AlarmEvent admin configuration."""
+    list_display = ['rule', 'object_id', 'status', 'escalation_level', 'triggered_at', 'next_escalation_at']
+    list_filter = ['status', 'rule', 'triggered_at']
+    search_fields = ['rule__name', 'object_id']
+    readonly_fields = ['created', 'updated', 'triggered_at', 'values']
+    actions = ['acknowledge', 'resolve']
+
+    @admin.action(description='Acknowledge selected alarms')
+    def acknowledge(self, request, queryset):
+        queryset.filter(status=AlarmEvent.Status.OPEN).update(
+            status=AlarmEvent.Status.ACKNOWLEDGED, next_escalation_at=None
+        )
+
+    @admin.action(description='Resolve selected alarms')
+    def resolve(self, request, queryset):
+        queryset.exclude(status=AlarmEvent.Status.RESOLVED).update(
+            status=AlarmEvent.Status.RESOLVED, next_escalation_at=None
+        )
@@ -9,6 +9,8 @@
 
    Django AppConfig for alarm application.
    Manages alarm rules and escalation policies.
+   On startup registers the built-in actions, the source model signals
+   (AlarmEngine) and the 'alarm.escalate' scheduler task type.
 
    Configuration:
    - App name: sopira_magic.apps.alarm
@@ -27,3 +29,12 @@ class AlarmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sopira_magic.apps.alarm'
     verbose_name = 'Alarm'
+
+    def ready(self):
+        from sopira_magic.apps.scheduler.registry import register_task_handler
+        from .actions import register_builtin_actions
+        from .engine import AlarmEngine
+        from .signals import register_alarm_signals
+        register_builtin_actions()
+        register_alarm_signals()
+        register_task_handler('alarm.escalate', lambda config: AlarmEngine.escalate())
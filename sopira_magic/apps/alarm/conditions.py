@@ -0,0 +1,173 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/conditions.py
+#   Alarm Conditions - JSON condition compiler
+#   AlarmRule.condition → Python predicate over a row dict
+#..............................................................
+
+"""
+   Alarm Conditions - JSON Condition Compiler.
+
+   AlarmRule.condition is compiled once into a closure over a row dict
+   ({attname: value}); evaluating a rule is then a few Python comparisons.
+
+   Grammar:
+   - leaf:   {"field": "roi_temp_max_c", "op": "gt", "value": 950}
+             ops: eq, ne, gt, gte, lt, lte, in, not_in, between ([low, high]),
+             isnull (value true/false)
+   - groups: {"all": [...]}, {"any": [...]}, {"not": {...}}
+   - scope:  top-level {"factory": id | [ids], ...} limits the rule to rows of
+             those factories (key = ALARM_SOURCES[rule_type]['scope']); the
+             remaining keys form the condition
+
+   Values are converted with the model field's to_python() at compile time
+   (950 → Decimal('950') for DecimalFields). Comparisons against NULL are
+   false, except isnull and ne.
+
+   Usage:
+   ```python
+   compiled = compile_condition(
+       {'factory': factory_id, 'field': 'roi_temp_max_c', 'op': 'gte', 'value': 950},
+       Measurement, scope='factory',
+   )
+   compiled.predicate({'roi_temp_max_c': Decimal('961.5')})  # True
+   compiled.fields   # {'roi_temp_max_c'}
+   compiled.scopes   # {'<factory_id>'}
+   ```
+"""
+
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Set
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+
+Predicate = Callable[[Mapping[str, Any]], bool]
+
+COMPARISONS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+OPERATORS = (*COMPARISONS, "ne", "in", "not_in", "between", "isnull")
+
+# Fields that cannot be compared (large payloads, files)
+UNSUPPORTED_FIELDS = (models.JSONField, models.FileField, models.BinaryField)
+
+
+class ConditionError(ValueError):
+    """Malformed AlarmRule.condition."""
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    predicate: Predicate
+    fields: FrozenSet[str]  # attnames read by the predicate
+    scopes: Optional[FrozenSet[str]]  # scope ids, None = all
+    matches_empty: bool  # predicate is true when all fields are NULL
+
+
+def comparable_fields(model) -> Dict[str, models.Field]:
+    """{name and attname: field} of fields usable in conditions."""
+    fields = {}
+    for field in model._meta.concrete_fields:
+        if isinstance(field, UNSUPPORTED_FIELDS):
+            continue
+        fields[field.name] = field
+        fields[field.attname] = field
+    return fields
+
+
+def _convert(field: models.Field, value: Any, expr: Any) -> Any:
+    target = field.target_field if field.many_to_one else field
+    try:
+        return target.to_python(value)
+    except (ValidationError, TypeError, ValueError):
+        raise ConditionError(f"Invalid value {value!r} for '{field.name}' in {expr}")
+
+
+def _leaf(expr: Dict[str, Any], fields: Dict[str, models.Field], used: Set[str]) -> Predicate:
+    name, op = expr.get("field"), expr.get("op", "eq")
+    if name not in fields:
+        raise ConditionError(f"Unknown field '{name}'")
+    if op not in OPERATORS:
+        raise ConditionError(f"Unknown operator '{op}' (expected one of {', '.join(OPERATORS)})")
+    field = fields[name]
+    key = field.attname
+    used.add(key)
+    value = expr.get("value")
+
+    if op == "isnull":
+        expected = bool(value if value is not None else True)
+        return lambda row: (row.get(key) is None) is expected
+    if op in ("in", "not_in"):
+        if not isinstance(value, (list, tuple)):
+            raise ConditionError(f"'{op}' expects a list for '{name}'")
+        options = frozenset(_convert(field, v, expr) for v in value)
+        if op == "in":
+            return lambda row: row.get(key) in options
+        return lambda row: row.get(key) is not None and row.get(key) not in options
+    if op == "between":
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ConditionError(f"'between' expects [low, high] for '{name}'")
+        low, high = (_convert(field, v, expr) for v in value)
+
+        def between(row):
+            current = row.get(key)
+            return current is not None and low <= current <= high
+        return between
+
+    if value is None:
+        raise ConditionError(f"'{op}' needs a value for '{name}' (use isnull)")
+    value = _convert(field, value, expr)
+    if op == "ne":
+        return lambda row: row.get(key) != value
+    compare = COMPARISONS[op]
+
+    def comparison(row):
+        current = row.get(key)
+        return current is not None and compare(current, value)
+    return comparison
+
+
+def _compile(expr: Any, fields: Dict[str, models.Field], used: Set[str]) -> Predicate:
+    if not isinstance(expr, dict) or not expr:
+        raise ConditionError(f"Condition must be a non-empty object, got {expr!r}")
+    if "all" in expr or "any" in expr:
+        group = "all" if "all" in expr else "any"
+        parts = expr[group]
+        if not isinstance(parts, list) or not parts:
+            raise ConditionError(f"'{group}' expects a non-empty list")
+        predicates = tuple(_compile(part, fields, used) for part in parts)
+        if group == "all":
+            return lambda row: all(p(row) for p in predicates)
+        return lambda row: any(p(row) for p in predicates)
+    if "not" in expr:
+        inner = _compile(expr["not"], fields, used)
+        return lambda row: not inner(row)
+    return _leaf(expr, fields, used)
+
+
+def compile_condition(condition: Dict[str, Any], model, scope: Optional[str] = None) -> CompiledCondition:
+    """Compile an AlarmRule.condition for rows of `model`."""
+    if not isinstance(condition, dict):
+        raise ConditionError("Condition must be an object")
+    condition = dict(condition)
+    scopes = None
+    if scope and scope in condition:
+        raw = condition.pop(scope)
+        raw = raw if isinstance(raw, (list, tuple)) else [raw]
+        scopes = frozenset(str(value) for value in raw if value not in (None, ""))
+
+    used: Set[str] = set()
+    predicate = _compile(condition, comparable_fields(model), used)
+    return CompiledCondition(
+        predicate=predicate,
+        fields=frozenset(used),
+        scopes=scopes or None,
+        matches_empty=bool(predicate({})),
+    )
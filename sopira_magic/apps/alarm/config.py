@@ -0,0 +1,54 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/config.py
+#   Alarm Config - SSOT for alarm sources
+#   Which models are evaluated against AlarmRule rows
+#..............................................................
+
+"""
+Alarm Configuration - SINGLE SOURCE OF TRUTH.
+
+ALARM_SOURCES maps AlarmRule.rule_type to the model whose rows the rule is
+evaluated against:
+
+- model: app_label.ModelName
+- view:  VIEWS_MATRIX view whose bulk writes (api.bulk.after_bulk_write,
+         impex imports) are evaluated in batches
+- scope: FK used to index rules; a rule limits itself with
+         condition[<scope>] = id or [ids] (absent = all)
+
+Usage:
+```python
+from sopira_magic.apps.alarm.config import get_source
+source = get_source('measurement')  # {'model': ..., 'view': ..., 'scope': 'factory'}
+```
+"""
+
+from typing import Any, Dict, Optional
+
+ALARM_SOURCES: Dict[str, Dict[str, Any]] = {
+    "measurement": {
+        "model": "measurement.Measurement",
+        "view": "measurements",
+        "scope": "factory",
+    },
+}
+
+
+def get_source(rule_type: str) -> Optional[Dict[str, Any]]:
+    return ALARM_SOURCES.get(rule_type)
+
+
+def source_for_model(model) -> Optional[str]:
+    """rule_type whose source is `model` (None = not an alarm source)."""
+    label = model._meta.label
+    for rule_type, source in ALARM_SOURCES.items():
+        if source["model"] == label:
+            return rule_type
+    return None
+
+
+def source_for_view(view_name: str) -> Optional[str]:
+    for rule_type, source in ALARM_SOURCES.items():
+        if source.get("view") == view_name:
+            return rule_type
+    return None
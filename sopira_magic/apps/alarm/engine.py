@@ -0,0 +1,528 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/engine.py
+#   AlarmEngine - Streaming alarm rule evaluation
+#   Compiled rule index + background evaluator + escalations
+#..............................................................
+
+"""
+   AlarmEngine - Streaming Alarm Rule Evaluation.
+
+   Every enabled AlarmRule is compiled once (conditions.py) and indexed per
+   source (rule_type, config.ALARM_SOURCES) by (scope id, field): a new
+   Measurement of factory F is only checked against rules of factory F (or of
+   all factories) that read at least one of its non-NULL fields.
+
+   Flow:
+   1. Write path: post_save of a source model snapshots the comparable field
+      values of the instance (no query) and, after the transaction commits,
+      appends them to an in-process buffer. Bulk writes and imports
+      (api.bulk.after_bulk_write) append the primary keys of the batch.
+   2. The evaluator thread is woken immediately, drains the buffer and
+      evaluates all buffered rows in one pass (pk batches are loaded with one
+      values() query per ALARM_BATCH_SIZE rows, reading only fields used by
+      rules).
+   3. Matches become AlarmEvent rows (one bulk_create per pass; one open event
+      per rule and row, repeated matches are ignored), then the rule action
+      and escalations with delay 0 run (registry.py, actions.py).
+   4. Later escalation levels are run by escalate(), registered as the
+      scheduler task type 'alarm.escalate' (e.g. schedule '* * * * *').
+
+   The compiled index is rebuilt when a rule or escalation is saved or
+   deleted (signals.py). Other processes notice via a version stamp in the
+   Django cache, checked at most every ALARM_RULES_CHECK_INTERVAL seconds.
+   That is immediate only with a shared cache (CACHE_URL); with per-process
+   caches the stamp expires after CACHE_VERSION_TIMEOUT seconds, so other
+   processes pick up rule changes at most that much later.
+
+   Durability: the buffer lives in process memory. It is evaluated at normal
+   interpreter exit (atexit), but rows still buffered when the process
+   crashes or is killed (SIGKILL, OOM) are never evaluated; they raise no
+   alarm until they are written again.
+
+   ALARM_EVALUATION: async (background thread, default) | sync (evaluate on
+   the committing thread, tests / scripts) | off.
+
+   Usage:
+   ```python
+   AlarmEngine.record(measurement, created=True)       # post_save (signals.py)
+   AlarmEngine.record_pks('measurements', pks)         # bulk writes / imports
+   AlarmEngine.flush()                                 # evaluate buffered rows now
+   AlarmEngine.escalate()                              # due escalation levels
+   ```
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .conditions import CompiledCondition, ConditionError, comparable_fields, compile_condition
+from .config import get_source, source_for_model, source_for_view
+from .registry import get_action_handler
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "alarm:rules:version"
+BATCH_SIZE = 1000
+RULES_CHECK_INTERVAL = 1.0  # seconds
+
+Actions = Tuple[Dict[str, Any], ...]
+
+# Buffered item: ("rows", rule_type, [(row, changed attnames | None)]) | ("pks", rule_type, [pk, ...])
+AlarmItem = Tuple[str, str, list]
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _actions(action: Any) -> Actions:
+    """AlarmRule.action / AlarmEscalation.action as a tuple of action dicts."""
+    if not action:
+        return ()
+    items = action if isinstance(action, list) else [action]
+    for item in items:
+        if not isinstance(item, dict) or not item.get("type"):
+            raise ConditionError(f"Action must be an object with a 'type', got {item!r}")
+    return tuple(items)
+
+
+@dataclass(frozen=True)
+class _Rule:
+    id: str
+    name: str
+    rule_type: str
+    condition: CompiledCondition
+    actions: Actions
+    escalations: Tuple[Tuple[int, int, Actions], ...]  # (level, delay_minutes, actions), by level
+
+
+class _SourceIndex:
+    """Compiled rules of one rule_type, bucketed by (scope id, field)."""
+
+    def __init__(self, rule_type: str, model, scope: Optional[str]):
+        self.rule_type = rule_type
+        self.model = model
+        self.scope_attname = model._meta.get_field(scope).attname if scope else None
+        self.rules: List[_Rule] = []
+        self.fields: set = set()
+        self._buckets: Dict[Tuple[Optional[str], Optional[str]], List[_Rule]] = defaultdict(list)
+
+    def add(self, rule: _Rule) -> None:
+        self.rules.append(rule)
+        self.fields.update(rule.condition.fields)
+        # Rules that can match an all-NULL row are candidates for every row
+        fields = (None,) if rule.condition.matches_empty else rule.condition.fields
+        for scope_id in rule.condition.scopes or (None,):
+            for field in fields:
+                self._buckets[(scope_id, field)].append(rule)
+
+    def candidates(self, scope_id: Optional[str], fields: Iterable[str]) -> Iterable[_Rule]:
+        found: Dict[str, _Rule] = {}
+        fields = (*fields, None)
+        for scope in {scope_id, None}:
+            for field in fields:
+                for rule in self._buckets.get((scope, field), ()):
+                    found[rule.id] = rule
+        return found.values()
+
+    def match(self, row: Dict[str, Any], changed: Optional[Iterable[str]] = None):
+        """(rule, scope_id) for every rule matching the row."""
+        scope_id = row.get(self.scope_attname) if self.scope_attname else None
+        scope_id = str(scope_id) if scope_id is not None else None
+        if changed is None:
+            fields = [field for field in self.fields if row.get(field) is not None]
+        else:
+            fields = self.fields.intersection(changed)
+        for rule in self.candidates(scope_id, fields):
+            try:
+                matched = rule.condition.predicate(row)
+            except TypeError as e:
+                logger.warning(f"[ALARM] Rule '{rule.name}' cannot compare row values: {e}")
+                continue
+            if matched:
+                yield rule, scope_id
+
+
+@lru_cache(maxsize=None)
+def _snapshot_fields(model) -> Tuple[str, ...]:
+    """Attnames copied from a saved instance (pk + comparable fields)."""
+    attnames = {field.attname for field in comparable_fields(model).values()}
+    return (model._meta.pk.attname, *sorted(attnames - {model._meta.pk.attname}))
+
+
+class AlarmEngine:
+    """Compiled rule index + buffered evaluation of source rows."""
+
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    _buffer: deque = deque()
+    _evaluator: Optional[threading.Thread] = None
+    _atexit_registered = False
+
+    _index_lock = threading.Lock()
+    _index: Optional[Dict[str, _SourceIndex]] = None
+    _index_version: Optional[str] = None
+    _index_checked = 0.0
+
+    # -------------------------
+    # Rule index
+    # -------------------------
+    @staticmethod
+    def _version() -> str:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(VERSION_KEY, version, getattr(settings, "CACHE_VERSION_TIMEOUT", None)):
+                version = cache.get(VERSION_KEY) or version
+        return version
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop compiled rules here and in other processes (rule saved / deleted)."""
+        cache.set(VERSION_KEY, uuid.uuid4().hex, getattr(settings, "CACHE_VERSION_TIMEOUT", None))
+        with cls._index_lock:
+            cls._index = None
+
+    @classmethod
+    def index(cls) -> Dict[str, _SourceIndex]:
+        """Compiled rules per rule_type (rebuilt after invalidate())."""
+        now = time.monotonic()
+        with cls._index_lock:
+            if cls._index is not None and now - cls._index_checked < _setting("ALARM_RULES_CHECK_INTERVAL", RULES_CHECK_INTERVAL):
+                return cls._index
+            version = cls._version()
+            cls._index_checked = now
+            if cls._index is None or version != cls._index_version:
+                cls._index = cls._build()
+                cls._index_version = version
+            return cls._index
+
+    @staticmethod
+    def _compile(rule) -> _Rule:
+        source = get_source(rule.rule_type)
+        if source is None:
+            raise ConditionError(f"Unknown rule_type '{rule.rule_type}'")
+        model = apps.get_model(source["model"])
+        escalations = sorted(rule.escalations.all(), key=lambda escalation: escalation.level)
+        return _Rule(
+            id=str(rule.pk),
+            name=rule.name,
+            rule_type=rule.rule_type,
+            condition=compile_condition(rule.condition, model, source.get("scope")),
+            actions=_actions(rule.action),
+            escalations=tuple((e.level, e.delay_minutes, _actions(e.action)) for e in escalations),
+        )
+
+    @classmethod
+    def _build(cls) -> Dict[str, _SourceIndex]:
+        from .models import AlarmRule
+
+        sources: Dict[str, _SourceIndex] = {}
+        rules = AlarmRule.objects.filter(enabled=True, active=True).prefetch_related("escalations")
+        for rule in rules:
+            try:
+                compiled = cls._compile(rule)
+            except ConditionError as e:
+                logger.warning(f"[ALARM] Rule '{rule.name}' ({rule.pk}) skipped: {e}")
+                continue
+            if rule.rule_type not in sources:
+                source = get_source(rule.rule_type)
+                sources[rule.rule_type] = _SourceIndex(
+                    rule.rule_type, apps.get_model(source["model"]), source.get("scope")
+                )
+            sources[rule.rule_type].add(compiled)
+        logger.info(f"[ALARM] Compiled {sum(len(s.rules) for s in sources.values())} alarm rules")
+        return sources
+
+    @classmethod
+    def validate(cls, rule) -> Optional[str]:
+        """Error message for an invalid rule (AlarmRule.clean), None if valid."""
+        source = get_source(rule.rule_type)
+        if source is None:
+            return f"Unknown rule_type '{rule.rule_type}'"
+        try:
+            compile_condition(rule.condition, apps.get_model(source["model"]), source.get("scope"))
+            _actions(rule.action)
+        except ConditionError as e:
+            return str(e)
+        return None
+
+    # -------------------------
+    # Producer side (write path)
+    # -------------------------
+    @staticmethod
+    def mode() -> str:
+        return _setting("ALARM_EVALUATION", "async")
+
+    @classmethod
+    def record(cls, instance, created: bool = True, update_fields: Optional[Iterable[str]] = None) -> None:
+        """Queue a saved source instance for evaluation after its transaction commits."""
+        if cls.mode() == "off":
+            return
+        model = type(instance)
+        rule_type = source_for_model(model)
+        if rule_type is None:
+            return
+        row = {attname: getattr(instance, attname) for attname in _snapshot_fields(model)}
+        changed = None
+        if not created and update_fields:
+            changed = [model._meta.get_field(name).attname for name in update_fields]
+        transaction.on_commit(
+            lambda: cls._append(("rows", rule_type, [(row, changed)])), using=instance._state.db
+        )
+
+    @classmethod
+    def record_pks(cls, view_name: str, pks: Iterable[Any]) -> None:
+        """Queue rows written in bulk (api.bulk.after_bulk_write, imports)."""
+        if cls.mode() == "off":
+            return
+        rule_type = source_for_view(view_name)
+        pks = list(pks)
+        if rule_type is None or not pks:
+            return
+        transaction.on_commit(lambda: cls._append(("pks", rule_type, pks)))
+
+    @classmethod
+    def _append(cls, item: AlarmItem) -> None:
+        with cls._lock:
+            cls._buffer.append(item)
+        if cls.mode() == "sync":
+            cls.flush()
+            return
+        cls._wakeup.set()
+        cls._ensure_evaluator()
+
+    @classmethod
+    def pending(cls) -> int:
+        with cls._lock:
+            return len(cls._buffer)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Discard buffered rows and compiled rules (tests)."""
+        with cls._lock:
+            cls._buffer.clear()
+        with cls._index_lock:
+            cls._index = None
+
+    # -------------------------
+    # Consumer side (evaluator)
+    # -------------------------
+    @classmethod
+    def flush(cls) -> int:
+        """Evaluate all buffered rows. Returns the number of alarms fired."""
+        fired = 0
+        while True:
+            with cls._lock:
+                items = list(cls._buffer)
+                cls._buffer.clear()
+            if not items:
+                return fired
+            try:
+                fired += cls.evaluate(items)
+            except Exception as e:
+                logger.error(f"[ALARM] Evaluation of {len(items)} buffered items failed: {e}", exc_info=True)
+
+    @classmethod
+    def evaluate(cls, items: List[AlarmItem]) -> int:
+        index = cls.index()
+        matches = []
+        for kind, rule_type, payload in items:
+            source = index.get(rule_type)
+            if source is None:
+                continue
+            rows = payload if kind == "rows" else ((row, None) for row in cls._load(source, payload))
+            for row, changed in rows:
+                matches.extend((rule, row, scope_id) for rule, scope_id in source.match(row, changed))
+        return cls._fire(matches)
+
+    @staticmethod
+    def _load(source: _SourceIndex, pks: List[Any]):
+        """Rows of a bulk write: one values() query per batch, only fields read by rules."""
+        meta = source.model._meta
+        fields = {meta.pk.attname, *source.fields}
+        if source.scope_attname:
+            fields.add(source.scope_attname)
+        batch_size = _setting("ALARM_BATCH_SIZE", BATCH_SIZE)
+        for start in range(0, len(pks), batch_size):
+            yield from source.model._default_manager.filter(pk__in=pks[start:start + batch_size]).values(*fields)
+
+    @staticmethod
+    def _plan(rule: _Rule, triggered_at: datetime, level: int, now: datetime):
+        """(due escalation levels, new level, next escalation time) after `level`."""
+        due, next_at = [], None
+        for esc_level, delay, actions in rule.escalations:
+            if esc_level <= level:
+                continue
+            at = triggered_at + timedelta(minutes=delay)
+            if at <= now:
+                due.append((esc_level, actions))
+            elif next_at is None or at < next_at:
+                next_at = at
+        return due, (due[-1][0] if due else level), next_at
+
+    @classmethod
+    def _fire(cls, matches: List[Tuple[_Rule, Dict[str, Any], Optional[str]]]) -> int:
+        from .models import AlarmEvent
+
+        if not matches:
+            return 0
+        now = timezone.now()
+        pk_names = {rule.rule_type: apps.get_model(get_source(rule.rule_type)["model"])._meta.pk.attname
+                    for rule, _, _ in matches}
+        keyed = [(rule, row, scope_id, str(row[pk_names[rule.rule_type]])) for rule, row, scope_id in matches]
+        existing = {
+            (str(rule_id), object_id)
+            for rule_id, object_id in AlarmEvent.objects.filter(
+                status=AlarmEvent.Status.OPEN,
+                rule_id__in={rule.id for rule, *_ in keyed},
+                object_id__in={object_id for *_, object_id in keyed},
+            ).values_list("rule_id", "object_id")
+        }
+
+        pending = []
+        for rule, row, scope_id, object_id in keyed:
+            if (rule.id, object_id) in existing:
+                continue
+            existing.add((rule.id, object_id))
+            due, level, next_at = cls._plan(rule, now, 0, now)
+            event = AlarmEvent(
+                rule_id=rule.id,
+                object_id=object_id,
+                scope_id=scope_id or "",
+                values={field: row.get(field) for field in sorted(rule.condition.fields)},
+                triggered_at=now,
+                escalation_level=level,
+                next_escalation_at=next_at,
+            )
+            pending.append((rule, event, due))
+        if not pending:
+            return 0
+
+        # Conditional unique constraint: a concurrent evaluator may have opened the same event
+        AlarmEvent.objects.bulk_create([event for _, event, _ in pending], ignore_conflicts=True)
+        created = {str(pk) for pk in AlarmEvent.objects.filter(
+            pk__in=[event.pk for _, event, _ in pending]).values_list("pk", flat=True)}
+
+        fired = 0
+        for rule, event, due in pending:
+            if str(event.pk) not in created:
+                continue
+            fired += 1
+            cls._run_actions(rule.actions, cls._context(rule, event, 0))
+            for level, actions in due:
+                cls._run_actions(actions, cls._context(rule, event, level))
+        logger.info(f"[ALARM] Fired {fired} alarms")
+        return fired
+
+    @staticmethod
+    def _context(rule: _Rule, event, level: int) -> Dict[str, Any]:
+        values = dict(event.values)
+        return {
+            **values,
+            "rule": rule.name,
+            "rule_id": rule.id,
+            "rule_type": rule.rule_type,
+            "level": level,
+            "event_id": str(event.pk),
+            "object_id": event.object_id,
+            "scope_id": event.scope_id,
+            "triggered_at": event.triggered_at.isoformat(),
+            "values": values,
+            "summary": ", ".join(f"{field}={value}" for field, value in values.items()),
+        }
+
+    @staticmethod
+    def _run_actions(actions: Actions, context: Dict[str, Any]) -> None:
+        for action in actions:
+            handler = get_action_handler(action["type"])
+            if handler is None:
+                logger.warning(f"[ALARM] No handler for action type '{action['type']}' (rule '{context['rule']}')")
+                continue
+            try:
+                handler(action, context)
+            except Exception as e:
+                logger.error(f"[ALARM] Action '{action['type']}' of rule '{context['rule']}' failed: {e}", exc_info=True)
+
+    # -------------------------
+    # Escalations (scheduler task 'alarm.escalate')
+    # -------------------------
+    @classmethod
+    def escalate(cls, now: Optional[datetime] = None) -> int:
+        """Run due escalation levels of open events. Returns the number of levels run."""
+        from .models import AlarmEvent
+
+        now = now or timezone.now()
+        rules = {rule.id: rule for source in cls.index().values() for rule in source.rules}
+        batch_size = _setting("ALARM_BATCH_SIZE", BATCH_SIZE)
+        escalated = []
+        with transaction.atomic():
+            events = list(
+                AlarmEvent.objects.select_for_update(skip_locked=True)
+                .filter(status=AlarmEvent.Status.OPEN, next_escalation_at__lte=now)
+                .order_by("next_escalation_at")[:batch_size]
+            )
+            for event in events:
+                rule = rules.get(str(event.rule_id))
+                if rule is None:
+                    # Rule disabled or deleted: nothing left to escalate
+                    event.next_escalation_at = None
+                else:
+                    due, event.escalation_level, event.next_escalation_at = cls._plan(
+                        rule, event.triggered_at, event.escalation_level, now
+                    )
+                    if due:
+                        escalated.append((rule, event, due))
+                event.updated = now
+            AlarmEvent.objects.bulk_update(events, ["escalation_level", "next_escalation_at", "updated"])
+
+        count = 0
+        for rule, event, due in escalated:
+            for level, actions in due:
+                cls._run_actions(actions, cls._context(rule, event, level))
+                count += 1
+        if count:
+            logger.info(f"[ALARM] Ran {count} escalation levels")
+        return count
+
+    # -------------------------
+    # Background evaluator thread
+    # -------------------------
+    @classmethod
+    def _ensure_evaluator(cls) -> None:
+        with cls._lock:
+            if cls._evaluator is not None and cls._evaluator.is_alive():
+                return
+            cls._evaluator = threading.Thread(target=cls._run_evaluator, name="alarm-evaluator", daemon=True)
+            cls._evaluator.start()
+            if not cls._atexit_registered:
+                # Evaluate what is left when the process exits (once, not per thread respawn)
+                atexit.register(cls.flush)
+                cls._atexit_registered = True
+
+    @classmethod
+    def _run_evaluator(cls) -> None:
+        while True:
+            cls._wakeup.wait()
+            cls._wakeup.clear()
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"[ALARM] Evaluator iteration failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:29
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alarm', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlarmEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('active', models.BooleanField(db_index=True, default=True, help_text='Is the record active? (soft delete flag)')),
+                ('visible', models.BooleanField(db_index=True, default=True, help_text='Should the record be visible in UI listings?')),
+                ('object_id', models.CharField(db_index=True, max_length=64)),
+                ('scope_id', models.CharField(blank=True, db_index=True, default='', max_length=64)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('acknowledged', 'Acknowledged'), ('resolved', 'Resolved')], db_index=True, default='open', max_length=20)),
+                ('values', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('triggered_at', models.DateTimeField(db_index=True)),
+                ('escalation_level', models.IntegerField(default=0)),
+                ('next_escalation_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='alarm.alarmrule')),
+            ],
+            options={
+                'verbose_name': 'Alarm Event',
+                'verbose_name_plural': 'Alarm Events',
+                'ordering': ['-triggered_at'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'open')), fields=('rule', 'object_id'), name='alarm_event_one_open_per_object')],
+            },
+        ),
+    ]
@@ -24,14 +24,25 @@
       - Links to AlarmRule
       - Ordered by: level
       - Defines escalation levels and delays
+      - delay_minutes counts from the moment the alarm fired
+
+   3. AlarmEvent (extends TimeStampedModel)
+      - Fired alarm: one open event per rule and source row
+      - Fields: rule (FK), object_id, scope_id, status, values (JSON),
+        triggered_at, escalation_level, next_escalation_at
+      - Status: open, acknowledged, resolved (escalation stops when not open)
+      - Created by AlarmEngine (engine.py)
+
+   Conditions are evaluated by AlarmEngine (engine.py); rule_type selects the
+   source model (config.ALARM_SOURCES), condition syntax see conditions.py.
 
    Usage:
    ```python
    from sopira_magic.apps.alarm.models import AlarmRule, AlarmEscalation
    rule = AlarmRule.objects.create(
        name='High Temperature Alert',
-       rule_type='temperature',
-       condition={'threshold': 100},
+       rule_type='measurement',
+       condition={'field': 'roi_temp_max_c', 'op': 'gte', 'value': 950},
        action={'type': 'email', 'recipients': ['admin@example.com']}
    )
    escalation = AlarmEscalation.objects.create(
@@ -43,6 +54,7 @@
    ```
 """
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from sopira_magic.apps.core.models import TimeStampedModel
@@ -60,6 +72,14 @@ class AlarmRule(TimeStampedModel):
         verbose_name = _("Alarm Rule")
         verbose_name_plural = _("Alarm Rules")
 
+    def clean(self):
+        super().clean()
+        from django.core.exceptions import ValidationError
+        from .engine import AlarmEngine
+        error = AlarmEngine.validate(self)
+        if error:
+            raise ValidationError({"condition": error})
+
 
 class AlarmEscalation(TimeStampedModel):
     """Alarm escalation model."""
@@ -72,3 +92,33 @@ class AlarmEscalation(TimeStampedModel):
         verbose_name = _("Alarm Escalation")
         verbose_name_plural = _("Alarm Escalations")
         ordering = ['level']
+
+
+class AlarmEvent(TimeStampedModel):
+    """Fired alarm (one open event per rule and source row)."""
+
+    class Status(models.TextChoices):
+        OPEN = "open", _("Open")
+        ACKNOWLEDGED = "acknowledged", _("Acknowledged")
+        RESOLVED = "resolved", _("Resolved")
+
+    rule = models.ForeignKey(AlarmRule, on_delete=models.CASCADE, related_name="events")
+    object_id = models.CharField(max_length=64, db_index=True)
+    scope_id = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.OPEN, db_index=True)
+    values = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    triggered_at = models.DateTimeField(db_index=True)
+    escalation_level = models.IntegerField(default=0)
+    next_escalation_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("Alarm Event")
+        verbose_name_plural = _("Alarm Events")
+        ordering = ['-triggered_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rule", "object_id"],
+                condition=models.Q(status="open"),
+                name="alarm_event_one_open_per_object",
+            ),
+        ]
@@ -0,0 +1,54 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/registry.py
+#   Alarm Registry - action handler callbacks
+#   Maps AlarmRule / AlarmEscalation action types to callables
+#..............................................................
+
+"""
+Registry for alarm action handlers.
+
+AlarmRule.action and AlarmEscalation.action are {"type": ..., ...} objects
+(or lists of them). The handler registered for the type is called with the
+action dict and the alarm context:
+
+    {rule, rule_id, rule_type, level, event_id, object_id, scope_id,
+     triggered_at, values, summary ("field=value, ..."), **values}
+
+The alarm app registers the built-in handlers (actions.py) in
+AlarmConfig.ready(); other apps register their own the same way.
+
+Usage:
+```python
+from sopira_magic.apps.alarm.registry import register_action_handler
+
+register_action_handler('webhook', lambda action, context: post_json(action['url'], context))
+```
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+ActionHandler = Callable[[Dict[str, Any], Dict[str, Any]], Any]
+
+# Global callback storage: action type → handler
+_handlers: Dict[str, ActionHandler] = {}
+
+
+def register_action_handler(action_type: str, callback: ActionHandler) -> None:
+    """
+    Register the handler executed for actions of `action_type`.
+
+    Args:
+        action_type: action["type"] value
+        callback: Function(action, context) → Any
+    """
+    _handlers[action_type] = callback
+
+
+def get_action_handler(action_type: str) -> Optional[ActionHandler]:
+    """Handler registered for `action_type` (None = unknown action type)."""
+    return _handlers.get(action_type)
+
+
+def registered_action_types() -> List[str]:
+    """All action types with a registered handler."""
+    return sorted(_handlers)
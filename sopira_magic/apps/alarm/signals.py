@@ -0,0 +1,46 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/signals.py
+#   Alarm Signals - source writes and rule invalidation
+#   post_save of source models feeds AlarmEngine
+#..............................................................
+
+"""
+Signal handlers for the alarm engine.
+
+- post_save of every ALARM_SOURCES model → AlarmEngine.record()
+  (snapshot only; evaluation runs after commit, off the write path)
+- save / delete of AlarmRule and AlarmEscalation → AlarmEngine.invalidate()
+
+Bulk writes bypass post_save and are queued via api.bulk.after_bulk_write.
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .config import ALARM_SOURCES
+from .engine import AlarmEngine
+
+
+def _record(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    AlarmEngine.record(instance, created=created, update_fields=update_fields)
+
+
+def _invalidate(sender, **kwargs):
+    AlarmEngine.invalidate()
+    # Again after commit: an evaluator may have rebuilt from the old rows meanwhile
+    transaction.on_commit(AlarmEngine.invalidate)
+
+
+def register_alarm_signals() -> None:
+    from .models import AlarmEscalation, AlarmRule
+
+    for rule_type, source in ALARM_SOURCES.items():
+        post_save.connect(_record, sender=apps.get_model(source["model"]), weak=False,
+                          dispatch_uid=f"alarm_record_{rule_type}")
+    for model in (AlarmRule, AlarmEscalation):
+        uid = f"alarm_invalidate_{model._meta.model_name}"
+        post_save.connect(_invalidate, sender=model, weak=False, dispatch_uid=f"{uid}_save")
+        post_delete.connect(_invalidate, sender=model, weak=False, dispatch_uid=f"{uid}_delete")
@@ -0,0 +1,95 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/tests/test_conditions.py
+#   Alarm Condition Tests
+#   Tests for conditions.py module
+#..............................................................
+
+"""
+   Alarm Condition Tests.
+
+   Tests for compiling AlarmRule.condition JSON into row predicates.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from sopira_magic.apps.alarm.conditions import ConditionError, compile_condition
+from sopira_magic.apps.m_measurement.models import Measurement
+
+
+def _compile(condition):
+    return compile_condition(condition, Measurement, scope='factory')
+
+
+class TestLeaf:
+    """Test suite for single comparisons."""
+
+    def test_threshold(self):
+        """Test values are converted to the field type and NULL never matches."""
+        compiled = _compile({'field': 'roi_temp_max_c', 'op': 'gte', 'value': 950})
+        assert compiled.predicate({'roi_temp_max_c': Decimal('950.000')})
+        assert not compiled.predicate({'roi_temp_max_c': Decimal('949.999')})
+        assert not compiled.predicate({'roi_temp_max_c': None})
+        assert compiled.fields == {'roi_temp_max_c'}
+        assert compiled.matches_empty is False
+
+    @pytest.mark.parametrize('condition, row, expected', [
+        ({'field': 'pot_side', 'value': 'L'}, {'pot_side': 'L'}, True),
+        ({'field': 'pot_side', 'op': 'ne', 'value': 'L'}, {'pot_side': None}, True),
+        ({'field': 'pot_knocks', 'op': 'in', 'value': [1, 2]}, {'pot_knocks': 2}, True),
+        ({'field': 'pot_knocks', 'op': 'not_in', 'value': [1, 2]}, {'pot_knocks': None}, False),
+        ({'field': 'roi_temp_min_c', 'op': 'between', 'value': [10, 20]}, {'roi_temp_min_c': Decimal('20')}, True),
+        ({'field': 'roi_temp_min_c', 'op': 'isnull', 'value': True}, {}, True),
+        ({'field': 'factory', 'op': 'isnull', 'value': False}, {'factory_id': 'x'}, True),
+    ])
+    def test_operators(self, condition, row, expected):
+        """Test every operator against matching and NULL values."""
+        assert _compile(condition).predicate(row) is expected
+
+
+class TestGroups:
+    """Test suite for all / any / not and scopes."""
+
+    def test_all_any_not(self):
+        """Test nested groups combine leaf predicates."""
+        compiled = _compile({'all': [
+            {'field': 'roi_temp_max_c', 'op': 'gt', 'value': 900},
+            {'any': [
+                {'field': 'pot_weight_kg', 'op': 'gt', 'value': 10},
+                {'not': {'field': 'pot_side', 'value': 'L'}},
+            ]},
+        ]})
+        assert compiled.fields == {'roi_temp_max_c', 'pot_weight_kg', 'pot_side'}
+        assert compiled.predicate({'roi_temp_max_c': Decimal(901), 'pot_weight_kg': Decimal(5), 'pot_side': 'R'})
+        assert not compiled.predicate({'roi_temp_max_c': Decimal(901), 'pot_weight_kg': Decimal(5), 'pot_side': 'L'})
+
+    def test_matches_empty(self):
+        """Test conditions true for all-NULL rows are flagged."""
+        assert _compile({'not': {'field': 'roi_temp_max_c', 'op': 'gt', 'value': 1}}).matches_empty is True
+
+    def test_scope(self):
+        """Test the scope key is removed from the condition and normalized to strings."""
+        compiled = _compile({'factory': ['a', 'b'], 'field': 'pot_knocks', 'op': 'gt', 'value': 1})
+        assert compiled.scopes == {'a', 'b'}
+        assert _compile({'field': 'pot_knocks', 'op': 'gt', 'value': 1}).scopes is None
+
+
+class TestErrors:
+    """Test suite for malformed conditions."""
+
+    @pytest.mark.parametrize('condition', [
+        {},
+        {'field': 'nope', 'op': 'gt', 'value': 1},
+        {'field': 'graph_roc', 'op': 'eq', 'value': 1},
+        {'field': 'pot_knocks', 'op': 'like', 'value': 1},
+        {'field': 'pot_knocks', 'op': 'gt'},
+        {'field': 'pot_knocks', 'op': 'gt', 'value': 'many'},
+        {'field': 'pot_knocks', 'op': 'between', 'value': [1]},
+        {'all': []},
+        [],
+    ])
+    def test_invalid(self, condition):
+        """Test invalid conditions raise ConditionError."""
+        with pytest.raises(ConditionError):
+            _compile(condition)
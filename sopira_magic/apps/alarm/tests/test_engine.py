@@ -0,0 +1,269 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/alarm/tests/test_engine.py
+#   Alarm Engine Tests
+#   Tests for engine.py, signals and escalations
+#..............................................................
+
+"""
+   Alarm Engine Tests.
+
+   Tests for AlarmEngine: rule index (scope / field buckets, invalidation),
+   evaluation of saved and bulk-written measurements, AlarmEvent
+   deduplication, actions and escalations.
+   Evaluation runs in 'sync' mode on the captured on_commit callbacks.
+"""
+
+import datetime
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from sopira_magic.apps.alarm import registry
+from sopira_magic.apps.alarm.engine import AlarmEngine
+from sopira_magic.apps.alarm.models import AlarmEscalation, AlarmEvent, AlarmRule
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_measurement.models import Measurement
+from sopira_magic.apps.scheduler.registry import registered_task_types
+
+
+@pytest.fixture(autouse=True)
+def sync_evaluation(settings):
+    """Evaluate on the captured commit callbacks; keep the audit flusher thread out of them."""
+    settings.ALARM_EVALUATION = 'sync'
+    settings.AUDIT_PIPELINE_ENABLED = False
+    AlarmEngine.clear()
+    yield
+    AlarmEngine.clear()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Collect contexts of the 'test' action type."""
+    collected = []
+    monkeypatch.setitem(registry._handlers, 'test', lambda action, context: collected.append(context))
+    return collected
+
+
+@pytest.fixture
+def plant():
+    company = Company.objects.create(code='AC', name='Acme')
+    return Factory.objects.create(company=company, code='F1', name='Alpha')
+
+
+def _rule(condition, action=None, **extra):
+    return AlarmRule.objects.create(
+        name=extra.pop('name', 'Hot pot'), rule_type='measurement', condition=condition,
+        action=action if action is not None else {'type': 'test'}, **extra,
+    )
+
+
+def _hot(value=950, **extra):
+    return {'field': 'roi_temp_max_c', 'op': 'gte', 'value': value, **extra}
+
+
+def _measurement(plant, code='M1', **extra):
+    values = dict(
+        factory=plant, dump_date=datetime.date(2026, 1, 5), dump_time=datetime.time(8, 0),
+        pot_knocks=3, pot_weight_kg=12, code=code, name=code,
+    )
+    values.update(extra)
+    return Measurement.objects.create(**values)
+
+
+@pytest.mark.django_db
+class TestEvaluation:
+    """Test suite for evaluation of saved measurements."""
+
+    def test_threshold_fires_once(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test a hot measurement opens one event and runs the action; re-saves do not fire again."""
+        rule = _rule(_hot())
+        with django_capture_on_commit_callbacks(execute=True):
+            m = _measurement(plant, roi_temp_max_c=Decimal('961.5'))
+        with django_capture_on_commit_callbacks(execute=True):
+            m.save()
+
+        event = AlarmEvent.objects.get()
+        assert event.rule == rule
+        assert event.object_id == str(m.pk)
+        assert event.scope_id == str(plant.pk)
+        assert event.values == {'roi_temp_max_c': '961.5'}
+        assert len(calls) == 1
+        assert calls[0]['rule'] == 'Hot pot'
+        assert calls[0]['roi_temp_max_c'] == Decimal('961.5')
+        assert calls[0]['summary'] == 'roi_temp_max_c=961.5'
+
+    def test_below_threshold(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test values below the threshold and NULL values do not fire."""
+        _rule(_hot())
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, code='M1', roi_temp_max_c=Decimal('900'))
+            _measurement(plant, code='M2')
+        assert not AlarmEvent.objects.exists()
+        assert calls == []
+
+    def test_rolled_back_write_does_not_fire(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test evaluation waits for the commit."""
+        _rule(_hot())
+        with django_capture_on_commit_callbacks(execute=False):
+            _measurement(plant, roi_temp_max_c=Decimal('999'))
+        assert AlarmEngine.pending() == 0
+        assert not AlarmEvent.objects.exists()
+
+    def test_factory_scope(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test a rule limited to another factory does not fire."""
+        other = Factory.objects.create(company=plant.company, code='F2', name='Beta')
+        _rule(_hot(factory=str(other.pk)))
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, roi_temp_max_c=Decimal('999'))
+        assert not AlarmEvent.objects.exists()
+
+    def test_update_fields(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test an update of the watched field fires."""
+        _rule(_hot())
+        with django_capture_on_commit_callbacks(execute=True):
+            m = _measurement(plant, roi_temp_max_c=Decimal('900'))
+        m.roi_temp_max_c = Decimal('955')
+        with django_capture_on_commit_callbacks(execute=True):
+            m.save(update_fields=['roi_temp_max_c'])
+        assert AlarmEvent.objects.count() == 1
+
+    def test_async_mode_buffers(self, plant, calls, settings, monkeypatch, django_capture_on_commit_callbacks):
+        """Test the write path only buffers; the evaluator does the work."""
+        settings.ALARM_EVALUATION = 'async'
+        monkeypatch.setattr(AlarmEngine, '_ensure_evaluator', classmethod(lambda cls: None))
+        _rule(_hot())
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, roi_temp_max_c=Decimal('999'))
+
+        assert AlarmEngine.pending() == 1
+        assert not AlarmEvent.objects.exists()
+        assert AlarmEngine.flush() == 1
+        assert AlarmEvent.objects.count() == 1
+
+    def test_evaluator_respawn_registers_atexit_once(self, monkeypatch):
+        """Test a respawned evaluator thread does not register another exit flush."""
+        registered = []
+        monkeypatch.setattr('atexit.register', registered.append)
+        monkeypatch.setattr(AlarmEngine, '_run_evaluator', classmethod(lambda cls: None))
+        monkeypatch.setattr(AlarmEngine, '_atexit_registered', False)
+        monkeypatch.setattr(AlarmEngine, '_evaluator', None)
+
+        for _ in range(3):
+            AlarmEngine._ensure_evaluator()
+            AlarmEngine._evaluator.join()
+
+        assert registered == [AlarmEngine.flush]
+
+    def test_bulk_pks_evaluated_in_batches(self, plant, calls, settings, django_capture_on_commit_callbacks,
+                                           django_assert_max_num_queries):
+        """Test bulk-written rows are loaded in batches with a constant number of queries."""
+        settings.ALARM_EVALUATION = 'off'
+        settings.ALARM_BATCH_SIZE = 10
+        pks = [_measurement(plant, code=f'B{i}', roi_temp_max_c=Decimal(940 + i)).pk for i in range(20)]
+        settings.ALARM_EVALUATION = 'sync'
+        _rule(_hot())
+        AlarmEngine.index()
+
+        with django_assert_max_num_queries(6):
+            with django_capture_on_commit_callbacks(execute=True):
+                AlarmEngine.record_pks('measurements', pks)
+
+        assert AlarmEvent.objects.count() == 10
+        assert len(calls) == 10
+
+
+@pytest.mark.django_db
+class TestIndex:
+    """Test suite for the compiled rule index."""
+
+    def test_candidates_by_scope_and_field(self, plant):
+        """Test only rules on present fields of the row's factory are candidates."""
+        hot = _rule(_hot(), name='hot')
+        _rule({'field': 'pot_weight_kg', 'op': 'gt', 'value': 100}, name='heavy')
+        _rule(_hot(factory='elsewhere'), name='other factory')
+
+        source = AlarmEngine.index()['measurement']
+        candidates = source.candidates(str(plant.pk), ['roi_temp_max_c'])
+        assert [rule.id for rule in candidates] == [str(hot.pk)]
+
+    def test_index_cached_and_invalidated(self, plant, calls, django_assert_num_queries,
+                                          django_capture_on_commit_callbacks):
+        """Test the index is reused until a rule changes."""
+        rule = _rule(_hot(1000))
+        AlarmEngine.index()
+        with django_assert_num_queries(0):
+            AlarmEngine.index()
+
+        rule.condition = _hot(900)
+        rule.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, roi_temp_max_c=Decimal('950'))
+        assert AlarmEvent.objects.count() == 1
+
+    def test_invalid_rules_skipped(self, plant):
+        """Test broken or disabled rules are left out of the index."""
+        AlarmRule.objects.create(name='bad', rule_type='measurement', condition={'field': 'nope', 'value': 1})
+        AlarmRule.objects.create(name='unknown', rule_type='temperature', condition=_hot())
+        _rule(_hot(), enabled=False)
+        assert AlarmEngine.index() == {}
+
+    def test_clean(self):
+        """Test model validation reports condition errors."""
+        with pytest.raises(ValidationError):
+            AlarmRule(name='x', rule_type='measurement', condition={'field': 'nope', 'value': 1}).clean()
+        with pytest.raises(ValidationError):
+            AlarmRule(name='x', rule_type='measurement', condition=_hot(), action={'recipients': []}).clean()
+        AlarmRule(name='x', rule_type='measurement', condition=_hot(), action={'type': 'log'}).clean()
+
+
+@pytest.mark.django_db
+class TestEscalation:
+    """Test suite for escalation levels."""
+
+    def test_levels(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test delay 0 levels run with the alarm, later levels via escalate()."""
+        rule = _rule(_hot())
+        AlarmEscalation.objects.create(rule=rule, level=1, delay_minutes=0, action={'type': 'test', 'to': 'shift'})
+        AlarmEscalation.objects.create(rule=rule, level=2, delay_minutes=10, action={'type': 'test', 'to': 'boss'})
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, roi_temp_max_c=Decimal('999'))
+
+        event = AlarmEvent.objects.get()
+        assert [c['level'] for c in calls] == [0, 1]
+        assert event.escalation_level == 1
+        assert event.next_escalation_at == event.triggered_at + timedelta(minutes=10)
+
+        assert AlarmEngine.escalate() == 0
+        assert AlarmEngine.escalate(now=timezone.now() + timedelta(minutes=11)) == 1
+        event.refresh_from_db()
+        assert [c['level'] for c in calls] == [0, 1, 2]
+        assert event.escalation_level == 2
+        assert event.next_escalation_at is None
+
+    def test_acknowledged_not_escalated(self, plant, calls, django_capture_on_commit_callbacks):
+        """Test only open events escalate."""
+        rule = _rule(_hot())
+        AlarmEscalation.objects.create(rule=rule, level=1, delay_minutes=5, action={'type': 'test'})
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, roi_temp_max_c=Decimal('999'))
+        AlarmEvent.objects.update(status=AlarmEvent.Status.ACKNOWLEDGED)
+
+        assert AlarmEngine.escalate(now=timezone.now() + timedelta(minutes=6)) == 0
+
+    def test_scheduler_task_and_email_action(self, plant, monkeypatch, django_capture_on_commit_callbacks):
+        """Test 'alarm.escalate' is a scheduler task type and email actions go to the outbox."""
+        from sopira_magic.apps.notification.outbox import NotificationOutbox
+
+        sent = []
+        monkeypatch.setattr(NotificationOutbox, 'enqueue', staticmethod(lambda *args, **kwargs: sent.append(args)))
+        _rule(_hot(), action={'type': 'email', 'recipients': ['ops@example.com'], 'subject': '{rule}: {roi_temp_max_c}'})
+        with django_capture_on_commit_callbacks(execute=True):
+            _measurement(plant, roi_temp_max_c=Decimal('999'))
+
+        assert 'alarm.escalate' in registered_task_types()
+        assert sent[0][:3] == ('alarm', ['ops@example.com'], 'Hot pot: 999')
+        assert 'Values: roi_temp_max_c=999' in sent[0][3]
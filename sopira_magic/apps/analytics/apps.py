@@ -27,3 +27,6 @@ class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sopira_magic.apps.analytics'
     verbose_name = 'Analytics'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - data version bumps for cached query results
@@ -0,0 +1,422 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/analytics/query.py
+#   Analytics Query - grouped metrics over VIEWS_MATRIX models
+#   One aggregated SQL query, columnar JSON, scope/version cache
+#..............................................................
+
+"""
+   Analytics Query - Grouped Metrics over VIEWS_MATRIX Models.
+
+   Runs group-by / metric queries server-side instead of shipping
+   serialized rows to the client:
+
+   - dimensions: FK, choice, boolean and integer columns, dates with
+     truncation (dump_date__month, dump_date__week, ...)
+   - metrics: "count", "<field>__<sum|avg|min|max|stddev|variance>" -> one
+     aggregated SQL query (GROUP BY)
+   - "<field>__<median|pNN>" (percentiles) -> one column fetch
+     (values_list) reduced per group; NumPy when installed, else the
+     statistics module
+   - scoping (ScopingEngine) and accessrights "view" as for the list endpoint;
+     partitioned views always get a partition_key bound (core/partitioning.py)
+   - result is columnar: {"columns": [...], "data": [[col0...], [col1...]]}
+   - cached by the SQL of the final query (covers filters and the user's
+     scope, so users with the same scope share entries) + a per-model
+     data version bumped on every write (signals, bulk writes). The bump
+     reaches other processes only through the shared cache (CACHE_URL);
+     with the per-process default the version expires after
+     CACHE_VERSION_TIMEOUT seconds, bounding staleness there
+
+   Usage:
+   ```python
+   from sopira_magic.apps.analytics.query import AnalyticsService
+   result = AnalyticsService.run(user, {
+       "view": "measurements",
+       "group_by": ["pot_side", "dump_date__month"],
+       "metrics": ["count", "roi_temp_max_c__avg", "pot_weight_kg__p90"],
+       "filters": {"dump_date__gte": "2026-01-01"},
+   })
+   ```
+"""
+
+import hashlib
+import json
+import logging
+import re
+import statistics
+import uuid
+from decimal import Decimal
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, PermissionDenied, ValidationError
+from django.db import models
+from django.db.models import Avg, Count, Max, Min, StdDev, Sum, Variance
+from django.db.models.functions import TruncDay, TruncMonth, TruncQuarter, TruncWeek, TruncYear
+
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+
+try:  # optional - vectorized reductions for percentile metrics
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VIEWS = ("measurements",)
+MAX_GROUPS = 10000
+MAX_ROWS = 1000000
+CACHE_TIMEOUT = 600
+CACHE_PREFIX = "analytics:"
+
+TRUNCATIONS = {
+    "year": TruncYear,
+    "quarter": TruncQuarter,
+    "month": TruncMonth,
+    "week": TruncWeek,
+    "day": TruncDay,
+}
+SQL_AGGREGATES = {
+    "sum": Sum,
+    "avg": Avg,
+    "min": Min,
+    "max": Max,
+    "stddev": StdDev,
+    "variance": Variance,
+}
+PERCENTILE_RE = re.compile(r"^p(\d{1,2})$")
+FILTER_LOOKUPS = {"exact", "in", "gt", "gte", "lt", "lte", "isnull"}
+
+DIMENSION_FIELDS = (models.ForeignKey, models.BooleanField, models.IntegerField, models.DateField)
+METRIC_FIELDS = (models.IntegerField, models.DecimalField, models.FloatField)
+
+
+class AnalyticsQueryError(ValueError):
+    """Invalid analytics query (unknown view, field, metric or filter)."""
+
+
+def _number(value) -> Optional[float]:
+    if value is None:
+        return None
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _percentile(values: List[float], q: int) -> Optional[float]:
+    """Linear interpolation (NumPy default / statistics 'inclusive')."""
+    if not values:
+        return None
+    if np is not None:
+        return float(np.percentile(np.asarray(values, dtype=float), q))
+    if len(values) == 1:
+        return float(values[0])
+    if q <= 0:
+        return float(min(values))
+    return float(statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1])
+
+
+# Python reductions for the column-fetch path (same results as the SQL aggregates)
+def _reducer(name: str) -> Callable[[List[float]], Optional[float]]:
+    if name == "median":
+        return lambda values: _percentile(values, 50)
+    match = PERCENTILE_RE.match(name)
+    if match:
+        q = int(match.group(1))
+        return lambda values: _percentile(values, q)
+    if np is not None:
+        vectorized = {"sum": np.sum, "avg": np.mean, "min": np.min, "max": np.max, "stddev": np.std, "variance": np.var}
+        func = vectorized[name]
+        return lambda values: float(func(np.asarray(values, dtype=float))) if values else None
+    python = {
+        "sum": sum, "avg": statistics.fmean, "min": min, "max": max,
+        "stddev": statistics.pstdev, "variance": statistics.pvariance,
+    }
+    func = python[name]
+    return lambda values: float(func(values)) if values else None
+
+
+class _Dimension:
+    __slots__ = ("name", "alias", "field", "expression")
+
+    def __init__(self, name: str, alias: str, field, expression=None):
+        self.name = name
+        self.alias = alias
+        self.field = field
+        self.expression = expression
+
+
+class _Metric:
+    __slots__ = ("name", "alias", "field", "function")
+
+    def __init__(self, name: str, alias: str, field, function: str):
+        self.name = name
+        self.alias = alias
+        self.field = field
+        self.function = function
+
+    @property
+    def in_sql(self) -> bool:
+        return self.function == "count" or self.function in SQL_AGGREGATES
+
+
+class AnalyticsService:
+    """Parse, authorize, run and cache analytics queries."""
+
+    # -------------------------
+    # Configuration / versions
+    # -------------------------
+    @staticmethod
+    def views() -> Tuple[str, ...]:
+        return tuple(getattr(settings, "ANALYTICS_VIEWS", DEFAULT_VIEWS))
+
+    @staticmethod
+    def data_version(model) -> str:
+        key = f"{CACHE_PREFIX}version:{model._meta.label_lower}"
+        version = cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, getattr(settings, "CACHE_VERSION_TIMEOUT", None)):
+                version = cache.get(key) or version
+        return version
+
+    @staticmethod
+    def bump(model) -> None:
+        """Invalidate cached results for a model (called on writes)."""
+        cache.set(
+            f"{CACHE_PREFIX}version:{model._meta.label_lower}", uuid.uuid4().hex,
+            getattr(settings, "CACHE_VERSION_TIMEOUT", None),
+        )
+
+    @classmethod
+    def bump_written(cls, model) -> None:
+        """Bump `model` and every analytics model with a FK to it (signal-free bulk writes / raw deletes)."""
+        cls.bump(model)
+        for view_name in cls.views():
+            source = VIEWS_MATRIX.get(view_name, {}).get("model")
+            if source is None or source is model:
+                continue
+            if any(f.many_to_one and f.related_model is model for f in source._meta.concrete_fields):
+                cls.bump(source)
+
+    # -------------------------
+    # Parsing
+    # -------------------------
+    @staticmethod
+    def _field(model, name: str, kinds) -> models.Field:
+        try:
+            field = model._meta.get_field(name)
+        except Exception:
+            raise AnalyticsQueryError(f"Unknown field '{name}'")
+        if not getattr(field, "concrete", False) or field.primary_key or not isinstance(field, kinds):
+            raise AnalyticsQueryError(f"Field '{name}' cannot be used here")
+        return field
+
+    @classmethod
+    def _dimensions(cls, model, names: List[str]) -> List[_Dimension]:
+        dimensions = []
+        for index, name in enumerate(names):
+            base, _, unit = name.partition("__")
+            if unit:
+                if unit not in TRUNCATIONS:
+                    raise AnalyticsQueryError(f"Unknown date truncation '{unit}'")
+                field = cls._field(model, base, (models.DateField,))
+                expression = TRUNCATIONS[unit](base)
+            else:
+                field = cls._field(model, base, DIMENSION_FIELDS + (models.CharField,))
+                if isinstance(field, models.CharField) and not field.choices:
+                    raise AnalyticsQueryError(f"Field '{name}' is free text, not a dimension")
+                expression = None
+            dimensions.append(_Dimension(name, f"d{index}", field, expression))
+        return dimensions
+
+    @classmethod
+    def _metrics(cls, model, names: List[str]) -> List[_Metric]:
+        if not names:
+            raise AnalyticsQueryError("At least one metric is required")
+        metrics = []
+        for index, name in enumerate(names):
+            if name == "count":
+                metrics.append(_Metric(name, f"m{index}", None, "count"))
+                continue
+            base, _, function = name.rpartition("__")
+            if not base or not (function in SQL_AGGREGATES or function == "median" or PERCENTILE_RE.match(function)):
+                raise AnalyticsQueryError(f"Unknown metric '{name}'")
+            field = cls._field(model, base, METRIC_FIELDS)
+            metrics.append(_Metric(name, f"m{index}", field, function))
+        return metrics
+
+    @classmethod
+    def _filters(cls, model, filters: Dict[str, Any]) -> Dict[str, Any]:
+        parsed = {}
+        for key, value in (filters or {}).items():
+            name, _, lookup = key.partition("__")
+            lookup = lookup or "exact"
+            if lookup not in FILTER_LOOKUPS:
+                raise AnalyticsQueryError(f"Unsupported filter lookup '{lookup}'")
+            field = cls._field(model, name, DIMENSION_FIELDS + METRIC_FIELDS + (models.CharField,))
+            target = field.target_field if field.is_relation else field
+            try:
+                if lookup == "isnull":
+                    value = bool(value)
+                elif lookup == "in":
+                    value = [target.to_python(v) for v in (value if isinstance(value, list) else [value])]
+                else:
+                    value = target.to_python(value)
+            except ValidationError as e:
+                raise AnalyticsQueryError(f"Invalid value for '{key}': {'; '.join(e.messages)}")
+            parsed[f"{field.attname if field.is_relation else name}__{lookup}"] = value
+        return parsed
+
+    @staticmethod
+    def _partition_bound(config, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Partitioned views: add the default window when the filters have no lower partition_key bound."""
+        from sopira_magic.apps.core.partitioning import partition_bounds
+
+        key = config.get("partition_key")
+        if not key or any(name in filters for name in (f"{key}__gte", f"{key}__gt", f"{key}__exact", f"{key}__in")):
+            return filters
+        upper = filters.get(f"{key}__lte") or filters.get(f"{key}__lt")
+        return {**partition_bounds(config, None, upper), **filters}
+
+    # -------------------------
+    # Execution
+    # -------------------------
+    @classmethod
+    def run(cls, user, query: Dict[str, Any]) -> Dict[str, Any]:
+        from sopira_magic.apps.accessrights.services import can_access
+        from sopira_magic.apps.scoping.engine import ScopingEngine
+
+        view_name = query.get("view") or DEFAULT_VIEWS[0]
+        if view_name not in cls.views() or view_name not in VIEWS_MATRIX:
+            raise AnalyticsQueryError(f"Analytics not available for '{view_name}'")
+        if not can_access(view_name, "view", user):
+            raise PermissionDenied(f"No view rights for '{view_name}'")
+
+        config = VIEWS_MATRIX[view_name]
+        model = config["model"]
+        group_by = list(query.get("group_by") or [])
+        dimensions = cls._dimensions(model, group_by)
+        metrics = cls._metrics(model, list(query.get("metrics") or ["count"]))
+
+        queryset = model._default_manager.filter(**(config.get("base_filters") or {}))
+        queryset = ScopingEngine.apply(queryset, user, view_name, config)
+        queryset = queryset.filter(**cls._partition_bound(config, cls._filters(model, query.get("filters")))).order_by()
+        queryset = queryset.annotate(**{d.alias: d.expression for d in dimensions if d.expression is not None})
+        keys = [d.alias if d.expression is not None else d.field.attname for d in dimensions]
+
+        if all(metric.in_sql for metric in metrics):
+            aggregates = {
+                m.alias: Count("pk") if m.function == "count" else SQL_AGGREGATES[m.function](m.field.name)
+                for m in metrics
+            }
+            final = queryset.values(*keys).annotate(**aggregates).order_by(*keys) if keys else queryset
+            runner = (lambda: cls._run_sql(final, keys, metrics, aggregates)) if keys else (
+                lambda: cls._run_aggregate(queryset, metrics, aggregates)
+            )
+        else:
+            fields = list(dict.fromkeys(m.field.attname for m in metrics if m.field is not None))
+            final = queryset.values_list(*keys, *fields).order_by(*keys)
+            runner = lambda: cls._run_columns(final, len(keys), fields, metrics)  # noqa: E731
+
+        try:
+            sql, params = final.query.sql_with_params()
+        except EmptyResultSet:  # empty scope / "in": [] - nothing to run, still cacheable
+            sql, params = "EMPTY", ()
+        # Percentile metrics share one column fetch -> column names are part of the key
+        columns = [d.name for d in dimensions] + [m.name for m in metrics]
+        labels = bool(query.get("labels", True))
+        fingerprint = hashlib.sha256(f"{columns}|{labels}|{sql}|{params!r}".encode("utf-8")).hexdigest()
+        cache_key = f"{CACHE_PREFIX}{model._meta.label_lower}:{cls.data_version(model)}:{fingerprint}"
+        result = cache.get(cache_key)
+        if result is None:
+            rows = runner()
+            result = {
+                "view": view_name,
+                "columns": columns,
+                "data": [list(column) for column in zip(*rows)] if rows else [[] for _ in columns],
+                "rows": len(rows),
+                "labels": cls._labels(queryset, config, dimensions, rows) if labels else {},
+            }
+            cache.set(cache_key, result, getattr(settings, "ANALYTICS_CACHE_TIMEOUT", CACHE_TIMEOUT))
+        return result
+
+    @staticmethod
+    def _limit(name: str, default: int) -> int:
+        return getattr(settings, name, default)
+
+    @classmethod
+    def _run_aggregate(cls, queryset, metrics, aggregates) -> List[list]:
+        values = queryset.aggregate(**aggregates)
+        return [[_number(values[m.alias]) for m in metrics]]
+
+    @classmethod
+    def _run_sql(cls, queryset, keys, metrics, aggregates) -> List[list]:
+        limit = cls._limit("ANALYTICS_MAX_GROUPS", MAX_GROUPS)
+        rows = list(queryset[:limit + 1])
+        if len(rows) > limit:
+            raise AnalyticsQueryError(f"More than {limit} groups - add filters or coarser dimensions")
+        return [[_number(row[key]) for key in keys] + [_number(row[m.alias]) for m in metrics] for row in rows]
+
+    @classmethod
+    def _run_columns(cls, queryset, dimension_count: int, fields: List[str], metrics) -> List[list]:
+        """One column fetch, grouped in order (rows are sorted by the dimensions)."""
+        limit = cls._limit("ANALYTICS_MAX_ROWS", MAX_ROWS)
+        position = {name: dimension_count + i for i, name in enumerate(fields)}
+        reducers = [None if m.function == "count" else _reducer(m.function) for m in metrics]
+        result, fetched = [], 0
+        rows = queryset.iterator(chunk_size=getattr(settings, "EXPORT_CHUNK_SIZE", 2000))
+        for key, group in groupby(rows, key=lambda row: row[:dimension_count]):
+            group = list(group)
+            fetched += len(group)
+            if fetched > limit:
+                raise AnalyticsQueryError(f"More than {limit} rows - add filters")
+            columns = {
+                name: [float(row[index]) for row in group if row[index] is not None]
+                for name, index in position.items()
+            }
+            values = []
+            for metric, reducer in zip(metrics, reducers):
+                if reducer is None:
+                    values.append(len(group))
+                else:
+                    values.append(reducer(columns[metric.field.attname]))
+            result.append([_number(v) for v in key] + values)
+        if not dimension_count and not result:
+            result.append([0 if m.function == "count" else None for m in metrics])
+        return result
+
+    @staticmethod
+    def _labels(queryset, config, dimensions, rows) -> Dict[str, Dict[str, str]]:
+        """{fk dimension: {pk: label}} via the target view's fk_display_template (one query per FK)."""
+        from sopira_magic.apps.impex.export import _label_template, build_label_map
+
+        labels = {}
+        for index, dimension in enumerate(dimensions):
+            if not isinstance(dimension.field, models.ForeignKey):
+                continue
+            present = {row[index] for row in rows if row[index] is not None}
+            if not present:
+                labels[dimension.name] = {}
+                continue
+            mapping = build_label_map(queryset, dimension.field, _label_template(config, dimension.field))
+            labels[dimension.name] = {str(pk): label for pk, label in mapping.items() if pk in present}
+        return labels
+
+
+def query_from_params(params) -> Dict[str, Any]:
+    """GET variant: ?group_by=a,b&metrics=count,x__avg&filters={json}&view=..."""
+    query: Dict[str, Any] = {}
+    if params.get("view"):
+        query["view"] = params["view"]
+    for key in ("group_by", "metrics"):
+        if params.get(key):
+            query[key] = [part.strip() for part in params[key].split(",") if part.strip()]
+    if params.get("filters"):
+        try:
+            query["filters"] = json.loads(params["filters"])
+        except ValueError:
+            raise AnalyticsQueryError("filters must be a JSON object")
+    if params.get("labels") in ("0", "false"):
+        query["labels"] = False
+    return query
@@ -0,0 +1,39 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/analytics/signals.py
+#   Analytics Signals - data version bumps for cached query results
+#   Writes to analytics models (and their FK targets) invalidate
+#..............................................................
+
+"""
+Signal handlers keeping cached analytics results in sync.
+
+Every save/delete of a model listed in settings.ANALYTICS_VIEWS bumps its
+data version, so cached results keyed on the old version are never read
+again. Writes to FK target models bump it too (results carry FK labels).
+Bulk writes and the generator's raw clears bypass the signals and call
+AnalyticsService.bump_written() (api.bulk.after_bulk_write,
+generator.clear_engine), which covers the same FK dependents.
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+
+from .query import AnalyticsService
+
+
+def _connect(model, sources) -> None:
+    def _bump(sender, **kwargs):
+        AnalyticsService.bump(model)
+
+    for source in sources:
+        uid = f"analytics_bump_{model._meta.label_lower}_{source._meta.label_lower}"
+        post_save.connect(_bump, sender=source, weak=False, dispatch_uid=f"{uid}_save")
+        post_delete.connect(_bump, sender=source, weak=False, dispatch_uid=f"{uid}_delete")
+
+
+for _view_name in AnalyticsService.views():
+    _model = VIEWS_MATRIX.get(_view_name, {}).get("model")
+    if _model is not None:
+        _targets = {f.related_model for f in _model._meta.concrete_fields if f.many_to_one}
+        _connect(_model, [_model, *_targets])
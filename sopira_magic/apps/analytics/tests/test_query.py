@@ -0,0 +1,219 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/analytics/tests/test_query.py
+#   Analytics Query Tests
+#   Tests for query.py and the analytics/query/ endpoint
+#..............................................................
+
+"""
+   Analytics Query Tests.
+
+   Tests for grouped SQL metrics, percentile metrics from the column fetch,
+   columnar output, validation, scoping and version-stamped caching.
+"""
+
+import datetime
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.analytics.query import AnalyticsQueryError, AnalyticsService
+from sopira_magic.apps.api.views_analytics import analytics_query_view
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_measurement.models import Measurement
+
+pytestmark = pytest.mark.django_db(databases=['default', 'state', 'logging'])
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def admin():
+    return get_user_model().objects.create_superuser(username='analyticsadmin', password='pass12345')
+
+
+@pytest.fixture
+def plants():
+    company = Company.objects.create(code='AC', name='Acme')
+    alpha = Factory.objects.create(company=company, code='F1', name='Alpha')
+    beta = Factory.objects.create(company=company, code='F2', name='Beta')
+    rows = [
+        (alpha, datetime.date(2026, 1, 5), 'FRONT', 10),
+        (alpha, datetime.date(2026, 1, 20), 'FRONT', 20),
+        (alpha, datetime.date(2026, 2, 3), 'BACK', 30),
+        (beta, datetime.date(2026, 1, 9), 'FRONT', 40),
+        (beta, datetime.date(2026, 2, 9), 'FRONT', None),
+    ]
+    for plant, day, side, weight in rows:
+        Measurement.objects.create(
+            factory=plant, dump_date=day, dump_time=datetime.time(8, 0), pot_side=side,
+            pot_knocks=1, pot_weight_kg=weight if weight is not None else 0, roi_temp_max_c=weight,
+        )
+    return alpha, beta
+
+
+def _columns(result):
+    return dict(zip(result['columns'], result['data']))
+
+
+class TestAnalyticsService:
+    """Test suite for AnalyticsService.run."""
+
+    def test_grouped_sql_metrics(self, admin, plants):
+        """Test group-by with SQL aggregates runs as one query and returns columns."""
+        alpha, beta = plants
+        with CaptureQueriesContext(connection) as queries:
+            result = AnalyticsService.run(admin, {
+                'group_by': ['factory'],
+                'metrics': ['count', 'roi_temp_max_c__avg', 'roi_temp_max_c__max'],
+                'labels': False,
+            })
+        columns = _columns(result)
+
+        assert len([q for q in queries.captured_queries if 'measurement_measurement' in q['sql']]) == 1
+        assert result['rows'] == 2
+        by_factory = {pk: i for i, pk in enumerate(columns['factory'])}
+        assert columns['count'][by_factory[alpha.pk]] == 3
+        assert columns['roi_temp_max_c__avg'][by_factory[alpha.pk]] == pytest.approx(20.0)
+        assert columns['roi_temp_max_c__max'][by_factory[beta.pk]] == pytest.approx(40.0)
+
+    def test_date_truncation_and_filters(self, admin, plants):
+        """Test dump_date__month dimensions and range / choice filters."""
+        result = AnalyticsService.run(admin, {
+            'group_by': ['dump_date__month'],
+            'metrics': ['count'],
+            'filters': {'dump_date__gte': '2026-01-01', 'dump_date__lt': '2026-03-01', 'pot_side': 'FRONT'},
+        })
+        columns = _columns(result)
+
+        assert columns['dump_date__month'] == [datetime.date(2026, 1, 1), datetime.date(2026, 2, 1)]
+        assert columns['count'] == [3, 1]
+
+    def test_percentiles_from_column_fetch(self, admin, plants):
+        """Test median / pNN are reduced per group from one column fetch."""
+        alpha, _ = plants
+        with CaptureQueriesContext(connection) as queries:
+            result = AnalyticsService.run(admin, {
+                'group_by': ['factory'],
+                'metrics': ['count', 'roi_temp_max_c__median', 'roi_temp_max_c__p90', 'roi_temp_max_c__avg'],
+                'labels': False,
+            })
+        columns = _columns(result)
+        index = columns['factory'].index(alpha.pk)
+
+        assert len([q for q in queries.captured_queries if 'measurement_measurement' in q['sql']]) == 1
+        assert columns['count'][index] == 3
+        assert columns['roi_temp_max_c__median'][index] == pytest.approx(20.0)
+        assert columns['roi_temp_max_c__p90'][index] == pytest.approx(28.0)
+        assert columns['roi_temp_max_c__avg'][index] == pytest.approx(20.0)
+
+    def test_totals_without_dimensions(self, admin, plants):
+        """Test queries without group_by return a single row."""
+        result = AnalyticsService.run(admin, {'metrics': ['count', 'roi_temp_max_c__sum']})
+        assert _columns(result) == {'count': [5], 'roi_temp_max_c__sum': [100.0]}
+
+    def test_fk_labels(self, admin, plants):
+        """Test FK dimensions come with a label map."""
+        alpha, beta = plants
+        result = AnalyticsService.run(admin, {'group_by': ['factory'], 'metrics': ['count']})
+        labels = result['labels']['factory']
+        assert set(labels) == {str(alpha.pk), str(beta.pk)}
+        assert 'Alpha' in labels[str(alpha.pk)]
+
+    @pytest.mark.parametrize('query', [
+        {'view': 'companies'},
+        {'group_by': ['nope']},
+        {'group_by': ['dump_date__hour']},
+        {'metrics': ['roi_temp_max_c__mode']},
+        {'metrics': ['pot_side__avg']},
+        {'filters': {'dump_date__regex': '.*'}},
+        {'filters': {'dump_date__gte': 'not-a-date'}},
+    ])
+    def test_invalid_queries(self, admin, query):
+        """Test unknown views, fields, metrics and filters are rejected."""
+        with pytest.raises(AnalyticsQueryError):
+            AnalyticsService.run(admin, query)
+
+    def test_cache_invalidated_by_writes(self, admin, plants):
+        """Test results are cached until a Measurement write bumps the data version."""
+        alpha, _ = plants
+        query = {'metrics': ['count']}
+        assert _columns(AnalyticsService.run(admin, query))['count'] == [5]
+
+        with CaptureQueriesContext(connection) as queries:
+            AnalyticsService.run(admin, query)
+        assert not [q for q in queries.captured_queries if 'measurement_measurement' in q['sql']]
+
+        Measurement.objects.create(
+            factory=alpha, dump_date=datetime.date(2026, 3, 1), dump_time=datetime.time(9, 0),
+            pot_knocks=0, pot_weight_kg=0,
+        )
+        assert _columns(AnalyticsService.run(admin, query))['count'] == [6]
+
+
+    def test_cache_invalidated_by_raw_clear(self, admin, plants):
+        """Test the generator's signal-free clear bumps the data version."""
+        from sopira_magic.apps.generator.clear_engine import BulkClearEngine
+
+        query = {'metrics': ['count']}
+        assert _columns(AnalyticsService.run(admin, query))['count'] == [5]
+
+        BulkClearEngine().clear(Measurement)
+
+        assert _columns(AnalyticsService.run(admin, query))['count'] == [0]
+
+    def test_fk_labels_invalidated_by_bulk_write_of_target(self, admin, plants):
+        """Test a bulk write to an FK target (factories) bumps the analytics models pointing at it."""
+        from sopira_magic.apps.api.bulk import after_bulk_write
+
+        alpha, _ = plants
+        query = {'group_by': ['factory'], 'metrics': ['count']}
+        assert 'Alpha' in AnalyticsService.run(admin, query)['labels']['factory'][str(alpha.pk)]
+
+        Factory.objects.filter(pk=alpha.pk).update(name='Gamma')  # bulk_update sends no post_save
+        after_bulk_write('factories', [alpha.pk])
+
+        assert 'Gamma' in AnalyticsService.run(admin, query)['labels']['factory'][str(alpha.pk)]
+
+class TestAnalyticsEndpoint:
+    """Test suite for analytics/query/."""
+
+    def _call(self, user, method='post', data=None):
+        if method == 'post':
+            request = APIRequestFactory().post('/api/analytics/query/', data, format='json')
+        else:
+            request = APIRequestFactory().get('/api/analytics/query/', data)
+        force_authenticate(request, user)
+        return analytics_query_view(request)
+
+    def test_post_and_get(self, admin, plants):
+        """Test POST JSON body and GET query params give the same result."""
+        body = {'group_by': ['pot_side'], 'metrics': ['count'], 'filters': {'dump_date__lt': '2026-02-01'}}
+        posted = self._call(admin, data=body)
+        fetched = self._call(admin, 'get', {
+            'group_by': 'pot_side', 'metrics': 'count', 'filters': json.dumps(body['filters']),
+        })
+
+        assert posted.status_code == 200 and fetched.status_code == 200
+        assert _columns(posted.data) == _columns(fetched.data) == {'pot_side': ['FRONT'], 'count': [3]}
+
+    def test_bad_request(self, admin):
+        """Test validation errors are 400."""
+        response = self._call(admin, data={'metrics': ['bogus']})
+        assert response.status_code == 400
+
+    def test_scope_applied(self, plants):
+        """Test users outside the company do not see its measurements."""
+        outsider = get_user_model().objects.create_user(username='outsider', password='pass12345', role='reader')
+        response = self._call(outsider, data={'metrics': ['count']})
+        assert response.status_code == 403 or _columns(response.data)['count'] == [0]
@@ -27,3 +27,9 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sopira_magic.apps.api'
     verbose_name = 'Api'
+
+    def ready(self):
+        from .bootstrap import register_bootstrap_invalidation
+        from .read_model import register_read_model_signals
+        register_bootstrap_invalidation()
+        register_read_model_signals()
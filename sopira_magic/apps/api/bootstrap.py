@@ -0,0 +1,280 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/bootstrap.py
+#   Bootstrap Service - single round-trip app start payload
+#   Access rights, preferences, metadata, default presets, FK options
+#..............................................................
+
+"""
+   Bootstrap Service - Single Round-Trip App Start Payload.
+
+   On app start the frontend needs access rights, user preferences, model
+   metadata, default mystate presets and FK dropdown options. Instead of five
+   requests (each with its own auth, session and scope resolution),
+   GET /api/bootstrap/ builds everything in one pass inside
+   shared_scope_resolution(), so each scope level is resolved once.
+
+   Payload builders are shared with the individual endpoints
+   (accessrights_matrix_view, user_preferences_view, models_metadata_view),
+   so both paths always return the same data.
+
+   Version stamp (ETag):
+   - global stamp: bumped when FK source models (VIEWS_MATRIX views with
+     fk_display_template) or relations change
+   - user stamp: bumped when the user, their preferences or their saved
+     presets change
+   - static digest: ACCESS_MATRIX / VIEWS_MATRIX metadata (changes on deploy)
+   Stamps live in the Django cache (like FKCacheService). With a shared cache
+   (CACHE_URL) a bump reaches every worker at once; with per-process caches
+   the stamps expire after CACHE_VERSION_TIMEOUT seconds, so other workers
+   serve a stale bootstrap (304) at most that long. Unchanged bootstraps
+   cost two cache reads and return 304.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.api.bootstrap import BootstrapService
+
+   etag = BootstrapService.etag(user)
+   payload = BootstrapService.build(user, request)
+   ```
+"""
+
+import hashlib
+import json
+import logging
+import time
+from functools import lru_cache, partial
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "bootstrap:version"
+
+# Menu items rendered by the frontend
+MENU_KEYS = (
+    "dashboard",
+    "measurements",
+    "companies",
+    "factories",
+    "locations",
+    "carriers",
+    "drivers",
+    "pots",
+    "pits",
+    "machines",
+    "cameras",
+    "users",
+)
+
+
+# =============================================================================
+# PAYLOAD BUILDERS (shared with the individual endpoints)
+# =============================================================================
+
+def accessrights_payload(user, menu_dependencies: Dict[str, bool] = None) -> Dict[str, Any]:
+    """menu + actions + menu_dependencies + empty_state_messages for the user."""
+    from sopira_magic.apps.accessrights.config import EMPTY_STATE_MESSAGES
+    from sopira_magic.apps.accessrights.services import (
+        can_view_menu,
+        check_menu_dependencies,
+        get_access_matrix_for_user,
+    )
+
+    if menu_dependencies is None:
+        menu_dependencies = check_menu_dependencies(user)
+    return {
+        "menu": {key: can_view_menu(key, user) for key in MENU_KEYS},
+        "actions": get_access_matrix_for_user(user, VIEWS_MATRIX),
+        "menu_dependencies": menu_dependencies,
+        "empty_state_messages": EMPTY_STATE_MESSAGES,
+    }
+
+
+def accessrights_etag(user, menu_dependencies: Dict[str, bool]) -> str:
+    """Strong ETag: compiled role matrix digest + the user's menu dependency flags."""
+    from sopira_magic.apps.accessrights.compiled import role_etag
+    from sopira_magic.apps.accessrights.services import _effective_role
+
+    flags = "".join("1" if menu_dependencies[key] else "0" for key in sorted(menu_dependencies))
+    return f'"{role_etag(_effective_role(user))}-{flags}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, '*' matches everything)."""
+    if not if_none_match:
+        return False
+    tokens = [token.strip() for token in if_none_match.split(',')]
+    weak = etag.removeprefix('W/')
+    return '*' in tokens or any(token.removeprefix('W/') == weak for token in tokens)
+
+
+def user_preferences_payload(user) -> Dict[str, Any]:
+    """Merged settings + preferences (empty general_settings if none saved)."""
+    from sopira_magic.apps.m_user.models import UserPreference
+
+    preference = UserPreference.objects.filter(user=user).first()
+    if preference is None:
+        return {"general_settings": {}}
+    return {**preference.settings, **preference.preferences}
+
+
+@lru_cache(maxsize=1)
+def models_metadata_payload() -> Dict[str, Dict[str, Any]]:
+    """ownership_field / factory_scoped / soft_delete per view (static, computed once)."""
+    metadata = {}
+    for view_name, config in VIEWS_MATRIX.items():
+        model_metadata = {}
+
+        # First field in hierarchy is typically the ownership field
+        ownership_hierarchy = config.get("ownership_hierarchy", [])
+        if ownership_hierarchy:
+            model_metadata["ownership_field"] = ownership_hierarchy[0]
+
+        if config.get("factory_scoped"):
+            model_metadata["factory_scoped"] = True
+        if config.get("soft_delete"):
+            model_metadata["soft_delete"] = True
+
+        if model_metadata:
+            metadata[view_name] = model_metadata
+    return metadata
+
+
+def default_presets_payload(user) -> Dict[str, Dict[str, Any]]:
+    """All default mystate presets of the user keyed by 'scope_type:scope_key' (one query)."""
+    from sopira_magic.apps.mystate.models import SavedState
+    from sopira_magic.apps.mystate.serializers import SavedStateSerializer
+
+    presets = SavedState.objects.using('state').filter(user_id=user.id, is_default=True)
+    return {
+        f"{preset.scope_type}:{preset.scope_key}": SavedStateSerializer(preset).data
+        for preset in presets
+    }
+
+
+def fk_options_payload(user, request=None) -> Dict[str, Dict[str, Any]]:
+    """FK dropdown options for all FK-capable views (FKCacheService, cached)."""
+    from sopira_magic.apps.fk_options_cache.services import FKCacheService
+
+    return {
+        view_name: {
+            "options": data.get("options", []),
+            "count": data.get("count", 0),
+            "factories_count": data.get("factories_count", 0),
+        }
+        for view_name, data in FKCacheService.get_all_fk_options(user=user, request=request).items()
+    }
+
+
+# =============================================================================
+# BOOTSTRAP SERVICE
+# =============================================================================
+
+class BootstrapService:
+    """Builds the bootstrap payload and its per-user version stamp."""
+
+    @staticmethod
+    def _version_key(scope: str) -> str:
+        return f"{VERSION_PREFIX}:{scope}"
+
+    @classmethod
+    def _get_version(cls, scope: str) -> int:
+        key = cls._version_key(scope)
+        version = cache.get(key)
+        if version is None:
+            # Seed from the clock so an evicted stamp never repeats an old ETag
+            cache.add(key, time.time_ns() // 1000, settings.CACHE_VERSION_TIMEOUT)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def bump(cls, user_id=None) -> None:
+        """Invalidate bootstraps of one user (user_id) or of everybody (None)."""
+        scope = f"user:{user_id}" if user_id else "global"
+        key = cls._version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns() // 1000, settings.CACHE_VERSION_TIMEOUT)
+
+    @classmethod
+    def etag(cls, user) -> str:
+        raw = f"{cls._get_version('global')}:{cls._get_version(f'user:{user.pk}')}:{_static_digest()}"
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+    @staticmethod
+    def build(user, request=None) -> Dict[str, Any]:
+        """All app start data, with one shared scope resolution."""
+        from sopira_magic.apps.scoping import shared_scope_resolution
+
+        with shared_scope_resolution():
+            return {
+                "accessrights": accessrights_payload(user),
+                "user_preferences": user_preferences_payload(user),
+                "models_metadata": models_metadata_payload(),
+                "default_presets": default_presets_payload(user),
+                "fk_options": fk_options_payload(user, request),
+            }
+
+
+@lru_cache(maxsize=1)
+def _static_digest() -> str:
+    """Digest of config that only changes on deploy (access matrix, view metadata)."""
+    from sopira_magic.apps.accessrights.config import ACCESS_MATRIX, DEFAULT_POLICY, EMPTY_STATE_MESSAGES
+
+    static = [ACCESS_MATRIX, DEFAULT_POLICY, EMPTY_STATE_MESSAGES, models_metadata_payload(), MENU_KEYS,
+              sorted(name for name, cfg in VIEWS_MATRIX.items() if cfg.get("fk_display_template"))]
+    return hashlib.sha1(json.dumps(static, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+# =============================================================================
+# INVALIDATION SIGNALS
+# =============================================================================
+
+def _bump_global(sender, **kwargs):
+    BootstrapService.bump()
+
+
+def _bump_user(attr: str, sender, instance, **kwargs):
+    BootstrapService.bump(getattr(instance, attr, None))
+
+
+def register_bootstrap_invalidation() -> None:
+    """
+    Connect version stamp bumps (called from ApiConfig.ready).
+
+    Writes that bypass model signals call BootstrapService.bump() themselves:
+    api.bulk.after_bulk_write, the mystate patch coalescer (.update()), the
+    generator BulkClearEngine (_raw_delete) and GeneratorService batches.
+    """
+    from django.contrib.auth import get_user_model
+    from sopira_magic.apps.m_user.models import UserPreference
+    from sopira_magic.apps.mystate.models import SavedState
+    from sopira_magic.apps.relation.models import RelationInstance
+
+    user_sources = (
+        (get_user_model(), 'pk'),
+        (UserPreference, 'user_id'),
+        (SavedState, 'user_id'),
+    )
+    for model, attr in user_sources:
+        uid = f"bootstrap_user_{model._meta.label_lower}"
+        handler = partial(_bump_user, attr)
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=f"{uid}_save")
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f"{uid}_delete")
+
+    global_sources = {RelationInstance}
+    global_sources.update(
+        cfg["model"] for cfg in VIEWS_MATRIX.values()
+        if cfg.get("model") is not None and cfg.get("fk_display_template")
+    )
+    for model in global_sources:
+        uid = f"bootstrap_global_{model._meta.label_lower}"
+        post_save.connect(_bump_global, sender=model, weak=False, dispatch_uid=f"{uid}_save")
+        post_delete.connect(_bump_global, sender=model, weak=False, dispatch_uid=f"{uid}_delete")
+    logger.debug(f"[BOOTSTRAP] Version stamps wired to {len(user_sources) + len(global_sources)} models")
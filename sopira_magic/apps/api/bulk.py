@@ -0,0 +1,468 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/bulk.py
+#   Bulk CRUD - list create/update/delete for generated viewsets
+#   One validation pass, one transaction, batched side effects
+#..............................................................
+
+"""
+   Bulk CRUD - List Create / Update / Delete for Generated ViewSets.
+
+   POST / PATCH / DELETE <view>/bulk/ on writable viewsets (create_viewset):
+
+   - the list is validated with one serializer instance; primary keys of
+     all FK / M2M fields are preloaded with one in_bulk() per field and
+     unique_together sets are checked with one query per set, instead of
+     one SELECT per item and field
+   - valid items are written in one transaction with bulk_create /
+     bulk_update; if the batch write fails (IntegrityError, DataError) the
+     items are retried one by one in savepoints, so one bad item never
+     aborts the others
+   - errors are reported per item index (HTTP 207 if only some items failed,
+     400 if all failed)
+   - after-hooks run once per batch: after_bulk_create / after_bulk_update
+     (instances, request) from VIEWS_MATRIX, else the per-instance
+     after_create / after_update hooks
+   - bulk writes send no post_save, so audit events are recorded explicitly
+     and search indexing, read models, FK options cache and bootstrap
+     stamps are refreshed and alarm rules evaluated once per request
+     (after_bulk_write)
+
+   Request bodies:
+       POST   [{...}, ...]
+       PATCH  [{"id": "...", ...}, ...]            (partial update)
+       DELETE {"ids": ["...", ...]} or ["...", ...]
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import ProtectedError, RestrictedError
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.utils import model_meta
+from rest_framework.validators import UniqueTogetherValidator
+
+from .serializers import GenericRelationTagsField
+from .view_configs import VIEWS_MATRIX
+
+logger = logging.getLogger(__name__)
+
+MAX_ITEMS = 1000
+
+# Batch write failures that are retried item by item (incl. ProtectedError / RestrictedError)
+WRITE_ERRORS = (IntegrityError, DataError)
+
+
+def _message(error: Exception) -> str:
+    if isinstance(error, (ProtectedError, RestrictedError)):
+        return error.args[0]  # (message, protected objects)
+    return str(error)
+
+
+class BulkError(ValueError):
+    """Malformed bulk request (not a list, too many items)."""
+
+
+def after_bulk_write(view_name: str, pks: Iterable[Any]) -> None:
+    """Deferred side effects of bulk_create / bulk_update (one pass per batch)."""
+    pks = list(pks)
+    config = VIEWS_MATRIX.get(view_name, {})
+    if not pks:
+        return
+    if config.get("dynamic_search", True):
+        try:
+            from sopira_magic.apps.search.services import SearchService
+            SearchService().index_pks(view_name, pks)
+        except Exception as e:
+            logger.warning(f"[BULK] Search indexing of {len(pks)} '{view_name}' rows failed: {e}")
+    if config.get("read_model"):
+        from .read_model import ReadModelService
+        ReadModelService.refresh(view_name, pks)
+    if config.get("model") is not None:
+        from .read_model import ReadModelService
+        # Labels / derived columns of read models pointing at the written rows
+        ReadModelService.refresh_targets(config["model"], pks)
+        from sopira_magic.apps.alarm.engine import AlarmEngine
+        from sopira_magic.apps.analytics.query import AnalyticsService
+        AnalyticsService.bump_written(config["model"])
+        AlarmEngine.record_pks(view_name, pks)
+    if config.get("fk_display_template"):
+        from sopira_magic.apps.fk_options_cache.services import FKCacheService
+        from .bootstrap import BootstrapService
+        FKCacheService.invalidate_all(view_name)
+        BootstrapService.bump()
+
+
+class _Entry:
+    __slots__ = ("index", "instance", "data", "tags", "many", "warnings")
+
+    def __init__(self, index: int, instance, data: Dict[str, Any], tags: Dict[str, list], many: Dict[str, list]):
+        self.index = index
+        self.instance = instance
+        self.data = data
+        self.tags = tags
+        self.many = many
+        self.warnings: List[str] = []
+
+
+class BulkService:
+    """Bulk create / partial update / delete on behalf of a generated viewset."""
+
+    @staticmethod
+    def max_items() -> int:
+        return getattr(settings, "BULK_MAX_ITEMS", MAX_ITEMS)
+
+    @classmethod
+    def _items(cls, data, key: str = None) -> list:
+        if key and isinstance(data, dict):
+            data = data.get(key)
+        if not isinstance(data, list):
+            raise BulkError("Expected a list of items" if not key else f"Expected a list or {{'{key}': [...]}}")
+        if len(data) > cls.max_items():
+            raise BulkError(f"Too many items ({len(data)} > {cls.max_items()})")
+        return data
+
+    # -------------------------
+    # Validation helpers
+    # -------------------------
+    @staticmethod
+    def _preload_related(serializer, items: list) -> None:
+        """Replace per-item FK lookups of PrimaryKeyRelatedFields with one in_bulk() per field."""
+        for name, field in serializer.fields.items():
+            if field.read_only:
+                continue
+            if isinstance(field, ManyRelatedField) and isinstance(field.child_relation, PrimaryKeyRelatedField):
+                relation = field.child_relation
+                values = [v for item in items if isinstance(item, dict) and isinstance(item.get(name), list)
+                          for v in item[name]]
+            elif isinstance(field, PrimaryKeyRelatedField):
+                relation = field
+                values = [item.get(name) for item in items if isinstance(item, dict)]
+            else:
+                continue
+            ids = {str(v) for v in values if isinstance(v, (str, int)) and v != ""}
+            if not ids:
+                continue
+            try:
+                objects = {str(pk): obj for pk, obj in relation.get_queryset().in_bulk(list(ids)).items()}
+            except (DjangoValidationError, TypeError, ValueError):
+                continue  # malformed pk - the per-item lookup reports it
+
+            def to_internal_value(data, objects=objects, original=relation.to_internal_value):
+                obj = objects.get(str(data))
+                return obj if obj is not None else original(data)
+
+            relation.to_internal_value = to_internal_value
+
+    @staticmethod
+    def _take_unique_validators(serializer) -> List[UniqueTogetherValidator]:
+        """Detach per-item unique_together validators (one exists() per item) for _check_unique."""
+        unique = [v for v in serializer.validators if isinstance(v, UniqueTogetherValidator)]
+        serializer.validators = [v for v in serializer.validators if not isinstance(v, UniqueTogetherValidator)]
+        return unique
+
+    @staticmethod
+    def _check_unique(model, validators, entries: List[_Entry], errors: List[dict]) -> List[_Entry]:
+        """unique_together check for the whole batch: one query per field set + in-batch duplicates."""
+        for validator in validators:
+            names = list(validator.fields)
+            attnames = [model._meta.get_field(name).attname for name in names]
+
+            def key(entry):
+                return tuple(getattr(entry.instance, attname) for attname in attnames)
+
+            candidates = [entry for entry in entries if None not in key(entry)]
+            if not candidates:
+                continue
+            first = attnames[0]
+            taken = {}
+            rows = validator.queryset.order_by().filter(
+                **{f"{first}__in": {key(entry)[0] for entry in candidates}}
+            ).values_list("pk", *attnames)
+            for pk, *values in rows:
+                taken[tuple(values)] = pk
+            message = validator.message.format(field_names=", ".join(names))
+            kept, seen = [], set()
+            for entry in entries:
+                value = key(entry)
+                if None not in value:
+                    owner = taken.get(value)
+                    if value in seen or (owner is not None and owner != entry.instance.pk):
+                        errors.append({"index": entry.index, "errors": {"non_field_errors": [message]}})
+                        continue
+                    seen.add(value)
+                kept.append(entry)
+            entries = kept
+        return entries
+
+    @staticmethod
+    def _special_fields(serializer, model) -> Tuple[List[str], List[str]]:
+        """(tag fields, to-many relation fields) - written after the row itself."""
+        relations = model_meta.get_field_info(model).relations
+        tags, many = [], []
+        for name, field in serializer.fields.items():
+            if field.read_only:
+                continue
+            if isinstance(field, GenericRelationTagsField):
+                tags.append(name)
+            elif isinstance(field, ManyRelatedField) or (name in relations and relations[name].to_many):
+                many.append(name)
+        return tags, many
+
+    @staticmethod
+    def _split(data: Dict[str, Any], tag_fields: List[str], many_fields: List[str]):
+        tags = {name: data.pop(name) for name in tag_fields if name in data}
+        many = {name: data.pop(name) for name in many_fields if name in data}
+        return data, tags, many
+
+    # -------------------------
+    # Write helpers
+    # -------------------------
+    @staticmethod
+    def _write(write: Callable[[list], Any], entries: List[_Entry], errors: List[dict], using: str) -> List[_Entry]:
+        """Batch write, falling back to one savepoint per item on failure."""
+        if not entries:
+            return []
+        try:
+            with transaction.atomic(using=using):
+                write([entry.instance for entry in entries])
+            return entries
+        except WRITE_ERRORS as e:
+            logger.info(f"[BULK] Batch write failed ({e}), retrying {len(entries)} items one by one")
+
+        written = []
+        for entry in entries:
+            try:
+                with transaction.atomic(using=using):
+                    write([entry.instance])
+                written.append(entry)
+            except WRITE_ERRORS as e:
+                errors.append({"index": entry.index, "errors": {"non_field_errors": [_message(e)]}})
+        return written
+
+    @staticmethod
+    def _create_each(viewset, items: list, using: str) -> Tuple[List[_Entry], List[dict]]:
+        """Per-item path for views with a before_create hook (the hook saves the instance itself)."""
+        entries, errors = [], []
+        for index, item in enumerate(items):
+            serializer = viewset.get_serializer(data=item)
+            if not serializer.is_valid():
+                errors.append({"index": index, "errors": serializer.errors})
+                continue
+            try:
+                with transaction.atomic(using=using):
+                    instance = viewset.perform_create(serializer) or serializer.instance
+            except WRITE_ERRORS as e:
+                errors.append({"index": index, "errors": {"non_field_errors": [_message(e)]}})
+                continue
+            entries.append(_Entry(index, instance, {}, {}, {}))
+        return entries, errors
+
+    @staticmethod
+    def _write_relations(model, entries: List[_Entry], replace_tags: bool) -> None:
+        from sopira_magic.apps.m_tag.services import TagService
+
+        for entry in entries:
+            for name, values in entry.many.items():
+                getattr(entry.instance, name).set(values)
+        tagged = [entry for entry in entries if entry.tags]
+        if replace_tags:
+            for entry in tagged:
+                for names in entry.tags.values():
+                    TagService.set_tags(entry.instance, names or [])
+        elif tagged:
+            TagService.assign(model, {
+                entry.instance.pk: [name for names in entry.tags.values() for name in names or []]
+                for entry in tagged
+            })
+
+    @staticmethod
+    def _response(key: str, entries: List[_Entry], errors: List[dict]) -> Response:
+        results = []
+        for entry in sorted(entries, key=lambda e: e.index):
+            result = {"index": entry.index, "id": entry.instance.pk}
+            if entry.warnings:
+                result["warnings"] = entry.warnings
+            results.append(result)
+        if not errors:
+            code = status.HTTP_200_OK
+        else:
+            code = status.HTTP_207_MULTI_STATUS if entries else status.HTTP_400_BAD_REQUEST
+        return Response(
+            {key: len(entries), "results": results, "errors": sorted(errors, key=lambda e: e["index"])},
+            status=code,
+        )
+
+    # -------------------------
+    # Operations
+    # -------------------------
+    @classmethod
+    def create(cls, viewset, data) -> Response:
+        items = cls._items(data)
+        view_name, config = viewset._view_name, viewset._view_config
+        model = config["model"]
+        request = viewset.request
+        using = model._default_manager.db
+        if config.get("before_create"):
+            written, errors = cls._create_each(viewset, items, using)
+            return cls._response("created", written, errors)
+
+        serializer = viewset.get_serializer()
+        cls._preload_related(serializer, items)
+        unique = cls._take_unique_validators(serializer)
+        tag_fields, many_fields = cls._special_fields(serializer, model)
+
+        errors: List[dict] = []
+        entries: List[_Entry] = []
+        for index, item in enumerate(items):
+            try:
+                validated = serializer.run_validation(item)
+            except serializers.ValidationError as e:
+                errors.append({"index": index, "errors": e.detail})
+                continue
+            validated, tags, many = cls._split(dict(validated), tag_fields, many_fields)
+            instance = model(**validated)
+            if hasattr(instance, "human_id") and not instance.human_id and getattr(instance, "code", None):
+                instance.human_id = instance.code  # NamedWithCodeModel.save() is bypassed by bulk_create
+            entries.append(_Entry(index, instance, validated, tags, many))
+        entries = cls._check_unique(model, unique, entries, errors)
+
+        with transaction.atomic(using=using):
+            written = cls._write(model._default_manager.bulk_create, entries, errors, using)
+            cls._write_relations(model, written, replace_tags=False)
+
+            instances = [entry.instance for entry in written]
+            after_bulk = config.get("after_bulk_create")
+            after_one = config.get("after_create")
+            if after_bulk:
+                after_bulk(instances, request)
+            elif after_one:
+                for instance in instances:
+                    after_one(instance, request)
+            from sopira_magic.apps.audit.capture import record_bulk
+            record_bulk(instances, created=True)
+
+        after_bulk_write(view_name, [instance.pk for instance in instances])
+        logger.info(f"[BULK] Created {len(written)} '{view_name}' rows ({len(errors)} errors)")
+        return cls._response("created", written, errors)
+
+    @classmethod
+    def update(cls, viewset, data) -> Response:
+        items = cls._items(data)
+        view_name, config = viewset._view_name, viewset._view_config
+        model = config["model"]
+        request = viewset.request
+        using = model._default_manager.db
+        serializer = viewset.get_serializer(partial=True)
+        cls._preload_related(serializer, items)
+        unique = cls._take_unique_validators(serializer)
+        tag_fields, many_fields = cls._special_fields(serializer, model)
+
+        ids = []
+        for item in items:
+            try:
+                ids.append(model._meta.pk.to_python(item.get("id")))
+            except (AttributeError, DjangoValidationError):
+                pass
+        # Scoped queryset: rows outside the user's scope are "not found"
+        existing = {str(pk): obj for pk, obj in viewset.get_queryset().in_bulk([pk for pk in ids if pk]).items()}
+
+        errors: List[dict] = []
+        entries: List[_Entry] = []
+        fields = set()
+        before_update = config.get("before_update")
+        for index, item in enumerate(items):
+            instance = existing.get(str(item.get("id"))) if isinstance(item, dict) else None
+            if instance is None:
+                errors.append({"index": index, "errors": {"id": ["Not found."]}})
+                continue
+            serializer.instance = instance
+            try:
+                validated = dict(serializer.run_validation(item))
+            except serializers.ValidationError as e:
+                errors.append({"index": index, "errors": e.detail})
+                continue
+            warnings = []
+            if before_update:
+                result = before_update(instance, validated, request)
+                validated, warnings = result if isinstance(result, tuple) else (result, [])
+            validated, tags, many = cls._split(validated, tag_fields, many_fields)
+            for attr, value in validated.items():
+                setattr(instance, attr, value)
+            fields.update(validated)
+            entry = _Entry(index, instance, validated, tags, many)
+            entry.warnings = list(warnings or [])
+            entries.append(entry)
+        serializer.instance = None
+        entries = cls._check_unique(model, unique, entries, errors)
+
+        now = timezone.now()
+        auto_now = [f.name for f in model._meta.concrete_fields if getattr(f, "auto_now", False)]
+        for entry in entries:
+            for name in auto_now:
+                setattr(entry.instance, name, now)
+        update_fields = sorted(fields | set(auto_now))
+
+        with transaction.atomic(using=using):
+            def write(instances):
+                if update_fields:
+                    model._default_manager.bulk_update(instances, update_fields)
+            written = cls._write(write, entries, errors, using)
+            cls._write_relations(model, written, replace_tags=True)
+
+            instances = [entry.instance for entry in written]
+            after_bulk = config.get("after_bulk_update")
+            after_one = config.get("after_update")
+            if after_bulk:
+                after_bulk(instances, request)
+            elif after_one:
+                for instance in instances:
+                    after_one(instance, request)
+            from sopira_magic.apps.audit.capture import record_bulk
+            record_bulk(instances, created=False, update_fields=update_fields)
+
+        after_bulk_write(view_name, [instance.pk for instance in instances])
+        logger.info(f"[BULK] Updated {len(written)} '{view_name}' rows ({len(errors)} errors)")
+        return cls._response("updated", written, errors)
+
+    @classmethod
+    def delete(cls, viewset, data) -> Response:
+        ids = cls._items(data, key="ids")
+        view_name, config = viewset._view_name, viewset._view_config
+        model = config["model"]
+        using = model._default_manager.db
+
+        valid = {}
+        for index, value in enumerate(ids):
+            try:
+                valid[index] = model._meta.pk.to_python(value)
+            except DjangoValidationError:
+                pass
+        # Scoped queryset: rows outside the user's scope are "not found"
+        existing = set(
+            viewset.get_queryset().order_by().filter(pk__in=list(valid.values())).values_list("pk", flat=True)
+        )
+
+        errors: List[dict] = []
+        entries: List[_Entry] = []
+        for index in range(len(ids)):
+            pk = valid.get(index)
+            if pk is None or pk not in existing:
+                errors.append({"index": index, "errors": {"id": ["Not found."]}})
+            elif not any(entry.instance.pk == pk for entry in entries):
+                entries.append(_Entry(index, model(pk=pk), {}, {}, {}))
+
+        def write(instances):
+            # Model.delete semantics (cascades, post_delete signals -> search / FK cache / audit)
+            model._default_manager.filter(pk__in=[instance.pk for instance in instances]).delete()
+
+        with transaction.atomic(using=using):
+            written = cls._write(write, entries, errors, using)
+
+        logger.info(f"[BULK] Deleted {len(written)} '{view_name}' rows ({len(errors)} errors)")
+        return cls._response("deleted", written, errors)
@@ -0,0 +1,41 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/management/commands/rebuild_read_models.py
+#   Rebuild Read Models Command - Management command
+#   Full rebuild of denormalized list tables (VIEWS_MATRIX read_model)
+#..............................................................
+
+"""
+   Rebuild Read Models Command - Management Command.
+
+   Rebuilds the read model of every VIEWS_MATRIX view with a "read_model"
+   (api/read_model.py) from its source table. Needed after writes that
+   bypass signals (queryset.update(), raw SQL, restores) and on first deploy.
+
+   Usage:
+   ```bash
+   python manage.py rebuild_read_models
+   python manage.py rebuild_read_models --view measurements
+   ```
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sopira_magic.apps.api.read_model import ReadModelService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild denormalized read models (VIEWS_MATRIX read_model) from their source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', default=None, help='VIEWS_MATRIX view (default: all with read_model)')
+
+    def handle(self, *args, **options):
+        views = ReadModelService.views()
+        if options['view']:
+            if options['view'] not in views:
+                raise CommandError(f"View '{options['view']}' has no read_model")
+            views = [options['view']]
+        for view_name in views:
+            self.stdout.write(f"Rebuilding {view_name}...")
+            written = ReadModelService.rebuild(view_name)
+            self.stdout.write(self.style.SUCCESS(f"✓ {view_name}: {written} rows"))
@@ -2,15 +2,32 @@
 API permissions - ConfigDriven&SSOT access control helpers.
 
 - IsSuperUserPermission: allow only authenticated superusers.
-- AccessRightsPermission: consults accessrights matrix (SSOT) for view/action.
+- AccessRightsPermission: consults the compiled accessrights matrix (SSOT) for view/action.
 """
 
-from rest_framework.permissions import BasePermission, SAFE_METHODS
+from rest_framework.permissions import BasePermission
 
 try:
-    from sopira_magic.apps.accessrights.services import can_access
+    from sopira_magic.apps.accessrights.compiled import is_allowed
+    from sopira_magic.apps.accessrights.services import _effective_role
 except Exception:  # pragma: no cover - fallback if module not installed yet
-    can_access = None  # type: ignore
+    is_allowed = None  # type: ignore
+
+# HTTP method -> accessrights action
+METHOD_ACTIONS = {
+    "GET": "view",
+    "HEAD": "view",
+    "OPTIONS": "view",
+    "POST": "add",
+    "PUT": "edit",
+    "PATCH": "edit",
+    "DELETE": "delete",
+}
+
+# ViewSet action -> accessrights action (takes precedence over the HTTP method)
+VIEWSET_ACTIONS = {
+    "export": "export",
+}
 
 
 class IsSuperUserPermission(BasePermission):
@@ -32,10 +49,11 @@ class AccessRightsPermission(BasePermission):
       POST -> "add"
       PUT/PATCH -> "edit"
       DELETE -> "delete"
+    ViewSet actions in VIEWSET_ACTIONS (export) map to their own action.
     """
 
     def has_permission(self, request, view):
-        if can_access is None:
+        if is_allowed is None:
             return True  # SSOT not available, do not block
 
         user = getattr(request, "user", None)
@@ -46,16 +64,6 @@ class AccessRightsPermission(BasePermission):
         if not view_name:
             return True
 
-        if request.method in SAFE_METHODS:
-            action = "view"
-        elif request.method == "POST":
-            action = "add"
-        elif request.method in ("PUT", "PATCH"):
-            action = "edit"
-        elif request.method == "DELETE":
-            action = "delete"
-        else:
-            action = "view"
-
-        return can_access(view_name, action, user)  # type: ignore[arg-type]
-
+        # Single lookup in the role table compiled at startup (accessrights/compiled.py)
+        action = VIEWSET_ACTIONS.get(getattr(view, "action", None)) or METHOD_ACTIONS.get(request.method, "view")
+        return bool(is_allowed(_effective_role(user), view_name, action))
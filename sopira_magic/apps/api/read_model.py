@@ -0,0 +1,425 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/read_model.py
+#   Read Models - denormalized list tables for VIEWS_MATRIX views
+#   Incremental maintenance (signals, bulk writes) + full rebuild
+#..............................................................
+
+"""
+   Read Models - Denormalized List Tables for VIEWS_MATRIX Views.
+
+   A view with a "read_model" config keeps one row per source object in a
+   flat table holding the list columns, precomputed FK display labels, tag
+   names and scope keys:
+
+   ```python
+   "read_model": {
+       "model": MeasurementListEntry,
+       "sources": {"company_id": "factory__company_id"},    # column -> source path
+       "scope": {"factory__company__users": "company__users"},  # ownership_hierarchy -> read model
+       "list": True,    # <view>/ list endpoint reads the read model
+       "search": True,  # DB search fallback reads the read model
+   }
+   ```
+
+   Columns are filled by name: same-named source fields are copied,
+   "<fk>_display_label" uses the fk_display_template of fk_fields (as
+   MySerializer does), "label" mirrors MySerializer.label, "tags" holds tag
+   names and "search_text" joins the own (non-FK) search_fields.
+
+   Maintenance:
+   - source post_save / post_delete -> refresh / delete the row (same transaction)
+   - FK target post_save -> one UPDATE of its label and derived columns
+   - TagService writes -> refresh_tagged() once per call; single TaggedItem
+     saves and Tag saves / deletes -> refresh the tagged rows (TaggedItem
+     deletes have no receiver, so they stay set-based)
+   - api.bulk.after_bulk_write -> refresh(pks) per batch, and refresh_targets()
+     for read models whose FKs point at the written model
+   - generator clear (raw deletes) -> delete(pks) per cleared chunk
+   - manage.py rebuild_read_models -> full rebuild (after queryset.update(), imports, ...)
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from rest_framework import serializers
+
+from .serializers import get_fk_display_label
+from .view_configs import VIEWS_MATRIX
+
+logger = logging.getLogger(__name__)
+
+LABEL_SUFFIX = "_display_label"
+CHUNK_SIZE = 2000
+COMPUTED_COLUMNS = ("label", "tags", "search_text")
+
+_specs: Dict[str, "ReadModelSpec"] = {}
+_serializers: Dict[str, type] = {}
+_registered = False
+
+
+class ReadModelSpec:
+    """Column plan of one read model (resolved once from VIEWS_MATRIX)."""
+
+    def __init__(self, view_name: str, config: Dict[str, Any]):
+        read_config = config["read_model"]
+        self.view_name = view_name
+        self.source = config["model"]
+        self.target = read_config["model"]
+        self.scope = read_config.get("scope") or {}
+
+        source_fields = {f.attname: f for f in self.source._meta.concrete_fields}
+        target_columns = [f.attname for f in self.target._meta.concrete_fields if not f.primary_key]
+
+        # column -> source path ("a__b_id" = attribute chain over select_related FKs)
+        self.paths: Dict[str, str] = dict(read_config.get("sources") or {})
+        # column -> (fk field, template)
+        self.labels: Dict[str, tuple] = {}
+        for fk_name, fk_view in (config.get("fk_fields") or {}).items():
+            template = VIEWS_MATRIX.get(fk_view, {}).get("fk_display_template")
+            column = f"{fk_name}{LABEL_SUFFIX}"
+            if template and column in target_columns:
+                self.labels[column] = (self.source._meta.get_field(fk_name), template)
+        for column in target_columns:
+            if column not in self.paths and column not in self.labels and column in source_fields:
+                self.paths[column] = column
+        self.computed = [c for c in COMPUTED_COLUMNS if c in target_columns]
+        self.columns = list(self.paths) + list(self.labels) + self.computed
+
+        self.own_fields = [f for f in self.paths.values() if f in source_fields]
+        self.search_fields = [f for f in config.get("search_fields") or [] if "__" not in f and f != "id"]
+        self.related = sorted(
+            {fk.name for fk, _ in self.labels.values()}
+            | {path.split("__")[0] for path in self.paths.values() if "__" in path}
+        )
+        self.has_tags = "tags" in self.computed and hasattr(self.source, "tags")
+
+    def dependents(self, fk_name: str) -> Dict[str, Any]:
+        """Columns that change when the FK target `fk_name` changes: {column: (template | path rest)}."""
+        columns = {}
+        for column, (fk, template) in self.labels.items():
+            if fk.name == fk_name:
+                columns[column] = ("label", template)
+        for column, path in self.paths.items():
+            head, _, rest = path.partition("__")
+            if rest and head == fk_name:
+                columns[column] = ("path", rest)
+        return columns
+
+
+def _resolve(obj, path: str):
+    for part in path.split("__"):
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    return obj
+
+
+def _row_label(obj) -> str:
+    # Same as MySerializer.get_label
+    code, name = getattr(obj, "code", None), getattr(obj, "name", None)
+    return f"{name} ({code})" if code and name else (name or code or str(obj))
+
+
+class ReadModelService:
+    """Build, refresh and query read models."""
+
+    @staticmethod
+    def views() -> List[str]:
+        return [name for name, cfg in VIEWS_MATRIX.items() if cfg.get("read_model")]
+
+    @staticmethod
+    def spec(view_name: str) -> ReadModelSpec:
+        if view_name not in _specs:
+            _specs[view_name] = ReadModelSpec(view_name, VIEWS_MATRIX[view_name])
+        return _specs[view_name]
+
+    @staticmethod
+    def enabled(view_name: str, usage: str) -> bool:
+        """usage: "list" | "search" - VIEWS_MATRIX opt-in of the read model."""
+        read_config = VIEWS_MATRIX.get(view_name, {}).get("read_model")
+        return bool(read_config and read_config.get(usage))
+
+    # -------------------------
+    # Building rows
+    # -------------------------
+    @classmethod
+    def build(cls, view_name: str, objects: Iterable[models.Model]) -> List[models.Model]:
+        spec = cls.spec(view_name)
+        objects = list(objects)
+        tags = cls._tags(spec, [obj.pk for obj in objects]) if spec.has_tags else {}
+        rows = []
+        for obj in objects:
+            values = {column: _resolve(obj, path) for column, path in spec.paths.items()}
+            for column, (fk, template) in spec.labels.items():
+                values[column] = get_fk_display_label(getattr(obj, fk.name), template=template)
+            if "label" in spec.computed:
+                values["label"] = _row_label(obj)
+            if spec.has_tags:
+                values["tags"] = tags.get(obj.pk, [])
+            if "search_text" in spec.computed:
+                parts = [str(getattr(obj, name) or "") for name in spec.search_fields]
+                values["search_text"] = " ".join(part for part in parts if part)
+            for column, value in values.items():
+                if isinstance(value, models.fields.files.FieldFile):
+                    values[column] = value.name or None
+            rows.append(spec.target(pk=obj.pk, **values))
+        return rows
+
+    @staticmethod
+    def _tags(spec: ReadModelSpec, pks: List[Any]) -> Dict[Any, List[str]]:
+        from django.contrib.contenttypes.models import ContentType
+        from sopira_magic.apps.m_tag.models import TaggedItem
+
+        content_type = ContentType.objects.get_for_model(spec.source)
+        tags: Dict[Any, List[str]] = {}
+        rows = TaggedItem.objects.filter(content_type=content_type, object_id__in=pks).values_list(
+            "object_id", "tag__name"
+        )
+        for object_id, name in rows:
+            tags.setdefault(object_id, []).append(name)
+        return tags
+
+    @classmethod
+    def _source_queryset(cls, spec: ReadModelSpec):
+        return spec.source._default_manager.select_related(*spec.related).only(
+            *spec.own_fields, *spec.related, *spec.search_fields
+        )
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    @classmethod
+    def refresh(cls, view_name: str, pks: Iterable[Any]) -> int:
+        """Upsert rows for `pks` (rows of deleted sources are removed)."""
+        spec = cls.spec(view_name)
+        pks = list(dict.fromkeys(pks))
+        chunk_size = getattr(settings, "READ_MODEL_CHUNK_SIZE", CHUNK_SIZE)
+        written = 0
+        for start in range(0, len(pks), chunk_size):
+            chunk = pks[start:start + chunk_size]
+            rows = cls.build(view_name, cls._source_queryset(spec).filter(pk__in=chunk))
+            found = {row.pk for row in rows}
+            missing = [pk for pk in chunk if pk not in found]
+            with transaction.atomic(using=spec.target._default_manager.db):
+                if missing:
+                    spec.target._default_manager.filter(pk__in=missing).delete()
+                if rows:
+                    spec.target._default_manager.bulk_create(
+                        rows, update_conflicts=True, unique_fields=["id"], update_fields=spec.columns,
+                    )
+            written += len(rows)
+        return written
+
+    @classmethod
+    def delete(cls, view_name: str, pks: Iterable[Any]) -> None:
+        cls.spec(view_name).target._default_manager.filter(pk__in=list(pks)).delete()
+
+    @classmethod
+    def refresh_related(cls, view_name: str, fk_name: str, instance) -> int:
+        """FK target changed: one UPDATE of its label / derived columns on the referencing rows."""
+        spec = cls.spec(view_name)
+        updates = {}
+        for column, (kind, value) in spec.dependents(fk_name).items():
+            updates[column] = get_fk_display_label(instance, template=value) if kind == "label" else _resolve(instance, value)
+        if not updates:
+            return 0
+        changed = Q()
+        for column, value in updates.items():
+            changed |= ~Q(**{column: value}) | Q(**{f"{column}__isnull": True})
+        return spec.target._default_manager.filter(**{f"{fk_name}_id": instance.pk}).filter(changed).update(**updates)
+
+    @classmethod
+    def refresh_targets(cls, model, pks: Iterable[Any]) -> int:
+        """FK targets written without post_save (bulk writes): refresh_related() on every read model pointing at them."""
+        concrete = model._meta.concrete_model
+        dependents = [
+            (view_name, fk_name)
+            for view_name in cls.views()
+            for fk_name in cls.spec(view_name).related
+            if cls.spec(view_name).source._meta.get_field(fk_name).related_model._meta.concrete_model is concrete
+        ]
+        if not dependents:
+            return 0
+        pks = list(pks)
+        referenced = {}
+        for view_name, fk_name in dependents:
+            # Only targets some row points at (fresh inserts have none)
+            for pk in cls.spec(view_name).target._default_manager.filter(
+                **{f"{fk_name}_id__in": pks}
+            ).values_list(f"{fk_name}_id", flat=True).distinct():
+                referenced.setdefault(pk, []).append((view_name, fk_name))
+        if not referenced:
+            return 0
+        updated = 0
+        for instance in model._default_manager.filter(pk__in=list(referenced)):
+            for view_name, fk_name in referenced[instance.pk]:
+                updated += cls.refresh_related(view_name, fk_name, instance)
+        return updated
+
+    @classmethod
+    def rebuild(cls, view_name: str) -> int:
+        """Full rebuild: drop orphans, upsert every source row in chunks."""
+        spec = cls.spec(view_name)
+        chunk_size = getattr(settings, "READ_MODEL_CHUNK_SIZE", CHUNK_SIZE)
+        source_pks = spec.source._default_manager.values_list("pk", flat=True)
+        spec.target._default_manager.exclude(pk__in=source_pks).delete()
+        written, chunk = 0, []
+        for pk in source_pks.order_by().iterator(chunk_size=chunk_size):
+            chunk.append(pk)
+            if len(chunk) >= chunk_size:
+                written += cls.refresh(view_name, chunk)
+                chunk = []
+        if chunk:
+            written += cls.refresh(view_name, chunk)
+        logger.info(f"[READ_MODEL] Rebuilt '{view_name}': {written} rows")
+        return written
+
+    # -------------------------
+    # Reading
+    # -------------------------
+    @classmethod
+    def queryset(cls, view_name: str):
+        return cls.spec(view_name).target._default_manager.all()
+
+    @classmethod
+    def scope_config(cls, view_name: str) -> Dict[str, Any]:
+        """ViewConfig whose ownership_hierarchy points at read model columns (for ScopingEngine)."""
+        spec, config = cls.spec(view_name), VIEWS_MATRIX[view_name]
+        hierarchy = [spec.scope.get(path, path) for path in config.get("ownership_hierarchy", [])]
+        return {**config, "ownership_hierarchy": hierarchy}
+
+    @classmethod
+    def search_fields(cls, view_name: str) -> List[str]:
+        spec = cls.spec(view_name)
+        return ["search_text", *spec.labels] if "search_text" in spec.computed else list(spec.labels)
+
+    @classmethod
+    def serializer(cls, view_name: str):
+        if view_name not in _serializers:
+            meta = type("Meta", (), {"model": cls.spec(view_name).target, "exclude": ["search_text"]})
+            _serializers[view_name] = type(
+                f"{cls.spec(view_name).target.__name__}Serializer", (serializers.ModelSerializer,), {"Meta": meta}
+            )
+        return _serializers[view_name]
+
+
+# =============================================================================
+# SIGNALS
+# =============================================================================
+
+def _on_source_save(view_name):
+    def handler(sender, instance, raw=False, **kwargs):
+        if not raw:
+            ReadModelService.refresh(view_name, [instance.pk])
+    return handler
+
+
+def _on_source_delete(view_name):
+    def handler(sender, instance, **kwargs):
+        ReadModelService.delete(view_name, [instance.pk])
+    return handler
+
+
+def _on_related_save(view_name, fk_name):
+    def handler(sender, instance, created=False, raw=False, **kwargs):
+        if not raw and not created:  # new targets are not referenced yet
+            ReadModelService.refresh_related(view_name, fk_name, instance)
+    return handler
+
+
+def _tagged_pks(tag) -> Dict[str, List[Any]]:
+    """{view_name: object ids} of read model rows carrying `tag`."""
+    from django.contrib.contenttypes.models import ContentType
+    from sopira_magic.apps.m_tag.models import TaggedItem
+
+    tagged = {}
+    for view_name in ReadModelService.views():
+        spec = ReadModelService.spec(view_name)
+        if spec.has_tags:
+            content_type = ContentType.objects.get_for_model(spec.source)
+            tagged[view_name] = list(
+                TaggedItem.objects.filter(tag=tag, content_type=content_type).values_list("object_id", flat=True)
+            )
+    return tagged
+
+
+def _on_tag_change(sender, instance, raw=False, **kwargs):
+    from django.contrib.contenttypes.models import ContentType
+    from sopira_magic.apps.m_tag.models import Tag
+
+    if raw:
+        return
+    if isinstance(instance, Tag):
+        for view_name, pks in _tagged_pks(instance).items():
+            ReadModelService.refresh(view_name, pks)
+        return
+    for view_name in ReadModelService.views():
+        spec = ReadModelService.spec(view_name)
+        if spec.has_tags and instance.content_type_id == ContentType.objects.get_for_model(spec.source).id:
+            ReadModelService.refresh(view_name, [instance.object_id])
+
+
+def _on_tag_pre_delete(sender, instance, **kwargs):
+    # The cascade removes the links before post_delete: remember the tagged rows
+    instance._read_model_tagged = _tagged_pks(instance)
+
+
+def _on_tag_post_delete(sender, instance, **kwargs):
+    for view_name, pks in getattr(instance, "_read_model_tagged", {}).items():
+        ReadModelService.refresh(view_name, pks)
+
+
+def refresh_tagged(model_class, object_ids: Iterable[Any]) -> None:
+    """Refresh tag columns after bulk TaggedItem writes (TagService sends no signals)."""
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+    for view_name in tagged_read_model_views(model_class):
+        ReadModelService.refresh(view_name, object_ids)
+
+
+def source_read_model_views(model_class) -> List[str]:
+    """Read model views whose source is `model_class`."""
+    concrete = model_class._meta.concrete_model
+    return [
+        view_name for view_name in ReadModelService.views()
+        if ReadModelService.spec(view_name).source._meta.concrete_model is concrete
+    ]
+
+
+def tagged_read_model_views(model_class) -> List[str]:
+    """Read model views with a tags column whose source is `model_class`."""
+    return [view_name for view_name in source_read_model_views(model_class) if ReadModelService.spec(view_name).has_tags]
+
+
+def register_read_model_signals() -> None:
+    """Connect maintenance handlers for every view with a read_model (once)."""
+    global _registered
+    if _registered:
+        return
+    from sopira_magic.apps.m_tag.models import Tag, TaggedItem
+
+    views = ReadModelService.views()
+    for view_name in views:
+        spec = ReadModelService.spec(view_name)
+        uid = f"read_model_{view_name}"
+        post_save.connect(_on_source_save(view_name), sender=spec.source, weak=False, dispatch_uid=f"{uid}_save")
+        post_delete.connect(_on_source_delete(view_name), sender=spec.source, weak=False, dispatch_uid=f"{uid}_delete")
+        for fk_name in spec.related:
+            related_model = spec.source._meta.get_field(fk_name).related_model
+            post_save.connect(
+                _on_related_save(view_name, fk_name), sender=related_model, weak=False,
+                dispatch_uid=f"{uid}_{fk_name}_save",
+            )
+    if views:
+        post_save.connect(_on_tag_change, sender=Tag, dispatch_uid="read_model_tag_save")
+        pre_delete.connect(_on_tag_pre_delete, sender=Tag, dispatch_uid="read_model_tag_pre_delete")
+        post_delete.connect(_on_tag_post_delete, sender=Tag, dispatch_uid="read_model_tag_delete")
+        # No TaggedItem post_delete receiver: it would run per deleted link
+        # (TagService.remove refreshes once per call instead)
+        post_save.connect(_on_tag_change, sender=TaggedItem, dispatch_uid="read_model_taggeditem_save")
+    _registered = True
@@ -27,6 +27,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from sopira_magic.apps.m_company.models import Company
 from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.logging.telemetry import SerializerTelemetryMixin
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +117,7 @@ class GenericRelationTagsField(serializers.ListField):
 # MY SERIALIZER - UNIVERSAL CONFIG-DRIVEN SERIALIZER FACTORY
 # =============================================================================
 
-class MySerializer(serializers.ModelSerializer):
+class MySerializer(SerializerTelemetryMixin, serializers.ModelSerializer):
     """
     Universal Serializer Factory that configures itself from VIEWS_MATRIX.
     
@@ -129,6 +130,7 @@ class MySerializer(serializers.ModelSerializer):
     - Auto-generates label field if model has code and name
     - Auto-generates tags field if model has tags relation
     - Auto-generates FK display labels from fk_display_template
+    - Reports serialization time to request telemetry (sampled requests only)
     
     Usage:
         # In view_factory.py or views.py
@@ -229,8 +231,7 @@ class MySerializer(serializers.ModelSerializer):
             1. before_update hooks from config (e.g., SA protection)
             2. GenericRelation (tags) fields
             """
-            from sopira_magic.apps.m_tag.models import Tag, TaggedItem
-            from django.contrib.contenttypes.models import ContentType
+            from sopira_magic.apps.m_tag.services import TagService
             from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
             
             # Initialize meta collections (ConfigDriven)
@@ -264,22 +265,9 @@ class MySerializer(serializers.ModelSerializer):
                 setattr(instance, attr, value)
             instance.save()
             
-            # 4. Update GenericRelation (tags)
+            # 4. Update GenericRelation (tags) - set-based replace
             for field_name, tag_names in tags_data.items():
-                # Clear existing
-                getattr(instance, field_name).all().delete()
-                
-                # Create new
-                if tag_names:
-                    content_type = ContentType.objects.get_for_model(instance)
-                    for tag_name in tag_names:
-                        if tag_name:
-                            tag, _ = Tag.objects.get_or_create(name=tag_name.strip())
-                            TaggedItem.objects.create(
-                                content_type=content_type,
-                                object_id=instance.pk,
-                                tag=tag
-                            )
+                TagService.set_tags(instance, tag_names or [])
             
             return instance
         
@@ -289,8 +277,7 @@ class MySerializer(serializers.ModelSerializer):
         if generic_relation_fields:
             def create(self, validated_data):
                 """Custom create to handle GenericRelation (tags) fields."""
-                from sopira_magic.apps.m_tag.models import Tag, TaggedItem
-                from django.contrib.contenttypes.models import ContentType
+                from sopira_magic.apps.m_tag.services import TagService
                 
                 # Extract tags data
                 tags_data = {}
@@ -306,15 +293,7 @@ class MySerializer(serializers.ModelSerializer):
                 # Add tags
                 for field_name, tag_names in tags_data.items():
                     if tag_names:
-                        content_type = ContentType.objects.get_for_model(instance)
-                        for tag_name in tag_names:
-                            if tag_name:
-                                tag, _ = Tag.objects.get_or_create(name=tag_name.strip())
-                                TaggedItem.objects.create(
-                                    content_type=content_type,
-                                    object_id=instance.pk,
-                                    tag=tag
-                                )
+                        TagService.set_tags(instance, tag_names)
                 
                 return instance
             
@@ -0,0 +1,127 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/tests/test_bootstrap.py
+#   Bootstrap Endpoint Tests
+#   Tests for bootstrap.py and views_bootstrap.py
+#..............................................................
+
+"""
+   Bootstrap Endpoint Tests.
+
+   Tests for the combined app start payload, shared scope resolution and
+   ETag / If-None-Match handling.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.api.bootstrap import BootstrapService
+from sopira_magic.apps.api.views_bootstrap import bootstrap_view
+from sopira_magic.apps.m_user.models import UserPreference
+from sopira_magic.apps.mystate.models import SavedState
+from sopira_magic.apps.scoping import registry, shared_scope_resolution
+
+pytestmark = pytest.mark.django_db(databases=['default', 'state'])
+
+factory = APIRequestFactory()
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username='bootuser', password='pass12345', role='reader')
+
+
+def _get(user, **headers):
+    request = factory.get('/api/bootstrap/', **headers)
+    force_authenticate(request, user)
+    return bootstrap_view(request)
+
+
+class TestSharedScopeResolution:
+    """Test suite for per-block scope memoization."""
+
+    def test_resolver_called_once_per_level(self, user, monkeypatch):
+        """Test repeated lookups inside the block hit the memo."""
+        calls = []
+        monkeypatch.setattr(registry, '_scope_resolver', lambda level, u, t: calls.append(level) or ['x'])
+
+        with shared_scope_resolution():
+            for _ in range(3):
+                assert registry.get_scope_values(1, user, 'accessible') == ['x']
+        registry.get_scope_values(1, user, 'accessible')
+
+        assert calls == [1, 1]
+
+
+class TestBootstrapView:
+    """Test suite for GET /api/bootstrap/."""
+
+    def test_payload_sections(self, user):
+        """Test all app start sections are returned together."""
+        UserPreference.objects.create(user=user, preferences={'general_settings': {'theme': 'dark'}})
+        SavedState.objects.using('state').create(
+            user_id=user.id, scope_type='table', scope_key='companies',
+            preset_name='Default', is_default=True,
+        )
+
+        response = _get(user)
+
+        assert response.status_code == 200
+        assert set(response.data) >= {
+            'version', 'accessrights', 'user_preferences', 'models_metadata', 'default_presets', 'fk_options',
+        }
+        assert response.data['user_preferences']['general_settings'] == {'theme': 'dark'}
+        assert response.data['default_presets']['table:companies']['preset_name'] == 'Default'
+        assert 'menu_dependencies' in response.data['accessrights']
+        assert response['ETag'] == response.data['version']
+
+    def test_not_modified_until_user_data_changes(self, user):
+        """Test If-None-Match returns 304 until a stamp is bumped."""
+        etag = _get(user)['ETag']
+
+        assert _get(user, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        UserPreference.objects.create(user=user, preferences={'general_settings': {}})
+        assert _get(user, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_global_bump_changes_every_etag(self, user):
+        """Test global stamp (FK sources / relations) invalidates all users."""
+        before = BootstrapService.etag(user)
+        BootstrapService.bump()
+        assert BootstrapService.etag(user) != before
+
+    def test_coalesced_state_write_changes_etag(self, user, settings):
+        """Test the SavedState .update() of the patch coalescer bumps the owner's stamp."""
+        from sopira_magic.apps.mystate.coalescer import StateWriteCoalescer
+
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+        preset = SavedState.objects.using('state').create(
+            user_id=user.id, scope_type='table', scope_key='companies', preset_name='Default', is_default=True,
+        )
+        before = BootstrapService.etag(user)
+        StateWriteCoalescer.patch(preset, {'state_data': {'density': 'compact'}}, 'merge-patch')
+        assert StateWriteCoalescer.flush() == 1
+        assert BootstrapService.etag(user) != before
+
+    def test_stamps_expire_without_shared_cache(self, user, settings, monkeypatch):
+        """Test stamps use CACHE_VERSION_TIMEOUT, so per-process caches pick up other workers' bumps."""
+        settings.CACHE_VERSION_TIMEOUT = 30
+        timeouts = []
+        original_add, original_set = cache.add, cache.set
+        monkeypatch.setattr(cache, 'add', lambda key, value, timeout=None: timeouts.append(timeout) or original_add(key, value, timeout))
+        monkeypatch.setattr(cache, 'set', lambda key, value, timeout=None: timeouts.append(timeout) or original_set(key, value, timeout))
+
+        BootstrapService.etag(user)
+        BootstrapService.bump(user.pk)
+        cache.delete(BootstrapService._version_key('global'))
+        BootstrapService.bump()
+
+        assert timeouts and set(timeouts) == {30}
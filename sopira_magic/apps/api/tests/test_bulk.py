@@ -0,0 +1,147 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/tests/test_bulk.py
+#   Bulk CRUD Tests
+#   Tests for bulk.py and <view>/bulk/ actions
+#..............................................................
+
+"""
+   Bulk CRUD Tests.
+
+   Tests for list create / partial update / delete, per-item error
+   reporting, preloaded FK lookups and batched side effects.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.api.view_factory import create_viewset
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+@pytest.fixture
+def admin():
+    return get_user_model().objects.create_superuser(username='bulkadmin', password='pass12345')
+
+
+@pytest.fixture
+def company():
+    return Company.objects.create(code='AC', name='Acme')
+
+
+@pytest.fixture
+def side_effects(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        'sopira_magic.apps.fk_options_cache.services.FKCacheService.invalidate_all',
+        lambda view_name: calls.append(('fk', view_name)),
+    )
+    monkeypatch.setattr(
+        'sopira_magic.apps.search.services.SearchService.index_pks',
+        lambda self, view_name, pks: calls.append(('search', view_name, len(pks))),
+    )
+    return calls
+
+
+def _bulk(view_name, method, user, data):
+    view = create_viewset(view_name, read_only=False).as_view({'post': 'bulk', 'patch': 'bulk', 'delete': 'bulk'})
+    request = getattr(factory, method)(f'/api/{view_name}/bulk/', data, format='json')
+    force_authenticate(request, user)
+    return view(request)
+
+
+class TestBulkCreate:
+    """Test suite for POST <view>/bulk/."""
+
+    def test_partial_success(self, admin, company, side_effects):
+        """Test valid items are created and invalid ones reported by index."""
+        items = [
+            {'code': 'F1', 'name': 'Alpha', 'company': str(company.pk)},
+            {'code': 'F2', 'name': 'Bravo', 'company': 'not-a-uuid'},
+            {'code': 'F3', 'name': 'Charlie', 'company': str(company.pk)},
+        ]
+        response = _bulk('factories', 'post', admin, items)
+
+        assert response.status_code == 207
+        assert response.data['created'] == 2
+        assert [r['index'] for r in response.data['results']] == [0, 2]
+        assert [e['index'] for e in response.data['errors']] == [1]
+        assert 'company' in response.data['errors'][0]['errors']
+        assert Factory.objects.get(code='F1').human_id == 'F1'
+        assert side_effects == [('search', 'factories', 2), ('fk', 'factories')]
+
+    def test_query_count_independent_of_items(self, admin, company, side_effects, django_assert_max_num_queries):
+        """Test FK lookups and inserts are batched."""
+        items = [{'code': f'F{i}', 'name': f'Plant {i}', 'company': str(company.pk)} for i in range(30)]
+        with django_assert_max_num_queries(15):
+            response = _bulk('factories', 'post', admin, items)
+        assert response.status_code == 200
+        assert Factory.objects.count() == 30
+
+    def test_unique_together_checked_per_batch(self, admin, company, side_effects):
+        """Test existing and in-batch duplicates are rejected per item."""
+        Factory.objects.create(company=company, code='F1', name='Alpha')
+        items = [
+            {'code': 'F1', 'name': 'Duplicate', 'company': str(company.pk)},
+            {'code': 'F2', 'name': 'Bravo', 'company': str(company.pk)},
+            {'code': 'F2', 'name': 'Bravo again', 'company': str(company.pk)},
+        ]
+        response = _bulk('factories', 'post', admin, items)
+
+        assert response.status_code == 207
+        assert [e['index'] for e in response.data['errors']] == [0, 2]
+        assert Factory.objects.filter(code='F2').count() == 1
+
+    def test_not_a_list(self, admin):
+        """Test malformed body returns 400."""
+        assert _bulk('factories', 'post', admin, {'code': 'F1'}).status_code == 400
+
+    def test_reader_forbidden(self, company):
+        """Test users without add right cannot bulk create."""
+        reader = get_user_model().objects.create_user(username='bulkreader', password='pass12345', role='reader')
+        response = _bulk('factories', 'post', reader, [{'code': 'F1', 'name': 'Alpha'}])
+        assert response.status_code == 403
+        assert not Factory.objects.exists()
+
+
+class TestBulkUpdate:
+    """Test suite for PATCH <view>/bulk/."""
+
+    def test_update_and_missing_id(self, admin, company, side_effects):
+        """Test partial updates are applied and unknown ids reported."""
+        alpha = Factory.objects.create(company=company, code='F1', name='Alpha')
+        bravo = Factory.objects.create(company=company, code='F2', name='Bravo')
+        items = [
+            {'id': str(alpha.pk), 'name': 'Alpha 2'},
+            {'id': '00000000-0000-0000-0000-000000000000', 'name': 'Ghost'},
+            {'id': str(bravo.pk), 'name': 'Bravo 2'},
+        ]
+        side_effects.clear()  # drop calls from the fixture saves
+        response = _bulk('factories', 'patch', admin, items)
+
+        assert response.status_code == 207
+        assert response.data['updated'] == 2
+        assert response.data['errors'] == [{'index': 1, 'errors': {'id': ['Not found.']}}]
+        assert set(Factory.objects.values_list('name', flat=True)) == {'Alpha 2', 'Bravo 2'}
+        assert side_effects == [('search', 'factories', 2), ('fk', 'factories')]
+
+
+class TestBulkDelete:
+    """Test suite for DELETE <view>/bulk/."""
+
+    def test_protected_row_does_not_abort_batch(self, admin, company):
+        """Test a PROTECT-referenced row is reported while the others are deleted."""
+        free = Company.objects.create(code='FR', name='Free')
+        Factory.objects.create(company=company, code='F1', name='Alpha')
+
+        response = _bulk('companies', 'delete', admin, {'ids': [str(company.pk), str(free.pk)]})
+
+        assert response.status_code == 207
+        assert response.data['deleted'] == 1
+        assert [e['index'] for e in response.data['errors']] == [0]
+        assert list(Company.objects.values_list('code', flat=True)) == ['AC']
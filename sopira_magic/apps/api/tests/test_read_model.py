@@ -0,0 +1,251 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/api/tests/test_read_model.py
+#   Read Model Tests
+#   Tests for read_model.py, list / search opt-in and rebuild command
+#..............................................................
+
+"""
+   Read Model Tests.
+
+   Tests for incremental maintenance of the measurements list read model
+   (source, FK target and tag signals, bulk writes), the list endpoint and
+   DB search fallback reading it, and the rebuild command.
+"""
+
+import datetime
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.api.read_model import ReadModelService
+from sopira_magic.apps.api.view_factory import create_viewset
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_measurement.models import Measurement, MeasurementListEntry
+from sopira_magic.apps.m_tag.models import Tag, TaggedItem
+from sopira_magic.apps.search.services import SearchService
+
+pytestmark = pytest.mark.django_db(databases=['default', 'state', 'logging'])
+
+factory = APIRequestFactory()
+
+
+@pytest.fixture
+def admin():
+    return get_user_model().objects.create_superuser(username='readadmin', password='pass12345')
+
+
+@pytest.fixture
+def plant():
+    company = Company.objects.create(code='AC', name='Acme')
+    return Factory.objects.create(company=company, code='F1', name='Alpha')
+
+
+def _measurement(plant, **extra):
+    values = dict(
+        factory=plant, dump_date=datetime.date(2026, 1, 5), dump_time=datetime.time(8, 0),
+        pot_knocks=3, pot_weight_kg=12, code='M1', name='First',
+    )
+    values.update(extra)
+    return Measurement.objects.create(**values)
+
+
+def _list(user, **params):
+    request = factory.get('/api/measurements/', params)
+    force_authenticate(request, user)
+    response = create_viewset('measurements').as_view({'get': 'list'})(request)
+    data = response.data
+    return response, (data['results'] if isinstance(data, dict) and 'results' in data else data)
+
+
+class TestMaintenance:
+    """Test suite for incremental read model maintenance."""
+
+    def test_row_written_on_save(self, plant):
+        """Test saving a Measurement writes its list row with labels and scope keys."""
+        measurement = _measurement(plant, comment='slag sample')
+        entry = MeasurementListEntry.objects.get(pk=measurement.pk)
+
+        assert entry.factory_id == plant.pk
+        assert entry.company_id == plant.company_id
+        assert entry.factory_display_label == 'Alpha'
+        assert entry.location_display_label is None
+        assert entry.label == 'First (M1)'
+        assert entry.pot_weight_kg == 12
+        assert 'slag sample' in entry.search_text
+
+    def test_update_and_delete(self, plant):
+        """Test updates rewrite the row and deletes remove it."""
+        measurement = _measurement(plant)
+        measurement.pot_knocks = 7
+        measurement.save()
+        assert MeasurementListEntry.objects.get(pk=measurement.pk).pot_knocks == 7
+
+        measurement.delete()
+        assert not MeasurementListEntry.objects.filter(pk=measurement.pk).exists()
+
+    def test_fk_target_change(self, plant):
+        """Test renaming a factory relabels its rows with one UPDATE."""
+        first, second = _measurement(plant), _measurement(plant, code='M2')
+        plant.name = 'Beta'
+        with CaptureQueriesContext(connection) as queries:
+            plant.save()
+
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "measurement_measurementlistentry"')]
+        assert len(updates) == 1
+        labels = set(MeasurementListEntry.objects.filter(pk__in=[first.pk, second.pk])
+                     .values_list('factory_display_label', flat=True))
+        assert labels == {'Beta'}
+
+    def test_tags(self, plant):
+        """Test tag assignment and tag renames refresh the tagged rows."""
+        measurement = _measurement(plant)
+        tag = Tag.objects.create(name='hot')
+        TaggedItem.objects.create(tag=tag, content_object=measurement)
+        assert MeasurementListEntry.objects.get(pk=measurement.pk).tags == ['hot']
+
+        tag.name = 'very hot'
+        tag.save()
+        assert MeasurementListEntry.objects.get(pk=measurement.pk).tags == ['very hot']
+
+    def test_tag_service_bulk_writes(self, plant):
+        """Test TagService.set_tags / assign (bulk_create, no signals) refresh the tagged rows."""
+        from sopira_magic.apps.m_tag.services import TagService
+
+        measurement = _measurement(plant)
+        TagService.set_tags(measurement, ['hot', 'urgent'])
+        assert sorted(MeasurementListEntry.objects.get(pk=measurement.pk).tags) == ['hot', 'urgent']
+
+        TagService.set_tags(measurement, ['cold'])
+        assert MeasurementListEntry.objects.get(pk=measurement.pk).tags == ['cold']
+
+        TagService.assign(Measurement, {measurement.pk: ['qa']})
+        assert sorted(MeasurementListEntry.objects.get(pk=measurement.pk).tags) == ['cold', 'qa']
+
+    def test_tag_service_remove_is_set_based(self, plant):
+        """Test TagService.remove refreshes once per call instead of once per deleted link."""
+        from sopira_magic.apps.m_tag.services import TagService
+
+        measurements = [_measurement(plant, code=f'M{i}') for i in range(20)]
+        TagService.assign(Measurement, {m.pk: ['hot', 'qa'] for m in measurements})
+
+        with CaptureQueriesContext(connection) as queries:
+            removed = TagService.remove(Measurement, object_ids=[m.pk for m in measurements])
+
+        assert removed == 40
+        assert len(queries.captured_queries) < 15
+        assert all(tags == [] for tags in MeasurementListEntry.objects.values_list('tags', flat=True))
+
+    def test_tag_delete_refreshes_rows(self, plant):
+        """Test deleting a Tag (cascade of its links) refreshes the tagged rows."""
+        from sopira_magic.apps.m_tag.services import TagService
+
+        measurement = _measurement(plant)
+        TagService.set_tags(measurement, ['hot', 'qa'])
+        Tag.objects.get(name='hot').delete()
+
+        assert MeasurementListEntry.objects.get(pk=measurement.pk).tags == ['qa']
+
+    def test_generator_clear_deletes_rows(self, admin, plant):
+        """Test the generator's raw-delete clear removes the read model rows (list endpoint is empty)."""
+        from sopira_magic.apps.generator.clear_engine import BulkClearEngine
+
+        _measurement(plant)
+        BulkClearEngine().clear(Measurement)
+
+        assert not MeasurementListEntry.objects.exists()
+        assert _list(admin)[1] == []
+
+    def test_bulk_patch_of_fk_target_relabels(self, admin, plant):
+        """Test a bulk PATCH of factories (no post_save) relabels the measurement rows."""
+        measurement = _measurement(plant)
+        view = create_viewset('factories', read_only=False).as_view({'patch': 'bulk'})
+        request = factory.patch('/api/factories/bulk/', [{'id': str(plant.pk), 'name': 'Beta'}], format='json')
+        force_authenticate(request, admin)
+
+        response = view(request)
+
+        assert response.status_code == 200, response.data
+        assert MeasurementListEntry.objects.get(pk=measurement.pk).factory_display_label == 'Beta'
+
+    def test_rebuild(self, plant):
+        """Test the rebuild command repairs rows changed behind the signals' back."""
+        measurement = _measurement(plant)
+        Measurement.objects.filter(pk=measurement.pk).update(pot_knocks=9)
+        MeasurementListEntry.objects.create(
+            id='00000000-0000-0000-0000-000000000001', dump_date=datetime.date(2026, 1, 1),
+            dump_time=datetime.time(0, 0),
+        )
+
+        out = io.StringIO()
+        call_command('rebuild_read_models', '--view', 'measurements', stdout=out)
+
+        assert '1 rows' in out.getvalue()
+        assert list(MeasurementListEntry.objects.values_list('pk', 'pot_knocks')) == [(measurement.pk, 9)]
+
+
+class TestReadPaths:
+    """Test suite for the list endpoint and search fallback on the read model."""
+
+    def test_list_reads_single_table(self, admin, plant):
+        """Test the list is served from the read model without joins."""
+        for index in range(5):
+            _measurement(plant, code=f'M{index}')
+        with CaptureQueriesContext(connection) as queries:
+            response, rows = _list(admin)
+
+        assert response.status_code == 200 and len(rows) == 5
+        assert rows[0]['factory_display_label'] == 'Alpha'
+        assert 'search_text' not in rows[0]
+        selects = [q['sql'] for q in queries.captured_queries if '"measurement_measurement"' in q['sql']]
+        assert selects == []
+        assert all(' JOIN ' not in q['sql'] for q in queries.captured_queries if 'measurementlistentry' in q['sql'])
+
+    def test_list_search_matches_labels(self, admin, plant):
+        """Test ?search= matches own text and FK labels."""
+        _measurement(plant, comment='slag')
+        other = Factory.objects.create(company=plant.company, code='F2', name='Gamma')
+        _measurement(other, code='M9')
+
+        _, rows = _list(admin, search='Gamma')
+        assert [row['code'] for row in rows] == ['M9']
+        _, rows = _list(admin, search='slag')
+        assert len(rows) == 1
+
+    def test_list_scoped(self, plant):
+        """Test users outside the company get no rows."""
+        _measurement(plant)
+        reader = get_user_model().objects.create_user(username='readonly', password='pass12345', role='reader')
+        response, rows = _list(reader)
+        assert response.status_code in (200, 403)
+        if response.status_code == 200:
+            assert rows == []
+
+    def test_db_search_fallback(self, admin, plant):
+        """Test the DB search fallback queries the read model."""
+        _measurement(plant)
+        result = SearchService().db_search(
+            view_name='measurements', query='Alpha', mode='simple', page=1, page_size=10,
+            ordering=None, user=admin, scope_filters={'factory_id': [str(plant.pk)]},
+        )
+        assert result['count'] == 1
+        assert result['results'][0]['data']['factory_display_label'] == 'Alpha'
+
+    def test_bulk_create_refreshes(self, admin, plant):
+        """Test bulk created rows appear in the read model."""
+        view = create_viewset('measurements', read_only=False).as_view({'post': 'bulk'})
+        request = factory.post('/api/measurements/bulk/', [{
+            'factory': str(plant.pk), 'dump_date': '2026-02-01', 'dump_time': '09:00:00',
+            'pot_knocks': 1, 'pot_weight_kg': '5.000', 'code': 'B1', 'name': 'Bulk',
+        }], format='json')
+        force_authenticate(request, admin)
+        response = view(request)
+
+        assert response.status_code in (200, 201), response.data
+        assert MeasurementListEntry.objects.filter(code='B1', factory_display_label='Alpha').exists()
+        assert ReadModelService.enabled('measurements', 'list')
@@ -33,7 +33,7 @@ from sopira_magic.apps.m_pot.models import Pot
 from sopira_magic.apps.m_pit.models import Pit
 from sopira_magic.apps.m_machine.models import Machine
 from sopira_magic.apps.m_camera.models import Camera
-from sopira_magic.apps.m_measurement.models import Measurement
+from sopira_magic.apps.m_measurement.models import Measurement, MeasurementListEntry
 from sopira_magic.apps.pdfviewer.models import FocusedView, Annotation
 from sopira_magic.apps.pdfviewer.serializers import (
     FocusedViewSerializer,
@@ -120,11 +120,13 @@ class ViewConfig(TypedDict, total=False):
     ordering_fields: List[str] | str  # "__all__" or specific list
     default_ordering: List[str]
     filter_fields: List[str]  # Optional list of fields that may be filtered via query params
+    partition_key: str  # Date field the table is range-partitioned by (core/partitioning.py); list/export/analytics always bound it
     
     # Features
     soft_delete: bool  # Use active=False instead of delete
     factory_scoped: bool  # [DEPRECATED/METADATA] TE legacy flag. Scoping sa určuje z SCOPING_RULES_MATRIX, NIE z tohto flagu!
     dynamic_search: bool  # Use visible columns for search
+    read_model: Dict[str, Any]  # Denormalized list table (api/read_model.py): model, sources, scope, list, search
     
     # Table state integration
     table_name: str  # For dynamic search fields
@@ -140,6 +142,8 @@ class ViewConfig(TypedDict, total=False):
     after_create: Optional[Callable]
     before_update: Optional[Callable]
     after_update: Optional[Callable]
+    after_bulk_create: Optional[Callable]  # (instances, request) - <view>/bulk/, else after_create per instance
+    after_bulk_update: Optional[Callable]  # (instances, request) - <view>/bulk/, else after_update per instance
     
     # Include unassigned records for superuser
     include_unassigned_for_superuser: bool
@@ -412,6 +416,15 @@ VIEWS_MATRIX: Dict[str, ViewConfig] = {
         },
         "select_related": ["factory", "location", "carrier", "driver", "pot", "pit", "machine"],
         "prefetch_related": ["tags__tag"],  # Avoid N+1 on tags GenericRelation
+        "partition_key": "dump_date",  # ?dump_date_from=&dump_date_to= on list/export
+        # List rows without the 7-way join (api/read_model.py; rebuild: manage.py rebuild_read_models)
+        "read_model": {
+            "model": MeasurementListEntry,
+            "sources": {"company_id": "factory__company_id"},
+            "scope": {"factory__company__users": "company__users"},
+            "list": True,
+            "search": True,
+        },
     },
     # PdfViewer focused views endpoint
     "focusedviews": {
@@ -603,6 +616,96 @@ CUSTOM_ENDPOINTS: Dict[str, CustomEndpointConfig] = {
         "cors_enabled": True,
     },
     
+    # =========================================================================
+    # Bootstrap Endpoint (app start - single round trip)
+    # =========================================================================
+    
+    "bootstrap": {
+        "path": "bootstrap/",
+        "view_function": "sopira_magic.apps.api.views_bootstrap.bootstrap_view",
+        "name": "bootstrap",
+        "methods": ["GET"],
+        "permission_classes": ["IsAuthenticated"],
+        "cors_enabled": True,
+    },
+
+    # =========================================================================
+    # Impex Endpoints (bulk import; exports are <view>/export/ on each viewset)
+    # =========================================================================
+
+    "impex-import": {
+        "path": "impex/import/",
+        "view_function": "sopira_magic.apps.api.views_impex.impex_import_view",
+        "name": "impex-import",
+        "methods": ["POST"],
+        "permission_classes": ["IsAuthenticated"],
+        "cors_enabled": True,
+    },
+
+    # =========================================================================
+    # Analytics Endpoint (grouped metrics, see analytics/query.py)
+    # =========================================================================
+
+    "analytics-query": {
+        "path": "analytics/query/",
+        "view_function": "sopira_magic.apps.api.views_analytics.analytics_query_view",
+        "name": "analytics-query",
+        "methods": ["GET", "POST"],
+        "permission_classes": ["IsAuthenticated"],
+        "cors_enabled": True,
+    },
+
+    # =========================================================================
+    # Media Endpoints (photos, videos, measurement-photos, measurement-videos)
+    # =========================================================================
+
+    "media-file": {
+        "path": "media/<str:source>/<uuid:pk>/",
+        "view_function": "sopira_magic.apps.api.views_media.media_file_view",
+        "name": "media-file",
+        "methods": ["GET", "HEAD", "POST"],
+        "permission_classes": ["IsAuthenticated"],
+        "path_params": {"source": "str", "pk": "uuid"},
+        "cors_enabled": True,
+    },
+    "media-thumbnail": {
+        "path": "media/<str:source>/<uuid:pk>/thumbnail/",
+        "view_function": "sopira_magic.apps.api.views_media.media_thumbnail_view",
+        "name": "media-thumbnail",
+        "methods": ["GET", "HEAD"],
+        "permission_classes": ["IsAuthenticated"],
+        "path_params": {"source": "str", "pk": "uuid"},
+        "cors_enabled": True,
+    },
+
+    # =========================================================================
+    # PdfViewer Endpoints (range delivery, page index, annotations per document)
+    # =========================================================================
+
+    "pdfviewer-annotations-by-document": {
+        "path": "pdfviewer/annotations/by-document/",
+        "view_function": "sopira_magic.apps.pdfviewer.views.annotations_by_document_view",
+        "name": "pdfviewer-annotations-by-document",
+        "methods": ["GET"],
+        "cors_enabled": True,
+    },
+    "pdfviewer-document-index": {
+        "path": "pdfviewer/document-index/<path:document_ref>",
+        "view_function": "sopira_magic.apps.pdfviewer.views.document_index_view",
+        "name": "pdfviewer-document-index",
+        "methods": ["GET"],
+        "path_params": {"document_ref": "path"},
+        "cors_enabled": True,
+    },
+    "pdfviewer-document": {
+        "path": "pdfviewer/documents/<path:document_ref>",
+        "view_function": "sopira_magic.apps.pdfviewer.views.document_file_view",
+        "name": "pdfviewer-document",
+        "methods": ["GET", "HEAD"],
+        "path_params": {"document_ref": "path"},
+        "cors_enabled": True,
+    },
+
     # =========================================================================
     # Models Metadata Endpoints
     # =========================================================================
@@ -745,6 +848,19 @@ CUSTOM_ENDPOINTS: Dict[str, CustomEndpointConfig] = {
         "cors_enabled": True,
     },
     
+    # =========================================================================
+    # Request Telemetry (sampled latency percentiles per view)
+    # =========================================================================
+    
+    "performance-percentiles": {
+        "path": "performance/percentiles/",
+        "view_function": "sopira_magic.apps.api.views_performance.performance_percentiles_view",
+        "name": "performance-percentiles",
+        "methods": ["GET"],
+        "permission_classes": ["IsAuthenticated"],
+        "cors_enabled": True,
+    },
+    
     # =========================================================================
     # DB Watchdog Endpoint (DEV only)
     # =========================================================================
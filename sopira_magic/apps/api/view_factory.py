@@ -22,13 +22,17 @@ Features:
 - Custom hooks (before_create, after_create, before_update, after_update)
 - Config-driven serializer selection (MySerializer fallback)
 - Scoping integration via ScopingViewSetMixin
+- Streaming export action (GET <view>/export/, impex.export)
+- Bulk create/update/delete action (<view>/bulk/, writable viewsets)
+- Lists from a denormalized read model (read_model.list, api/read_model.py)
 """
 
 import logging
 from typing import Type
 
 from django.db.models import QuerySet
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
@@ -39,6 +43,7 @@ from django.conf import settings
 DEV_MODE = getattr(settings, 'DEV_SKIP_AUTH', False)
 
 from sopira_magic.apps.scoping.middleware import ScopingViewSetMixin
+from .read_model import ReadModelService
 from .view_configs import VIEWS_MATRIX, ViewConfig
 from .permissions import IsSuperUserPermission, AccessRightsPermission
 
@@ -81,6 +86,7 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
     ordering_fields_cfg = cfg.get("ordering_fields", [])
     default_ordering_cfg = cfg.get("default_ordering", [])
     filter_fields_cfg = cfg.get("filter_fields", [])
+    partition_key_cfg = cfg.get("partition_key")
     permission_classes_cfg = cfg.get("permission_classes")
     
     # Query optimization from config
@@ -101,15 +107,23 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
         from .serializers import MySerializer
         return MySerializer.create_serializer(view_name)
 
+    def _uses_read_model(self) -> bool:
+        """List requests of views with read_model.list read the denormalized table."""
+        return getattr(self, 'action', None) == 'list' and ReadModelService.enabled(view_name, 'list')
+
     def get_queryset(self) -> QuerySet:  # type: ignore[override]
         """Dynamic queryset with optimization and filters."""
-        qs = model.objects.all()
-        
-        # Apply query optimization (select_related, prefetch_related)
-        if select_related_cfg:
-            qs = qs.select_related(*select_related_cfg)
-        if prefetch_related_cfg:
-            qs = qs.prefetch_related(*prefetch_related_cfg)
+        read_model = _uses_read_model(self)
+        if read_model:
+            qs = ReadModelService.queryset(view_name)
+        else:
+            qs = model.objects.all()
+
+            # Apply query optimization (select_related, prefetch_related)
+            if select_related_cfg:
+                qs = qs.select_related(*select_related_cfg)
+            if prefetch_related_cfg:
+                qs = qs.prefetch_related(*prefetch_related_cfg)
         
         # Apply base filters (e.g., active=True)
         if base_filters:
@@ -126,6 +140,18 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
             }
             if dynamic_filters:
                 qs = qs.filter(**dynamic_filters)
+
+        # Partitioned tables: list/export always carry a partition key bound (pruning)
+        if request is not None and partition_key_cfg and getattr(self, 'action', None) in ('list', 'export'):
+            from rest_framework.exceptions import ValidationError
+            from sopira_magic.apps.core.partitioning import partition_bounds
+            params = request.query_params
+            try:
+                qs = qs.filter(**partition_bounds(
+                    cfg, params.get(f"{partition_key_cfg}_from"), params.get(f"{partition_key_cfg}_to")
+                ))
+            except ValueError as e:
+                raise ValidationError({partition_key_cfg: str(e)})
         
         # ============================================================
         # SCOPING - Apply scoping rules to queryset
@@ -133,7 +159,7 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
         if request is not None and hasattr(request, 'user') and request.user.is_authenticated:
             try:
                 from sopira_magic.apps.scoping.engine import ScopingEngine
-                view_config = getattr(self, '_view_config', {})
+                view_config = ReadModelService.scope_config(view_name) if read_model else getattr(self, '_view_config', {})
                 qs = ScopingEngine.apply(qs, request.user, view_name, view_config)
             except Exception as e:
                 import logging
@@ -146,11 +172,56 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
     def get_serializer_class(self):
         """Return appropriate serializer for read vs write operations."""
         action = getattr(self, 'action', None)
-        if action in ['create', 'update', 'partial_update']:
+        if action in ['create', 'update', 'partial_update', 'bulk']:
             if serializer_write is not None:
                 return serializer_write
+        if _uses_read_model(self):
+            return ReadModelService.serializer(view_name)
         return _get_serializer_class()
+
+    def _search_fields(self):
+        """SearchFilter fields - read model lists search its text + label columns."""
+        return ReadModelService.search_fields(view_name) if _uses_read_model(self) else search_fields_cfg
     
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Streaming export of the list with the same scoping, filters, search and ordering.
+
+        Query params: type=csv|xlsx|ndjson, fields=a,b,c, config=<ExportConfig name>.
+        ('format' is reserved by DRF content negotiation.)
+        """
+        from sopira_magic.apps.impex.export import ExportError, ExportService
+
+        params = request.query_params
+        fields = [name.strip() for name in params.get('fields', '').split(',') if name.strip()]
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            return ExportService.stream(
+                queryset,
+                view_name,
+                export_type=params.get('type'),
+                fields=fields or None,
+                config_name=params.get('config'),
+            )
+        except ExportError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        List create (POST), partial update (PATCH) and delete (DELETE) in one request.
+
+        One validation pass, one transaction, per-item errors (see bulk.py).
+        """
+        from .bulk import BulkError, BulkService
+
+        handlers = {'POST': BulkService.create, 'PATCH': BulkService.update, 'DELETE': BulkService.delete}
+        try:
+            return handlers[request.method](self, request.data)
+        except BulkError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     def perform_create(self, serializer):
         """Create with custom before/after hooks."""
         if before_create_hook:
@@ -258,11 +329,12 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
         # Allow per-view permission overrides via config (config-driven SSOT).
         # If no permission_classes are configured, default to IsAuthenticated.
         "permission_classes": effective_permissions,
-        "search_fields": search_fields_cfg,
+        "search_fields": property(_search_fields),
         "ordering_fields": ordering_fields_cfg,
         "ordering": default_ordering_cfg,
         "get_queryset": get_queryset,
         "get_serializer_class": get_serializer_class,
+        "export": export,
         # Provide scoping metadata for ScopingViewSetMixin
         "_view_name": view_name,
         "_view_config": cfg,
@@ -274,6 +346,7 @@ def create_viewset(view_name: str, read_only: bool = True) -> Type[viewsets.View
         attrs["perform_update"] = perform_update
         attrs["update"] = update  # Custom update to inject _meta
         attrs["finalize_response"] = finalize_response  # Fallback for other actions
+        attrs["bulk"] = bulk
 
     base_class = viewsets.ReadOnlyModelViewSet if read_only else viewsets.ModelViewSet
 
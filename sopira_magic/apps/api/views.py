@@ -30,22 +30,18 @@
 
 import logging
 import time
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.renderers import BaseRenderer
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.db import connection
 
 from .models import APIKey, APIVersion, RateLimitConfig
 from sopira_magic.apps.pdfviewer.services import PdfViewerService
-from sopira_magic.apps.accessrights.services import (
-    can_view_menu,
-    get_access_matrix_for_user,
-)
 from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
 from sopira_magic.apps.m_user.models import UserPreference
 # TEMP: TableState removed, zakomentované pre migráciu
@@ -62,8 +58,9 @@ from sopira_magic.apps.generator.api import (
     generator_objects_view_impl,
     generator_progress_status_view_impl,
     generator_progress_cancel_view_impl,
+    generator_progress_event_stream,
 )
-from django.http import StreamingHttpResponse
+from django.http import JsonResponse, StreamingHttpResponse
 import json
 import time
 
@@ -152,14 +149,6 @@ def assign_focused_view(request):
         status=status.HTTP_200_OK,
     )
 
-class EventStreamRenderer(BaseRenderer):
-    media_type = "text/event-stream"
-    format = "event-stream"
-
-    def render(self, data, accepted_media_type=None, renderer_context=None):
-        return data
-
-
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def generator_progress_status_view(request, job_id: str):
@@ -183,28 +172,38 @@ def generator_progress_cancel_view(request, job_id: str):
     return generator_progress_cancel_view_impl(job_id)
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-@renderer_classes([EventStreamRenderer])
-def generator_progress_stream_view(request, job_id: str):
+def _authenticate_api_request(request):
+    """Run the DRF authenticators for a plain Django request (None = invalid credentials)."""
+    from rest_framework.exceptions import APIException
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        return drf_request.user
+    except APIException:
+        return None
+
+
+async def generator_progress_stream_view(request, job_id: str):
     """
     SSE stream pre progress jobu.
+
+    Async view: awaits pushes from the progress bus instead of polling, so a
+    long job does not pin a worker thread. Requires the ASGI deployment
+    (uvicorn workers on sopira_magic.asgi, see README); under WSGI Django
+    would consume the async stream in a worker thread.
+
+    Authenticates with the same DRF authentication classes as the other
+    API views (DEFAULT_AUTHENTICATION_CLASSES), not only the session.
     """
-    from sopira_magic.apps.generator.progress_state import get_status
-
-    def event_stream():
-        last_payload = None
-        while True:
-            payload = get_status(job_id)
-            if payload and payload != last_payload:
-                yield f"data: {json.dumps(payload)}\n\n"
-                last_payload = payload
-                if payload.get("done") or payload.get("cancel_requested") or payload.get("error"):
-                    break
-            time.sleep(1)
+    user = await sync_to_async(_authenticate_api_request)(request)
+    if user is None or not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=status.HTTP_403_FORBIDDEN)
 
-    resp = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+    resp = StreamingHttpResponse(generator_progress_event_stream(job_id), content_type="text/event-stream")
     resp["Cache-Control"] = "no-cache"
+    resp["X-Accel-Buffering"] = "no"
     return resp
 
 
@@ -213,46 +212,22 @@ def generator_progress_stream_view(request, job_id: str):
 def accessrights_matrix_view(request):
     """
     Read-only endpoint pre FE: vráti menu + actions + dependencies pre aktuálneho usera.
+    Strong ETag (compiled role matrix + menu dependencies): If-None-Match → 304.
     """
     from sopira_magic.apps.accessrights.services import check_menu_dependencies
-    from sopira_magic.apps.accessrights.config import EMPTY_STATE_MESSAGES
-    
-    user = request.user
+    from sopira_magic.apps.api.bootstrap import accessrights_etag, accessrights_payload, etag_matches
+    from sopira_magic.apps.scoping import shared_scope_resolution
 
-    # Zoznam menu položiek používaných vo FE
-    menu_keys = [
-        "dashboard",
-        "measurements",
-        "companies",
-        "factories",
-        "locations",
-        "carriers",
-        "drivers",
-        "pots",
-        "pits",
-        "machines",
-        "cameras",
-        "users",
-    ]
+    with shared_scope_resolution():
+        menu_dependencies = check_menu_dependencies(request.user)
 
-    # Actions pre všetky viewsety z VIEWS_MATRIX
-    actions = get_access_matrix_for_user(user, VIEWS_MATRIX)
+    etag = accessrights_etag(request.user, menu_dependencies)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("If-None-Match", ""), etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    # Menu viditeľnosť
-    menu = {key: can_view_menu(key, user) for key in menu_keys}
-    
-    # Menu dependencies (has_companies, has_factories)
-    menu_dependencies = check_menu_dependencies(user)
-
-    return Response(
-        {
-            "menu": menu,
-            "actions": actions,
-            "menu_dependencies": menu_dependencies,
-            "empty_state_messages": EMPTY_STATE_MESSAGES,
-        },
-        status=status.HTTP_200_OK,
-    )
+    payload = accessrights_payload(request.user, menu_dependencies)
+    return Response(payload, status=status.HTTP_200_OK, headers=headers)
 
 
 @api_view(["GET", "POST", "PUT"])
@@ -266,22 +241,10 @@ def user_preferences_view(request):
     user = request.user
     
     if request.method == "GET":
-        try:
-            preference = UserPreference.objects.get(user=user)
-            # Merge settings and preferences into a single response
-            response_data = {
-                **preference.settings,
-                **preference.preferences,
-            }
-            return Response(response_data, status=status.HTTP_200_OK)
-        except UserPreference.DoesNotExist:
-            # Return empty preferences if none exist
-            return Response(
-                {
-                    "general_settings": {},
-                },
-                status=status.HTTP_200_OK,
-            )
+        from sopira_magic.apps.api.bootstrap import user_preferences_payload
+
+        # Merged settings + preferences (empty general_settings if none exist)
+        return Response(user_preferences_payload(user), status=status.HTTP_200_OK)
     
     elif request.method in ["POST", "PUT"]:
         data = request.data or {}
@@ -468,25 +431,9 @@ def models_metadata_view(request):
     Models metadata endpoint.
     Returns metadata from VIEWS_MATRIX (ownership_field, etc.)
     """
-    metadata = {}
-    
-    for view_name, config in VIEWS_MATRIX.items():
-        model_metadata = {}
-        
-        # Extract ownership_field from ownership_hierarchy
-        ownership_hierarchy = config.get("ownership_hierarchy", [])
-        if ownership_hierarchy:
-            # First field in hierarchy is typically the ownership field
-            model_metadata["ownership_field"] = ownership_hierarchy[0]
-        
-        # Add other metadata if needed
-        if config.get("factory_scoped"):
-            model_metadata["factory_scoped"] = True
-        if config.get("soft_delete"):
-            model_metadata["soft_delete"] = True
-        
-        if model_metadata:
-            metadata[view_name] = model_metadata
+    from sopira_magic.apps.api.bootstrap import models_metadata_payload
+
+    metadata = models_metadata_payload()
     
     return Response(metadata, status=status.HTTP_200_OK)
 
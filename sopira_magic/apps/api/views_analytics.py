@@ -0,0 +1,50 @@
+#*........................................................
+#*       sopira_magic/apps/api/views_analytics.py
+#*       Analytics API endpoints - grouped metrics, columnar JSON
+#*........................................................
+
+from django.core.exceptions import PermissionDenied
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from sopira_magic.apps.analytics.query import AnalyticsQueryError, AnalyticsService, query_from_params
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def analytics_query_view(request):
+    """
+    Grouped metrics over a VIEWS_MATRIX view (settings.ANALYTICS_VIEWS),
+    computed in the database with the user's scope applied.
+
+    POST body (GET: same keys as query params, lists comma separated,
+    filters as JSON):
+    {
+        "view": "measurements",
+        "group_by": ["pot_side", "dump_date__month"],
+        "metrics": ["count", "roi_temp_max_c__avg", "pot_weight_kg__p90"],
+        "filters": {"dump_date__gte": "2026-01-01", "factory__in": ["..."]},
+        "labels": true
+    }
+
+    Response format (columnar - one array per column):
+    {
+        "view": "measurements",
+        "columns": ["pot_side", "dump_date__month", "count", ...],
+        "data": [["FRONT", "BACK"], ["2026-01-01", "2026-01-01"], [412, 388], ...],
+        "rows": 2,
+        "labels": {"factory": {"<uuid>": "Plant A"}}
+    }
+    """
+    try:
+        query = request.data if request.method == 'POST' else query_from_params(request.query_params)
+        if not isinstance(query, dict):
+            raise AnalyticsQueryError('Request body must be a JSON object')
+        result = AnalyticsService.run(request.user, query)
+    except AnalyticsQueryError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except PermissionDenied as e:
+        return Response({'detail': str(e)}, status=status.HTTP_403_FORBIDDEN)
+    return Response(result, status=status.HTTP_200_OK)
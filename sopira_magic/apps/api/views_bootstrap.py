@@ -0,0 +1,42 @@
+#*........................................................
+#*       sopira_magic/apps/api/views_bootstrap.py
+#*       Bootstrap API endpoint - all app start data in one request
+#*........................................................
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from sopira_magic.apps.api.bootstrap import BootstrapService, etag_matches
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap_view(request):
+    """
+    Returns everything the frontend needs on app start in one response.
+
+    Replaces separate calls to accessrights/matrix/, user/preferences/,
+    models/metadata/, mystate/default/ (per scope) and fk-options-cache/
+    (per field). Supports If-None-Match: unchanged data returns 304.
+
+    Response format:
+    {
+        "version": "W/\"3f1c...\"",
+        "accessrights": {"menu": {...}, "actions": {...}, "menu_dependencies": {...},
+                         "empty_state_messages": {...}},
+        "user_preferences": {"general_settings": {...}, ...},
+        "models_metadata": {"factories": {"ownership_field": "company", ...}, ...},
+        "default_presets": {"table:companies": {<SavedState>}, ...},
+        "fk_options": {"companies": {"options": [...], "count": 3, "factories_count": 0}, ...}
+    }
+    """
+    etag = BootstrapService.etag(request.user)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+    if etag_matches(request.headers.get('If-None-Match', ''), etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    payload = BootstrapService.build(request.user, request)
+    return Response({'version': etag, **payload}, status=status.HTTP_200_OK, headers=headers)
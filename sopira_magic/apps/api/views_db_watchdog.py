@@ -3,36 +3,35 @@
 #*       DB Watchdog API endpoint - exposes query metrics
 #*........................................................
 
+import logging
+import threading
+from collections import deque
+
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.db import connection
-import logging
 
 logger = logging.getLogger(__name__)
 
-# In-memory storage for recent high DB usage warnings (last 50)
-_recent_warnings = []
+# In-memory storage for recent query inspector reports (last 50, newest first)
 MAX_WARNINGS = 50
+_recent_warnings = deque(maxlen=MAX_WARNINGS)
+_lock = threading.Lock()
 
 
-def log_high_db_usage(method: str, path: str, query_count: int, top_queries: list):
+def record_report(report: dict):
     """
-    Called by DatabaseDebugMiddleware to log high DB usage.
-    Stores warning in memory for dashboard display.
+    Called by QueryInspectorMiddleware (apps/logging/query_inspector.py)
+    for requests with N+1 patterns or high query counts.
+    Stores the structured report in memory for dashboard display.
     """
-    warning = {
-        "timestamp": __import__('datetime').datetime.now().isoformat(),
-        "method": method,
-        "path": path,
-        "query_count": query_count,
-        "top_queries": top_queries[:3],  # Only top 3
-    }
-    
-    _recent_warnings.insert(0, warning)
-    
-    # Keep only last MAX_WARNINGS
-    if len(_recent_warnings) > MAX_WARNINGS:
-        _recent_warnings.pop()
+    with _lock:
+        _recent_warnings.appendleft(report)
+
+
+def clear_reports():
+    """Discard stored reports (tests)."""
+    with _lock:
+        _recent_warnings.clear()
 
 
 @api_view(['GET'])
@@ -47,9 +46,23 @@ def db_watchdog_view(request):
                 "timestamp": "2025-12-13T23:45:00",
                 "method": "GET",
                 "path": "/api/factories/",
+                "view": "factories",
                 "query_count": 24,
+                "db_ms": {"default": 12.4, "state": 0.8},
+                "distinct_queries": 3,
+                "n_plus_one": [
+                    {
+                        "fingerprint": "SELECT ... WHERE \"id\" = ?",
+                        "count": 20,
+                        "total_ms": 9.1,
+                        "alias": "default",
+                        "serializer": "FactorySerializer",
+                        "field": "company_name",
+                        "sample_sql": "SELECT ... (truncated)"
+                    }
+                ],
                 "top_queries": [
-                    {"time": "0.002s", "sql": "SELECT ... (truncated)"},
+                    {"time": "0.009s", "count": 20, "sql": "SELECT ... (truncated)"},
                     ...
                 ]
             },
@@ -58,8 +71,10 @@ def db_watchdog_view(request):
         "total": 10
     }
     """
+    with _lock:
+        warnings = list(_recent_warnings)
     return Response({
-        "warnings": _recent_warnings,
-        "total": len(_recent_warnings),
+        "warnings": warnings,
+        "total": len(warnings),
     })
 
@@ -0,0 +1,56 @@
+#*........................................................
+#*       sopira_magic/apps/api/views_impex.py
+#*       Impex API endpoints - ImportConfig-driven bulk import
+#*........................................................
+
+import re
+
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from sopira_magic.apps.impex.importer import ImportAborted, ImportConfigError, ImportService
+
+JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def impex_import_view(request):
+    """
+    Bulk import of an uploaded file according to an ImportConfig.
+
+    Multipart fields:
+    - file: csv / xlsx / json / xml file
+    - config: ImportConfig name (format, target view, column mapping, ...)
+    - job_id: optional client-generated id (uuid4 hex), lets the client follow
+      progress on generator/progress/<job_id>/stream/ while the upload runs
+
+    Requires accessrights "add" on the target view ("edit" for upserts).
+
+    Response format:
+    {
+        "job_id": "3f1c...", "view": "measurements", "cancelled": false,
+        "created": 1200, "updated": 35, "skipped": 2,
+        "errors": [{"row": 17, "field": "factory", "message": "'XX' not found"}],
+        "ignored_columns": ["Remark"]
+    }
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'detail': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    job_id = request.data.get('job_id') or None
+    if job_id is not None and not JOB_ID_RE.match(job_id):
+        return Response({'detail': 'job_id must be a uuid4 hex string'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        config = ImportService.get_config(request.data.get('config'))
+        result = ImportService.run(upload, config, user=request.user, job_id=job_id)
+    except ImportConfigError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ImportAborted as e:
+        return Response({'detail': str(e), 'errors': e.errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,138 @@
+#*........................................................
+#*       sopira_magic/apps/api/views_media.py
+#*       Media API endpoints - Photo / Video / Measurement files
+#*       Range + conditional GET, cached thumbnails, dedup upload
+#*........................................................
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from sopira_magic.apps.file_storage.engine import (
+    MEDIA_SOURCES,
+    DerivativeUnavailable,
+    StorageEngine,
+    StorageError,
+    UnsupportedContent,
+)
+from sopira_magic.apps.file_storage.serving import file_response
+
+# Media inherit visibility from their measurement (User -> Company -> Factory -> Measurement)
+SCOPE_VIEW = 'measurements'
+
+
+def _get_instance(request, source, pk, action):
+    """Instance of MEDIA_SOURCES[source] if its measurement is in the user's scope, else None."""
+    from sopira_magic.apps.accessrights.services import can_access
+    from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+    from sopira_magic.apps.scoping.engine import ScopingEngine
+
+    if source not in MEDIA_SOURCES or not can_access(SCOPE_VIEW, action, request.user):
+        return None
+    model = StorageEngine.source_model(source)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return None
+    config = VIEWS_MATRIX[SCOPE_VIEW]
+    measurement_id = instance.pk if model is config['model'] else instance.measurement_id
+    if measurement_id is None:
+        return instance if request.user.is_superuser else None
+    scoped = ScopingEngine.apply(
+        config['model']._default_manager.filter(pk=measurement_id), request.user, SCOPE_VIEW, config
+    )
+    return instance if scoped.exists() else None
+
+
+def _not_found(detail='Not found.'):
+    return Response({'detail': detail}, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['GET', 'HEAD', 'POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def media_file_view(request, source, pk):
+    """
+    GET/HEAD: original media file (photos, videos, measurement-photos, measurement-videos).
+
+    Supports Range (206 / 416), If-None-Match / If-Modified-Since (304) and
+    If-Range; the file is sent with FileResponse (sendfile) or handed to the
+    web server via FILE_STORAGE_SENDFILE_HEADER.
+
+    POST (photos, videos): multipart "file" - stored content-addressed,
+    identical content is stored once. Requires "edit" on measurements.
+    The type is sniffed from the bytes (image/* for photos, video/* for
+    videos); other content is rejected with 415.
+
+    Response format (POST):
+    {"id": "...", "sha256": "ab12...", "file_size": 52311, "deduplicated": false}
+    """
+    action = 'edit' if request.method == 'POST' else 'view'
+    instance = _get_instance(request, source, pk, action)
+    if instance is None:
+        return _not_found()
+
+    if request.method == 'POST':
+        if MEDIA_SOURCES[source].get('file_field'):
+            return Response({'detail': 'Upload is supported for photos and videos only'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            stored = StorageEngine.attach(instance, upload)
+        except UnsupportedContent as e:
+            return Response({'detail': str(e)}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        return Response({
+            'id': str(instance.pk),
+            'sha256': stored.digest,
+            'file_size': stored.size,
+            'deduplicated': not stored.created,
+        }, status=status.HTTP_201_CREATED if stored.created else status.HTTP_200_OK)
+
+    try:
+        media = StorageEngine.source(source, instance)
+    except StorageError as e:
+        return _not_found(str(e))
+    return file_response(
+        request, media.path, media.content_type,
+        etag=media.etag, last_modified=media.last_modified, filename=media.filename,
+    )
+
+
+@api_view(['GET', 'HEAD'])
+@permission_classes([IsAuthenticated])
+def media_thumbnail_view(request, source, pk):
+    """
+    Cached JPEG thumbnail (images) / poster frame (videos).
+
+    Query params:
+    - size: longest side in px, one of MEDIA_THUMBNAIL_SIZES (default 256)
+
+    Built once on first request, then served from the derivative cache with
+    the same conditional GET handling as the original.
+    """
+    instance = _get_instance(request, source, pk, 'view')
+    if instance is None:
+        return _not_found()
+    try:
+        size = int(request.query_params.get('size', 256))
+    except ValueError:
+        return Response({'detail': 'size must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    if size not in StorageEngine.thumbnail_sizes():
+        return Response({'detail': f'size must be one of {list(StorageEngine.thumbnail_sizes())}'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        thumbnail = StorageEngine.thumbnail(StorageEngine.source(source, instance), size)
+    except DerivativeUnavailable as e:
+        return _not_found(f'Thumbnail not available: {e}')
+    except StorageError as e:
+        return _not_found(str(e))
+    return file_response(
+        request, thumbnail.path, thumbnail.content_type,
+        etag=thumbnail.etag, last_modified=thumbnail.last_modified,
+        max_age=getattr(settings, 'MEDIA_THUMBNAIL_MAX_AGE', 86400),
+    )
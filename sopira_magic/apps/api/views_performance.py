@@ -0,0 +1,52 @@
+#*........................................................
+#*       sopira_magic/apps/api/views_performance.py
+#*       Performance API endpoint - request latency percentiles
+#*........................................................
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from sopira_magic.apps.logging.telemetry import TelemetryService
+
+MAX_WINDOW_MINUTES = 7 * 24 * 60
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def performance_percentiles_view(request):
+    """
+    Returns sampled request latency percentiles per VIEWS_MATRIX view.
+
+    Query params:
+    - window: minutes to look back (default 60, max 7 days)
+    - view: restrict to one or more views (repeatable)
+    - include_custom=1: include CUSTOM_ENDPOINTS routes
+
+    Response format:
+    {
+        "window_minutes": 60,
+        "views": {
+            "factories": {
+                "count": 120, "p50": 12.4, "p95": 48.0, "p99": 91.2,
+                "mean_ms": 17.3, "max_ms": 120.5, "queries_mean": 4.0,
+                "db_ms_mean": {"default": 3.1, "state": 0.4},
+                "serializer_ms_mean": 5.2
+            },
+            ...
+        }
+    }
+    """
+    try:
+        window = int(request.query_params.get('window', 60))
+    except (TypeError, ValueError):
+        return Response({"detail": "window must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    window = min(max(window, 1), MAX_WINDOW_MINUTES)
+
+    views = request.query_params.getlist('view') or None
+    include_custom = request.query_params.get('include_custom') in ('1', 'true')
+    return Response({
+        "window_minutes": window,
+        "views": TelemetryService.percentiles(window, views=views, include_custom=include_custom),
+    })
@@ -16,6 +16,10 @@
    - Verbose name: Audit
    - Default auto field: BigAutoField
    - Database: logging (separate from PRIMARY)
+
+   Startup:
+   - ready() attaches field-level change capture to VIEWS_MATRIX models
+     (capture.py → pipeline.py → logging.AuditLog)
    
    Important:
    - NO HARDCODING: All solutions must be universal and config-driven
@@ -29,3 +33,7 @@ class AuditConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sopira_magic.apps.audit'
     verbose_name = 'Audit'
+
+    def ready(self):
+        from .capture import register_model_audit
+        register_model_audit()
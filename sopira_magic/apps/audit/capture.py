@@ -0,0 +1,190 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/audit/capture.py
+#   Audit Capture - Field-level change capture for VIEWS_MATRIX models
+#   Snapshot on load (from_db), diff on save - no extra SELECT
+#..............................................................
+
+"""
+   Audit Capture - Field-Level Change Capture.
+
+   Records CREATE / UPDATE / DELETE events with field diffs for every model
+   in VIEWS_MATRIX, without reading the old row before save:
+
+   - Model.from_db is wrapped to keep the (field_names, values) tuple the ORM
+     already has when it builds an instance (JSON values are deep-copied so
+     in-place mutations are still detected)
+   - post_save compares current attribute values against that snapshot
+     (restricted to update_fields when given) and buffers only changed fields
+   - the snapshot is refreshed after each save, so repeated saves diff correctly
+   - auto_now fields are skipped, AUDIT_MASKED_FIELDS are recorded as '***'
+
+   Events go to AuditPipeline (ring buffer + background flusher).
+
+   Registration (called from AuditConfig.ready):
+   ```python
+   from sopira_magic.apps.audit.capture import register_model_audit
+   register_model_audit()
+   ```
+"""
+
+import copy
+import logging
+from functools import partial
+from typing import Dict, FrozenSet, Tuple
+
+from django.conf import settings
+from django.db.models import JSONField
+from django.db.models.signals import post_delete, post_save
+
+from .pipeline import AuditPipeline
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ATTR = '_audit_snapshot'
+MASKED_VALUE = '***'
+DEFAULT_MASKED_FIELDS = ('password',)
+
+# Never audit the audit/log storage itself
+EXCLUDED_APP_LABELS = frozenset({'logging', 'audit', 'state', 'mystate'})
+
+
+class _ModelSpec:
+    """Per-model capture settings computed once at registration."""
+
+    __slots__ = ('attnames', 'skipped', 'masked', 'json_attnames')
+
+    def __init__(self, model):
+        fields = model._meta.concrete_fields
+        self.attnames: Tuple[str, ...] = tuple(f.attname for f in fields)
+        self.skipped: FrozenSet[str] = frozenset(
+            f.attname for f in fields if getattr(f, 'auto_now', False) or f.primary_key
+        )
+        self.masked: FrozenSet[str] = frozenset(
+            getattr(settings, 'AUDIT_MASKED_FIELDS', DEFAULT_MASKED_FIELDS)
+        )
+        self.json_attnames: FrozenSet[str] = frozenset(
+            f.attname for f in fields if isinstance(f, JSONField)
+        )
+
+
+_specs: Dict[type, _ModelSpec] = {}
+
+
+def _snapshot(spec: _ModelSpec, field_names, values) -> Dict[str, object]:
+    if not spec.json_attnames:
+        return dict(zip(field_names, values))
+    return {
+        name: copy.deepcopy(value) if name in spec.json_attnames else value
+        for name, value in zip(field_names, values)
+    }
+
+
+def _wrap_from_db(model) -> None:
+    original = model.from_db
+    if getattr(original, '_audit_wrapped', False):
+        return
+    original_func = original.__func__
+
+    def from_db(cls, db, field_names, values):
+        instance = original_func(cls, db, field_names, values)
+        spec = _specs.get(cls)
+        if spec is not None:
+            instance.__dict__[SNAPSHOT_ATTR] = _snapshot(spec, field_names, values)
+        return instance
+
+    from_db._audit_wrapped = True
+    model.from_db = classmethod(from_db)
+
+
+def _current_values(instance, spec: _ModelSpec, names) -> Dict[str, object]:
+    values = {}
+    for name in names:
+        if name in instance.__dict__:  # deferred fields are not loaded - skip them
+            values[name] = instance.__dict__[name]
+    return _snapshot(spec, values.keys(), values.values())
+
+
+def _field_names(instance, spec: _ModelSpec, update_fields=None):
+    if update_fields is None:
+        return spec.attnames
+    return [
+        f.attname for f in instance._meta.concrete_fields
+        if f.name in update_fields or f.attname in update_fields
+    ]
+
+
+def diff(instance, spec: _ModelSpec, update_fields=None) -> Tuple[Tuple[str, object, object], ...]:
+    """Changed fields since load/last save: ((field, old, new), ...)."""
+    before = instance.__dict__.get(SNAPSHOT_ATTR)
+    if before is None:
+        return ()
+    changes = []
+    for name in _field_names(instance, spec, update_fields):
+        if name in spec.skipped or name not in before or name not in instance.__dict__:
+            continue
+        old, new = before[name], instance.__dict__[name]
+        if old != new:
+            if name in spec.masked:
+                old, new = MASKED_VALUE, MASKED_VALUE
+            changes.append((name, old, new))
+    return tuple(changes)
+
+
+def _on_save(spec: _ModelSpec, sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        AuditPipeline.record('CREATE', instance)
+    else:
+        had_snapshot = SNAPSHOT_ATTR in instance.__dict__
+        changes = diff(instance, spec, update_fields)
+        if changes or not had_snapshot:
+            # No snapshot (instance not loaded from DB) -> UPDATE without field diff
+            extra = None if had_snapshot else {'fields': sorted(update_fields) if update_fields else '*'}
+            AuditPipeline.record('UPDATE', instance, changes=changes, extra=extra)
+
+    # Refresh snapshot so the next save diffs against the saved state
+    snapshot = instance.__dict__.get(SNAPSHOT_ATTR) or {}
+    snapshot.update(_current_values(instance, spec, _field_names(instance, spec, update_fields)))
+    instance.__dict__[SNAPSHOT_ATTR] = snapshot
+
+
+def record_bulk(instances, created: bool, update_fields=None) -> None:
+    """Audit bulk_create / bulk_update writes (they send no post_save)."""
+    for instance in instances:
+        spec = _specs.get(type(instance))
+        if spec is not None:
+            _on_save(spec, type(instance), instance, created, update_fields=update_fields)
+
+
+def _on_delete(sender, instance, **kwargs):
+    AuditPipeline.record('DELETE', instance)
+
+
+def audited_models():
+    """Distinct concrete models referenced by VIEWS_MATRIX (minus log storage apps)."""
+    from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+
+    models = []
+    for cfg in VIEWS_MATRIX.values():
+        model = cfg.get('model')
+        if model is None or model in models:
+            continue
+        if model._meta.abstract or model._meta.proxy or model._meta.app_label in EXCLUDED_APP_LABELS:
+            continue
+        models.append(model)
+    return models
+
+
+def register_model_audit() -> None:
+    """Attach diff capture to all VIEWS_MATRIX models (called from apps.ready)."""
+    if not getattr(settings, 'AUDIT_MODEL_CHANGES', True):
+        return
+
+    for model in audited_models():
+        spec = _specs[model] = _ModelSpec(model)
+        _wrap_from_db(model)
+        uid = f'audit_capture_{model._meta.label_lower}'
+        post_save.connect(partial(_on_save, spec), sender=model, weak=False, dispatch_uid=f'{uid}_save')
+        post_delete.connect(_on_delete, sender=model, weak=False, dispatch_uid=f'{uid}_delete')
+    logger.debug(f"[AUDIT] Change capture registered for {len(_specs)} models")
@@ -0,0 +1,29 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/audit/middleware.py
+#   Audit Context Middleware - Request context for audit events
+#..............................................................
+
+"""
+   Audit Context Middleware - Request Context for Audit Events.
+
+   Stores the current request in a context variable so audit events recorded
+   anywhere during the request (model saves, auth actions) carry user, IP and
+   user agent. AuditPipeline.record() resolves those values on the request
+   thread when the event is recorded; the flusher only receives plain values.
+"""
+
+from .pipeline import current_request
+
+
+class AuditContextMiddleware:
+    """Expose the current request to AuditPipeline.record()."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
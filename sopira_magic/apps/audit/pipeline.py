@@ -0,0 +1,337 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/audit/pipeline.py
+#   Audit Pipeline - Asynchronous audit logging
+#   In-process ring buffer + background flusher into logging.AuditLog
+#..............................................................
+
+"""
+   Audit Pipeline - Asynchronous Audit Logging.
+
+   The request path only appends a small tuple to an in-process ring buffer;
+   a background flusher thread turns buffered events into AuditLog rows and
+   writes them with bulk_create into the LOGGING database in batches.
+
+   Flow:
+   1. AuditPipeline.record() / record_auth() / capture hooks (capture.py)
+      → append (action, model label, pk, changes, actor, timestamp)
+   2. Flusher thread wakes every AUDIT_FLUSH_INTERVAL seconds (or when a batch
+      is full), resolves content types and bulk-inserts AUDIT_BATCH_SIZE rows
+      per INSERT
+   3. The flusher starts after the first recording transaction commits;
+      remaining events are flushed at interpreter exit (atexit)
+
+   Overflow policy (AUDIT_OVERFLOW_POLICY, buffer = AUDIT_BUFFER_SIZE events):
+   - drop_oldest: ring buffer semantics, newest events win (default)
+   - drop_newest: keep the backlog, reject new events
+   - block:       wait up to AUDIT_BLOCK_TIMEOUT seconds for space, then drop newest
+   - flush:       flush synchronously on the caller thread (no loss, adds latency)
+   Dropped events are counted and reported by the flusher.
+
+   Request context comes from AuditContextMiddleware and is captured as plain
+   values (user id, username, IP, user agent) on the request thread at record
+   time; the buffer never holds request or lazy user objects.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.audit.pipeline import AuditPipeline
+
+   AuditPipeline.record('DELETE', instance)
+   AuditPipeline.record_auth('LOGIN', user=user, success=True, ip_address=ip)
+   AuditPipeline.flush()  # tests / management commands
+   ```
+"""
+
+import atexit
+import contextvars
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0  # seconds
+BLOCK_TIMEOUT = 0.05  # seconds
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block', 'flush')
+
+MAX_VALUE_LENGTH = 10000
+
+# Current request (set by AuditContextMiddleware, read at record time)
+current_request: contextvars.ContextVar = contextvars.ContextVar('audit_request', default=None)
+
+# Actor: (user_id, username, ip_address, user_agent) - plain values
+AuditActor = Tuple[Any, str, Optional[str], str]
+
+# Buffered event: (action, model_label, object_id, changes, actor, timestamp, extra)
+#   changes = ((field_name, old_value, new_value), ...) or ()
+AuditEvent = Tuple[str, str, Any, tuple, AuditActor, datetime, Optional[dict]]
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+class AuditPipeline:
+    """Ring buffer + background flusher for AuditLog rows."""
+
+    _lock = threading.Lock()
+    _not_full = threading.Condition(_lock)
+    _wakeup = threading.Event()
+    _buffer: deque = deque(maxlen=BUFFER_SIZE)
+    _dropped = 0
+    _flusher: Optional[threading.Thread] = None
+
+    # -------------------------
+    # Producer side (request path)
+    # -------------------------
+    @classmethod
+    def enabled(cls) -> bool:
+        return _setting('AUDIT_PIPELINE_ENABLED', True)
+
+    @classmethod
+    def record(
+        cls,
+        action: str,
+        instance=None,
+        changes: tuple = (),
+        model_label: str = '',
+        object_id: Any = None,
+        user=None,
+        extra: Optional[dict] = None,
+    ) -> bool:
+        """Buffer one audit event. Returns False if the event was dropped."""
+        if not cls.enabled():
+            return False
+        if instance is not None:
+            model_label = instance._meta.label
+            object_id = instance.pk
+        # Resolve on the request thread: request.user is lazy and tied to it
+        actor = _resolve_context(user if user is not None else current_request.get(), extra)
+        return cls._append((action, model_label, object_id, changes, actor, timezone.now(), extra))
+
+    @classmethod
+    def record_auth(cls, action: str, user=None, success: bool = True, **kwargs) -> bool:
+        """Buffer an authentication event (AuthEngine._log_audit)."""
+        extra = {'success': success, **{k: v for k, v in kwargs.items() if v is not None}}
+        model_label = user._meta.label if user is not None else ''
+        object_id = user.pk if user is not None else None
+        return cls.record(action, model_label=model_label, object_id=object_id, user=user, extra=extra)
+
+    @classmethod
+    def _append(cls, event: AuditEvent) -> bool:
+        policy = _setting('AUDIT_OVERFLOW_POLICY', 'drop_oldest')
+        flush_first = False
+        with cls._lock:
+            cls._resize()
+            if len(cls._buffer) >= cls._buffer.maxlen:
+                if policy == 'flush':
+                    flush_first = True
+                elif policy == 'drop_newest':
+                    cls._dropped += 1
+                    return False
+                elif policy == 'block':
+                    cls._wakeup.set()
+                    if not cls._not_full.wait_for(
+                        lambda: len(cls._buffer) < cls._buffer.maxlen,
+                        timeout=_setting('AUDIT_BLOCK_TIMEOUT', BLOCK_TIMEOUT),
+                    ):
+                        cls._dropped += 1
+                        return False
+                else:
+                    cls._dropped += 1  # drop_oldest: deque(maxlen) evicts the oldest event
+            if not flush_first:
+                cls._buffer.append(event)
+                batch_ready = len(cls._buffer) >= _setting('AUDIT_BATCH_SIZE', BATCH_SIZE)
+
+        if flush_first:
+            # Caller pays the write - nothing is lost
+            cls.flush()
+            with cls._lock:
+                cls._buffer.append(event)
+            return True
+
+        if batch_ready:
+            cls._wakeup.set()
+        cls._ensure_flusher()
+        return True
+
+    @classmethod
+    def _resize(cls):
+        size = _setting('AUDIT_BUFFER_SIZE', BUFFER_SIZE)
+        if cls._buffer.maxlen != size:
+            cls._buffer = deque(cls._buffer, maxlen=size)
+
+    # -------------------------
+    # Consumer side (flusher)
+    # -------------------------
+    @classmethod
+    def _take(cls, limit: int) -> List[AuditEvent]:
+        with cls._lock:
+            count = min(limit, len(cls._buffer))
+            events = [cls._buffer.popleft() for _ in range(count)]
+            if events:
+                cls._not_full.notify_all()
+        return events
+
+    @classmethod
+    def flush(cls) -> int:
+        """Write all buffered events to AuditLog. Returns number of rows written."""
+        batch_size = _setting('AUDIT_BATCH_SIZE', BATCH_SIZE)
+        written = 0
+        while True:
+            events = cls._take(batch_size)
+            if not events:
+                break
+            try:
+                written += cls._write(events)
+            except Exception as e:
+                logger.error(f"[AUDIT] Failed to write {len(events)} audit events: {e}", exc_info=True)
+
+        with cls._lock:
+            dropped, cls._dropped = cls._dropped, 0
+        if dropped:
+            logger.warning(f"[AUDIT] Buffer overflow - dropped {dropped} audit events")
+        return written
+
+    @staticmethod
+    def _write(events: List[AuditEvent]) -> int:
+        from django.apps import apps
+        from django.contrib.contenttypes.models import ContentType
+        from sopira_magic.apps.logging.models import AuditLog
+
+        content_types: Dict[str, Any] = {}
+        rows = []
+        for action, model_label, object_id, changes, actor, at, extra in events:
+            if model_label and model_label not in content_types:
+                try:
+                    content_types[model_label] = ContentType.objects.get_for_model(apps.get_model(model_label)).pk
+                except (LookupError, ValueError):
+                    content_types[model_label] = None
+            user_id, username, ip_address, user_agent = actor
+            extra_data = _jsonable(extra or {})
+            uuid_id = _as_uuid(object_id)
+            if uuid_id is None and object_id is not None:
+                extra_data['object_pk'] = str(object_id)  # non-UUID primary keys
+            base = dict(
+                action=action,
+                user_id=user_id,
+                username=username,
+                content_type_id=content_types.get(model_label),  # cross-DB: id only
+                object_id=uuid_id,
+                model_name=model_label,
+                timestamp=at,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                extra_data=extra_data,
+            )
+            if not changes:
+                rows.append(AuditLog(**base))
+            for field_name, old_value, new_value in changes:
+                rows.append(AuditLog(
+                    **base,
+                    field_name=field_name,
+                    old_value=_as_text(old_value),
+                    new_value=_as_text(new_value),
+                ))
+
+        AuditLog.objects.bulk_create(rows, batch_size=_setting('AUDIT_BATCH_SIZE', BATCH_SIZE))
+        return len(rows)
+
+    @classmethod
+    def pending(cls) -> int:
+        with cls._lock:
+            return len(cls._buffer)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Discard buffered events (tests)."""
+        with cls._lock:
+            cls._buffer.clear()
+            cls._dropped = 0
+
+    # -------------------------
+    # Background flusher thread
+    # -------------------------
+    @classmethod
+    def _ensure_flusher(cls):
+        if cls._flusher is not None and cls._flusher.is_alive():
+            return
+        # Start after the recording transaction commits (never inside test transactions)
+        transaction.on_commit(cls._start_flusher)
+
+    @classmethod
+    def _start_flusher(cls):
+        with cls._lock:
+            if cls._flusher is not None and cls._flusher.is_alive():
+                return
+            cls._flusher = threading.Thread(target=cls._run_flusher, name='audit-flusher', daemon=True)
+            cls._flusher.start()
+        # Flush what is left when the process exits
+        atexit.register(cls.flush)
+
+    @classmethod
+    def _run_flusher(cls):
+        interval = _setting('AUDIT_FLUSH_INTERVAL', FLUSH_INTERVAL)
+        while True:
+            cls._wakeup.wait(interval)
+            cls._wakeup.clear()
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"[AUDIT] Flusher iteration failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
+
+
+def _resolve_context(context, extra: Optional[dict]) -> AuditActor:
+    """(user_id, username, ip_address, user_agent) from a request or user object."""
+    from sopira_magic.apps.security.utils import SecurityUtils
+
+    extra = extra or {}
+    user = context
+    ip_address = extra.get('ip_address')
+    user_agent = extra.get('user_agent', '')
+    meta = getattr(context, 'META', None)
+    if meta is not None:
+        user = getattr(context, 'user', None)
+        ip_address = SecurityUtils.get_client_ip(context)
+        user_agent = meta.get('HTTP_USER_AGENT', '')
+
+    user_id, username = None, extra.get('username', '')
+    if user is not None and getattr(user, 'is_authenticated', False):
+        user_id = _as_uuid(user.pk)
+        username = user.get_username()
+    if ip_address and not SecurityUtils.validate_ip_address(ip_address):
+        ip_address = None
+    return user_id, username or '', ip_address, (user_agent or '')[:500]
+
+
+def _as_uuid(value):
+    import uuid
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _as_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value)[:MAX_VALUE_LENGTH]
+
+
+def _jsonable(data: dict) -> dict:
+    return {
+        k: v if isinstance(v, (str, int, float, bool, type(None), list, dict)) else str(v)
+        for k, v in data.items()
+    }
+
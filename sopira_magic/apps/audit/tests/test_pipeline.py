@@ -0,0 +1,168 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/audit/tests/test_pipeline.py
+#   Audit Pipeline Tests
+#   Tests for pipeline.py and capture.py modules
+#..............................................................
+
+"""
+   Audit Pipeline Tests.
+
+   Tests for AuditPipeline (ring buffer, overflow policies, batched flush into
+   logging.AuditLog) and field-level change capture on VIEWS_MATRIX models.
+"""
+
+import pytest
+from django.test import RequestFactory
+
+from sopira_magic.apps.audit.pipeline import AuditPipeline, current_request
+from sopira_magic.apps.logging.models import AuditLog
+from sopira_magic.apps.m_company.models import Company
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer(settings):
+    """Start every test with an empty buffer and default limits."""
+    settings.AUDIT_BUFFER_SIZE = 100
+    settings.AUDIT_OVERFLOW_POLICY = 'drop_oldest'
+    AuditPipeline.clear()
+    yield
+    AuditPipeline.clear()
+
+
+class TestAuditPipelineBuffer:
+    """Test suite for the ring buffer and overflow policies."""
+
+    def test_record_only_buffers(self):
+        """Test record() appends to the buffer without writing."""
+        assert AuditPipeline.record('VIEW', model_label='company.Company') is True
+        assert AuditPipeline.pending() == 1
+
+    def test_drop_oldest_keeps_newest_events(self, settings):
+        """Test ring buffer evicts oldest events when full."""
+        settings.AUDIT_BUFFER_SIZE = 3
+        for i in range(5):
+            AuditPipeline.record('VIEW', model_label='company.Company', extra={'i': i})
+
+        assert AuditPipeline.pending() == 3
+        assert [event[6]['i'] for event in AuditPipeline._buffer] == [2, 3, 4]
+        assert AuditPipeline._dropped == 2
+
+    def test_drop_newest_rejects_new_events(self, settings):
+        """Test drop_newest keeps the backlog."""
+        settings.AUDIT_BUFFER_SIZE = 2
+        settings.AUDIT_OVERFLOW_POLICY = 'drop_newest'
+        results = [AuditPipeline.record('VIEW', model_label='company.Company', extra={'i': i}) for i in range(3)]
+
+        assert results == [True, True, False]
+        assert [event[6]['i'] for event in AuditPipeline._buffer] == [0, 1]
+
+    def test_block_times_out_and_drops(self, settings):
+        """Test block policy gives up after AUDIT_BLOCK_TIMEOUT."""
+        settings.AUDIT_BUFFER_SIZE = 1
+        settings.AUDIT_OVERFLOW_POLICY = 'block'
+        settings.AUDIT_BLOCK_TIMEOUT = 0.01
+        AuditPipeline.record('VIEW', model_label='company.Company')
+
+        assert AuditPipeline.record('VIEW', model_label='company.Company') is False
+
+    def test_disabled_pipeline_records_nothing(self, settings):
+        """Test AUDIT_PIPELINE_ENABLED=False turns recording off."""
+        settings.AUDIT_PIPELINE_ENABLED = False
+
+        assert AuditPipeline.record('VIEW', model_label='company.Company') is False
+        assert AuditPipeline.pending() == 0
+
+
+@pytest.mark.django_db(databases=['default', 'logging'])
+class TestAuditPipelineFlush:
+    """Test suite for batched writes and change capture."""
+
+    def test_flush_bulk_writes_in_batches(self, settings):
+        """Test flush() drains the buffer into AuditLog."""
+        settings.AUDIT_BATCH_SIZE = 2
+        for _ in range(5):
+            AuditPipeline.record('VIEW', model_label='company.Company')
+
+        assert AuditPipeline.flush() == 5
+        assert AuditPipeline.pending() == 0
+        assert AuditLog.objects.filter(action='VIEW', model_name='company.Company').count() == 5
+
+    def test_flush_policy_writes_on_caller_when_full(self, settings):
+        """Test flush policy never loses events."""
+        settings.AUDIT_BUFFER_SIZE = 2
+        settings.AUDIT_OVERFLOW_POLICY = 'flush'
+        for _ in range(3):
+            assert AuditPipeline.record('VIEW', model_label='company.Company') is True
+
+        assert AuditLog.objects.count() == 2
+        assert AuditPipeline.pending() == 1
+
+    def test_capture_create_update_delete(self):
+        """Test field diffs are captured from the load snapshot without extra queries."""
+        company = Company.objects.create(code='AUD-1', name='Before')
+        loaded = Company.objects.get(pk=company.pk)
+        loaded.name = 'After'
+        loaded.save()
+        loaded.save()  # No changes since last save -> no event
+        loaded.delete()
+
+        AuditPipeline.flush()
+        rows = AuditLog.objects.filter(model_name='company.Company', object_id=company.pk)
+        assert sorted(rows.values_list('action', flat=True)) == ['CREATE', 'DELETE', 'UPDATE']
+        update = rows.get(action='UPDATE')
+        assert (update.field_name, update.old_value, update.new_value) == ('name', 'Before', 'After')
+
+    def test_capture_respects_update_fields(self):
+        """Test only update_fields are diffed."""
+        company = Company.objects.create(code='AUD-2', name='One')
+        loaded = Company.objects.get(pk=company.pk)
+        loaded.name = 'Two'
+        loaded.code = 'AUD-2B'
+        loaded.save(update_fields=['name'])
+
+        AuditPipeline.flush()
+        fields = AuditLog.objects.filter(action='UPDATE', object_id=company.pk).values_list('field_name', flat=True)
+        assert list(fields) == ['name']
+
+    def test_request_context_is_resolved(self, test_user):
+        """Test user and IP come from the current request."""
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.5', HTTP_USER_AGENT='pytest')
+        request.user = test_user
+        token = current_request.set(request)
+        try:
+            AuditPipeline.record('VIEW', model_label='company.Company')
+        finally:
+            current_request.reset(token)
+
+        AuditPipeline.flush()
+        row = AuditLog.objects.get(action='VIEW')
+        assert row.user_id == test_user.pk
+        assert row.username == 'testuser'
+        assert row.ip_address == '10.0.0.5'
+        assert row.user_agent == 'pytest'
+
+    def test_buffer_holds_plain_values(self, test_user):
+        """Test the request is not kept in the buffer (captured at record time)."""
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.6', HTTP_USER_AGENT='pytest')
+        request.user = test_user
+        token = current_request.set(request)
+        try:
+            AuditPipeline.record('VIEW', model_label='company.Company')
+        finally:
+            current_request.reset(token)
+        request.user = None  # request is gone by the time the flusher runs
+
+        assert AuditPipeline._buffer[-1][4] == (test_user.pk, 'testuser', '10.0.0.6', 'pytest')
+        AuditPipeline.flush()
+        assert AuditLog.objects.get(action='VIEW').user_id == test_user.pk
+
+    def test_record_auth_failed_login(self):
+        """Test auth events without a user are stored with extra data."""
+        AuditPipeline.record_auth('LOGIN_FAILED', user=None, success=False, username='ghost', ip_address='Unknown')
+
+        AuditPipeline.flush()
+        row = AuditLog.objects.get(action='LOGIN_FAILED')
+        assert row.content_type is None
+        assert row.username == 'ghost'
+        assert row.ip_address is None
+        assert row.extra_data['success'] is False
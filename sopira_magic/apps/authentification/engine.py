@@ -102,7 +102,7 @@ def _get_role_data(user: Any) -> Dict[str, Any]:
 
 
 def _log_audit(action: str, user: Optional[Any] = None, success: bool = True, **kwargs) -> None:
-    """Log audit event using registry callback."""
+    """Log audit event using registry callback (default: AuditPipeline)."""
     audit_config = get_audit_config()
     if not audit_config.get("audit_enabled", False):
         return
@@ -118,8 +118,10 @@ def _log_audit(action: str, user: Optional[Any] = None, success: bool = True, **
         except Exception as e:
             logger.error(f"Audit logging failed: {e}")
     else:
-        # Default logging
-        logger.info(f"Auth audit: {action} - User: {user} - Success: {success} - {kwargs}")
+        # Default: asynchronous audit pipeline → logging.AuditLog
+        from sopira_magic.apps.audit.pipeline import AuditPipeline
+        AuditPipeline.record_auth(action, user=user, success=success, **kwargs)
+        logger.debug(f"Auth audit: {action} - User: {user} - Success: {success}")
 
 
 def _send_notification(notification_type: str, data: Dict[str, Any]) -> None:
@@ -16,6 +16,11 @@ class CoreConfig(AppConfig):
     
     def ready(self):
         self._register_scoping_callbacks()
+        self._register_cross_database_cascade()
+    
+    def _register_cross_database_cascade(self):
+        from .signals import register_cross_database_cascade
+        register_cross_database_cascade()
     
     def _register_scoping_callbacks(self):
         try:
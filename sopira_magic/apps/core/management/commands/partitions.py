@@ -0,0 +1,125 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/core/management/commands/partitions.py
+#   Partitions Command - Management command
+#   Create / attach / convert / detach monthly range partitions
+#..............................................................
+
+"""
+   Partitions Command - Management Command.
+
+   Maintains monthly range partitions of VIEWS_MATRIX views with a
+   "partition_key" (core/partitioning.py). PostgreSQL only.
+
+   Usage:
+   ```bash
+   # Show partitions and their date ranges
+   python manage.py partitions list --view measurements
+
+   # One-time migration of the existing table (maintenance window)
+   python manage.py partitions convert --view measurements            # old table -> <table>_legacy partition
+   python manage.py partitions convert --view measurements --copy     # split old rows into monthly partitions
+
+   # Create + attach partitions ahead of time (run daily / monthly from cron)
+   python manage.py partitions ensure --view measurements --months-ahead 3
+
+   # Retention: detach partitions older than N months (or --before YYYY-MM-DD)
+   python manage.py partitions detach --view measurements --months 24 [--drop] [--concurrently]
+   ```
+
+   Defaults come from settings.PARTITION_MONTHS_AHEAD / PARTITION_RETENTION_MONTHS.
+   Without --view every partitioned view is processed.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+from sopira_magic.apps.core.partitioning import PartitionError, PartitionManager, add_months, month_start
+
+
+class Command(BaseCommand):
+    help = 'Create, attach, convert and detach monthly range partitions (views with partition_key)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['list', 'ensure', 'convert', 'detach'])
+        parser.add_argument('--view', default=None, help='VIEWS_MATRIX view (default: all with partition_key)')
+        parser.add_argument('--months-ahead', type=int, default=None, help='ensure/convert: months to create ahead')
+        parser.add_argument('--copy', action='store_true', help='convert: copy rows into monthly partitions')
+        parser.add_argument('--months', type=int, default=None, help='detach: keep this many months')
+        parser.add_argument('--before', default=None, help='detach: partitions ending on/before YYYY-MM-DD')
+        parser.add_argument('--drop', action='store_true', help='detach: DROP the detached tables')
+        parser.add_argument('--concurrently', action='store_true', help='detach: DETACH ... CONCURRENTLY')
+
+    def _views(self, view_name):
+        views = {name: cfg for name, cfg in VIEWS_MATRIX.items() if cfg.get('partition_key')}
+        if view_name is None:
+            return views
+        if view_name not in views:
+            raise CommandError(f"View '{view_name}' has no partition_key")
+        return {view_name: views[view_name]}
+
+    def handle(self, *args, **options):
+        action = options['action']
+        months_ahead = options['months_ahead']
+        if months_ahead is None:
+            months_ahead = getattr(settings, 'PARTITION_MONTHS_AHEAD', 3)
+
+        for view_name, cfg in self._views(options['view']).items():
+            model, key = cfg['model'], cfg['partition_key']
+            try:
+                if action == 'list':
+                    self._list(view_name, model)
+                elif action == 'ensure':
+                    created = PartitionManager.ensure(model, key, months_ahead=months_ahead)
+                    self.stdout.write(self.style.SUCCESS(f"✓ {view_name}: {len(created)} partitions attached"))
+                    for name in created:
+                        self.stdout.write(f"  + {name}")
+                elif action == 'convert':
+                    result = PartitionManager.convert(
+                        model, key, mode='copy' if options['copy'] else 'attach', months_ahead=months_ahead
+                    )
+                    self.stdout.write(self.style.SUCCESS(
+                        f"✓ {view_name}: {result['table']} partitioned by {key} ({result['mode']}), "
+                        f"data {result['lowest']}..{result['highest']}, {len(result['created'])} partitions ahead"
+                    ))
+                else:
+                    before = self._before(options)
+                    if before is None:
+                        self.stdout.write(self.style.WARNING(
+                            'No retention configured (--months / --before / PARTITION_RETENTION_MONTHS)'
+                        ))
+                        return
+                    detached = PartitionManager.detach(
+                        model, before, drop=options['drop'], concurrently=options['concurrently']
+                    )
+                    self.stdout.write(self.style.SUCCESS(
+                        f"✓ {view_name}: {len(detached)} partitions before {before} detached"
+                    ))
+                    for name in detached:
+                        self.stdout.write(f"  - {name}")
+            except PartitionError as e:
+                raise CommandError(f"{view_name}: {e}")
+
+    def _list(self, view_name, model):
+        if not PartitionManager.is_partitioned(model):
+            self.stdout.write(self.style.WARNING(f"{view_name}: {model._meta.db_table} is not partitioned"))
+            return
+        self.stdout.write(f"{view_name}: {model._meta.db_table}")
+        for partition in PartitionManager.partitions(model):
+            bounds = 'DEFAULT' if partition.is_default else f"[{partition.lower}, {partition.upper})"
+            self.stdout.write(f"  {partition.name:<48} {bounds}")
+
+    def _before(self, options):
+        if options['before']:
+            before = parse_date(options['before'])
+            if before is None:
+                raise CommandError('--before must be YYYY-MM-DD')
+            return before
+        months = options['months']
+        if months is None:
+            months = getattr(settings, 'PARTITION_RETENTION_MONTHS', 0)
+        if not months:
+            return None
+        return add_months(month_start(timezone.localdate()), -months)
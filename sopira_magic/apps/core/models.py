@@ -207,6 +207,10 @@ class MeasurementRelatedModel(TimeStampedModel):
     
     Note: measurement is nullable for migration compatibility.
     Use RunPython to populate, then make non-nullable.
+
+    Note: no DB-level FK constraint - a range-partitioned measurement table
+    (core/partitioning.py) has no unique index on id alone. CASCADE is
+    handled by Django's delete collector.
     """
     measurement = models.ForeignKey(
         'measurement.Measurement',
@@ -215,6 +219,7 @@ class MeasurementRelatedModel(TimeStampedModel):
         help_text=_("Measurement this entity belongs to"),
         null=True,  # Migration compatibility - make NOT NULL after data migration
         blank=True,
+        db_constraint=False,
     )
 
     class Meta:
@@ -0,0 +1,345 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/core/partitioning.py
+#   Core Partitioning - monthly range partitions (PostgreSQL)
+#   Partition DDL, conversion, DETACH retention, query bounds
+#..............................................................
+
+"""
+   Core Partitioning - Monthly Range Partitions (PostgreSQL).
+
+   Tables of VIEWS_MATRIX views with a "partition_key" (e.g. measurements ->
+   dump_date) can be range-partitioned by month:
+
+   - <table>_pYYYYMM  one partition per month, created + ATTACHed ahead of time
+                      (ATTACH takes a weaker lock than CREATE ... PARTITION OF)
+   - <table>_default  catches rows outside all monthly ranges; ensure() moves
+                      them into their month before attaching it
+   - <table>_legacy   convert(mode="attach"): the original table attached as one
+                      partition covering its date range - no data is rewritten
+                      (mode="copy" splits it into monthly partitions instead)
+
+   The primary key becomes (id, <partition_key>) - PostgreSQL requires the
+   partition key in every unique constraint (other unique columns likewise
+   become unique together with the key). Django keeps using "id" as pk.
+   Foreign keys pointing to a partitioned table must be db_constraint=False.
+
+   Retention is detach(before): old partitions are DETACHed (optionally
+   DROPped) - a catalog operation instead of a mass DELETE.
+
+   Query side: partition_bounds() returns the <key> filter every list /
+   export / analytics query carries, so PostgreSQL prunes partitions. When
+   the client gives no bound and the table is partitioned, the default
+   window (settings.PARTITION_DEFAULT_WINDOW_DAYS) applies.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.core.partitioning import PartitionManager, partition_bounds
+   PartitionManager.ensure(Measurement, "dump_date", months_ahead=3)
+   qs = qs.filter(**partition_bounds(VIEWS_MATRIX["measurements"], "2026-01-01", None))
+   ```
+   CLI: manage.py partitions list|ensure|convert|detach --view measurements
+"""
+
+import datetime
+import logging
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_DAYS = 400
+CACHE_PREFIX = "partitioning:"
+BOUND_RE = re.compile(r"FROM \('([0-9-]+)'\) TO \('([0-9-]+)'\)")
+
+
+class PartitionError(Exception):
+    """Partitioning not possible (backend, table state, referencing FKs)."""
+
+
+class Partition(NamedTuple):
+    name: str
+    lower: Optional[datetime.date]  # None for the default partition
+    upper: Optional[datetime.date]
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def add_months(day: datetime.date, months: int) -> datetime.date:
+    index = day.year * 12 + day.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def month_ranges(start: datetime.date, end: datetime.date) -> List[Tuple[datetime.date, datetime.date]]:
+    """[(first day, first day of next month)] for every month touching [start, end)."""
+    ranges, lower = [], month_start(start)
+    while lower < end:
+        upper = add_months(lower, 1)
+        ranges.append((lower, upper))
+        lower = upper
+    return ranges
+
+
+def partition_name(table: str, lower: datetime.date) -> str:
+    return f"{table}_p{lower.year:04d}{lower.month:02d}"
+
+
+def _parse_day(value, name: str) -> Optional[datetime.date]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime.date):
+        return value
+    day = parse_date(str(value))
+    if day is None:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD)")
+    return day
+
+
+def partition_bounds(view_config: Dict[str, Any], date_from=None, date_to=None) -> Dict[str, datetime.date]:
+    """
+    Filter kwargs bounding view_config["partition_key"] ({} for unpartitioned views).
+
+    date_from / date_to are inclusive (ISO strings or dates); without date_from
+    the default window applies once the table is actually partitioned.
+    Raises ValueError for unparseable dates.
+    """
+    key = view_config.get("partition_key")
+    if not key:
+        return {}
+    lower = _parse_day(date_from, f"{key}_from")
+    upper = _parse_day(date_to, f"{key}_to")
+    if lower is None and PartitionManager.is_partitioned(view_config["model"]):
+        window = getattr(settings, "PARTITION_DEFAULT_WINDOW_DAYS", DEFAULT_WINDOW_DAYS)
+        if window:
+            lower = (upper or timezone.localdate()) - datetime.timedelta(days=window)
+    bounds = {}
+    if lower is not None:
+        bounds[f"{key}__gte"] = lower
+    if upper is not None:
+        bounds[f"{key}__lte"] = upper
+    return bounds
+
+
+class PartitionManager:
+    """DDL for monthly range partitions of a model table (PostgreSQL only)."""
+
+    @staticmethod
+    def _connection(model):
+        return connections[router.db_for_write(model)]
+
+    @classmethod
+    def supported(cls, model) -> bool:
+        return cls._connection(model).vendor == "postgresql"
+
+    @classmethod
+    def is_partitioned(cls, model) -> bool:
+        """Cached catalog lookup (False on non-PostgreSQL backends without a query)."""
+        if not cls.supported(model):
+            return False
+        key = f"{CACHE_PREFIX}{model._meta.db_table}"
+        value = cache.get(key)
+        if value is None:
+            with cls._connection(model).cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+                    "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+                    [model._meta.db_table],
+                )
+                value = cursor.fetchone() is not None
+            cache.set(key, value, 300)
+        return value
+
+    @staticmethod
+    def _forget(model) -> None:
+        cache.delete(f"{CACHE_PREFIX}{model._meta.db_table}")
+
+    @classmethod
+    def _require(cls, model, partitioned: bool = True) -> None:
+        if not cls.supported(model):
+            raise PartitionError("Range partitioning requires PostgreSQL")
+        cls._forget(model)
+        if cls.is_partitioned(model) != partitioned:
+            state = "is not" if partitioned else "is already"
+            raise PartitionError(f"Table {model._meta.db_table} {state} partitioned")
+
+    @classmethod
+    def partitions(cls, model) -> List[Partition]:
+        """Attached partitions ordered by lower bound (default partition last)."""
+        with cls._connection(model).cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = %s AND pg_table_is_visible(p.oid)",
+                [model._meta.db_table],
+            )
+            rows = cursor.fetchall()
+        result = []
+        for name, bound in rows:
+            match = BOUND_RE.search(bound or "")
+            if match:
+                result.append(Partition(name, parse_date(match.group(1)), parse_date(match.group(2))))
+            else:
+                result.append(Partition(name, None, None))
+        return sorted(result, key=lambda p: (p.is_default, p.lower or datetime.date.max))
+
+    # -------------------------
+    # Statements
+    # -------------------------
+    @staticmethod
+    def attach_statements(table: str, lower: datetime.date, upper: datetime.date, qn) -> List[str]:
+        """Create a monthly table shaped like the parent and ATTACH it."""
+        name = partition_name(table, lower)
+        return [
+            f"CREATE TABLE IF NOT EXISTS {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM ('{lower}') TO ('{upper}')",
+        ]
+
+    @staticmethod
+    def move_from_default_statements(table: str, key: str, lower: datetime.date, upper: datetime.date, qn) -> List[str]:
+        """Rows of the default partition in [lower, upper) go into the new partition before ATTACH."""
+        name, default = partition_name(table, lower), f"{table}_default"
+        where = f"{qn(key)} >= '{lower}' AND {qn(key)} < '{upper}'"
+        return [
+            f"INSERT INTO {qn(name)} SELECT * FROM {qn(default)} WHERE {where}",
+            f"DELETE FROM {qn(default)} WHERE {where}",
+        ]
+
+    # -------------------------
+    # Operations
+    # -------------------------
+    @classmethod
+    def ensure(cls, model, key: str, months_ahead: int = 3, start: Optional[datetime.date] = None) -> List[str]:
+        """Create + attach missing monthly partitions from `start` (default: this month) to months_ahead."""
+        cls._require(model)
+        connection = cls._connection(model)
+        qn, table = connection.ops.quote_name, model._meta.db_table
+        existing = cls.partitions(model)
+        has_default = any(p.is_default for p in existing)
+        first = month_start(start or timezone.localdate())
+        created = []
+        for lower, upper in month_ranges(first, add_months(month_start(timezone.localdate()), months_ahead + 1)):
+            if any(p.lower is not None and p.lower < upper and lower < p.upper for p in existing):
+                continue
+            name = partition_name(table, lower)
+            create, attach = cls.attach_statements(table, lower, upper, qn)
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(create)
+                if has_default:
+                    for statement in cls.move_from_default_statements(table, key, lower, upper, qn):
+                        cursor.execute(statement)
+                cursor.execute(attach)
+            created.append(name)
+            logger.info(f"[PARTITIONING] Attached {name} [{lower}, {upper})")
+        return created
+
+    @classmethod
+    def convert(cls, model, key: str, mode: str = "attach", months_ahead: int = 3) -> Dict[str, Any]:
+        """
+        Turn the existing table into a partitioned table (maintenance window).
+
+        attach: the old table becomes partition <table>_legacy for its date range
+        copy:   rows are copied into monthly partitions, the old table is dropped
+        """
+        if mode not in ("attach", "copy"):
+            raise PartitionError(f"Unknown conversion mode '{mode}'")
+        cls._require(model, partitioned=False)
+        connection = cls._connection(model)
+        qn, table = connection.ops.quote_name, model._meta.db_table
+        legacy = f"{table}_legacy"
+        pk_column = model._meta.pk.column
+
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname, conrelid::regclass::text FROM pg_constraint "
+                "WHERE contype = 'f' AND confrelid = %s::regclass",
+                [table],
+            )
+            referencing = cursor.fetchall()
+            if referencing:
+                names = ", ".join(f"{rel}.{name}" for name, rel in referencing)
+                raise PartitionError(f"Foreign keys reference {table} (set db_constraint=False and migrate): {names}")
+
+            cursor.execute(f"SELECT MIN({qn(key)}), MAX({qn(key)}) FROM {qn(table)}")
+            lowest, highest = cursor.fetchone()
+
+            # Free index names for the new parent (index names are schema-wide)
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table])
+            for (index_name,) in cursor.fetchall():
+                cursor.execute(f"ALTER INDEX {qn(index_name)} RENAME TO {qn(index_name[:55] + '_legacy')}")
+            cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+            cursor.execute(
+                f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+                f"INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ({qn(key)})"
+            )
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY ({qn(pk_column)}, {qn(key)})")
+            for field in model._meta.local_fields:
+                if field.unique and not field.primary_key:  # unique per table -> unique with the key
+                    cursor.execute(
+                        f"CREATE UNIQUE INDEX {qn(f'{table}_{field.column}_{key}_uniq'[:63])} "
+                        f"ON {qn(table)} ({qn(field.column)}, {qn(key)})"
+                    )
+            with connection.schema_editor(atomic=False) as editor:
+                # db_index fields + Meta.indexes (created as partitioned indexes) and FK constraints
+                for statement in editor._model_indexes_sql(model):
+                    cursor.execute(str(statement))
+                for field in model._meta.local_fields:
+                    if field.remote_field and field.db_constraint:
+                        cursor.execute(str(editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s")))
+
+            moved = 0
+            if lowest is not None and mode == "attach":
+                lower, upper = month_start(lowest), add_months(month_start(highest), 1)
+                cursor.execute(
+                    f"ALTER TABLE {qn(legacy)} ADD CONSTRAINT {qn(legacy + '_bound')} "
+                    f"CHECK ({qn(key)} >= '{lower}' AND {qn(key)} < '{upper}')"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(legacy)} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+                )
+            else:
+                for lower, upper in month_ranges(lowest, add_months(month_start(highest), 1)) if lowest else []:
+                    for statement in cls.attach_statements(table, lower, upper, qn):
+                        cursor.execute(statement)
+                    cursor.execute(
+                        f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)} "
+                        f"WHERE {qn(key)} >= '{lower}' AND {qn(key)} < '{upper}'"
+                    )
+                    moved += cursor.rowcount
+                cursor.execute(f"DROP TABLE {qn(legacy)}")
+            cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+        cls._forget(model)
+        created = cls.ensure(model, key, months_ahead=months_ahead)
+        logger.info(f"[PARTITIONING] Converted {table} ({mode}), range {lowest}..{highest}, copied {moved} rows")
+        return {"table": table, "mode": mode, "lowest": lowest, "highest": highest, "copied": moved, "created": created}
+
+    @classmethod
+    def detach(cls, model, before: datetime.date, drop: bool = False, concurrently: bool = False) -> List[str]:
+        """DETACH (and optionally DROP) every partition entirely older than `before`."""
+        cls._require(model)
+        connection = cls._connection(model)
+        qn, table = connection.ops.quote_name, model._meta.db_table
+        detached = []
+        for partition in cls.partitions(model):
+            if partition.is_default or partition.upper > before:
+                continue
+            option = " CONCURRENTLY" if concurrently else ""
+            # DETACH ... CONCURRENTLY cannot run inside a transaction block
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(partition.name)}{option}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {qn(partition.name)}")
+            detached.append(partition.name)
+            logger.info(f"[PARTITIONING] Detached {partition.name}{' (dropped)' if drop else ''}")
+        return detached
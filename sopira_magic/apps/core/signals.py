@@ -12,13 +12,27 @@
    automatically detects and deletes related records in other databases.
 
    How it works:
-   1. On pre_delete signal, detects all ForeignKeys pointing to the deleted object
-   2. For each ForeignKey, checks if related model is in different database
-   3. If yes, deletes related records from that database before deletion
+   1. At app-ready time, build_cross_database_map() scans all models ONCE and
+      maps each model to its dependents living in a different database
+   2. pre_delete is connected only for models that have such dependents
+      (other models keep Django's fast-delete path)
+   3. The handler is a dictionary lookup + one statement per dependent;
+      delete_cross_database_dependents() does the same for a batch of PKs
+      (bulk-delete hook for set-based deletes)
+
+   on_delete of the dependent FK is honoured:
+   - CASCADE: DELETE dependents
+   - SET_NULL / SET_DEFAULT / SET(...): UPDATE the FK column
+   - PROTECT / RESTRICT: raise ProtectedError / RestrictedError if dependents exist
+   - DO_NOTHING: not mapped at all (dependents keep the dangling id)
 
    Usage:
-   Automatically registered for all models when core app is loaded.
-   No manual registration needed.
+   Registered by CoreConfig.ready() via register_cross_database_cascade().
+   Bulk deletes call the hook directly:
+   ```python
+   from sopira_magic.apps.core.signals import delete_cross_database_dependents
+   delete_cross_database_dependents(Model, pks)
+   ```
 
    Important:
    - NO HARDCODING: This solution works universally for all models
@@ -27,81 +41,152 @@
 """
 
 import logging
+from typing import Any, Callable, Dict, List, Tuple
+from django.db import models
+from django.db.models.deletion import ProtectedError, RestrictedError
 from django.db.models.signals import pre_delete
-from django.dispatch import receiver
 from django.apps import apps
 
 logger = logging.getLogger(__name__)
 
+# model label -> [(dependent model, FK field name, dependent database, on_delete)]
+CROSS_DB_DEPENDENTS: Dict[str, List[Tuple[type, str, str, Callable]]] = {}
+
+
+def build_cross_database_map() -> Dict[str, List[Tuple[type, str, str, Callable]]]:
+    """
+    Compute the cross-database relation map (once per process).
+
+    For every concrete FK/O2O field, compares the database of the owning
+    model with the database of the referenced model (via DatabaseRouter).
+    """
+    from sopira_magic.db_router import DatabaseRouter
+
+    router = DatabaseRouter()
+    relation_map: Dict[str, List[Tuple[type, str, str, Callable]]] = {}
+
+    for model in apps.get_models():
+        model_db = router.db_for_write(model)
+        for field in model._meta.concrete_fields:
+            target = field.related_model if field.is_relation else None
+            if target is None or target == model:
+                continue
+            if router.db_for_write(target) == model_db:
+                continue
+            on_delete = getattr(field.remote_field, "on_delete", None)
+            if on_delete is None or on_delete is models.DO_NOTHING:
+                continue
+            relation_map.setdefault(target._meta.label, []).append((model, field.name, model_db, on_delete))
+
+    CROSS_DB_DEPENDENTS.clear()
+    CROSS_DB_DEPENDENTS.update(relation_map)
+    return CROSS_DB_DEPENDENTS
+
+
+def _set_value(model, field_name: str, on_delete: Callable) -> Any:
+    """Value written by SET_NULL / SET_DEFAULT / SET(value)."""
+    if on_delete is models.SET_NULL:
+        return None
+    field = model._meta.get_field(field_name)
+    if on_delete is models.SET_DEFAULT:
+        return field.get_default()
+    value = on_delete.deconstruct()[1][0]  # SET(value)
+    return value() if callable(value) else value
+
+
+def delete_cross_database_dependents(sender, pks) -> int:
+    """
+    Bulk-delete hook: apply on_delete to cross-database dependents of `sender` rows.
+
+    Args:
+        sender: Model class whose rows are being deleted
+        pks: Iterable of primary keys being deleted
+
+    Returns:
+        Number of dependent rows deleted or updated
+
+    Raises:
+        ProtectedError / RestrictedError: a PROTECT / RESTRICT dependent exists
+    """
+    dependents = CROSS_DB_DEPENDENTS.get(sender._meta.label)
+    if not dependents:
+        return 0
+
+    pks = list(pks)
+    total = 0
+    for model, field_name, target_db, on_delete in dependents:
+        qs = model._base_manager.using(target_db).filter(**{f"{field_name}__in": pks})
+        try:
+            if on_delete in (models.PROTECT, models.RESTRICT):
+                blocking = list(qs[:10])
+                if blocking:
+                    error = ProtectedError if on_delete is models.PROTECT else RestrictedError
+                    raise error(
+                        f"Cannot delete {sender._meta.label} rows: referenced by "
+                        f"{model._meta.label}.{field_name} ({target_db} database)",
+                        set(blocking),
+                    )
+                continue
+            if on_delete is models.CASCADE:
+                affected, _ = qs.delete()
+                action = "Deleted"
+            else:
+                affected = qs.update(**{field_name: _set_value(model, field_name, on_delete)})
+                action = "Updated"
+            if affected:
+                total += affected
+                logger.info(
+                    f"[CORE] {action} {affected} {model._meta.label} records "
+                    f"in {target_db} database for {len(pks)} {sender._meta.label} rows"
+                )
+        except (ProtectedError, RestrictedError):
+            raise
+        except Exception as e:
+            # Log error but don't prevent deletion
+            # Target database might not exist or table might not exist yet
+            error_msg = str(e)
+            if 'does not exist' in error_msg.lower() or 'database' in error_msg.lower():
+                logger.debug(
+                    f"[CORE] Target database/tables not available for {model._meta.label}: {error_msg}"
+                )
+            else:
+                logger.warning(
+                    f"[CORE] Failed to apply on_delete to {model._meta.label} records "
+                    f"in {target_db} database: {error_msg}"
+                )
+    return total
+
 
-@receiver(pre_delete)
 def handle_cross_database_cascade(sender, instance, **kwargs):
     """
     Universal cross-database cascade delete handler.
-    
-    This signal automatically handles cascade deletion for ForeignKeys
-    that span across databases (e.g., STATE → PRIMARY, LOGGING → PRIMARY).
-    
+
+    This signal applies the on_delete of ForeignKeys that span across
+    databases (e.g., STATE → PRIMARY, LOGGING → PRIMARY); PROTECT / RESTRICT
+    abort the delete.
+
     Args:
         sender: The model class being deleted
         instance: The model instance being deleted
         **kwargs: Additional signal arguments
     """
     try:
-        from sopira_magic.db_router import DatabaseRouter
-        
-        router = DatabaseRouter()
-        source_db = router.db_for_write(sender)
-        
-        # Get all models that might have ForeignKeys to this model
-        for model in apps.get_models():
-            # Skip if same model
-            if model == sender:
-                continue
-            
-            # Get all ForeignKey fields pointing to this model
-            for field in model._meta.get_fields():
-                if (hasattr(field, 'related_model') and 
-                    field.related_model is not None and 
-                    field.related_model == sender):
-                    # Check if this is a cross-database relationship
-                    target_db = router.db_for_write(model)
-                    
-                    if source_db != target_db:
-                        # Cross-database ForeignKey detected
-                        # Delete related records from target database
-                        try:
-                            # Get the field name
-                            field_name = field.name
-                            
-                            # Build filter to find related records
-                            filter_kwargs = {field_name: instance.id}
-                            
-                            # Delete related records from target database
-                            related_count = model.objects.using(target_db).filter(**filter_kwargs).count()
-                            
-                            if related_count > 0:
-                                model.objects.using(target_db).filter(**filter_kwargs).delete()
-                                
-                                logger.info(
-                                    f"[CORE] Deleted {related_count} {model._meta.label} records "
-                                    f"from {target_db} database for {sender._meta.label} (id={instance.id})"
-                                )
-                        except Exception as e:
-                            # Log error but don't prevent deletion
-                            # Target database might not exist or table might not exist yet
-                            error_msg = str(e)
-                            if 'does not exist' in error_msg.lower() or 'database' in error_msg.lower():
-                                logger.debug(
-                                    f"[CORE] Target database/tables not available for {model._meta.label}: {error_msg}"
-                                )
-                            else:
-                                logger.warning(
-                                    f"[CORE] Failed to delete {model._meta.label} records "
-                                    f"from {target_db} database: {error_msg}"
-                                )
-                            
+        delete_cross_database_dependents(sender, [instance.pk])
+    except (ProtectedError, RestrictedError):
+        raise
     except Exception as e:
         # Log error but don't prevent deletion
         logger.debug(f"[CORE] Cross-database cascade handler error: {str(e)}")
 
+
+def register_cross_database_cascade():
+    """Build the relation map and connect pre_delete only for affected senders."""
+    relation_map = build_cross_database_map()
+    for label in relation_map:
+        sender = apps.get_model(label)
+        pre_delete.connect(
+            handle_cross_database_cascade,
+            sender=sender,
+            dispatch_uid=f"core_cross_db_cascade_{label}",
+        )
+    logger.debug(f"[CORE] Cross-database cascade registered for {len(relation_map)} models")
@@ -0,0 +1,91 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/core/tests/test_cross_database.py
+#   Core Cross-Database Cascade Tests
+#   Tests for signals.py on_delete handling
+#..............................................................
+
+"""
+   Core Cross-Database Cascade Tests.
+
+   Tests that the cross-database delete hook honours the dependent FK's
+   on_delete. The relation map is patched with same-database relations,
+   the hook does not care where the dependent lives.
+"""
+
+import datetime
+
+import pytest
+from django.db import models
+from django.db.models.deletion import ProtectedError, RestrictedError
+
+from sopira_magic.apps.core import signals
+from sopira_magic.apps.core.signals import CROSS_DB_DEPENDENTS, build_cross_database_map, delete_cross_database_dependents
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_measurement.models import Measurement
+
+
+@pytest.fixture
+def plant():
+    company = Company.objects.create(code='AC', name='Acme')
+    return Factory.objects.create(company=company, code='F1', name='Alpha')
+
+
+@pytest.fixture
+def measurement(plant):
+    return Measurement.objects.create(
+        factory=plant, dump_date=datetime.date(2026, 1, 5), dump_time=datetime.time(8, 0),
+        pot_knocks=3, pot_weight_kg=12, code='M1', name='First',
+    )
+
+
+def _depend(monkeypatch, on_delete):
+    monkeypatch.setitem(CROSS_DB_DEPENDENTS, Factory._meta.label, [(Measurement, 'factory', 'default', on_delete)])
+
+
+def test_do_nothing_is_not_mapped():
+    """Test DO_NOTHING relations (AuditLog.content_type) are left alone."""
+    relation_map = build_cross_database_map()
+    for dependents in relation_map.values():
+        assert all(on_delete is not models.DO_NOTHING for *_, on_delete in dependents)
+    assert not any(model._meta.label == 'logging.AuditLog' for deps in relation_map.values() for model, *_ in deps)
+
+
+@pytest.mark.django_db
+class TestOnDelete:
+    """Test suite for delete_cross_database_dependents."""
+
+    def test_cascade(self, monkeypatch, plant, measurement):
+        """Test CASCADE deletes dependents."""
+        _depend(monkeypatch, models.CASCADE)
+        assert delete_cross_database_dependents(Factory, [plant.pk]) == 1
+        assert not Measurement.objects.exists()
+
+    def test_set_null(self, monkeypatch, plant, measurement):
+        """Test SET_NULL clears the FK and keeps the row."""
+        _depend(monkeypatch, models.SET_NULL)
+        assert delete_cross_database_dependents(Factory, [plant.pk]) == 1
+        measurement.refresh_from_db()
+        assert measurement.factory_id is None
+
+    def test_set_value(self, monkeypatch, plant, measurement):
+        """Test SET(callable) writes the computed value."""
+        _depend(monkeypatch, models.SET(lambda: None))
+        delete_cross_database_dependents(Factory, [plant.pk])
+        measurement.refresh_from_db()
+        assert measurement.factory_id is None
+
+    @pytest.mark.parametrize('on_delete, error', [(models.PROTECT, ProtectedError), (models.RESTRICT, RestrictedError)])
+    def test_protect_and_restrict(self, monkeypatch, plant, measurement, on_delete, error):
+        """Test PROTECT / RESTRICT abort the delete, also through the pre_delete handler."""
+        _depend(monkeypatch, on_delete)
+        with pytest.raises(error):
+            delete_cross_database_dependents(Factory, [plant.pk])
+        with pytest.raises(error):
+            signals.handle_cross_database_cascade(Factory, plant)
+        assert Measurement.objects.filter(pk=measurement.pk, factory=plant).exists()
+
+    def test_protect_without_dependents(self, monkeypatch, plant):
+        """Test PROTECT only blocks when dependents exist."""
+        _depend(monkeypatch, models.PROTECT)
+        assert delete_cross_database_dependents(Factory, [plant.pk]) == 0
@@ -0,0 +1,193 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/core/tests/test_partitioning.py
+#   Core Partitioning Tests
+#   Tests for partitioning.py, partitions command and query bounds
+#..............................................................
+
+"""
+   Core Partitioning Tests.
+
+   Tests for month arithmetic, partition DDL statements, partition key
+   bounds on list / analytics queries and the partitions command.
+"""
+
+import datetime
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.analytics.query import AnalyticsService
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+from sopira_magic.apps.api.view_factory import create_viewset
+from sopira_magic.apps.core.partitioning import (
+    PartitionError,
+    PartitionManager,
+    add_months,
+    month_ranges,
+    partition_bounds,
+    partition_name,
+)
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_measurement.models import Measurement
+
+TABLE = 'measurement_measurement'
+
+
+def qn(name):
+    return f'"{name}"'
+
+
+@pytest.fixture
+def partitioned(monkeypatch):
+    monkeypatch.setattr(PartitionManager, 'is_partitioned', classmethod(lambda cls, model: True))
+
+
+class TestMonths:
+    """Test suite for month helpers."""
+
+    def test_add_months_across_years(self):
+        """Test month arithmetic wraps years."""
+        assert add_months(datetime.date(2026, 11, 15), 3) == datetime.date(2027, 2, 1)
+        assert add_months(datetime.date(2026, 1, 1), -1) == datetime.date(2025, 12, 1)
+
+    def test_month_ranges(self):
+        """Test ranges cover every month touching [start, end)."""
+        ranges = month_ranges(datetime.date(2026, 1, 20), datetime.date(2026, 3, 1))
+        assert ranges == [
+            (datetime.date(2026, 1, 1), datetime.date(2026, 2, 1)),
+            (datetime.date(2026, 2, 1), datetime.date(2026, 3, 1)),
+        ]
+        assert partition_name(TABLE, ranges[1][0]) == f'{TABLE}_p202602'
+
+
+class TestStatements:
+    """Test suite for partition DDL statements."""
+
+    def test_attach(self):
+        """Test partitions are created detached and then ATTACHed with month bounds."""
+        create, attach = PartitionManager.attach_statements(
+            TABLE, datetime.date(2026, 2, 1), datetime.date(2026, 3, 1), qn
+        )
+        assert create.startswith(f'CREATE TABLE IF NOT EXISTS "{TABLE}_p202602" (LIKE "{TABLE}"')
+        assert attach == (
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{TABLE}_p202602" '
+            f"FOR VALUES FROM ('2026-02-01') TO ('2026-03-01')"
+        )
+
+    def test_move_from_default(self):
+        """Test rows of the default partition are moved before ATTACH."""
+        insert, delete = PartitionManager.move_from_default_statements(
+            TABLE, 'dump_date', datetime.date(2026, 2, 1), datetime.date(2026, 3, 1), qn
+        )
+        assert insert.startswith(f'INSERT INTO "{TABLE}_p202602" SELECT * FROM "{TABLE}_default"')
+        assert delete.endswith(""""dump_date" >= '2026-02-01' AND "dump_date" < '2026-03-01'""")
+
+    @pytest.mark.django_db(databases=['default', 'state', 'logging'])
+    def test_requires_postgresql(self):
+        """Test DDL operations refuse non-PostgreSQL backends."""
+        if PartitionManager.supported(Measurement):
+            pytest.skip('PostgreSQL backend')
+        assert PartitionManager.is_partitioned(Measurement) is False
+        with pytest.raises(PartitionError):
+            PartitionManager.ensure(Measurement, 'dump_date')
+
+
+class TestBounds:
+    """Test suite for partition_bounds."""
+
+    def test_unpartitioned_view(self):
+        """Test views without partition_key get no bound."""
+        assert partition_bounds(VIEWS_MATRIX['factories'], '2026-01-01') == {}
+
+    @pytest.mark.django_db(databases=['default', 'state', 'logging'])
+    def test_explicit_bounds(self):
+        """Test client bounds are inclusive and parsed."""
+        bounds = partition_bounds(VIEWS_MATRIX['measurements'], '2026-01-01', '2026-01-31')
+        assert bounds == {'dump_date__gte': datetime.date(2026, 1, 1), 'dump_date__lte': datetime.date(2026, 1, 31)}
+        with pytest.raises(ValueError):
+            partition_bounds(VIEWS_MATRIX['measurements'], 'yesterday')
+
+    def test_default_window(self, partitioned, settings):
+        """Test partitioned tables get the default window without a lower bound."""
+        settings.PARTITION_DEFAULT_WINDOW_DAYS = 30
+        bounds = partition_bounds(VIEWS_MATRIX['measurements'], None, '2026-03-31')
+        assert bounds == {'dump_date__gte': datetime.date(2026, 3, 1), 'dump_date__lte': datetime.date(2026, 3, 31)}
+
+
+@pytest.mark.django_db(databases=['default', 'state', 'logging'])
+class TestQueryPaths:
+    """Test suite for partition key bounds on list and analytics queries."""
+
+    @pytest.fixture
+    def admin(self):
+        return get_user_model().objects.create_superuser(username='partadmin', password='pass12345')
+
+    @pytest.fixture
+    def measurements(self):
+        company = Company.objects.create(code='AC', name='Acme')
+        plant = Factory.objects.create(company=company, code='F1', name='Alpha')
+        today = datetime.date.today()
+        for day in (today, today - datetime.timedelta(days=40), today - datetime.timedelta(days=900)):
+            Measurement.objects.create(
+                factory=plant, dump_date=day, dump_time=datetime.time(8, 0), pot_knocks=0, pot_weight_kg=0,
+            )
+        return today
+
+    def _list(self, user, **params):
+        request = APIRequestFactory().get('/api/measurements/', params)
+        force_authenticate(request, user)
+        response = create_viewset('measurements').as_view({'get': 'list'})(request)
+        data = response.data
+        return response, (data['results'] if isinstance(data, dict) and 'results' in data else data)
+
+    def test_list_bounds(self, admin, measurements):
+        """Test ?dump_date_from / ?dump_date_to narrow the list."""
+        since = (measurements - datetime.timedelta(days=60)).isoformat()
+        response, rows = self._list(admin, dump_date_from=since)
+        assert response.status_code == 200 and len(rows) == 2
+
+        response, rows = self._list(admin, dump_date_from=since, dump_date_to=since)
+        assert len(rows) == 0
+
+    def test_list_invalid_bound(self, admin, measurements):
+        """Test unparseable bounds are 400."""
+        response, _ = self._list(admin, dump_date_from='soon')
+        assert response.status_code == 400
+
+    def test_unpartitioned_list_is_unbounded(self, admin, measurements):
+        """Test the default window only applies to partitioned tables."""
+        _, rows = self._list(admin)
+        assert len(rows) == 3
+
+    def test_default_window(self, admin, measurements, partitioned, settings):
+        """Test list and analytics get the default window on partitioned tables."""
+        settings.PARTITION_DEFAULT_WINDOW_DAYS = 365
+        _, rows = self._list(admin)
+        result = AnalyticsService.run(admin, {'metrics': ['count']})
+        wide = AnalyticsService.run(admin, {'metrics': ['count'], 'filters': {'dump_date__gte': '2000-01-01'}})
+
+        assert len(rows) == 2
+        assert result['data'] == [[2]]
+        assert wide['data'] == [[3]]
+
+
+@pytest.mark.django_db(databases=['default', 'state', 'logging'])
+class TestCommand:
+    """Test suite for manage.py partitions."""
+
+    def test_list_unpartitioned(self):
+        """Test list reports unpartitioned tables."""
+        if PartitionManager.supported(Measurement):
+            pytest.skip('PostgreSQL backend')
+        out = io.StringIO()
+        call_command('partitions', 'list', '--view', 'measurements', stdout=out)
+        assert 'is not partitioned' in out.getvalue()
+
+    def test_unknown_view(self):
+        """Test views without partition_key are rejected."""
+        with pytest.raises(CommandError):
+            call_command('partitions', 'ensure', '--view', 'factories')
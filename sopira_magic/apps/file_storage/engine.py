@@ -0,0 +1,442 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/file_storage/engine.py
+#   File Storage Engine - Content-addressed local media storage
+#   SHA-256 sharded blobs, dedup, lazily built cached derivatives
+#..............................................................
+
+"""
+   File Storage Engine - Content-Addressed Local Media Storage.
+
+   Blobs are stored under their SHA-256 digest, sharded into two directory
+   levels so no directory grows unbounded:
+
+       <root>/objects/ab/cd/abcd1234...        original content
+       <root>/derivatives/ab/cd/<key>/<name>   thumbnails, poster frames, ...
+       <root>/tmp/                             in-flight writes
+
+   - put() hashes while streaming into tmp/ and renames into place; content
+     that already exists is not written twice (deduplication)
+   - every blob is indexed once in FileVersion (file_path "sha256/<digest>")
+     on the default local StorageConfig
+   - derivatives are built lazily on first request and cached on disk;
+     writes are atomic (tmp + rename), so concurrent builders never expose a
+     partial file
+   - image thumbnails need Pillow, video poster frames need ffmpeg; both are
+     optional - without them derivative() raises DerivativeUnavailable
+
+   Media sources (MEDIA_SOURCES) map URL names to the stored content:
+   Photo / Video keep the digest in metadata["sha256"], Measurement keeps
+   local files in FileFields (derivatives keyed by name + size + mtime).
+
+   Uploads are typed by their bytes, never by the client's Content-Type:
+   attach() sniffs the leading magic bytes and accepts only the
+   MEDIA_CONTENT_TYPES of the source kind (image/* for photos, video/* for
+   videos); anything else raises UnsupportedContent.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.file_storage.engine import StorageEngine
+   StorageEngine.attach(photo, request.FILES['file'])
+   source = StorageEngine.source('photos', photo)
+   thumb = StorageEngine.thumbnail(source, 256)
+   ```
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.apps import apps
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+DIGEST_PREFIX = "sha256/"
+DEFAULT_THUMBNAIL_SIZES = (128, 256, 512)
+
+MEDIA_SOURCES: Dict[str, Dict[str, str]] = {
+    "photos": {"model": "photo.Photo", "kind": "image"},
+    "videos": {"model": "video.Video", "kind": "video"},
+    "measurement-photos": {"model": "measurement.Measurement", "file_field": "photo_local_file", "kind": "image"},
+    "measurement-videos": {"model": "measurement.Measurement", "file_field": "video_local_file", "kind": "video"},
+}
+
+
+class StorageError(Exception):
+    """Content missing or not storable."""
+
+
+class DerivativeUnavailable(StorageError):
+    """Derivative cannot be built (missing Pillow / ffmpeg, unsupported content)."""
+
+
+class UnsupportedContent(StorageError):
+    """Upload is not an allowed media type for its source (sniffed from the bytes)."""
+
+
+# Types accepted per source kind - and the only types served inline (serving.py)
+MEDIA_CONTENT_TYPES: Dict[str, frozenset] = {
+    "image": frozenset({
+        "image/jpeg", "image/png", "image/gif", "image/webp", "image/bmp", "image/tiff",
+        "image/avif", "image/heic", "image/heif",
+    }),
+    "video": frozenset({"video/mp4", "video/quicktime", "video/webm", "video/x-matroska", "video/x-msvideo"}),
+}
+SNIFF_BYTES = 64
+
+# ISO base media file format brands (bytes 8-12 after "ftyp")
+_FTYP_BRANDS = {
+    b"avif": "image/avif", b"avis": "image/avif",
+    b"heic": "image/heic", b"heix": "image/heic", b"mif1": "image/heif", b"msf1": "image/heif",
+    b"qt  ": "video/quicktime",
+}
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Media type from the leading bytes of a file (None = not a recognised image / video)."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return "video/x-msvideo"
+    if head[:2] == b"BM" and len(head) >= 14:
+        return "image/bmp"
+    if head[:4] in (b"II*\x00", b"MM\x00*"):
+        return "image/tiff"
+    if head[4:8] == b"ftyp":
+        return _FTYP_BRANDS.get(head[8:12], "video/mp4")
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "video/webm" if b"webm" in head else "video/x-matroska"
+    return None
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    digest: str
+    size: int
+    path: Path
+    created: bool  # False = deduplicated, content already stored
+
+
+@dataclass(frozen=True)
+class MediaSource:
+    """Servable content: file on disk + validators + derivative cache key."""
+    path: Path
+    content_type: str
+    etag: str
+    last_modified: datetime
+    key: str
+    kind: str
+    filename: str = ""
+
+
+def _shard(name: str) -> tuple:
+    return name[:2], name[2:4]
+
+
+def _atomic_write(tmp_dir: Path, target: Path, build: Callable[[Path], None]) -> None:
+    """Let build() write a temp file, then rename it to target (same filesystem)."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, suffix=target.suffix)
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        build(tmp)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class ContentStore:
+    """Hash-sharded blob store on the local filesystem."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.tmp = self.root / "tmp"
+
+    def path(self, digest: str) -> Path:
+        return self.root.joinpath("objects", *_shard(digest), digest)
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    def put(self, fileobj) -> StoredObject:
+        """Store a file-like object; returns the existing blob for duplicate content."""
+        self.tmp.mkdir(parents=True, exist_ok=True)
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        sha = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self.tmp, delete=False) as tmp:
+            try:
+                chunks = fileobj.chunks(CHUNK_SIZE) if hasattr(fileobj, "chunks") else iter(
+                    lambda: fileobj.read(CHUNK_SIZE), b""
+                )
+                for chunk in chunks:
+                    sha.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+
+        digest = sha.hexdigest()
+        target = self.path(digest)
+        if target.exists():
+            os.unlink(tmp.name)
+            return StoredObject(digest, size, target, created=False)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp.name, target)
+        return StoredObject(digest, size, target, created=True)
+
+    def delete(self, digest: str) -> None:
+        self.path(digest).unlink(missing_ok=True)
+        shutil.rmtree(self.root.joinpath("derivatives", *_shard(digest), digest), ignore_errors=True)
+
+    def derivative_path(self, key: str, name: str) -> Path:
+        return self.root.joinpath("derivatives", *_shard(key), key, name)
+
+    def derivative(self, key: str, name: str, build: Callable[[Path], None]) -> Path:
+        """Cached derivative `name` of content `key`, built on first use."""
+        target = self.derivative_path(key, name)
+        if not target.exists():
+            self.tmp.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.tmp, target, build)
+            logger.debug(f"[STORAGE] Built derivative {name} for {key[:12]}")
+        return target
+
+
+# -------------------------
+# Derivative builders
+# -------------------------
+def build_image_thumbnail(source: Path, size: int) -> Callable[[Path], None]:
+    def build(target: Path) -> None:
+        try:
+            from PIL import Image, ImageOps
+        except ImportError:
+            raise DerivativeUnavailable("Pillow is not installed")
+        try:
+            with Image.open(source) as image:
+                image = ImageOps.exif_transpose(image)
+                image.thumbnail((size, size))
+                image.convert("RGB").save(target, "JPEG", quality=82, optimize=True)
+        except OSError as e:
+            raise DerivativeUnavailable(f"Cannot read image: {e}")
+    return build
+
+
+def build_video_poster(source: Path, size: int) -> Callable[[Path], None]:
+    def build(target: Path) -> None:
+        ffmpeg = getattr(settings, "FFMPEG_BINARY", None) or shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise DerivativeUnavailable("ffmpeg is not available")
+        command = [
+            ffmpeg, "-v", "error", "-y", "-ss", "1", "-i", str(source), "-frames:v", "1",
+            "-vf", f"scale='min({size},iw)':-2", "-f", "image2", str(target),
+        ]
+        try:
+            subprocess.run(command, check=True, timeout=60, capture_output=True)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            raise DerivativeUnavailable(f"ffmpeg failed: {e}")
+    return build
+
+
+THUMBNAIL_BUILDERS: Dict[str, Callable[[Path, int], Callable[[Path], None]]] = {
+    "image": build_image_thumbnail,
+    "video": build_video_poster,
+}
+
+
+class StorageEngine:
+    """Content-addressed storage + media sources for Photo / Video / Measurement files."""
+
+    _stores: Dict[str, ContentStore] = {}
+
+    @staticmethod
+    def storage_config():
+        from .models import StorageConfig
+
+        config = StorageConfig.objects.filter(storage_type="local", is_default=True, enabled=True).first()
+        if config is None:
+            config, _ = StorageConfig.objects.get_or_create(
+                name="Local content store", storage_type="local",
+                defaults={"is_default": True, "config": {}},
+            )
+        return config
+
+    @classmethod
+    def root(cls) -> Path:
+        default = getattr(settings, "FILE_STORAGE_ROOT", None) or Path(settings.MEDIA_ROOT) / "cas"
+        return Path((cls.storage_config().config or {}).get("root") or default)
+
+    @classmethod
+    def store(cls) -> ContentStore:
+        root = str(cls.root())
+        if root not in cls._stores:
+            cls._stores[root] = ContentStore(root)
+        return cls._stores[root]
+
+    @staticmethod
+    def thumbnail_sizes() -> tuple:
+        return tuple(getattr(settings, "MEDIA_THUMBNAIL_SIZES", DEFAULT_THUMBNAIL_SIZES))
+
+    # -------------------------
+    # Ingest
+    # -------------------------
+    @classmethod
+    def ingest(cls, fileobj, name: str = "", content_type: str = ""):
+        """Store content once; returns (FileVersion, StoredObject)."""
+        from .models import FileVersion
+
+        stored = cls.store().put(fileobj)
+        content_type = content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+        version, created = FileVersion.objects.get_or_create(
+            file_path=f"{DIGEST_PREFIX}{stored.digest}",
+            version=1,
+            defaults={
+                "storage_config": cls.storage_config(),
+                "file_size": stored.size,
+                "metadata": {"sha256": stored.digest, "content_type": content_type, "name": name},
+            },
+        )
+        logger.info(
+            f"[STORAGE] {'Stored' if stored.created else 'Deduplicated'} {name or 'blob'} "
+            f"({stored.size} B, {stored.digest[:12]})"
+        )
+        return version, stored
+
+    @classmethod
+    def attach(cls, instance, fileobj) -> StoredObject:
+        """
+        Store an upload and point a Photo / Video at it (metadata sha256, content_type, name).
+
+        The content type is sniffed from the bytes; the client-supplied one is
+        ignored. Raises UnsupportedContent unless it is an allowed type of the
+        source kind.
+        """
+        name = getattr(fileobj, "name", "") or ""
+        kind = cls.kind_for(instance)
+        content_type = sniff_content_type(cls._head(fileobj))
+        if content_type not in MEDIA_CONTENT_TYPES.get(kind, ()):
+            raise UnsupportedContent(
+                f"Unsupported {kind} content ({content_type or 'unrecognised format'}); "
+                f"allowed: {', '.join(sorted(MEDIA_CONTENT_TYPES.get(kind, ())))}"
+            )
+        version, stored = cls.ingest(fileobj, name=name, content_type=content_type)
+        instance.metadata = {
+            **(instance.metadata or {}),
+            "sha256": stored.digest,
+            "content_type": content_type,
+            "name": name,
+        }
+        instance.file_size = stored.size
+        instance.save(update_fields=["metadata", "file_size", "updated"])
+        return stored
+
+    @staticmethod
+    def _head(fileobj) -> bytes:
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        head = fileobj.read(SNIFF_BYTES)
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        return head or b""
+
+    @staticmethod
+    def kind_for(instance) -> str:
+        """Media kind of an uploadable source model instance (Photo = image, Video = video)."""
+        label = instance._meta.label
+        for spec in MEDIA_SOURCES.values():
+            if spec["model"] == label and not spec.get("file_field"):
+                return spec["kind"]
+        raise StorageError(f"{label} is not an uploadable media source")
+
+    # -------------------------
+    # Sources
+    # -------------------------
+    @staticmethod
+    def source_model(source_name: str):
+        spec = MEDIA_SOURCES.get(source_name)
+        if spec is None:
+            raise StorageError(f"Unknown media source '{source_name}'")
+        return apps.get_model(spec["model"])
+
+    @classmethod
+    def source(cls, source_name: str, instance) -> MediaSource:
+        """MediaSource for an instance of MEDIA_SOURCES[source_name]; StorageError if it has no content."""
+        spec = MEDIA_SOURCES[source_name]
+        if spec.get("file_field"):
+            return cls._file_source(getattr(instance, spec["file_field"]), spec["kind"])
+        metadata = instance.metadata or {}
+        digest = metadata.get("sha256")
+        if not digest:
+            raise StorageError("No stored content")
+        path = cls.store().path(digest)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise StorageError("Stored content is missing")
+        return MediaSource(
+            path=path,
+            content_type=metadata.get("content_type") or "application/octet-stream",
+            etag=f'"{digest}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc),
+            key=digest,
+            kind=spec["kind"],
+            filename=metadata.get("name", ""),
+        )
+
+    @staticmethod
+    def _file_source(fieldfile, kind: str) -> MediaSource:
+        if not fieldfile:
+            raise StorageError("No stored content")
+        try:
+            path = Path(fieldfile.path)
+            stat = path.stat()
+        except (NotImplementedError, FileNotFoundError, ValueError):
+            raise StorageError("Stored content is missing")
+        # Not content-addressed: validators and derivative key from name + size + mtime
+        key = hashlib.sha256(f"{fieldfile.name}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+        return MediaSource(
+            path=path,
+            content_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            etag=f'"{key[:32]}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc),
+            key=key,
+            kind=kind,
+            filename=path.name,
+        )
+
+    @classmethod
+    def thumbnail(cls, source: MediaSource, size: int) -> MediaSource:
+        """Cached JPEG thumbnail / poster frame (longest side = size)."""
+        if size not in cls.thumbnail_sizes():
+            raise StorageError(f"Unsupported thumbnail size {size}")
+        builder = THUMBNAIL_BUILDERS.get(source.kind)
+        if builder is None:
+            raise DerivativeUnavailable(f"No thumbnails for '{source.kind}'")
+        path = cls.store().derivative(source.key, f"thumb_{size}.jpg", builder(source.path, size))
+        stat = path.stat()
+        return MediaSource(
+            path=path,
+            content_type="image/jpeg",
+            etag=f'"{source.key[:32]}-t{size}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc),
+            key=source.key,
+            kind="image",
+            filename=f"thumb_{size}.jpg",
+        )
@@ -0,0 +1,176 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/file_storage/serving.py
+#   File Storage Serving - Range + conditional GET file responses
+#   Zero-copy FileResponse / X-Accel-Redirect, 304 / 206 / 416
+#..............................................................
+
+"""
+   File Storage Serving - Range and Conditional GET File Responses.
+
+   file_response() serves a file from disk without reading it in Python:
+
+   - If-None-Match / If-Modified-Since -> 304 (If-Match / If-Unmodified-Since -> 412)
+     via django.utils.cache.get_conditional_response
+   - Range: bytes=a-b (single range, honoured only if If-Range still matches)
+     -> 206 with Content-Range; unsatisfiable -> 416
+   - full responses use FileResponse on the open file, so the WSGI server can
+     use sendfile (wsgi.file_wrapper); range bodies are streamed in chunks
+   - with FILE_STORAGE_SENDFILE_HEADER (e.g. "X-Accel-Redirect") and
+     FILE_STORAGE_SENDFILE_ROOTS {local dir: internal URL prefix} the body is
+     left to the web server (which then also handles Range itself)
+
+   Only allowlisted media types (engine.MEDIA_CONTENT_TYPES, or the caller's
+   inline_types) are served inline with their type; anything else goes out as
+   application/octet-stream with Content-Disposition: attachment. Every
+   response carries X-Content-Type-Options: nosniff.
+"""
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .engine import MEDIA_CONTENT_TYPES
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+RANGE_CHUNK_SIZE = 64 * 1024
+INLINE_CONTENT_TYPES = frozenset().union(*MEDIA_CONTENT_TYPES.values())
+DOWNLOAD_CONTENT_TYPE = "application/octet-stream"
+
+
+def parse_range(header: str, size: int):
+    """(start, end) inclusive for a single 'bytes=' range, None if not parseable, False if unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multi-range / other units -> full response
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    value = request.META.get("HTTP_IF_RANGE")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return bool(etag) and value == etag and not value.startswith("W/")
+    timestamp = parse_http_date_safe(value)
+    return bool(last_modified) and timestamp is not None and int(last_modified.timestamp()) <= timestamp
+
+
+def _iter_range(path: Path, start: int, length: int):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _sendfile_location(path: Path) -> Optional[str]:
+    roots = getattr(settings, "FILE_STORAGE_SENDFILE_ROOTS", None) or {}
+    for root, prefix in roots.items():
+        try:
+            relative = path.resolve().relative_to(Path(root).resolve())
+        except ValueError:
+            continue
+        return prefix.rstrip("/") + "/" + relative.as_posix()
+    return None
+
+
+def file_response(
+    request,
+    path: Path,
+    content_type: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    filename: str = "",
+    max_age: Optional[int] = None,
+    inline_types: Optional[frozenset] = None,
+):
+    """
+    Serve `path` with ETag / Last-Modified validators and single-range support.
+
+    content_type is kept (inline) only if it is in inline_types (default:
+    INLINE_CONTENT_TYPES); otherwise the file is a download.
+    """
+    inline = content_type in (INLINE_CONTENT_TYPES if inline_types is None else inline_types)
+    if not inline:
+        content_type = DOWNLOAD_CONTENT_TYPE
+    path = Path(path)
+    size = path.stat().st_size
+    etag = quote_etag(etag) if etag else None
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if conditional is not None:
+        response = conditional
+    else:
+        response = _body_response(request, path, size, content_type, etag, last_modified)
+
+    if etag:
+        response["ETag"] = etag
+    if last_modified_ts is not None:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    response["Accept-Ranges"] = "bytes"
+    response["X-Content-Type-Options"] = "nosniff"
+    if response.status_code in (200, 206):
+        disposition = "inline" if inline else "attachment"
+        safe_name = "".join(ch for ch in filename if ch.isprintable() and ch not in '"\\')
+        response["Content-Disposition"] = f'{disposition}; filename="{safe_name}"' if safe_name else disposition
+    if max_age is None:
+        max_age = getattr(settings, "MEDIA_CACHE_MAX_AGE", 3600)
+    patch_cache_control(response, private=True, max_age=max_age)
+    return response
+
+
+def _body_response(request, path: Path, size: int, content_type: str, etag, last_modified):
+    header = getattr(settings, "FILE_STORAGE_SENDFILE_HEADER", "")
+    location = _sendfile_location(path) if header else None
+    if location:
+        response = HttpResponse(content_type=content_type)
+        response[header] = location
+        return response
+
+    byte_range = None
+    if request.method in ("GET", "HEAD") and request.META.get("HTTP_RANGE") and _if_range_matches(
+        request, etag, last_modified
+    ):
+        byte_range = parse_range(request.META["HTTP_RANGE"], size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416, content_type=content_type)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is None:
+        if request.method == "HEAD":
+            response = HttpResponse(content_type=content_type)
+        else:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+        response["Content-Length"] = str(size)
+        return response
+
+    start, end = byte_range
+    length = end - start + 1
+    body = iter(()) if request.method == "HEAD" else _iter_range(path, start, length)
+    response = StreamingHttpResponse(body, status=206, content_type=content_type)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(length)
+    return response
@@ -0,0 +1,237 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/file_storage/tests/test_engine.py
+#   File Storage Engine Tests
+#   Tests for engine.py, serving.py and media/ endpoints
+#..............................................................
+
+"""
+   File Storage Engine Tests.
+
+   Tests for content-addressed storage and deduplication, cached
+   derivatives, Range / conditional GET responses and scoped media endpoints.
+"""
+
+import datetime
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.api.views_media import media_file_view, media_thumbnail_view
+from sopira_magic.apps.file_storage import engine
+from sopira_magic.apps.file_storage.engine import ContentStore, StorageEngine
+from sopira_magic.apps.file_storage.models import FileVersion
+from sopira_magic.apps.file_storage.serving import file_response, parse_range
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_measurement.models import Measurement
+from sopira_magic.apps.m_photo.models import Photo
+
+CONTENT = b'0123456789' * 100
+JPEG = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00' + CONTENT
+
+
+@pytest.fixture(autouse=True)
+def storage_root(settings, tmp_path):
+    settings.FILE_STORAGE_ROOT = str(tmp_path / 'cas')
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    return tmp_path / 'cas'
+
+
+def _body(response):
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+class TestContentStore:
+    """Test suite for ContentStore."""
+
+    def test_put_is_sharded_and_deduplicated(self, storage_root):
+        """Test identical content is stored once under its digest."""
+        store = ContentStore(storage_root)
+        first = store.put(io.BytesIO(CONTENT))
+        second = store.put(io.BytesIO(CONTENT))
+
+        assert first.created and not second.created
+        assert first.path == second.path
+        assert first.path.relative_to(storage_root).parts[:3] == ('objects', first.digest[:2], first.digest[2:4])
+        assert first.path.read_bytes() == CONTENT
+        assert list((storage_root / 'tmp').iterdir()) == []
+
+    def test_derivative_built_once(self, storage_root):
+        """Test derivatives are cached after the first build."""
+        store = ContentStore(storage_root)
+        calls = []
+
+        def build(target):
+            calls.append(target)
+            target.write_bytes(b'thumb')
+
+        first = store.derivative('ab' * 32, 'thumb_128.jpg', build)
+        second = store.derivative('ab' * 32, 'thumb_128.jpg', build)
+        assert first == second and first.read_bytes() == b'thumb'
+        assert len(calls) == 1
+
+
+class TestFileResponse:
+    """Test suite for Range / conditional GET handling."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / 'file.bin'
+        path.write_bytes(CONTENT)
+        return path
+
+    def _get(self, path, **headers):
+        request = RequestFactory().get('/media/', **headers)
+        modified = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+        return file_response(request, path, 'application/octet-stream', etag='"abc"', last_modified=modified)
+
+    def test_full_response(self, path):
+        """Test full GET is a FileResponse with validators."""
+        response = self._get(path)
+        assert response.status_code == 200
+        assert _body(response) == CONTENT
+        assert response['ETag'] == '"abc"'
+        assert response['Accept-Ranges'] == 'bytes'
+
+    def test_range(self, path):
+        """Test single byte ranges return 206 with Content-Range."""
+        response = self._get(path, HTTP_RANGE='bytes=10-19')
+        assert response.status_code == 206
+        assert response['Content-Range'] == f'bytes 10-19/{len(CONTENT)}'
+        assert _body(response) == CONTENT[10:20]
+        assert _body(self._get(path, HTTP_RANGE='bytes=-5')) == CONTENT[-5:]
+
+    def test_unsatisfiable_range(self, path):
+        """Test ranges past the end return 416."""
+        response = self._get(path, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        assert response.status_code == 416
+        assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+    def test_stale_if_range_returns_full_body(self, path):
+        """Test If-Range with another ETag ignores the Range header."""
+        response = self._get(path, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"other"')
+        assert response.status_code == 200
+
+    def test_not_modified(self, path):
+        """Test If-None-Match returns 304 without a body."""
+        response = self._get(path, HTTP_IF_NONE_MATCH='"abc"')
+        assert response.status_code == 304
+        assert response.content == b''
+
+    def test_unlisted_type_is_download(self, path):
+        """Test non-media types are served as octet-stream attachments."""
+        request = RequestFactory().get('/media/')
+        response = file_response(request, path, 'text/html', etag='"abc"', filename='page.html')
+        assert response['Content-Type'] == 'application/octet-stream'
+        assert response['Content-Disposition'] == 'attachment; filename="page.html"'
+        assert response['X-Content-Type-Options'] == 'nosniff'
+
+    def test_sniff_content_type(self):
+        """Test magic-byte detection of images and videos."""
+        assert engine.sniff_content_type(JPEG[:64]) == 'image/jpeg'
+        assert engine.sniff_content_type(b'\x00\x00\x00\x18ftypmp42') == 'video/mp4'
+        assert engine.sniff_content_type(b'\x00\x00\x00\x14ftypqt  ') == 'video/quicktime'
+        assert engine.sniff_content_type(b'<svg xmlns="http://www.w3.org/2000/svg">') is None
+
+    def test_parse_range(self):
+        """Test range header parsing."""
+        assert parse_range('bytes=0-', 10) == (0, 9)
+        assert parse_range('bytes=5-100', 10) == (5, 9)
+        assert parse_range('bytes=0-1,4-5', 10) is None
+        assert parse_range('bytes=20-', 10) is False
+
+
+@pytest.mark.django_db
+class TestMediaEndpoints:
+    """Test suite for media/<source>/<pk>/ endpoints."""
+
+    @pytest.fixture
+    def admin(self):
+        return get_user_model().objects.create_superuser(username='mediaadmin', password='pass12345')
+
+    @pytest.fixture
+    def photo(self):
+        company = Company.objects.create(code='AC', name='Acme')
+        plant = Factory.objects.create(company=company, code='F1', name='Alpha')
+        measurement = Measurement.objects.create(
+            factory=plant, dump_date=datetime.date(2026, 1, 1), dump_time=datetime.time(8, 0),
+            pot_knocks=0, pot_weight_kg=0,
+        )
+        return Photo.objects.create(measurement=measurement)
+
+    def _call(self, view, method, user, photo, data=None, **headers):
+        request = getattr(APIRequestFactory(), method)('/api/media/photos/x/', data, format='multipart', **headers)
+        force_authenticate(request, user)
+        return view(request, source='photos', pk=photo.pk)
+
+    def test_upload_deduplicates(self, admin, photo):
+        """Test uploads are content-addressed and indexed once."""
+        upload = lambda: SimpleUploadedFile('a.jpg', JPEG, content_type='image/jpeg')  # noqa: E731
+        first = self._call(media_file_view, 'post', admin, photo, {'file': upload()})
+        other = Photo.objects.create(measurement=photo.measurement)
+        second = self._call(media_file_view, 'post', admin, other, {'file': upload()})
+
+        assert first.status_code == 201 and second.status_code == 200
+        assert second.data['deduplicated'] is True
+        assert FileVersion.objects.count() == 1
+        photo.refresh_from_db()
+        assert photo.metadata['sha256'] == first.data['sha256']
+        assert photo.file_size == len(JPEG)
+
+    def test_download_range_and_etag(self, admin, photo):
+        """Test the stored file is served with Range and ETag support."""
+        StorageEngine.attach(photo, SimpleUploadedFile('a.jpg', JPEG, content_type='image/jpeg'))
+
+        response = self._call(media_file_view, 'get', admin, photo, HTTP_RANGE='bytes=0-3')
+        assert response.status_code == 206
+        assert _body(response) == JPEG[:4]
+        assert response['Content-Type'] == 'image/jpeg'
+
+        etag = response['ETag']
+        assert self._call(media_file_view, 'get', admin, photo, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_thumbnail_cached(self, admin, photo, monkeypatch):
+        """Test thumbnails are built on first request and reused."""
+        StorageEngine.attach(photo, SimpleUploadedFile('a.jpg', JPEG, content_type='image/jpeg'))
+        calls = []
+
+        def fake_builder(source, size):
+            def build(target):
+                calls.append(size)
+                target.write_bytes(b'jpeg')
+            return build
+
+        monkeypatch.setitem(engine.THUMBNAIL_BUILDERS, 'image', fake_builder)
+        for _ in range(2):
+            response = self._call(media_thumbnail_view, 'get', admin, photo)
+            assert response.status_code == 200
+            assert _body(response) == b'jpeg'
+        assert calls == [256]
+
+    def test_upload_type_is_sniffed(self, admin, photo):
+        """Test the client Content-Type is ignored: HTML claiming image/jpeg is rejected."""
+        html = SimpleUploadedFile('x.jpg', b'<html><script>alert(1)</script></html>', content_type='image/jpeg')
+        response = self._call(media_file_view, 'post', admin, photo, {'file': html})
+        assert response.status_code == 415
+
+        png = SimpleUploadedFile('a.bin', b'\x89PNG\r\n\x1a\n' + CONTENT, content_type='text/html')
+        assert self._call(media_file_view, 'post', admin, photo, {'file': png}).status_code == 201
+        photo.refresh_from_db()
+        assert photo.metadata['content_type'] == 'image/png'
+
+    def test_served_with_nosniff(self, admin, photo):
+        """Test media responses forbid MIME sniffing."""
+        StorageEngine.attach(photo, SimpleUploadedFile('a.jpg', JPEG, content_type='image/jpeg'))
+        response = self._call(media_file_view, 'get', admin, photo)
+        assert response['X-Content-Type-Options'] == 'nosniff'
+        assert response['Content-Disposition'] == 'inline; filename="a.jpg"'
+
+    def test_out_of_scope_is_not_found(self, photo):
+        """Test users outside the measurement's company get 404."""
+        StorageEngine.attach(photo, SimpleUploadedFile('a.jpg', JPEG, content_type='image/jpeg'))
+        outsider = get_user_model().objects.create_user(username='outsider', password='pass12345', role='reader')
+        assert self._call(media_file_view, 'get', outsider, photo).status_code == 404
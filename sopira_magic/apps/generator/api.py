@@ -1,91 +1,3 @@
-def generator_assign_tags_view_impl(user, model_key: str, count_per_object: int | None = 1, object_ids=None):
-    """
-    Priraď tagy k vybraným objektom (alebo ku všetkým pre daný model).
-    count_per_object: koľko nových tagov vygenerovať na objekt (default 1)
-    object_ids: zoznam ID; ak None → všetky objekty modelu
-    """
-    from django.contrib.contenttypes.models import ContentType
-    from sopira_magic.apps.m_tag.models import Tag, TaggedItem
-    from sopira_magic.apps.generator.datasets import generate_tags
-
-    if not model_key:
-        return Response({"error": "model_key is required"}, status=status.HTTP_400_BAD_REQUEST)
-
-    try:
-        count_int = max(1, int(count_per_object or 1))
-    except Exception:
-        count_int = 1
-
-    cfg = get_generator_config(model_key)
-    if not cfg:
-        return Response({"error": f"Generator config '{model_key}' not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    model_class = GeneratorService.get_model_class(cfg["model"])
-    qs = model_class.objects.all()
-    if object_ids:
-        try:
-            qs = qs.filter(pk__in=object_ids)
-        except Exception:
-            pass
-    objects = list(qs)
-
-    ctype = ContentType.objects.get_for_model(model_class)
-    tagged_items = 0
-    tags_created = 0
-    for obj in objects:
-        tag_names = generate_tags(count_int)
-        for name in tag_names:
-            tag, created_tag = Tag.objects.get_or_create(name=name)
-            tags_created += 1 if created_tag else 0
-            _, created_item = TaggedItem.objects.get_or_create(
-                tag=tag,
-                content_type=ctype,
-                object_id=obj.pk,
-            )
-            tagged_items += 1 if created_item else 0
-
-    return Response(
-        {
-            "model_key": model_key,
-            "objects_tagged": len(objects),
-            "tags_requested": len(objects) * count_int,
-            "tag_records_created": tags_created,
-            "tagged_links_created": tagged_items,
-        },
-        status=status.HTTP_200_OK,
-    )
-
-
-def generator_remove_tags_view_impl(user, model_key: str, object_ids=None):
-    """
-    Odstráni všetky tagy z vybraných objektov (alebo všetkých objektov modelu).
-    """
-    from django.contrib.contenttypes.models import ContentType
-    from sopira_magic.apps.m_tag.models import TaggedItem
-
-    if not model_key:
-        return Response({"error": "model_key is required"}, status=status.HTTP_400_BAD_REQUEST)
-
-    cfg = get_generator_config(model_key)
-    if not cfg:
-        return Response({"error": f"Generator config '{model_key}' not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    model_class = GeneratorService.get_model_class(cfg["model"])
-    qs = model_class.objects.all()
-    if object_ids:
-        try:
-            qs = qs.filter(pk__in=object_ids)
-        except Exception:
-            pass
-    obj_ids = [obj.pk for obj in qs]
-
-    ctype = ContentType.objects.get_for_model(model_class)
-    deleted, _ = TaggedItem.objects.filter(content_type=ctype, object_id__in=obj_ids).delete()
-
-    return Response(
-        {"model_key": model_key, "objects_processed": len(obj_ids), "tag_links_deleted": deleted},
-        status=status.HTTP_200_OK,
-    )
 """
 Generator API helpers - separation of concerns from api/views.py
 
@@ -97,8 +9,10 @@ api/views.py nezväčšoval. Obsahuje:
 - generator_generate_view_impl
 - generator_clear_view_impl
 - generator_clear_all_view_impl
+- generator_progress_event_stream (async SSE)
 """
 
+import json
 import logging
 from rest_framework import status
 from rest_framework.response import Response
@@ -226,66 +140,15 @@ def generator_models_view_impl(user):
 
 def generator_generate_view_impl(user, model_key: str, count):
     """
-    Spustí generovanie asynchrónne a hneď vráti job_id, aby FE mohlo otvoriť modal a počúvať SSE.
+    Zaradí generovanie do perzistentnej fronty (GeneratorJobQueue) a hneď vráti job_id,
+    aby FE mohlo otvoriť modal a počúvať SSE. Job vykoná `generator_worker`.
     """
-    import threading
-    from sopira_magic.apps.generator.progress_state import new_job_id, set_status, mark_done
-    from sopira_magic.apps.generator.progress import ProgressTracker
-
-    job_id = new_job_id()
-    cfg = get_generator_config(model_key)
-    model_class = GeneratorService.get_model_class(cfg["model"])
-    total_target = count or cfg.get("count", 0)
-
-    # Inicializuj stav hneď, aby SSE malo čo streamovať
-    set_status(
-        job_id,
-        {
-            "job_id": job_id,
-            "name": f"generate_{model_key}",
-            "completed": 0,
-            "total": total_target,
-            "note": "Starting",
-            "done": False,
-        },
-    )
-
-    def run_generation():
-        def status_fn(snapshot):
-            set_status(job_id, snapshot)
-
-        tracker = ProgressTracker(
-            name=f"generate_{model_key}",
-            total=total_target,
-            status_fn=status_fn,
-            job_id=job_id,
-        )
-        created = []
-        try:
-            tracker.start()
-            created = GeneratorService.generate_data(
-                model_key, count=count, user=user, progress=tracker, job_id=job_id
-            )
-            tracker.finish()
-            mark_done(job_id)
-            set_status(
-                job_id,
-                {
-                    "job_id": job_id,
-                    "name": f"generate_{model_key}",
-                    "completed": len(created),
-                    "total": total_target or len(created),
-                    "done": True,
-                    "note": "done",
-                },
-            )
-        except Exception as e:
-            set_status(
-                job_id,
-                {"job_id": job_id, "name": f"generate_{model_key}", "error": str(e), "done": True},
-            )
+    from sopira_magic.apps.generator.jobs import GeneratorJobQueue
 
-    threading.Thread(target=run_generation, daemon=True).start()
+    try:
+        job_id = GeneratorJobQueue.enqueue("generate", user=user, model_key=model_key, count=count)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     return Response(
         {
@@ -297,6 +160,17 @@ def generator_generate_view_impl(user, model_key: str, count):
     )
 
 
+def _clear_tracker(job_id: str, name: str, total: int):
+    """ProgressTracker wired to progress_state so status/SSE endpoints see clear progress."""
+    from sopira_magic.apps.generator.progress_state import set_status
+    from sopira_magic.apps.generator.progress import ProgressTracker
+
+    def status_fn(snapshot):
+        set_status(job_id, snapshot)
+
+    return ProgressTracker(name=name, total=total, logger=logger, status_fn=status_fn, job_id=job_id, min_interval=0.5)
+
+
 def generator_clear_view_impl(user, model_key: str, delete_count):
     from sopira_magic.apps.generator.progress_state import new_job_id, set_status, mark_done
     job_id = new_job_id()
@@ -306,25 +180,20 @@ def generator_clear_view_impl(user, model_key: str, delete_count):
     qs = model_class.objects.all()
     total_before = qs.count()
 
-    deleted = 0
-
     # Preserve superuser sopira for user model
     if model_key == "user":
         qs = qs.exclude(username="sopira")
 
+    if delete_count and delete_count > 0:
+        qs = model_class.objects.filter(id__in=list(qs.order_by("id").values_list("id", flat=True)[:delete_count]))
+
+    tracker = _clear_tracker(job_id, f"clear_{model_key}", qs.count())
     try:
-        if delete_count and delete_count > 0:
-            ids = list(qs.order_by("id").values_list("id", flat=True)[:delete_count])
-            deleted = len(ids)
-            if ids:
-                model_class.objects.filter(id__in=ids).delete()
-        else:
-            if model_key == "user":
-                deleted = qs.count()
-                qs.delete()
-            else:
-                deleted = GeneratorService.clear_data(model_key, keep_count=0)
+        tracker.start()
+        deleted = GeneratorService.clear_data(model_key, queryset=qs, progress=tracker, job_id=job_id)
+        tracker.finish()
     except Exception as e:
+        set_status(job_id, {"job_id": job_id, "name": f"clear_{model_key}", "error": str(e), "done": True})
         return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     total_after = model_class.objects.count()
@@ -349,7 +218,7 @@ def generator_clear_view_impl(user, model_key: str, delete_count):
 
 
 def generator_clear_all_view_impl(user, skip_users: bool = False):
-    from sopira_magic.apps.generator.progress_state import new_job_id, set_status, mark_done, is_cancel_requested
+    from sopira_magic.apps.generator.progress_state import new_job_id, mark_done, is_cancel_requested
     job_id = new_job_id()
     configs, parents_map, _ = _get_generator_dependency_graph()
     order = _topological_order(configs, parents_map)  # parents last
@@ -357,67 +226,35 @@ def generator_clear_all_view_impl(user, skip_users: bool = False):
 
     delete_order = list(reversed(order))  # children first, parents last
 
-    total_target = sum(get_generator_config(k).get("count", 0) for k in delete_order)
-    completed = 0
+    # Real row counts (not config defaults) so progress reaches 100 %
+    querysets = {}
+    for key in delete_order:
+        if key == "user" and skip_users:
+            continue
+        model_class = GeneratorService.get_model_class(get_generator_config(key)["model"])
+        qs = model_class.objects.all()
+        if key == "user":
+            qs = qs.exclude(username="sopira")
+        querysets[key] = qs
+    tracker = _clear_tracker(job_id, "clear_all", sum(qs.count() for qs in querysets.values()))
+    tracker.start()
 
     for key in delete_order:
         if is_cancel_requested(job_id):
             deleted_summary["cancelled"] = True
             break
+        if key not in querysets:
+            deleted_summary[key] = "skipped"
+            continue
         try:
-            cfg = get_generator_config(key)
-            model_class = GeneratorService.get_model_class(cfg["model"])
-
-            if key == "user":
-                if skip_users:
-                    deleted_summary[key] = "skipped"
-                    continue
-                
-                # First, clear state records for users to be deleted (cross-database CASCADE)
-                try:
-                    from sopira_magic.apps.state.models import TableState, SavedWorkspace, EnvironmentState
-                    from sopira_magic.apps.m_user.models import UserPreference
-                    
-                    # Get IDs of users to delete (all except sopira)
-                    user_ids_to_delete = list(
-                        model_class.objects.exclude(username="sopira").values_list("id", flat=True)
-                    )
-                    
-                    if user_ids_to_delete:
-                        # Clear state DB records for these users
-                        TableState.objects.using("state").filter(user_id__in=user_ids_to_delete).delete()
-                        SavedWorkspace.objects.using("state").filter(user_id__in=user_ids_to_delete).delete()
-                        EnvironmentState.objects.using("state").filter(user_id__in=user_ids_to_delete).delete()
-                        
-                        # Clear UserPreference (PRIMARY DB)
-                        UserPreference.objects.filter(user_id__in=user_ids_to_delete).delete()
-                except Exception as state_err:
-                    logger.warning("Failed to clear state data for users: %s", state_err)
-                
-                # Now delete users
-                qs = model_class.objects.exclude(username="sopira")
-                deleted = qs.count()
-                try:
-                    qs.delete()
-                    deleted_summary[key] = deleted
-                except Exception as e:
-                    # Log error but still report how many we tried to delete
-                    deleted_summary[key] = f"error: {str(e)} (attempted {deleted})"
-                continue
-
-            deleted = GeneratorService.clear_data(key, keep_count=0)
-            deleted_summary[key] = deleted
-            completed += deleted
-            set_status(job_id, {
-                "job_id": job_id,
-                "name": "clear_all",
-                "completed": completed,
-                "total": total_target,
-                "note": f"cleared {key}",
-            })
+            # Cross-database children (state/logging) are part of the cascade plan
+            deleted_summary[key] = GeneratorService.clear_data(
+                key, queryset=querysets[key], progress=tracker, job_id=job_id
+            )
         except Exception as e:
             deleted_summary[key] = f"error: {str(e)}"
 
+    tracker.finish()
     mark_done(job_id)
     return Response({"job_id": job_id, "deleted": deleted_summary}, status=status.HTTP_200_OK)
 
@@ -530,6 +367,19 @@ def generator_progress_cancel_view_impl(job_id: str):
     return Response({"job_id": job_id, "cancel_requested": True}, status=status.HTTP_200_OK)
 
 
+async def generator_progress_event_stream(job_id: str):
+    """Async SSE event stream fed by the progress bus (push, no polling)."""
+    from sopira_magic.apps.generator.progress_bus import get_progress_bus
+
+    async for payload in get_progress_bus().listen(job_id):
+        if payload is None:
+            yield ": keepalive\n\n"
+            continue
+        yield f"data: {json.dumps(payload, default=str)}\n\n"
+        if payload.get("done") or payload.get("cancel_requested") or payload.get("error"):
+            break
+
+
 # =============================================================================
 # TAG API HELPERS - Wrapper functions for tag operations
 # =============================================================================
@@ -544,8 +394,6 @@ def generator_assign_tags_view_impl(user, model_key, count_per_object=2, object_
         count_per_object: how many tags per object (default 2)
         object_ids: optional list of specific object IDs
     """
-    from ..services import GeneratorService
-
     if not model_key:
         return Response({"error": "model_key is required"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -577,8 +425,6 @@ def generator_remove_tags_view_impl(user, model_key, count_per_object=None, obje
         count_per_object: optional number of tags to remove per object (None => remove all)
         object_ids: optional list of specific object IDs
     """
-    from ..services import GeneratorService
-
     if not model_key:
         return Response({"error": "model_key is required"}, status=status.HTTP_400_BAD_REQUEST)
 
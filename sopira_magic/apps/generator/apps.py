@@ -34,3 +34,9 @@ class GeneratorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sopira_magic.apps.generator'
     verbose_name = 'Generator'
+
+    def ready(self):
+        # Fail fast: an external job worker cannot share an in-process progress bus
+        from .progress_bus import check_backend_configuration
+
+        check_backend_configuration()
@@ -0,0 +1,339 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/clear_engine.py
+#   BulkClearEngine - Set-based bulk delete for generator clear
+#   Cascade plan per model, chunked raw deletes, progress reporting
+#..............................................................
+
+"""
+BulkClearEngine - Set-Based Bulk Delete.
+
+   `QuerySet.delete()` makes Django collect every related object in Python and
+   fire pre/post_delete per instance. Clearing thousands of generated records
+   that way is O(instances x models x fields). This engine computes a cascade
+   plan ONCE per model and then deletes in chunked, set-based SQL batches.
+
+   How it works:
+   1. plan_for(model) walks reverse relations (FK / O2O / auto M2M through
+      tables) and GenericRelations once and caches the resulting tree
+   2. Each step is routed via DatabaseRouter; dependents in another database
+      (state / logging) are deleted per chunk via the core.signals bulk hook
+   3. clear() snapshots the PKs, then per chunk deletes children first
+      (CASCADE), nulls SET_NULL columns, checks PROTECT/RESTRICT, and finally
+      deletes the chunk via `_raw_delete` (no per-instance signals); read
+      model rows (api.read_model) of deleted / nulled rows are deleted /
+      refreshed in the same transaction
+   4. Progress goes through ProgressTracker → progress_state (SSE/status)
+   5. After the clear, derived views (FK options cache, search index) of all
+      touched models are refreshed once instead of per instance
+
+   Fallback:
+   Models the plan cannot express (multi-table inheritance, cycles,
+   SET_DEFAULT / SET(...)) are deleted via the standard `QuerySet.delete()`.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.generator.clear_engine import BulkClearEngine
+   deleted = BulkClearEngine(progress=tracker, job_id=job_id).clear(Measurement)
+   ```
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models.deletion import ProtectedError, get_candidate_relations_to_delete
+
+from sopira_magic.apps.core.signals import CROSS_DB_DEPENDENTS, delete_cross_database_dependents
+from sopira_magic.db_router import DatabaseRouter
+from .progress import ProgressTracker
+from .progress_state import is_cancel_requested
+
+logger = logging.getLogger(__name__)
+
+CASCADE = "cascade"
+SET_NULL = "set_null"
+PROTECT = "protect"
+GENERIC = "generic"
+
+DEFAULT_CHUNK_SIZE = 500
+
+_router = DatabaseRouter()
+
+
+class _PlanUnsupported(Exception):
+    """Relation graph the set-based plan cannot express (falls back to QuerySet.delete())."""
+
+
+@dataclass
+class CascadeStep:
+    """One edge of the cascade plan (child model → parent via field)."""
+    model: type
+    field_name: str
+    action: str
+    db: str
+    content_type_field: Optional[str] = None
+    children: List["CascadeStep"] = field(default_factory=list)
+
+
+@dataclass
+class CascadePlan:
+    """Precomputed cascade tree for a root model."""
+    model: type
+    db: str
+    steps: List[CascadeStep] = field(default_factory=list)
+    fallback_reason: Optional[str] = None
+
+    @property
+    def models(self) -> Set[type]:
+        """All models touched when clearing the root model."""
+        touched = {self.model}
+        stack = list(self.steps)
+        while stack:
+            step = stack.pop()
+            if step.action in (CASCADE, GENERIC):
+                touched.add(step.model)
+            stack.extend(step.children)
+        return touched
+
+
+_PLAN_CACHE: Dict[str, CascadePlan] = {}
+
+
+def _action_for(on_delete) -> Optional[str]:
+    if on_delete is models.CASCADE:
+        return CASCADE
+    if on_delete is models.SET_NULL:
+        return SET_NULL
+    if on_delete in (models.PROTECT, models.RESTRICT):
+        return PROTECT
+    if on_delete is models.DO_NOTHING:
+        return None
+    raise _PlanUnsupported(getattr(on_delete, "__name__", repr(on_delete)))
+
+
+def _build_steps(model, path: tuple) -> List[CascadeStep]:
+    steps: List[CascadeStep] = []
+    opts = model._meta
+
+    model_db = _router.db_for_write(model)
+
+    for rel in get_candidate_relations_to_delete(opts):
+        child = rel.related_model
+        child_db = _router.db_for_write(child)
+        if child_db != model_db:
+            # Cross-database dependents go through core.signals bulk hook
+            continue
+        action = _action_for(rel.on_delete)
+        if action is None:
+            continue
+        step = CascadeStep(
+            model=child,
+            field_name=rel.field.name,
+            action=action,
+            db=child_db,
+        )
+        if action == CASCADE:
+            if child in path:
+                raise _PlanUnsupported(f"cycle via {child._meta.label}")
+            step.children = _build_steps(child, path + (child,))
+        steps.append(step)
+
+    for private in opts.private_fields:
+        if not isinstance(private, GenericRelation):
+            continue
+        steps.append(
+            CascadeStep(
+                model=private.related_model,
+                field_name=private.object_id_field_name,
+                action=GENERIC,
+                db=_router.db_for_write(private.related_model),
+                content_type_field=private.content_type_field_name,
+            )
+        )
+    return steps
+
+
+def plan_for(model) -> CascadePlan:
+    """Return (and cache) the cascade plan for `model`."""
+    label = model._meta.label
+    plan = _PLAN_CACHE.get(label)
+    if plan is not None:
+        return plan
+
+    plan = CascadePlan(model=model, db=_router.db_for_write(model))
+    if model._meta.parents:
+        plan.fallback_reason = "multi-table inheritance"
+    else:
+        try:
+            plan.steps = _build_steps(model, (model,))
+        except _PlanUnsupported as e:
+            plan.fallback_reason = str(e)
+    if plan.fallback_reason:
+        logger.info(f"[CLEAR] {label}: set-based plan unavailable ({plan.fallback_reason}), using QuerySet.delete()")
+    _PLAN_CACHE[label] = plan
+    return plan
+
+
+def clear_plan_cache():
+    """Drop cached plans (tests / dynamic model registration)."""
+    _PLAN_CACHE.clear()
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class BulkClearEngine:
+    """
+    Set-based clear for any model.
+
+    - Deletes children first in chunked `_raw_delete` batches per database.
+    - Reports progress via ProgressTracker and honours cancel requests.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressTracker] = None,
+        job_id: Optional[str] = None,
+    ):
+        self.chunk_size = max(int(chunk_size), 1)
+        self.progress = progress
+        self.job_id = job_id
+        self.cancelled = False
+
+    def clear(self, model, queryset=None, note: Optional[str] = None) -> int:
+        """
+        Delete all rows of `queryset` (default: all rows of `model`).
+
+        Returns:
+            Number of root rows deleted.
+        """
+        plan = plan_for(model)
+        qs = queryset if queryset is not None else model._base_manager.all()
+        note = note or model._meta.model_name
+
+        if plan.fallback_reason:
+            count = qs.count()
+            qs.delete()
+            if self.progress:
+                self.progress.step(count, note=note)
+            return count
+
+        pks = list(qs.values_list("pk", flat=True))
+        deleted = 0
+        for chunk in _chunks(pks, self.chunk_size):
+            if self.job_id and is_cancel_requested(self.job_id):
+                logger.info(f"[CLEAR] Cancel requested, stopping {model._meta.label} after {deleted} rows")
+                self.cancelled = True
+                break
+            delete_cross_database_dependents(model, chunk)
+            with transaction.atomic(using=plan.db):
+                self._delete_steps(plan.steps, model, chunk)
+                deleted += model._base_manager.using(plan.db).filter(pk__in=chunk)._raw_delete(plan.db)
+                _delete_read_model_rows(model, chunk)
+            if self.progress:
+                self.progress.step(len(chunk), note=note)
+
+        _refresh_derived_views(plan.models)
+        return deleted
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _delete_steps(self, steps: List[CascadeStep], parent_model, parent_pks: List):
+        for step in steps:
+            manager = step.model._base_manager.using(step.db)
+
+            if step.action == GENERIC:
+                ctype = ContentType.objects.get_for_model(parent_model)
+                qs = manager.filter(**{
+                    step.content_type_field: ctype,
+                    f"{step.field_name}__in": parent_pks,
+                })
+                qs._raw_delete(step.db)
+                continue
+
+            qs = manager.filter(**{f"{step.field_name}__in": parent_pks})
+
+            if step.action == PROTECT:
+                if qs.exists():
+                    raise ProtectedError(
+                        f"Cannot clear {parent_model._meta.label}: referenced through "
+                        f"protected foreign key {step.model._meta.label}.{step.field_name}",
+                        set(qs[:10]),
+                    )
+                continue
+
+            read_views = _read_model_views(step.model)
+            if step.action == SET_NULL:
+                nulled = list(qs.values_list("pk", flat=True)) if read_views else []
+                qs.update(**{step.field_name: None})
+                _refresh_read_model_rows(step.model, nulled)
+                continue
+
+            if step.children or read_views or CROSS_DB_DEPENDENTS.get(step.model._meta.label):
+                child_pks = list(qs.values_list("pk", flat=True))
+                for chunk in _chunks(child_pks, self.chunk_size):
+                    delete_cross_database_dependents(step.model, chunk)
+                    self._delete_steps(step.children, step.model, chunk)
+                    manager.filter(pk__in=chunk)._raw_delete(step.db)
+                    _delete_read_model_rows(step.model, chunk)
+            else:
+                qs._raw_delete(step.db)
+
+
+def _read_model_views(model) -> List[str]:
+    """Read model views (api.read_model) sourced from `model`."""
+    from sopira_magic.apps.api.read_model import source_read_model_views
+    return source_read_model_views(model)
+
+
+def _delete_read_model_rows(model, pks: List) -> None:
+    """_raw_delete sends no post_delete: drop the read model rows of deleted source rows."""
+    from sopira_magic.apps.api.read_model import ReadModelService
+    for view_name in _read_model_views(model):
+        ReadModelService.delete(view_name, pks)
+
+
+def _refresh_read_model_rows(model, pks: List) -> None:
+    """SET_NULL via queryset.update() sends no post_save: refresh the nulled rows' read model rows."""
+    from sopira_magic.apps.api.read_model import ReadModelService
+    for view_name in _read_model_views(model):
+        ReadModelService.refresh(view_name, pks)
+
+
+def _refresh_derived_views(touched_models: Set[type]):
+    """Invalidate FK option caches, bootstrap ETags, analytics results and rebuild search indexes once per touched view."""
+    try:
+        from sopira_magic.apps.analytics.query import AnalyticsService
+        from sopira_magic.apps.api.bootstrap import BootstrapService
+        from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+        from sopira_magic.apps.fk_options_cache.services import FKCacheService
+        from sopira_magic.apps.search.services import SearchService
+    except Exception as e:
+        logger.debug(f"[CLEAR] Derived view refresh unavailable: {e}")
+        return
+
+    # _raw_delete sends no post_delete, so the bootstrap / analytics signal handlers never run
+    BootstrapService.bump()
+    for model in touched_models:
+        AnalyticsService.bump_written(model)
+
+    search = SearchService()
+    for view_name, cfg in VIEWS_MATRIX.items():
+        if cfg.get("model") not in touched_models:
+            continue
+        try:
+            if cfg.get("fk_display_template"):
+                FKCacheService.invalidate_all(view_name)
+            if cfg.get("dynamic_search", True):
+                search.recreate_index(view_name)
+        except Exception as e:
+            logger.warning(f"[CLEAR] Failed to refresh derived views for {view_name}: {e}")
@@ -0,0 +1,344 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/jobs.py
+#   GeneratorJobQueue - Persistent, resumable generator job queue
+#   DB-backed via scheduler.ScheduledTask / TaskExecution
+#..............................................................
+
+"""
+GeneratorJobQueue - Persistent, Resumable Generator Jobs.
+
+   Generation jobs are stored in the scheduler app's tables instead of living
+   in daemon threads of the web process:
+
+   - ScheduledTask  = the job (task_type 'generator.generate' | 'generator.seed',
+                      schedule '' = one-shot, config = params + checkpoint)
+   - TaskExecution  = one attempt (running → success | failed)
+
+   Queue semantics (ScheduledTask fields):
+   - pending:  enabled=True and next_run <= now
+   - claimed:  next_run = now + LEASE_SECONDS (lease, renewed on checkpoint)
+   - finished: enabled=False, next_run=None
+
+   A worker claims jobs inside a transaction that locks the enabled generator
+   jobs (SELECT ... FOR UPDATE), so GENERATOR_JOB_MAX_RUNNING holds across
+   workers. If a worker dies, its lease expires and the job is claimed again;
+   the new attempt resumes from the per-model-key checkpoint in
+   config['checkpoint']. A job that keeps losing its lease counts those
+   attempts as retries and is given up after MAX_RETRIES.
+
+   Usage:
+   ```python
+   job_id = GeneratorJobQueue.enqueue('generate', user=user, model_key='factory', count=50)
+   # separate process:
+   #   python manage.py generator_worker --concurrency 2
+   ```
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from sopira_magic.apps.scheduler.models import ScheduledTask, TaskExecution
+from .config import get_all_generator_configs, get_generator_config
+from .progress import ProgressTracker
+from .progress_state import new_job_id, set_status, mark_done, is_cancel_requested
+from .services import GeneratorService
+
+logger = logging.getLogger(__name__)
+
+TASK_TYPE_PREFIX = "generator."
+JOB_KINDS = ("generate", "seed")
+
+LEASE_SECONDS = 120
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 30
+
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+
+def _max_running() -> int:
+    return int(getattr(settings, "GENERATOR_JOB_MAX_RUNNING", 1))
+
+
+class GeneratorJobQueue:
+    """DB-backed queue for generator jobs (enqueue / claim / run / checkpoint)."""
+
+    # -------------------------
+    # Producer side
+    # -------------------------
+    @staticmethod
+    def enqueue(kind: str, user=None, model_key: Optional[str] = None, count: Optional[int] = None) -> str:
+        """Persist a job and return its progress job_id."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown generator job kind '{kind}'")
+        if kind == "generate":
+            cfg = get_generator_config(model_key)
+            if not cfg:
+                raise ValueError(f"Generator config '{model_key}' not found")
+            total = count or cfg.get("count", 0)
+        else:
+            total = sum(cfg.get("count", 0) for cfg in get_all_generator_configs().values())
+
+        job_id = new_job_id()
+        name = f"generate_{model_key}" if kind == "generate" else "generate_seed_data"
+        ScheduledTask.objects.create(
+            name=name,
+            task_type=f"{TASK_TYPE_PREFIX}{kind}",
+            schedule="",
+            config={
+                "job_id": job_id,
+                "model_key": model_key,
+                "count": count,
+                "total": total,
+                "user_id": str(user.pk) if user is not None else None,
+                "checkpoint": {},
+            },
+            enabled=True,
+            next_run=timezone.now(),
+        )
+        set_status(job_id, {
+            "job_id": job_id,
+            "name": name,
+            "completed": 0,
+            "total": total,
+            "note": "queued",
+            "done": False,
+        })
+        _notify_inline_worker()
+        return job_id
+
+    # -------------------------
+    # Worker side
+    # -------------------------
+    @staticmethod
+    def claim(worker_id: str) -> Optional[TaskExecution]:
+        """Claim the oldest due job and open a running execution."""
+        now = timezone.now()
+        given_up = []
+        execution = None
+        with transaction.atomic():
+            # Lock all enabled generator jobs (a handful of rows): claimers are
+            # serialized, so the running limit below cannot be passed by two
+            # workers that both counted before either claimed.
+            jobs = list(
+                ScheduledTask.objects.select_for_update()
+                .filter(task_type__startswith=TASK_TYPE_PREFIX, enabled=True)
+                .order_by("next_run", "created")
+            )
+            running = TaskExecution.objects.filter(
+                status=STATUS_RUNNING,
+                task__in=[job for job in jobs if job.next_run and job.next_run > now],
+            ).count()
+            if running >= _max_running():
+                return None
+
+            for task in jobs:
+                if task.next_run is None or task.next_run > now:
+                    continue
+                # Previous attempt whose lease expired (worker crashed)
+                attempts = task.executions.count()
+                expired = task.executions.filter(status=STATUS_RUNNING).update(
+                    status=STATUS_FAILED,
+                    completed_at=now,
+                    error_message="lease expired",
+                )
+                if expired and attempts >= MAX_RETRIES:
+                    task.enabled = False
+                    task.next_run = None
+                    task.save(update_fields=["enabled", "next_run", "updated"])
+                    given_up.append(task.config.get("job_id"))
+                    continue
+
+                task.last_run = now
+                task.next_run = now + timedelta(seconds=LEASE_SECONDS)
+                task.save(update_fields=["last_run", "next_run", "updated"])
+                execution = TaskExecution.objects.create(
+                    task=task,
+                    status=STATUS_RUNNING,
+                    started_at=now,
+                    retry_count=attempts,
+                    error_message=f"worker={worker_id}",
+                )
+                break
+
+        for job_id in given_up:
+            logger.warning(f"[GENERATOR] Job {job_id} lost its lease {MAX_RETRIES} times, giving up")
+            set_status(job_id, {"error": "lease expired", "done": True})
+        return execution
+
+    @staticmethod
+    def checkpoint(task: ScheduledTask, model_key: str, created: int):
+        """Persist per-model-key progress and renew the lease."""
+        task.config.setdefault("checkpoint", {})[model_key] = created
+        task.next_run = timezone.now() + timedelta(seconds=LEASE_SECONDS)
+        task.save(update_fields=["config", "next_run", "updated"])
+
+    @staticmethod
+    def run(execution: TaskExecution):
+        """Execute a claimed job, resuming from its checkpoint."""
+        task = execution.task
+        cfg: Dict[str, Any] = task.config
+        job_id = cfg["job_id"]
+        kind = task.task_type[len(TASK_TYPE_PREFIX):]
+        user = _load_user(cfg.get("user_id"))
+
+        try:
+            if kind == "seed":
+                result = GeneratorJobQueue._run_seed(task, job_id, user)
+            else:
+                result = GeneratorJobQueue._run_generate(task, job_id, user)
+        except Exception as e:
+            logger.exception(f"[GENERATOR] Job {job_id} failed")
+            GeneratorJobQueue._finish(execution, STATUS_FAILED, str(e))
+            set_status(job_id, {"error": str(e), "done": execution.retry_count + 1 >= MAX_RETRIES})
+            return
+
+        if is_cancel_requested(job_id):
+            GeneratorJobQueue._finish(execution, STATUS_CANCELLED)
+            mark_done(job_id, note="cancelled")
+            return
+
+        GeneratorJobQueue._finish(execution, STATUS_SUCCESS)
+        set_status(job_id, {
+            "completed": result,
+            "total": cfg.get("total") or result,
+            "done": True,
+            "note": "done",
+        })
+
+    @staticmethod
+    def _run_generate(task: ScheduledTask, job_id: str, user) -> int:
+        cfg = task.config
+        model_key = cfg["model_key"]
+        total = cfg.get("total") or 0
+        already = int(cfg.get("checkpoint", {}).get(model_key, 0))
+        remaining = max(total - already, 0)
+
+        def status_fn(snapshot):
+            set_status(job_id, {**snapshot, "completed": already + snapshot.get("completed", 0), "total": total})
+            GeneratorJobQueue.checkpoint(task, model_key, already + snapshot.get("completed", 0))
+
+        tracker = ProgressTracker(name=task.name, total=remaining, status_fn=status_fn, job_id=job_id)
+        tracker.start()
+        created = []
+        if remaining:
+            created = GeneratorService.generate_data(
+                model_key, count=remaining, user=user, progress=tracker, job_id=job_id
+            )
+        GeneratorJobQueue.checkpoint(task, model_key, already + len(created))
+        return already + len(created)
+
+    @staticmethod
+    def _run_seed(task: ScheduledTask, job_id: str, user) -> int:
+        def status_fn(snapshot):
+            set_status(job_id, snapshot)
+
+        def checkpoint_fn(model_key, created):
+            GeneratorJobQueue.checkpoint(task, model_key, created)
+
+        generated = GeneratorService.generate_seed_data(
+            user=user,
+            job_id=job_id,
+            status_fn=status_fn,
+            completed=dict(task.config.get("checkpoint", {})),
+            checkpoint_fn=checkpoint_fn,
+        )
+        return sum(generated.values())
+
+    @staticmethod
+    def _finish(execution: TaskExecution, status: str, error: str = ""):
+        task = execution.task
+        now = timezone.now()
+        execution.status = status
+        execution.completed_at = now
+        if error:
+            execution.error_message = error
+        execution.save(update_fields=["status", "completed_at", "error_message", "updated"])
+
+        if status == STATUS_FAILED and execution.retry_count + 1 < MAX_RETRIES:
+            # Retry later, resuming from checkpoint
+            task.next_run = now + timedelta(seconds=RETRY_BACKOFF_SECONDS * (execution.retry_count + 1))
+        else:
+            task.enabled = False
+            task.next_run = None
+        task.save(update_fields=["enabled", "next_run", "updated"])
+
+
+def _load_user(user_id: Optional[str]):
+    from django.contrib.auth import get_user_model
+    if not user_id:
+        return None
+    return get_user_model().objects.filter(pk=user_id).first()
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def run_worker(concurrency: int = 1, poll_interval: float = 2.0, once: bool = False, stop_event: Optional[threading.Event] = None):
+    """
+    Worker loop: `concurrency` threads claim and run jobs until stopped.
+
+    once=True drains currently due jobs and returns (used by tests / cron).
+    """
+    stop_event = stop_event or threading.Event()
+
+    def loop():
+        wid = worker_id()
+        while not stop_event.is_set():
+            close_old_connections()
+            execution = GeneratorJobQueue.claim(wid)
+            if execution is None:
+                if once:
+                    return
+                stop_event.wait(poll_interval)
+                continue
+            logger.info(f"[GENERATOR] Worker {wid} running job {execution.task.config.get('job_id')}")
+            GeneratorJobQueue.run(execution)
+
+    threads = [threading.Thread(target=loop, name=f"generator-worker-{i}", daemon=True) for i in range(max(concurrency, 1))]
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            while t.is_alive():
+                t.join(timeout=1.0)
+    except KeyboardInterrupt:
+        stop_event.set()
+
+
+# -------------------------
+# Inline worker (local dev without a separate worker process)
+# -------------------------
+_inline_lock = threading.Lock()
+_inline_thread: Optional[threading.Thread] = None
+
+
+def _notify_inline_worker():
+    """Drain the queue in a background thread when GENERATOR_JOB_WORKER == 'inline'."""
+    global _inline_thread
+    if getattr(settings, "GENERATOR_JOB_WORKER", "external") != "inline":
+        return
+
+    def drain():
+        # Start after the enqueueing transaction commits
+        time.sleep(0.05)
+        run_worker(concurrency=1, once=True)
+
+    with _inline_lock:
+        if _inline_thread is None or not _inline_thread.is_alive():
+            _inline_thread = threading.Thread(target=drain, name="generator-inline-worker", daemon=True)
+            transaction.on_commit(_inline_thread.start)
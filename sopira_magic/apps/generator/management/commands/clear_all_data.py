@@ -40,6 +40,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from sopira_magic.apps.generator.services import GeneratorService
+from sopira_magic.apps.generator.clear_engine import BulkClearEngine
 from sopira_magic.apps.generator.config import get_all_generator_configs
 from sopira_magic.apps.generator.progress import ProgressTracker
 from sopira_magic.apps.relation.models import RelationInstance
@@ -86,8 +87,7 @@ class Command(BaseCommand):
         # Step 1: Clear RelationInstance records
         self.stdout.write(self.style.SUCCESS('Step 1: Clearing RelationInstance records...'))
         if not dry_run:
-            instance_count = RelationInstance.objects.count()
-            RelationInstance.objects.all().delete()
+            instance_count = BulkClearEngine().clear(RelationInstance)
             self.stdout.write(self.style.SUCCESS(f'   ✓ Deleted {instance_count} relation instances\n'))
         else:
             instance_count = RelationInstance.objects.count()
@@ -150,8 +150,7 @@ class Command(BaseCommand):
                 model_class = apps.get_model(app_label, model_name)
                 if not dry_run:
                     qs = model_class.objects.exclude(username='sopira')
-                    count = qs.count()
-                    qs.delete()
+                    count = GeneratorService.clear_data(key, queryset=qs)
                     deleted_counts[key] = count
                     if count > 0:
                         self.stdout.write(self.style.SUCCESS(f'   ✓ Cleared users except sopira: {count} records'))
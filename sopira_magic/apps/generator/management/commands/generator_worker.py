@@ -0,0 +1,70 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/management/commands/generator_worker.py
+#   Generator Worker Command - Management command
+#   Claims and executes queued generator jobs (GeneratorJobQueue)
+#..............................................................
+
+"""
+   Generator Worker Command - Management Command.
+
+   Long-running worker that executes generator jobs persisted by
+   GeneratorJobQueue (scheduler.ScheduledTask rows with task_type 'generator.*').
+
+   Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several worker
+   processes can run side by side. A job whose worker died is re-claimed after
+   its lease expires and resumes from its per-model checkpoint.
+
+   Usage:
+   ```bash
+   # Run with 2 worker threads
+   python manage.py generator_worker --concurrency 2
+
+   # Drain currently queued jobs and exit
+   python manage.py generator_worker --once
+   ```
+
+   Arguments:
+   - --concurrency: Worker threads in this process (default: 1)
+   - --poll-interval: Seconds between queue polls when idle (default: 2.0)
+   - --once: Exit when no due job is left
+
+   Note:
+   settings.GENERATOR_JOB_MAX_RUNNING caps running jobs across all workers.
+"""
+
+from django.core.management.base import BaseCommand
+
+from sopira_magic.apps.generator.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Run the generator job worker (executes queued generator jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Number of worker threads (default: 1)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds between queue polls when idle (default: 2.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain currently due jobs and exit',
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        self.stdout.write(f'Starting generator worker (concurrency={concurrency})...')
+        run_worker(
+            concurrency=concurrency,
+            poll_interval=options['poll_interval'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS('Generator worker stopped'))
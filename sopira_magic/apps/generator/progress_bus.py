@@ -0,0 +1,232 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/progress_bus.py
+#   Progress pub/sub bus - push-based progress channel for generator jobs
+#   In-process backend (default) + Redis-compatible backend
+#..............................................................
+
+"""
+Push-based progress channel for generator jobs.
+
+Replaces cache polling: writers (ProgressTracker via progress_state) update
+individual status fields atomically and publish the change; the async SSE
+view awaits updates instead of sleeping in a loop.
+
+Backends (settings.GENERATOR_PROGRESS_BACKEND):
+- "inprocess": lock-protected dict + asyncio queues (single process; inline
+  worker only)
+- "redis": HASH per job (HSET = atomic field-level update) + PUBLISH;
+  works with any Redis-compatible server (Redis, Valkey, KeyDB, Dragonfly);
+  required with GENERATOR_JOB_WORKER='external' (check_backend_configuration)
+
+Usage:
+    bus = get_progress_bus()
+    bus.update(job_id, {"completed": 10})
+    async for snapshot in bus.listen(job_id):
+        ...  # None = heartbeat (no update within `heartbeat` seconds)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import redis  # type: ignore
+    import redis.asyncio as redis_async  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis = None  # type: ignore
+    redis_async = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "generator_progress:"
+TTL_SECONDS = 60 * 60  # keep for 1h
+HEARTBEAT_SECONDS = 15.0
+
+
+class ProgressBus:
+    """Interface: field-level status store + per-job change notifications."""
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_field(self, job_id: str, field: str, default: Any = None) -> Any:
+        status = self.get(job_id) or {}
+        return status.get(field, default)
+
+    async def listen(self, job_id: str, heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+class InProcessProgressBus(ProgressBus):
+    """Single-process backend; thread-safe writers, asyncio subscribers."""
+
+    def __init__(self, ttl: int = TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._expires: Dict[str, float] = {}
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            status = self._state.setdefault(job_id, {})
+            status.update(fields)
+            status["updated_at"] = now
+            snapshot = dict(status)
+            self._expires[job_id] = now + self.ttl
+            self._prune(now)
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+            except RuntimeError:
+                pass  # subscriber loop already closed
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._expires.get(job_id, 0) < time.time():
+                return None
+            status = self._state.get(job_id)
+            return dict(status) if status is not None else None
+
+    async def listen(self, job_id: str, heartbeat: float = HEARTBEAT_SECONDS):
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (loop, queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(entry)
+        try:
+            current = self.get(job_id)
+            if current is not None:
+                yield current
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                subs = self._subscribers.get(job_id, [])
+                if entry in subs:
+                    subs.remove(entry)
+                if not subs:
+                    self._subscribers.pop(job_id, None)
+
+    def _prune(self, now: float):
+        expired = [job_id for job_id, ts in self._expires.items() if ts < now]
+        for job_id in expired:
+            self._expires.pop(job_id, None)
+            self._state.pop(job_id, None)
+
+
+class RedisProgressBus(ProgressBus):
+    """Redis-compatible backend: HSET per field + PUBLISH per update."""
+
+    def __init__(self, url: str, ttl: int = TTL_SECONDS):
+        if redis is None:
+            raise RuntimeError("redis package is not installed (required for GENERATOR_PROGRESS_BACKEND='redis')")
+        self.url = url
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, job_id: str) -> str:
+        return f"{KEY_PREFIX}{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{KEY_PREFIX}{job_id}:events"
+
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Dict[str, Any]:
+        return {k.decode(): json.loads(v) for k, v in raw.items()}
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        fields = {**fields, "updated_at": time.time()}
+        encoded = {k: json.dumps(v, default=str) for k, v in fields.items()}
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(self._key(job_id), mapping=encoded)
+        pipe.expire(self._key(job_id), self.ttl)
+        pipe.publish(self._channel(job_id), json.dumps(fields, default=str))
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._client.hgetall(self._key(job_id))
+        return self._decode(raw) if raw else None
+
+    def get_field(self, job_id: str, field: str, default: Any = None) -> Any:
+        raw = self._client.hget(self._key(job_id), field)
+        return json.loads(raw) if raw is not None else default
+
+    async def listen(self, job_id: str, heartbeat: float = HEARTBEAT_SECONDS):
+        client = redis_async.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            raw = await client.hgetall(self._key(job_id))
+            snapshot = self._decode(raw) if raw else {}
+            if snapshot:
+                yield dict(snapshot)
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat)
+                if message is None:
+                    yield None
+                    continue
+                snapshot.update(json.loads(message["data"]))
+                yield dict(snapshot)
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
+            await client.aclose()
+
+
+def check_backend_configuration() -> None:
+    """
+    Fail fast when the bus cannot reach the job worker.
+
+    With GENERATOR_JOB_WORKER='external' the job runs in the generator_worker
+    process while SSE/status/cancel requests are served by web processes; an
+    in-process bus would leave each side with its own private state (progress
+    never arrives, cancel is never seen).
+    """
+    backend = getattr(settings, "GENERATOR_PROGRESS_BACKEND", "inprocess")
+    worker = getattr(settings, "GENERATOR_JOB_WORKER", "inline")
+    if backend not in ("inprocess", "redis"):
+        raise ImproperlyConfigured(f"Unknown GENERATOR_PROGRESS_BACKEND '{backend}' (expected 'inprocess' or 'redis')")
+    if worker == "external" and backend != "redis":
+        raise ImproperlyConfigured(
+            "GENERATOR_JOB_WORKER='external' requires GENERATOR_PROGRESS_BACKEND='redis' "
+            "(progress and cancel state must be shared between web and worker processes)"
+        )
+    if backend == "redis" and redis is None:
+        raise ImproperlyConfigured("GENERATOR_PROGRESS_BACKEND='redis' requires the redis package")
+
+
+_bus: Optional[ProgressBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Return the configured bus (singleton per process)."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                backend = getattr(settings, "GENERATOR_PROGRESS_BACKEND", "inprocess")
+                if backend == "redis":
+                    _bus = RedisProgressBus(getattr(settings, "GENERATOR_PROGRESS_REDIS_URL", "redis://localhost:6379/0"))
+                else:
+                    _bus = InProcessProgressBus()
+                logger.info(f"[GENERATOR] Progress bus backend: {_bus.__class__.__name__}")
+    return _bus
@@ -37,6 +37,7 @@ GeneratorService - Universal Data Generation Service.
 
    3. GeneratorService.clear_data()
       - Clears generated data while optionally preserving oldest records
+      - Set-based via BulkClearEngine (see `clear_engine.py`), reports progress
       - Useful for testing and data refresh scenarios
 
    Configuration Flow:
@@ -78,6 +79,7 @@ from .field_generators import generate_field_value
 from .datasets import generate_tags
 from sopira_magic.apps.relation.services import RelationService
 from .progress import ProgressTracker
+from .clear_engine import BulkClearEngine
 from .progress_state import is_cancel_requested
 
 import logging
@@ -204,6 +206,7 @@ class GeneratorService:
             )
             existing_count_after = model_class.objects.count()
             logger.info(f"[GENERATOR] generate_data COMPLETE: model_key={model_key}, created={len(result)}, total_in_db={existing_count_after}")
+            GeneratorService._bump_bootstrap(result)
             return result
         
         # Standard generation mode
@@ -307,7 +310,15 @@ class GeneratorService:
         existing_count_after = model_class.objects.count()
         elapsed = time.time() - start_time
         logger.info(f"[GENERATOR] generate_data COMPLETE: model_key={model_key}, created={len(created_objects)}, expected={target_count}, total_in_db={existing_count_after}, elapsed={elapsed:.2f}s")
+        GeneratorService._bump_bootstrap(created_objects)
         return created_objects
+
+    @staticmethod
+    def _bump_bootstrap(created: List[Any]) -> None:
+        """Invalidate bootstrap ETags once per generated batch (tag links and relations bypass model signals)."""
+        if created:
+            from sopira_magic.apps.api.bootstrap import BootstrapService
+            BootstrapService.bump()
     
     @staticmethod
     def _generate_data_per_source(
@@ -737,11 +748,15 @@ class GeneratorService:
         return None
     
     @staticmethod
-    def generate_seed_data(user=None, job_id: str = None, status_fn=None) -> Dict[str, int]:
+    def generate_seed_data(user=None, job_id: str = None, status_fn=None, completed: Optional[Dict[str, int]] = None, checkpoint_fn=None) -> Dict[str, int]:
         """
         Generate seed data for all configured models.
         Respects dependencies via 'depends_on' config - generates in correct order.
         
+        Args:
+            completed: Model keys already generated (resume from checkpoint) - skipped
+            checkpoint_fn: Called as checkpoint_fn(model_key, created_count) after each model
+        
         Returns:
             Dictionary with counts of created objects per model
         """
@@ -771,8 +786,11 @@ class GeneratorService:
         progress.start()
         
         # Topological sort to generate in correct order
-        generated = {}
+        generated = dict(completed or {})
         visited = set()
+        if generated:
+            logger.info(f"[GENERATOR] Resuming seed, already completed: {generated}")
+            progress.step(sum(configs[k].get('count', 0) for k in generated if k in configs), note="resume")
         
         def generate_recursive(key):
             if key in visited:
@@ -790,9 +808,14 @@ class GeneratorService:
                     return generated
                 logger.info(f"[GENERATOR] Generating model: {key}")
                 objects = GeneratorService.generate_data(key, user=user, progress=progress, job_id=job_id)
+                if job_id and is_cancel_requested(job_id):
+                    # Partially generated model is not checkpointed
+                    return generated
                 generated[key] = len(objects)
                 logger.info(f"[GENERATOR] Generated {key}: {len(objects)} objects")
                 progress.step(len(objects), note=f"model {key}")
+                if checkpoint_fn:
+                    checkpoint_fn(key, len(objects))
         
         # Generate all models
         for key in configs.keys():
@@ -803,13 +826,20 @@ class GeneratorService:
         return generated
     
     @staticmethod
-    def clear_data(model_key: str, keep_count: int = 0):
+    def clear_data(model_key: str, keep_count: int = 0, progress: ProgressTracker = None, job_id: str = None, queryset=None):
         """
         Clear generated data for a model.
         
+        Uses BulkClearEngine: the cascade plan is computed once per model and
+        rows are deleted in chunked set-based batches (children first, across
+        primary/state/logging databases) without per-instance signals.
+        
         Args:
             model_key: Key from GENERATOR_CONFIG
             keep_count: Number of records to keep (oldest)
+            progress: Optional ProgressTracker (stepped per deleted chunk)
+            job_id: Optional progress job id (honours cancel requests)
+            queryset: Optional pre-filtered queryset of rows to delete
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -821,43 +851,23 @@ class GeneratorService:
         model_path = config['model']
         model_class = GeneratorService.get_model_class(model_path)
         
+        qs = queryset if queryset is not None else model_class.objects.all()
         if keep_count > 0:
             # Keep oldest records
-            to_delete = model_class.objects.order_by('created')[keep_count:]
-            count = to_delete.count()
-            try:
-                to_delete.delete()
-                logger.info(f"[GENERATOR] Cleared {model_key}: {count} records (kept {keep_count} oldest)")
-                return count
-            except Exception as e:
-                error_msg = str(e)
-                # If error is about STATE database (for User model), signal should handle it
-                # But Django CASCADE might still try to delete from PRIMARY
-                if 'state_tablestate' in error_msg or 'state_savedworkspace' in error_msg or 'state_environmentstate' in error_msg:
-                    logger.warning(f"[GENERATOR] CASCADE deletion error for {model_key} (STATE database related): {error_msg}")
-                    # Try to delete without CASCADE by using raw SQL or individual deletion
-                    # For now, just log and re-raise - signal should handle STATE records
-                    raise
-                raise
+            qs = qs.order_by('created')[keep_count:]
+        
+        engine = BulkClearEngine(progress=progress, job_id=job_id)
+        try:
+            count = engine.clear(model_class, queryset=qs, note=model_key)
+        except Exception as e:
+            logger.error(f"[GENERATOR] Failed to clear {model_key}: {str(e)}")
+            raise
+        
+        if keep_count > 0:
+            logger.info(f"[GENERATOR] Cleared {model_key}: {count} records (kept {keep_count} oldest)")
         else:
-            # Delete all
-            count = model_class.objects.count()
-            try:
-                # Universal cross-database cascade delete is handled by core.signals
-                # No hardcoded model-specific logic needed
-                model_class.objects.all().delete()
-                logger.info(f"[GENERATOR] Cleared {model_key}: {count} records")
-                return count
-            except Exception as e:
-                error_msg = str(e)
-                # If error is about cross-database CASCADE, core.signals should handle it
-                # But Django CASCADE might still try to delete from wrong database
-                if 'does not exist' in error_msg.lower() and ('state_' in error_msg.lower() or 'logging_' in error_msg.lower()):
-                    logger.warning(f"[GENERATOR] Cross-database CASCADE error for {model_key}: {error_msg}")
-                    logger.info(f"[GENERATOR] This should be handled by core.signals - re-raising for command to handle")
-                    raise
-                logger.error(f"[GENERATOR] Failed to clear {model_key}: {error_msg}")
-                raise
+            logger.info(f"[GENERATOR] Cleared {model_key}: {count} records")
+        return count
 
 # =============================================================================
 # TAG SERVICES - Advanced tag assignment and removal
@@ -917,32 +927,15 @@ class GeneratorService:
             from .datasets import TAG_POOL
             tag_pool = TAG_POOL
         
-        tags_assigned = 0
-        
-        for obj in objects:
-            # Generate random tags for this object
-            tags_to_assign = random.sample(tag_pool, min(count_per_object, len(tag_pool)))
-            
-            for tag_name in tags_to_assign:
-                try:
-                    # Get or create tag
-                    tag, created = Tag.objects.get_or_create(
-                        name=tag_name,
-                        defaults={'color': '#3366FF', 'description': ''}
-                    )
-                    
-                    # Create tagged item
-                    TaggedItem.objects.get_or_create(
-                        tag=tag,
-                        content_type=ContentType.objects.get_for_model(obj),
-                        object_id=obj.id
-                    )
-                    
-                    tags_assigned += 1
-                    
-                except Exception as e:
-                    logger.error(f"[TAG GENERATOR] Failed to assign tag '{tag_name}' to object {obj.id}: {str(e)}")
-                    continue
+        # Set-based: one tag upsert pass + one bulk insert of links
+        from sopira_magic.apps.m_tag.services import TagService
+        sample_size = min(int(count_per_object), len(tag_pool))
+        assignments = {
+            pk: random.sample(tag_pool, sample_size)
+            for pk in objects.values_list('pk', flat=True).iterator(chunk_size=2000)
+        }
+        result = TagService.assign(model_class, assignments, defaults={'color': '#3366FF', 'description': ''})
+        tags_assigned = result['links_created']
         
         logger.info(f"[TAG GENERATOR] assign_tags_to_objects COMPLETE: assigned {tags_assigned} tags to {total_objects} objects")
         
@@ -998,27 +991,13 @@ class GeneratorService:
                 "message": "No objects found to process"
             }
         
-        tags_removed = 0
-        
-        for obj in objects:
-            # Get all tags for this object
-            content_type = ContentType.objects.get_for_model(obj)
-            tags = TaggedItem.objects.filter(
-                content_type=content_type,
-                object_id=obj.id
-            )
-            
-            if count_per_object is None:
-                # Remove ALL tags
-                count = tags.count()
-                tags.delete()
-                tags_removed += count
-            else:
-                # Remove N tags (or all if N > available)
-                tags_to_remove = tags.order_by('created')[:count_per_object]
-                count = tags_to_remove.count()
-                tags_to_remove.delete()
-                tags_removed += count
+        # Single delete-by-join (N oldest links per object when count_per_object is set)
+        from sopira_magic.apps.m_tag.services import TagService
+        tags_removed = TagService.remove(
+            model_class,
+            object_ids=object_ids or None,
+            per_object=int(count_per_object) if count_per_object is not None else None,
+        )
         
         logger.info(f"[TAG GENERATOR] remove_tags_from_objects COMPLETE: removed {tags_removed} tags from {total_objects} objects")
         
@@ -0,0 +1,115 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/tests/test_clear_engine.py
+#   Clear Engine Tests
+#   Tests for clear_engine.py module
+#..............................................................
+
+"""
+   Clear Engine Tests.
+
+   Tests for BulkClearEngine: cascade plan, chunked set-based deletes,
+   generic relations, PROTECT handling and progress reporting.
+"""
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import ProtectedError
+from sopira_magic.apps.generator import clear_engine
+from sopira_magic.apps.generator.clear_engine import BulkClearEngine, plan_for, CASCADE, GENERIC, PROTECT
+from sopira_magic.apps.generator.progress import ProgressTracker
+from sopira_magic.apps.m_user.models import User, UserPreference
+from sopira_magic.apps.m_company.models import Company, UserCompany
+from sopira_magic.apps.m_factory.models import Factory
+from sopira_magic.apps.m_tag.models import Tag, TaggedItem
+
+
+class TestCascadePlan:
+    """Test suite for plan_for."""
+
+    def test_plan_is_cached(self):
+        """Test plan is computed once per model."""
+        assert plan_for(User) is plan_for(User)
+
+    def test_plan_contains_cascade_children(self):
+        """Test reverse FK/O2O children are part of the plan."""
+        actions = {(step.model, step.action) for step in plan_for(User).steps}
+
+        assert (UserPreference, CASCADE) in actions
+        assert (UserCompany, CASCADE) in actions
+
+    def test_plan_contains_generic_and_protect_steps(self):
+        """Test GenericRelation tags and PROTECT foreign keys are planned."""
+        actions = {(step.model, step.action) for step in plan_for(Company).steps}
+
+        assert (TaggedItem, GENERIC) in actions
+        assert (Factory, PROTECT) in actions
+
+    def test_unrelated_not_implemented_error_propagates(self, monkeypatch):
+        """Test only unsupported relation graphs fall back; other errors are not swallowed."""
+        def broken(model, path):
+            raise NotImplementedError('bug elsewhere')
+        monkeypatch.setattr(clear_engine, '_build_steps', broken)
+        monkeypatch.setattr(clear_engine, '_PLAN_CACHE', {})
+
+        with pytest.raises(NotImplementedError):
+            plan_for(User)
+
+
+@pytest.mark.django_db
+class TestBulkClearEngine:
+    """Test suite for BulkClearEngine.clear."""
+
+    def test_clear_deletes_children_first_in_chunks(self, multiple_users):
+        """Test children are deleted and chunking covers all rows."""
+        for user in multiple_users:
+            UserPreference.objects.create(user=user)
+
+        deleted = BulkClearEngine(chunk_size=2).clear(User)
+
+        assert deleted == 5
+        assert User.objects.count() == 0
+        assert UserPreference.objects.count() == 0
+
+    def test_clear_respects_queryset(self, multiple_users):
+        """Test only rows from the given queryset are deleted."""
+        qs = User.objects.exclude(username='user0')
+
+        deleted = BulkClearEngine().clear(User, queryset=qs)
+
+        assert deleted == 4
+        assert list(User.objects.values_list('username', flat=True)) == ['user0']
+
+    def test_clear_deletes_generic_tags(self, sample_company):
+        """Test TaggedItem rows of cleared objects are removed."""
+        tag = Tag.objects.create(name='clear-engine')
+        TaggedItem.objects.create(
+            tag=tag,
+            content_type=ContentType.objects.get_for_model(Company),
+            object_id=sample_company.id,
+        )
+
+        BulkClearEngine().clear(Company)
+
+        assert Company.objects.count() == 0
+        assert TaggedItem.objects.count() == 0
+        assert Tag.objects.count() == 1
+
+    def test_clear_protected_raises(self, sample_company):
+        """Test PROTECT foreign keys abort the clear."""
+        Factory.objects.create(code='F1', name='Factory', company=sample_company)
+
+        with pytest.raises(ProtectedError):
+            BulkClearEngine().clear(Company)
+
+        assert Company.objects.count() == 1
+
+    def test_clear_reports_progress(self, multiple_users):
+        """Test progress tracker is stepped per deleted chunk."""
+        snapshots = []
+        tracker = ProgressTracker(name='clear_user', total=5, status_fn=snapshots.append, min_interval=0)
+        tracker.start()
+
+        BulkClearEngine(chunk_size=2, progress=tracker).clear(User)
+
+        assert tracker.completed == 5
+        assert [s['completed'] for s in snapshots[1:]] == [2, 4, 5]
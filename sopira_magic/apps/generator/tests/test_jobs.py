@@ -0,0 +1,158 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/tests/test_jobs.py
+#   Generator Job Queue Tests
+#   Tests for jobs.py module
+#..............................................................
+
+"""
+   Generator Job Queue Tests.
+
+   Tests for GeneratorJobQueue: enqueue, claim (lease + concurrency limit),
+   checkpoint resume after a crashed worker, retries and the worker loop.
+   SQLite ignores FOR UPDATE; claim semantics are still covered.
+"""
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from sopira_magic.apps.generator.jobs import (
+    GeneratorJobQueue, run_worker, MAX_RETRIES, STATUS_FAILED, STATUS_RUNNING, STATUS_SUCCESS,
+)
+from sopira_magic.apps.generator.progress_state import get_status
+from sopira_magic.apps.m_user.models import User
+from sopira_magic.apps.scheduler.models import ScheduledTask
+
+
+@pytest.fixture(autouse=True)
+def external_worker(settings):
+    """Disable the inline worker; tests drive the queue explicitly."""
+    settings.GENERATOR_JOB_WORKER = "external"
+    settings.GENERATOR_JOB_MAX_RUNNING = 1
+
+
+def _task(job_id):
+    return ScheduledTask.objects.get(config__job_id=job_id)
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    """Test suite for GeneratorJobQueue.enqueue."""
+
+    def test_enqueue_persists_pending_task(self, sample_user):
+        """Test job is stored as a due ScheduledTask and progress is initialized."""
+        job_id = GeneratorJobQueue.enqueue('generate', user=sample_user, model_key='user', count=3)
+
+        task = _task(job_id)
+        assert task.task_type == 'generator.generate'
+        assert task.enabled is True
+        assert task.next_run <= timezone.now()
+        assert task.config['total'] == 3
+        assert get_status(job_id)['note'] == 'queued'
+
+    def test_enqueue_unknown_model_key(self):
+        """Test unknown model key is rejected."""
+        with pytest.raises(ValueError):
+            GeneratorJobQueue.enqueue('generate', model_key='nonexistent')
+
+
+@pytest.mark.django_db
+class TestClaimAndRun:
+    """Test suite for claim / run / checkpoint."""
+
+    def test_claim_sets_lease_and_respects_concurrency(self):
+        """Test claimed job is leased and the running limit blocks a second claim."""
+        GeneratorJobQueue.enqueue('generate', model_key='user', count=1)
+        GeneratorJobQueue.enqueue('generate', model_key='user', count=1)
+
+        execution = GeneratorJobQueue.claim('w1')
+
+        assert execution.status == STATUS_RUNNING
+        assert execution.task.next_run > timezone.now()
+        assert GeneratorJobQueue.claim('w2') is None
+
+    def test_run_generates_and_finishes(self):
+        """Test job runs to completion and is not claimable again."""
+        job_id = GeneratorJobQueue.enqueue('generate', model_key='user', count=3)
+        before = User.objects.count()
+
+        GeneratorJobQueue.run(GeneratorJobQueue.claim('w1'))
+
+        task = _task(job_id)
+        assert User.objects.count() == before + 3
+        assert task.enabled is False
+        assert task.executions.get().status == STATUS_SUCCESS
+        assert get_status(job_id)['done'] is True
+        assert GeneratorJobQueue.claim('w1') is None
+
+    def test_expired_lease_resumes_from_checkpoint(self):
+        """Test a crashed attempt is re-claimed and only the remainder is generated."""
+        job_id = GeneratorJobQueue.enqueue('generate', model_key='user', count=5)
+        first = GeneratorJobQueue.claim('w1')
+        task = first.task
+        GeneratorJobQueue.checkpoint(task, 'user', 2)
+        # Simulate worker crash: lease runs out
+        ScheduledTask.objects.filter(pk=task.pk).update(next_run=timezone.now() - timedelta(seconds=1))
+        before = User.objects.count()
+
+        second = GeneratorJobQueue.claim('w2')
+        GeneratorJobQueue.run(second)
+
+        first.refresh_from_db()
+        assert first.status == STATUS_FAILED
+        assert second.retry_count == 1
+        assert User.objects.count() == before + 3
+        assert _task(job_id).config['checkpoint']['user'] == 5
+
+    def test_repeatedly_expired_lease_is_given_up(self):
+        """Test a job whose worker keeps crashing is failed after MAX_RETRIES attempts."""
+        job_id = GeneratorJobQueue.enqueue('generate', model_key='user', count=1)
+
+        retries = []
+        for _ in range(MAX_RETRIES):
+            retries.append(GeneratorJobQueue.claim('w1').retry_count)
+            ScheduledTask.objects.filter(config__job_id=job_id).update(next_run=timezone.now() - timedelta(seconds=1))
+
+        assert GeneratorJobQueue.claim('w2') is None
+        task = _task(job_id)
+        assert retries == list(range(MAX_RETRIES))
+        assert task.enabled is False
+        assert task.executions.filter(status=STATUS_FAILED).count() == MAX_RETRIES
+        assert get_status(job_id)['done'] is True
+
+    def test_failure_is_retried_then_given_up(self, monkeypatch):
+        """Test failing job is rescheduled until MAX_RETRIES is reached."""
+        from sopira_magic.apps.generator import jobs
+
+        def boom(*args, **kwargs):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(jobs.GeneratorService, 'generate_data', boom)
+        job_id = GeneratorJobQueue.enqueue('generate', model_key='user', count=1)
+
+        for _ in range(MAX_RETRIES):
+            ScheduledTask.objects.filter(config__job_id=job_id, enabled=True).update(next_run=timezone.now())
+            GeneratorJobQueue.run(GeneratorJobQueue.claim('w1'))
+
+        task = _task(job_id)
+        assert task.enabled is False
+        assert task.executions.filter(status=STATUS_FAILED).count() == MAX_RETRIES
+        assert get_status(job_id)['done'] is True
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWorker:
+    """Test suite for run_worker."""
+
+    def test_worker_once_drains_queue(self, monkeypatch):
+        """Test worker loop executes all due jobs and exits."""
+        from sopira_magic.apps.generator import jobs
+
+        ran = []
+        monkeypatch.setattr(jobs.GeneratorJobQueue, 'run', staticmethod(
+            lambda execution: (ran.append(execution.task.config['job_id']), jobs.GeneratorJobQueue._finish(execution, STATUS_SUCCESS))
+        ))
+        ids = {GeneratorJobQueue.enqueue('generate', model_key='user', count=1) for _ in range(2)}
+
+        run_worker(concurrency=1, once=True)
+
+        assert set(ran) == ids
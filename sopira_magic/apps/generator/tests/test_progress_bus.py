@@ -0,0 +1,143 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/generator/tests/test_progress_bus.py
+#   Progress Bus Tests
+#   Tests for progress_bus.py and progress_state.py modules
+#..............................................................
+
+"""
+   Progress Bus Tests.
+
+   Tests for the in-process progress bus: field-level updates,
+   push delivery to async subscribers and heartbeats.
+"""
+
+import asyncio
+import base64
+import threading
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory
+
+from sopira_magic.apps.generator.progress_bus import InProcessProgressBus, check_backend_configuration
+from sopira_magic.apps.generator import progress_state
+
+
+class TestInProcessProgressBus:
+    """Test suite for InProcessProgressBus."""
+
+    def test_update_merges_fields(self):
+        """Test updates are field-level (no overwrite of other fields)."""
+        bus = InProcessProgressBus()
+        bus.update('job', {'completed': 1, 'total': 10})
+        bus.update('job', {'completed': 5})
+
+        status = bus.get('job')
+        assert status['completed'] == 5
+        assert status['total'] == 10
+        assert bus.get_field('job', 'total') == 10
+
+    def test_get_unknown_job_returns_none(self):
+        """Test unknown job id returns None."""
+        assert InProcessProgressBus().get('missing') is None
+
+    def test_expired_job_is_dropped(self):
+        """Test entries expire after TTL."""
+        bus = InProcessProgressBus(ttl=-1)
+        bus.update('job', {'completed': 1})
+
+        assert bus.get('job') is None
+
+    def test_listen_receives_pushed_updates(self):
+        """Test subscriber gets current snapshot and updates pushed from another thread."""
+        bus = InProcessProgressBus()
+        bus.update('job', {'completed': 0, 'total': 2})
+
+        async def consume():
+            received = []
+            async for payload in bus.listen('job', heartbeat=5):
+                received.append(payload)
+                if len(received) == 1:
+                    threading.Thread(target=bus.update, args=('job', {'completed': 2, 'done': True})).start()
+                if payload.get('done'):
+                    break
+            return received
+
+        received = asyncio.run(consume())
+        assert received[0]['completed'] == 0
+        assert received[-1]['completed'] == 2
+        assert received[-1]['total'] == 2
+
+    def test_listen_yields_heartbeat(self):
+        """Test None is yielded when no update arrives within heartbeat."""
+        bus = InProcessProgressBus()
+
+        async def first():
+            async for payload in bus.listen('job', heartbeat=0.01):
+                return payload
+
+        assert asyncio.run(first()) is None
+
+
+class TestProgressState:
+    """Test suite for progress_state helpers on top of the bus."""
+
+    def test_cancel_and_done_flags(self):
+        """Test cancel/done flags are set without losing progress fields."""
+        job_id = progress_state.new_job_id()
+        progress_state.set_status(job_id, {'completed': 3, 'total': 9})
+        progress_state.mark_cancel(job_id)
+        progress_state.mark_done(job_id)
+
+        status = progress_state.get_status(job_id)
+        assert progress_state.is_cancel_requested(job_id) is True
+        assert status['done'] is True
+        assert status['completed'] == 3
+
+
+class TestBackendConfiguration:
+    """Test suite for the startup check of the bus backend."""
+
+    def test_external_worker_requires_redis(self, settings):
+        """Test an external worker with the in-process bus refuses to start."""
+        settings.GENERATOR_JOB_WORKER = 'external'
+        settings.GENERATOR_PROGRESS_BACKEND = 'inprocess'
+        with pytest.raises(ImproperlyConfigured):
+            check_backend_configuration()
+
+    def test_inline_worker_allows_inprocess(self, settings):
+        """Test the local setup (inline worker + in-process bus) passes."""
+        settings.GENERATOR_JOB_WORKER = 'inline'
+        settings.GENERATOR_PROGRESS_BACKEND = 'inprocess'
+        check_backend_configuration()
+
+
+@pytest.mark.django_db(databases=['default', 'state', 'logging'], transaction=True)
+class TestProgressStreamView:
+    """Test suite for the async SSE view authentication."""
+
+    def _call(self, request):
+        from sopira_magic.apps.api.views import generator_progress_stream_view
+        return asyncio.run(generator_progress_stream_view(request, 'job-x'))
+
+    def test_anonymous_request_is_rejected(self):
+        """Test requests without credentials get 403."""
+        from django.contrib.auth.models import AnonymousUser
+
+        request = RequestFactory().get('/api/generator/progress/job-x/stream/')
+        request.user = AnonymousUser()
+        assert self._call(request).status_code == 403
+
+    def test_drf_authentication_classes_are_used(self):
+        """Test non-session credentials (HTTP Basic) are accepted like on other API views."""
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import AnonymousUser
+
+        get_user_model().objects.create_user(username='stream_user', password='testpass123')
+        token = base64.b64encode(b'stream_user:testpass123').decode()
+        request = RequestFactory().get('/api/generator/progress/job-x/stream/', HTTP_AUTHORIZATION=f'Basic {token}')
+        request.user = AnonymousUser()
+
+        response = self._call(request)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
@@ -244,3 +244,59 @@ class TestGeneratorServiceRelations:
             )
             assert user_relations.count() > 0
 
+
+
+@pytest.mark.django_db
+class TestGeneratorServiceTags:
+    """Test suite for set-based tag assignment/removal."""
+
+    def test_assign_tags_to_objects(self, multiple_users):
+        """Test every object gets count_per_object tag links."""
+        from sopira_magic.apps.m_tag.models import TaggedItem
+
+        result = GeneratorService.assign_tags_to_objects(None, 'user', count_per_object=2)
+
+        assert result['total_objects'] == 5
+        assert result['tags_assigned'] == 10
+        for user in multiple_users:
+            assert TaggedItem.objects.filter(object_id=user.id).count() == 2
+
+    def test_assign_tags_is_idempotent_for_existing_links(self, multiple_users):
+        """Test duplicate links are skipped instead of failing."""
+        from sopira_magic.apps.m_tag.services import TagService
+        from sopira_magic.apps.m_tag.models import Tag, TaggedItem
+
+        user = multiple_users[0]
+        TagService.assign(User, {user.pk: ['alpha', 'beta']})
+        result = TagService.assign(User, {user.pk: ['alpha', 'gamma']})
+
+        assert result == {'tags_created': 1, 'links_created': 1}
+        assert Tag.objects.filter(name__in=['alpha', 'beta', 'gamma']).count() == 3
+        assert TaggedItem.objects.filter(object_id=user.pk).count() == 3
+
+    def test_remove_tags_per_object_and_all(self, multiple_users):
+        """Test N oldest links per object are removed, then all remaining."""
+        from sopira_magic.apps.m_tag.models import TaggedItem
+
+        GeneratorService.assign_tags_to_objects(None, 'user', count_per_object=3)
+
+        result = GeneratorService.remove_tags_from_objects(None, 'user', count_per_object=1)
+        assert result['tags_removed'] == 5
+        for user in multiple_users:
+            assert TaggedItem.objects.filter(object_id=user.id).count() == 2
+
+        target = [multiple_users[0].id]
+        result = GeneratorService.remove_tags_from_objects(None, 'user', object_ids=target)
+        assert result['tags_removed'] == 2
+        assert TaggedItem.objects.count() == 8
+
+    def test_set_tags_replaces_object_tags(self, sample_user):
+        """Test serializer write path keeps wanted links and drops the rest."""
+        from sopira_magic.apps.m_tag.services import TagService
+        from sopira_magic.apps.m_tag.models import TaggedItem
+
+        TagService.set_tags(sample_user, ['alpha', 'beta'])
+        TagService.set_tags(sample_user, ['beta', ' gamma '])
+
+        names = set(TaggedItem.objects.filter(object_id=sample_user.pk).values_list('tag__name', flat=True))
+        assert names == {'beta', 'gamma'}
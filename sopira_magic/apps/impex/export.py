@@ -0,0 +1,400 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/impex/export.py
+#   Impex Export - streaming CSV/XLSX/NDJSON export engine
+#   values() projection + server-side cursor + preloaded FK labels
+#..............................................................
+
+"""
+   Impex Export - Streaming CSV/XLSX/NDJSON Export Engine.
+
+   Exports the (already scoped, filtered and ordered) queryset of a
+   VIEWS_MATRIX view in constant memory:
+
+   - rows come from a values() projection iterated with a server-side
+     cursor (.iterator(chunk_size=EXPORT_CHUNK_SIZE)), no model instances,
+     no MySerializer
+   - FK columns are rendered with the fk_display_template of the target
+     view from a label map preloaded with one query per FK column
+     (only targets referenced by the exported rows)
+   - writers are generators feeding a StreamingHttpResponse
+
+   Columns default to the concrete model fields. An enabled ExportConfig
+   (name = view name, or ?config=<name>) can narrow them:
+       config = {"fields": [...], "labels": {"field": "Header"},
+                 "exclude": [...], "chunk_size": 5000, "delimiter": ";"}
+   Its export_type is the default format (csv, xlsx/excel, ndjson/json).
+
+   XLSX is written with a minimal streaming SpreadsheetML writer (zipfile
+   on a non-seekable stream, inline strings) - no openpyxl dependency.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.impex.export import ExportService
+
+   queryset = viewset.filter_queryset(viewset.get_queryset())
+   return ExportService.stream(queryset, "measurements", "csv")
+   ```
+"""
+
+import csv
+import datetime
+import decimal
+import json
+import logging
+import re
+import string
+import zipfile
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+
+# Never exported, regardless of config or requested fields: credentials of
+# users and integrations (m_camera, endpoint) - exact names and name parts
+EXCLUDED_FIELDS = frozenset({"password", "api_key", "auth_token"})
+SENSITIVE_NAME_PARTS = ("password", "secret", "token", "api_key", "private_key")
+
+FORMAT_ALIASES = {"excel": "xlsx", "json": "ndjson"}
+
+
+class ExportError(ValueError):
+    """Invalid export request (unknown format, unknown fields)."""
+
+
+# =============================================================================
+# COLUMNS + FK LABEL MAPS
+# =============================================================================
+
+class ExportColumn:
+    """One exported column: values() key + header (+ label map for FK columns)."""
+
+    __slots__ = ("name", "key", "header", "field", "labels")
+
+    def __init__(self, field, header: Optional[str] = None):
+        self.field = field
+        self.name = field.name
+        self.key = field.attname  # factory_id for FKs - no join in the projection
+        self.header = header or field.name
+        self.labels: Optional[Dict[Any, str]] = None
+
+    @property
+    def is_relation(self) -> bool:
+        return self.field.is_relation
+
+
+def resolve_columns(model, fields: Optional[Iterable[str]] = None,
+                    labels: Optional[Dict[str, str]] = None,
+                    exclude: Iterable[str] = ()) -> List[ExportColumn]:
+    """
+    Concrete model fields (optionally narrowed / reordered by `fields`).
+
+    Sensitive fields and the config `exclude` list are always removed, also
+    from an explicit `fields` list.
+    """
+    available = {
+        field.name: field for field in model._meta.concrete_fields
+        if not is_sensitive_field(field.name)
+    }
+    labels = labels or {}
+    excluded = set(exclude or ())
+    if fields:
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ExportError(f"Unknown export fields: {', '.join(unknown)}")
+        names = [name for name in dict.fromkeys(fields) if name not in excluded]
+    else:
+        names = [name for name in available if name not in excluded]
+    return [ExportColumn(available[name], labels.get(name)) for name in names]
+
+
+def is_sensitive_field(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in EXCLUDED_FIELDS or any(part in lowered for part in SENSITIVE_NAME_PARTS)
+
+
+def _label_template(view_config: Dict[str, Any], field) -> str:
+    """fk_display_template of the FK target view (fk_fields first, then by model)."""
+    target_view = (view_config.get("fk_fields") or {}).get(field.name)
+    template = VIEWS_MATRIX.get(target_view, {}).get("fk_display_template") if target_view else None
+    if template:
+        return template
+    for config in VIEWS_MATRIX.values():
+        if config.get("model") is field.related_model and config.get("fk_display_template"):
+            return config["fk_display_template"]
+    return "{name}"
+
+
+def build_label_map(queryset, field, template: str) -> Dict[Any, str]:
+    """{fk_id: label} for all targets referenced by `queryset` (one query)."""
+    target = field.related_model
+    target_fields = {f.name for f in target._meta.concrete_fields}
+    keys = [name for _, name, _, _ in string.Formatter().parse(template) if name]
+    columns = [key for key in dict.fromkeys(keys) if key in target_fields and key != "id"]
+
+    referenced = queryset.order_by().values(field.attname)
+    rows = target._default_manager.filter(pk__in=referenced).values_list("pk", *columns)
+    label_map = {}
+    for pk, *values in rows.iterator(chunk_size=CHUNK_SIZE):
+        context = {key: "" for key in keys}
+        context.update((key, "" if value is None else value) for key, value in zip(columns, values))
+        context["id"] = str(pk)
+        try:
+            label_map[pk] = template.format(**context)
+        except (KeyError, IndexError, ValueError):
+            label_map[pk] = str(pk)
+    return label_map
+
+
+def iter_rows(queryset, columns: List[ExportColumn], chunk_size: int) -> Iterator[List[Any]]:
+    """values() rows with FK ids replaced by labels (server-side cursor)."""
+    keys = [column.key for column in columns]
+    relabel = [(index, column.labels) for index, column in enumerate(columns) if column.labels is not None]
+    projection = queryset.select_related(None).prefetch_related(None).values_list(*keys)
+    for values in projection.iterator(chunk_size=chunk_size):
+        row = list(values)
+        for index, labels in relabel:
+            value = row[index]
+            if value is not None:
+                row[index] = labels.get(value, str(value))
+        yield row
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _text(value: Any) -> str:
+    """Cell text for CSV / XLSX inline strings."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return str(value)
+
+
+# =============================================================================
+# WRITERS
+# =============================================================================
+
+class _Echo:
+    """File-like object returning what is written (csv.writer -> generator)."""
+
+    def write(self, value):
+        return value
+
+
+class CsvExportWriter:
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self, delimiter: str = ","):
+        self.delimiter = delimiter
+
+    def stream(self, headers: List[str], rows: Iterable[List[Any]], batch_size: int) -> Iterator[bytes]:
+        writer = csv.writer(_Echo(), delimiter=self.delimiter)
+        # BOM so Excel detects UTF-8
+        yield ("\ufeff" + writer.writerow(headers)).encode("utf-8")
+        for batch in _batched(rows, batch_size):
+            yield "".join(writer.writerow([_text(value) for value in row]) for row in batch).encode("utf-8")
+
+
+class NdjsonExportWriter:
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, **options):
+        self.encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    def stream(self, headers: List[str], rows: Iterable[List[Any]], batch_size: int) -> Iterator[bytes]:
+        encode = self.encoder.encode
+        for batch in _batched(rows, batch_size):
+            yield "".join(encode(dict(zip(headers, row))) + "\n" for row in batch).encode("utf-8")
+
+
+class _ZipStream:
+    """Non-seekable sink for zipfile; drained after every batch."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# XML 1.0 forbids most control characters
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+class XlsxExportWriter:
+    content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self, sheet_name: str = "Export", **options):
+        self.sheet_name = _ILLEGAL_XML.sub("", sheet_name)[:31] or "Export"
+
+    @staticmethod
+    def _cell(value: Any) -> str:
+        if isinstance(value, bool):
+            return f'<c t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, decimal.Decimal)):
+            return f"<c><v>{value}</v></c>"
+        text = _text(value)
+        if not text:
+            return "<c/>"
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_ILLEGAL_XML.sub("", text))}</t></is></c>'
+
+    def _row(self, values: Iterable[Any]) -> bytes:
+        return ("<row>" + "".join(self._cell(value) for value in values) + "</row>").encode("utf-8")
+
+    def stream(self, headers: List[str], rows: Iterable[List[Any]], batch_size: int) -> Iterator[bytes]:
+        sink = _ZipStream()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, content in _XLSX_STATIC.items():
+                archive.writestr(name, content)
+            archive.writestr("xl/workbook.xml", (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                f'<sheets><sheet name="{escape(self.sheet_name, {chr(34): "&quot;"})}" sheetId="1" r:id="rId1"/></sheets>'
+                '</workbook>'
+            ))
+            with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+                sheet.write(
+                    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                )
+                sheet.write(self._row(headers))
+                for batch in _batched(rows, batch_size):
+                    sheet.write(b"".join(self._row(row) for row in batch))
+                    data = sink.drain()
+                    if data:
+                        yield data
+                sheet.write(b"</sheetData></worksheet>")
+        yield sink.drain()
+
+
+WRITERS = {
+    "csv": CsvExportWriter,
+    "xlsx": XlsxExportWriter,
+    "ndjson": NdjsonExportWriter,
+}
+
+
+# =============================================================================
+# EXPORT SERVICE
+# =============================================================================
+
+class ExportService:
+    """Builds streaming export responses for VIEWS_MATRIX querysets."""
+
+    @staticmethod
+    def chunk_size() -> int:
+        return getattr(settings, "EXPORT_CHUNK_SIZE", CHUNK_SIZE)
+
+    @staticmethod
+    def normalize_format(export_type: Optional[str]) -> str:
+        export_type = (export_type or "csv").lower()
+        export_type = FORMAT_ALIASES.get(export_type, export_type)
+        if export_type not in WRITERS:
+            raise ExportError(f"Unsupported export format '{export_type}' (use {', '.join(WRITERS)})")
+        return export_type
+
+    @staticmethod
+    def get_config(view_name: str, name: Optional[str] = None):
+        """Enabled ExportConfig by explicit name, else the one named after the view."""
+        from .models import ExportConfig
+
+        config = ExportConfig.objects.filter(name=name or view_name, enabled=True).order_by("-updated").first()
+        if config is None and name:
+            raise ExportError(f"Export config '{name}' not found")
+        return config
+
+    @classmethod
+    def stream(cls, queryset, view_name: str, export_type: Optional[str] = None,
+               fields: Optional[List[str]] = None, config_name: Optional[str] = None) -> StreamingHttpResponse:
+        """StreamingHttpResponse with the export of `queryset` (rows are fetched lazily)."""
+        view_config = VIEWS_MATRIX.get(view_name, {})
+        export_config = cls.get_config(view_name, config_name)
+        options = dict(export_config.config or {}) if export_config else {}
+
+        export_type = cls.normalize_format(export_type or (export_config.export_type if export_config else None))
+        columns = resolve_columns(
+            queryset.model,
+            fields=fields or options.get("fields"),
+            labels=options.get("labels"),
+            exclude=options.get("exclude", ()),
+        )
+        for column in columns:
+            if column.is_relation:
+                column.labels = build_label_map(queryset, column.field, _label_template(view_config, column.field))
+
+        chunk_size = int(options.get("chunk_size") or cls.chunk_size())
+        if export_type == "csv":
+            writer = CsvExportWriter(delimiter=options.get("delimiter", ","))
+        elif export_type == "xlsx":
+            writer = XlsxExportWriter(sheet_name=view_name)
+        else:
+            writer = NdjsonExportWriter()
+
+        headers = [column.header for column in columns]
+        rows = iter_rows(queryset, columns, chunk_size)
+        logger.info(f"[IMPEX] Export '{view_name}' as {export_type}: {len(columns)} columns, chunk {chunk_size}")
+
+        response = StreamingHttpResponse(writer.stream(headers, rows, chunk_size), content_type=writer.content_type)
+        filename = f"{view_name}-{timezone.localtime():%Y%m%d-%H%M%S}.{writer.extension}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Cache-Control"] = "no-store"
+        return response
@@ -0,0 +1,649 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/impex/importer.py
+#   Impex Import - bulk import pipeline driven by ImportConfig
+#   Streaming readers + chunk validation + preloaded FK lookups
+#..............................................................
+
+"""
+   Impex Import - Bulk Import Pipeline Driven by ImportConfig.
+
+   Imports csv / excel (xlsx) / json (array or NDJSON) / xml files into a
+   VIEWS_MATRIX model without going through the generated viewsets:
+
+   1. the file is read as a stream of records (csv.DictReader, NDJSON lines,
+      ElementTree.iterparse, xlsx sheet iterparse)
+   2. records are validated per chunk, column by column (field.to_python,
+      choices, field validators) - no full_clean(), no per-row queries
+   3. FK columns are resolved to PKs through lookup dicts preloaded once per
+      FK column from the user's scoped rows (pk, code, human_id by default)
+   4. valid rows are written with bulk_create / bulk_update per chunk;
+      upserts match existing rows by `unique_fields` (one query per chunk)
+   5. bulk writes emit no signals, so search indexing, FK options cache and
+      bootstrap stamps are refreshed once at the end (finalize)
+
+   Progress is reported through generator.progress_state (ProgressTracker
+   status_fn), so generator/progress/<job_id>/ and its SSE stream work for
+   imports too; cancellation is checked between chunks.
+
+   ImportConfig.config:
+   ```python
+   {
+       "view": "measurements",                       # default: ImportConfig.name
+       "columns": {"Date": "dump_date", "Plant": "factory", "Skip me": None},
+       "fk_lookup": {"factory": ["code"],            # default: code, human_id (+ pk)
+                     "location": {"keys": ["code"], "within": "factory"}},
+       "unique_fields": ["factory", "code"],         # upsert key (empty = insert only)
+       "defaults": {"pot_side": "NONE"},
+       "batch_size": 1000, "on_error": "skip",       # or "abort"
+       "atomic": False, "max_errors": 100,
+       "delimiter": ",", "encoding": "utf-8-sig",    # csv
+       "record_tag": "row", "sheet": None,           # xml / xlsx
+   }
+   ```
+
+   Usage:
+   ```python
+   from sopira_magic.apps.impex.importer import ImportService
+
+   config = ImportService.get_config("plant-measurements")
+   result = ImportService.run(uploaded_file, config, user=request.user)
+   ```
+"""
+
+import csv
+import datetime
+import io
+import json
+import logging
+import operator
+import re
+import zipfile
+from contextlib import nullcontext
+from functools import reduce
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, iterparse
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied, ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 100
+DEFAULT_FK_KEYS = ("code", "human_id")
+
+# Managed by the model (or sensitive) - never written by imports
+EXCLUDED_FIELDS = frozenset({"id", "uuid", "created", "updated", "password"})
+
+FORMAT_ALIASES = {"excel": "xlsx", "ndjson": "json"}
+
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+_MISSING = object()
+_AMBIGUOUS = object()
+
+
+class ImportConfigError(ValueError):
+    """Invalid import request or ImportConfig (unknown view, format, fields)."""
+
+
+class ImportAborted(Exception):
+    """on_error='abort' and a row failed validation."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(f"Import aborted, {len(errors)} invalid rows")
+        self.errors = errors
+
+
+# =============================================================================
+# READERS (stream of dict records)
+# =============================================================================
+
+def _raw(fileobj):
+    return getattr(fileobj, "file", fileobj)
+
+
+def read_csv(fileobj, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    stream = io.TextIOWrapper(_raw(fileobj), encoding=options.get("encoding", "utf-8-sig"), newline="")
+    yield from csv.DictReader(stream, delimiter=options.get("delimiter", ","))
+
+
+def read_json(fileobj, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """JSON array (loaded at once) or NDJSON (one record per line, streamed)."""
+    stream = io.TextIOWrapper(_raw(fileobj), encoding=options.get("encoding", "utf-8-sig"))
+    head = stream.read(1)
+    while head and head.isspace():
+        head = stream.read(1)
+    try:
+        if head == "[":
+            yield from json.loads(head + stream.read())
+            return
+        for line in chain([head + stream.readline()], stream):
+            if line.strip():
+                yield json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ImportConfigError(f"Invalid JSON: {e}")
+
+
+def read_xml(fileobj, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """<record_tag> elements; attributes and child elements become fields."""
+    tag = options.get("record_tag", "row")
+    try:
+        for _event, elem in iterparse(_raw(fileobj), events=("end",)):
+            if elem.tag != tag:
+                continue
+            record = dict(elem.attrib)
+            record.update((child.tag, child.text) for child in elem)
+            elem.clear()
+            yield record
+    except ParseError as e:
+        raise ImportConfigError(f"Invalid XML: {e}")
+
+
+def _column_index(ref: str) -> int:
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _xlsx_value(cell, shared: List[str]) -> Any:
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{XLSX_NS}t"))
+    node = cell.find(f"{XLSX_NS}v")
+    text = node.text if node is not None else None
+    if text is None:
+        return None
+    if cell_type == "s":
+        return shared[int(text)]
+    if cell_type == "b":
+        return text == "1"
+    if cell_type in ("str", "e"):
+        return text
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def read_xlsx(fileobj, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """First (or options['sheet']) worksheet; first row = headers."""
+    try:
+        archive = zipfile.ZipFile(_raw(fileobj))
+    except zipfile.BadZipFile:
+        raise ImportConfigError("Invalid xlsx file")
+    names = archive.namelist()
+
+    shared: List[str] = []
+    if "xl/sharedStrings.xml" in names:
+        with archive.open("xl/sharedStrings.xml") as handle:
+            for _event, elem in iterparse(handle):
+                if elem.tag == f"{XLSX_NS}si":
+                    shared.append("".join(t.text or "" for t in elem.iter(f"{XLSX_NS}t")))
+                    elem.clear()
+
+    sheets = sorted(
+        (name for name in names if re.fullmatch(r"xl/worksheets/sheet\d+\.xml", name)),
+        key=lambda name: int(re.search(r"(\d+)\.xml$", name).group(1)),
+    )
+    sheet = options.get("sheet") or (sheets[0] if sheets else None)
+    if sheet not in names:
+        raise ImportConfigError("xlsx file has no worksheet")
+
+    headers: Optional[Dict[int, str]] = None
+    with archive.open(sheet) as handle:
+        for _event, elem in iterparse(handle):
+            if elem.tag != f"{XLSX_NS}row":
+                continue
+            values = {}
+            for position, cell in enumerate(elem.iter(f"{XLSX_NS}c")):
+                ref = cell.get("r")
+                values[_column_index(ref) if ref else position] = _xlsx_value(cell, shared)
+            elem.clear()
+            if headers is None:
+                headers = {i: str(v).strip() for i, v in values.items() if v not in (None, "")}
+                continue
+            yield {headers[i]: v for i, v in values.items() if i in headers}
+
+
+READERS = {
+    "csv": read_csv,
+    "json": read_json,
+    "xml": read_xml,
+    "xlsx": read_xlsx,
+}
+
+
+def _count_records(fileobj, import_type: str) -> int:
+    """Line count for csv / NDJSON (progress total), 0 when unknown."""
+    raw = _raw(fileobj)
+    if import_type not in ("csv", "json") or not getattr(raw, "seekable", lambda: False)():
+        return 0
+    start = raw.tell()
+    lines = 0
+    first = b""
+    while chunk := raw.read(1 << 20):
+        first = first or chunk[:1]
+        lines += chunk.count(b"\n")
+    raw.seek(start)
+    if import_type == "json" and first.lstrip()[:1] == b"[":
+        return 0
+    return max(lines - 1, 0) if import_type == "csv" else lines
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# =============================================================================
+# COERCION + FK LOOKUPS
+# =============================================================================
+
+def coerce_value(field, raw: Any) -> Any:
+    """Raw file value -> Python value for `field` (raises ValidationError)."""
+    if isinstance(raw, str):
+        raw = raw.strip()
+    if raw is None or raw == "":
+        if field.null:
+            return None
+        if field.blank and field.empty_strings_allowed:
+            return ""
+        raise ValidationError(field.error_messages["blank" if field.empty_strings_allowed else "null"])
+
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        # Excel serial dates / day fractions
+        if isinstance(field, models.DateTimeField):
+            raw = EXCEL_EPOCH + datetime.timedelta(days=raw)
+        elif isinstance(field, models.DateField):
+            raw = (EXCEL_EPOCH + datetime.timedelta(days=raw)).date()
+        elif isinstance(field, models.TimeField):
+            raw = (datetime.datetime.min + datetime.timedelta(seconds=round(raw % 1 * 86400, 3))).time()
+    if isinstance(field, models.JSONField) and isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raise ValidationError("Invalid JSON.")
+
+    value = field.to_python(raw)
+    if isinstance(field, models.DateTimeField) and settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    if field.choices and value not in {key for key, _ in field.flatchoices}:
+        raise ValidationError(f"Value {value!r} is not a valid choice.")
+    field.run_validators(value)
+    return value
+
+
+def _target_view(view_config: Dict[str, Any], field) -> Optional[str]:
+    target_view = (view_config.get("fk_fields") or {}).get(field.name)
+    if target_view in VIEWS_MATRIX:
+        return target_view
+    for name, config in VIEWS_MATRIX.items():
+        if config.get("model") is field.related_model:
+            return name
+    return None
+
+
+def _scoped(queryset, user, view_name: Optional[str]):
+    if user is None or view_name is None:
+        return queryset
+    from sopira_magic.apps.scoping.engine import ScopingEngine
+
+    return ScopingEngine.apply(queryset, user, view_name, VIEWS_MATRIX[view_name])
+
+
+class FKLookup:
+    """{key: pk} for one FK column, preloaded from the user's scoped target rows."""
+
+    __slots__ = ("field", "within", "parent_attname", "map")
+
+    def __init__(self, field, keys: Iterable[str], within: Optional[str], queryset):
+        target = field.related_model
+        target_fields = {f.name for f in target._meta.concrete_fields}
+        keys = [key for key in keys if key in target_fields and key != "pk"]
+        self.field = field
+        self.within = within
+        self.parent_attname = None
+        parent_column = "pk"
+        if within:
+            parent_column = target._meta.get_field(within).attname
+            self.parent_attname = field.model._meta.get_field(within).attname
+
+        self.map: Dict[Any, Any] = {}
+        for pk, parent, *values in queryset.values_list("pk", parent_column, *keys).iterator():
+            for value in (pk, *values):
+                if value in (None, ""):
+                    continue
+                key = (parent, str(value)) if within else str(value)
+                known = self.map.get(key)
+                self.map[key] = pk if known is None or known == pk else _AMBIGUOUS
+
+    def resolve(self, raw: Any, parent: Any = None) -> Any:
+        key = str(raw).strip()
+        return self.map.get((parent, key) if self.within else key)
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class ImportColumn:
+    __slots__ = ("source", "field", "lookup")
+
+    def __init__(self, source: str, field):
+        self.source = source
+        self.field = field
+        self.lookup: Optional[FKLookup] = None
+
+
+class ImportPipeline:
+    """Chunk-wise validation and bulk writes into one VIEWS_MATRIX model."""
+
+    def __init__(self, view_name: str, options: Dict[str, Any], user=None):
+        self.view_name = view_name
+        self.view_config = VIEWS_MATRIX[view_name]
+        self.model = self.view_config["model"]
+        self.options = options
+        self.user = user
+        self.batch_size = int(options.get("batch_size") or BATCH_SIZE)
+        self.max_errors = int(options.get("max_errors") or MAX_ERRORS)
+        self.abort_on_error = options.get("on_error") == "abort"
+
+        meta = self.model._meta
+        self.unique_attnames = [self._field(name).attname for name in options.get("unique_fields") or []]
+        self.auto_now = [f.attname for f in meta.concrete_fields if getattr(f, "auto_now", False)]
+        self.defaults = {
+            self._field(name).attname: value for name, value in (options.get("defaults") or {}).items()
+        }
+
+        self.columns: Optional[List[ImportColumn]] = None
+        self.required: List[str] = []
+        self.ignored_columns: List[str] = []
+        self.created = self.updated = self.skipped = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.pks: List[Any] = []
+
+    # -------------------------
+    # Planning
+    # -------------------------
+    def _field(self, name: str):
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            field = next((f for f in self.model._meta.concrete_fields if f.attname == name), None)
+            if field is None:
+                raise ImportConfigError(f"Unknown field '{name}' on {self.model.__name__}")
+        if not field.concrete or field.name in EXCLUDED_FIELDS:
+            raise ImportConfigError(f"Field '{name}' cannot be imported")
+        return field
+
+    def _plan(self, headers: Iterable[str]) -> None:
+        mapping = self.options.get("columns") or {}
+        fk_options = self.options.get("fk_lookup") or {}
+        columns = []
+        for header in headers:
+            name = mapping.get(header, header)
+            try:
+                field = self._field(name) if name else None
+            except ImportConfigError:
+                field = None
+            if field is None:
+                self.ignored_columns.append(header)
+                continue
+            column = ImportColumn(header, field)
+            if field.is_relation:
+                spec = fk_options.get(field.name, DEFAULT_FK_KEYS)
+                if not isinstance(spec, dict):
+                    spec = {"keys": spec}
+                target_view = _target_view(self.view_config, field)
+                queryset = _scoped(field.related_model._default_manager.all(), self.user, target_view)
+                column.lookup = FKLookup(field, spec.get("keys", DEFAULT_FK_KEYS), spec.get("within"), queryset)
+            columns.append(column)
+        # Plain columns first, FKs after, FKs resolved 'within' a parent last
+        columns.sort(key=lambda c: 0 if c.lookup is None else (2 if c.lookup.within else 1))
+        self.columns = columns
+
+        mapped = {c.field.attname for c in columns}
+        missing_keys = [a for a in self.unique_attnames if a not in mapped and a not in self.defaults]
+        if missing_keys:
+            raise ImportConfigError(f"Unique fields missing in file: {', '.join(missing_keys)}")
+        self.required = [
+            f.attname for f in self.model._meta.concrete_fields
+            if not (f.null or f.has_default() or f.primary_key or f.name in EXCLUDED_FIELDS
+                    or getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+                    or (f.blank and f.empty_strings_allowed))
+        ]
+
+    # -------------------------
+    # Chunk processing
+    # -------------------------
+    def _error(self, row: int, field: Optional[str], message: str) -> None:
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "field": field, "message": message})
+
+    def _validate(self, chunk: List[Tuple[int, Dict[str, Any]]]):
+        """Column-wise coercion + FK resolution. Returns (values per row, {index: errors})."""
+        rows = [dict(self.defaults) for _ in chunk]
+        bad: Dict[int, List[Tuple[str, str]]] = {}
+        for column in self.columns:
+            field, lookup = column.field, column.lookup
+            attname, source = field.attname, column.source
+            for i, (_row, record) in enumerate(chunk):
+                raw = record.get(source, _MISSING)
+                if raw is _MISSING:
+                    continue
+                if lookup is None:
+                    try:
+                        rows[i][attname] = coerce_value(field, raw)
+                    except ValidationError as e:
+                        bad.setdefault(i, []).append((field.name, "; ".join(e.messages)))
+                    continue
+                if raw is None or (isinstance(raw, str) and not raw.strip()):
+                    if field.null:
+                        rows[i][attname] = None
+                    else:
+                        bad.setdefault(i, []).append((field.name, "This field is required."))
+                    continue
+                pk = lookup.resolve(raw, rows[i].get(lookup.parent_attname) if lookup.within else None)
+                if pk is None:
+                    bad.setdefault(i, []).append((field.name, f"'{raw}' not found"))
+                elif pk is _AMBIGUOUS:
+                    bad.setdefault(i, []).append((field.name, f"'{raw}' is ambiguous"))
+                else:
+                    rows[i][attname] = pk
+        return rows, bad
+
+    def _existing(self, keys: Iterable[tuple]) -> Dict[tuple, Any]:
+        """{unique key: pk} of rows already in the DB (one query)."""
+        keys = {key for key in keys if None not in key}
+        if not keys:
+            return {}
+        if len(self.unique_attnames) == 1:
+            condition = models.Q(**{f"{self.unique_attnames[0]}__in": [key[0] for key in keys]})
+        else:
+            condition = reduce(operator.or_, (models.Q(**dict(zip(self.unique_attnames, key))) for key in keys))
+        rows = self.model._default_manager.filter(condition).values_list("pk", *self.unique_attnames)
+        return {tuple(values): pk for pk, *values in rows}
+
+    def process(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if self.columns is None:
+            self._plan(chunk[0][1].keys())
+        rows, bad = self._validate(chunk)
+
+        keys = {}
+        existing: Dict[tuple, Any] = {}
+        if self.unique_attnames:
+            keys = {i: tuple(values.get(a) for a in self.unique_attnames) for i, values in enumerate(rows) if i not in bad}
+            existing = self._existing(keys.values())
+            if existing and self.user is not None:
+                scoped = _scoped(self.model._default_manager.filter(pk__in=existing.values()), self.user, self.view_name)
+                allowed = set(scoped.values_list("pk", flat=True))
+                for i, key in keys.items():
+                    if key in existing and existing[key] not in allowed:
+                        bad.setdefault(i, []).append((None, "Existing row is outside your scope"))
+
+        creates: Dict[Any, models.Model] = {}
+        updates: Dict[Any, Dict[str, Any]] = {}
+        for i, (row, _record) in enumerate(chunk):
+            values = rows[i]
+            key = keys.get(i)
+            pk = existing.get(key) if key is not None else None
+            if pk is None and i not in bad:
+                missing = [a for a in self.required if a not in values]
+                if missing:
+                    bad.setdefault(i, []).extend((a, "This field is required.") for a in missing)
+            if i in bad:
+                self.skipped += 1
+                for field, message in bad[i]:
+                    self._error(row, field, message)
+                continue
+
+            if pk is not None:
+                updates.setdefault(pk, {}).update(values)
+            elif key is not None and None not in key and key in creates:
+                for attname, value in values.items():  # duplicate key in the file: last row wins
+                    setattr(creates[key], attname, value)
+            else:
+                obj = self.model(**values)
+                if hasattr(obj, "human_id") and not obj.human_id and getattr(obj, "code", None):
+                    obj.human_id = obj.code  # NamedWithCodeModel.save() is bypassed by bulk_create
+                creates[key if key is not None and None not in key else ("row", row)] = obj
+
+        if bad and self.abort_on_error:
+            raise ImportAborted(self.errors)
+        self._write(list(creates.values()), updates)
+
+    def _write(self, creates: List[models.Model], updates: Dict[Any, Dict[str, Any]]) -> None:
+        now = timezone.now()
+        with transaction.atomic(using=self.model._default_manager.db):
+            if creates:
+                self.model._default_manager.bulk_create(creates, batch_size=self.batch_size)
+                self.pks.extend(obj.pk for obj in creates)
+                self.created += len(creates)
+            # bulk_update writes the same columns for every object -> group by present fields
+            groups: Dict[frozenset, List[models.Model]] = {}
+            for pk, values in updates.items():
+                obj = self.model(pk=pk)
+                for attname, value in values.items():
+                    setattr(obj, attname, value)
+                for attname in self.auto_now:
+                    setattr(obj, attname, now)
+                groups.setdefault(frozenset(values) - set(self.unique_attnames), []).append(obj)
+            for fields, objs in groups.items():
+                if not fields and not self.auto_now:
+                    continue
+                self.model._default_manager.bulk_update(objs, [*fields, *self.auto_now], batch_size=self.batch_size)
+            self.pks.extend(updates)
+            self.updated += len(updates)
+
+    # -------------------------
+    # Deferred side effects
+    # -------------------------
+    def finalize(self) -> None:
+        """One-pass search indexing + cache invalidation (bulk writes send no signals)."""
+        from sopira_magic.apps.api.bulk import after_bulk_write
+
+        after_bulk_write(self.view_name, self.pks)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "view": self.view_name,
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "ignored_columns": self.ignored_columns,
+        }
+
+
+# =============================================================================
+# IMPORT SERVICE
+# =============================================================================
+
+def _import_tracker(job_id: str, name: str, total: int):
+    """ProgressTracker wired to generator progress_state (status/SSE endpoints)."""
+    from sopira_magic.apps.generator.progress import ProgressTracker
+    from sopira_magic.apps.generator.progress_state import set_status
+
+    def status_fn(snapshot):
+        set_status(job_id, snapshot)
+
+    return ProgressTracker(name=name, total=total, logger=logger, status_fn=status_fn, job_id=job_id, min_interval=0.5)
+
+
+class ImportService:
+    """Runs ImportConfig-driven bulk imports."""
+
+    @staticmethod
+    def get_config(name: Optional[str]):
+        from .models import ImportConfig
+
+        if not name:
+            raise ImportConfigError("Import config is required")
+        config = ImportConfig.objects.filter(name=name, enabled=True).order_by("-updated").first()
+        if config is None:
+            raise ImportConfigError(f"Import config '{name}' not found")
+        return config
+
+    @staticmethod
+    def check_access(view_name: str, user, upsert: bool) -> None:
+        from sopira_magic.apps.accessrights.services import can_access
+
+        if not can_access(view_name, "add", user) or (upsert and not can_access(view_name, "edit", user)):
+            raise PermissionDenied(f"No import rights for '{view_name}'")
+
+    @classmethod
+    def run(cls, fileobj, import_config, user=None, job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Import `fileobj` according to `import_config`. Returns the summary (incl. job_id)."""
+        from sopira_magic.apps.generator.progress_state import is_cancel_requested, mark_done, new_job_id, set_status
+
+        options = dict(import_config.config or {})
+        view_name = options.get("view") or import_config.name
+        if view_name not in VIEWS_MATRIX:
+            raise ImportConfigError(f"Unknown import view '{view_name}'")
+        import_type = FORMAT_ALIASES.get(import_config.import_type.lower(), import_config.import_type.lower())
+        if import_type not in READERS:
+            raise ImportConfigError(f"Unsupported import type '{import_config.import_type}'")
+        if user is not None:
+            cls.check_access(view_name, user, bool(options.get("unique_fields")))
+
+        job_id = job_id or new_job_id()
+        pipeline = ImportPipeline(view_name, options, user=user)
+        tracker = _import_tracker(job_id, f"import_{view_name}", _count_records(fileobj, import_type))
+        logger.info(f"[IMPEX] Import '{import_config.name}' ({import_type}) into '{view_name}' started, job {job_id}")
+
+        cancelled = False
+        tracker.start()
+        try:
+            atomic = transaction.atomic() if options.get("atomic") else nullcontext()
+            with atomic:
+                records = enumerate(READERS[import_type](fileobj, options), start=1)
+                for chunk in _batched(records, pipeline.batch_size):
+                    if is_cancel_requested(job_id):
+                        cancelled = True
+                        break
+                    pipeline.process(chunk)
+                    tracker.step(len(chunk), note=f"created={pipeline.created} updated={pipeline.updated}")
+            pipeline.finalize()
+        except Exception as e:
+            set_status(job_id, {"job_id": job_id, "name": tracker.name, "error": str(e), "done": True})
+            logger.warning(f"[IMPEX] Import '{import_config.name}' failed: {e}")
+            raise
+        tracker.finish()
+
+        result = {"job_id": job_id, "cancelled": cancelled, **pipeline.summary()}
+        set_status(job_id, {key: value for key, value in result.items() if key != "errors"})
+        mark_done(job_id, note="cancelled" if cancelled else "done")
+        logger.info(
+            f"[IMPEX] Import '{import_config.name}' finished: created={pipeline.created} "
+            f"updated={pipeline.updated} skipped={pipeline.skipped}"
+        )
+        return result
@@ -0,0 +1,152 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/impex/tests/test_export.py
+#   Impex Export Tests
+#   Tests for export.py and the <view>/export/ action
+#..............................................................
+
+"""
+   Impex Export Tests.
+
+   Tests for column resolution, preloaded FK label maps, the CSV / NDJSON /
+   XLSX writers and the streaming export action of generated viewsets.
+"""
+
+import csv
+import io
+import json
+import zipfile
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.api.view_factory import create_viewset
+from sopira_magic.apps.impex.export import (
+    ExportError,
+    ExportService,
+    build_label_map,
+    resolve_columns,
+)
+from sopira_magic.apps.impex.models import ExportConfig
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+@pytest.fixture
+def admin():
+    return get_user_model().objects.create_superuser(username='exporter', password='pass12345')
+
+
+@pytest.fixture
+def factories():
+    acme = Company.objects.create(code='AC', name='Acme')
+    beta = Company.objects.create(code='BT', name='Beta')
+    return [
+        Factory.objects.create(company=acme, code='F1', name='Alpha plant'),
+        Factory.objects.create(company=beta, code='F2', name='Bravo plant'),
+        Factory.objects.create(company=acme, code='F3', name='Charlie plant'),
+    ]
+
+
+def _export(user, **params):
+    request = factory.get('/api/factories/export/', params)
+    force_authenticate(request, user)
+    view = create_viewset('factories', read_only=False).as_view({'get': 'export'})
+    return view(request)
+
+
+def _body(response) -> bytes:
+    return b''.join(response.streaming_content)
+
+
+class TestColumns:
+    """Test suite for column resolution and FK label maps."""
+
+    def test_default_columns_skip_sensitive_fields(self):
+        """Test concrete fields are exported, password never."""
+        names = [column.name for column in resolve_columns(get_user_model())]
+        assert 'username' in names
+        assert 'password' not in names
+
+    def test_exclude_and_sensitive_fields_apply_to_explicit_fields(self):
+        """Test config exclude is subtracted and credentials stay unavailable with explicit fields."""
+        names = [column.name for column in resolve_columns(Factory, fields=['name', 'code'], exclude=['code'])]
+        assert names == ['name']
+
+        from sopira_magic.apps.m_camera.models import ServiceCredential
+        available = [column.name for column in resolve_columns(ServiceCredential)]
+        assert not {'password', 'api_key', 'auth_token'} & set(available)
+        with pytest.raises(ExportError):
+            resolve_columns(get_user_model(), fields=['username', 'password'])
+
+    def test_unknown_field_rejected(self):
+        """Test explicit fields are validated."""
+        with pytest.raises(ExportError):
+            resolve_columns(Factory, fields=['name', 'bogus'])
+
+    def test_label_map_one_query(self, factories, django_assert_num_queries):
+        """Test labels of referenced companies are loaded in one query."""
+        queryset = Factory.objects.filter(code__in=['F1', 'F3'])
+        with django_assert_num_queries(1):
+            labels = build_label_map(queryset, Factory._meta.get_field('company'), '{code}-{name}')
+        assert labels == {factories[0].company_id: 'AC-Acme'}
+
+
+class TestExportAction:
+    """Test suite for GET /api/<view>/export/."""
+
+    def test_csv_uses_filters_ordering_and_labels(self, admin, factories, django_assert_max_num_queries):
+        """Test CSV export honours search/ordering and renders FK labels."""
+        response = _export(admin, type='csv', search='plant', ordering='-name', fields='code,name,company')
+        assert response.status_code == 200
+        assert response.streaming
+        assert 'attachment; filename="factories-' in response['Content-Disposition']
+
+        with django_assert_max_num_queries(2):  # label map + rows, independent of row count
+            body = _body(response).decode('utf-8-sig')
+        rows = list(csv.reader(io.StringIO(body)))
+        assert rows == [
+            ['code', 'name', 'company'],
+            ['F3', 'Charlie plant', 'AC-Acme'],
+            ['F2', 'Bravo plant', 'BT-Beta'],
+            ['F1', 'Alpha plant', 'AC-Acme'],
+        ]
+
+    def test_ndjson_with_export_config(self, admin, factories):
+        """Test ExportConfig named after the view sets format, fields and headers."""
+        ExportConfig.objects.create(
+            name='factories', export_type='json',
+            config={'fields': ['code', 'company'], 'labels': {'company': 'Company'}},
+        )
+        response = _export(admin, ordering='code')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in _body(response).decode().splitlines()]
+        assert lines[0] == {'code': 'F1', 'Company': 'AC-Acme'}
+        assert len(lines) == 3
+
+    def test_xlsx_is_valid_workbook(self, admin, factories):
+        """Test the streamed XLSX is a readable zip with one row per record."""
+        response = _export(admin, type='xlsx', fields='code,name')
+        archive = zipfile.ZipFile(io.BytesIO(_body(response)))
+        assert archive.testzip() is None
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        assert sheet.count('<row>') == 4
+        assert 'Bravo plant' in sheet
+
+    def test_bad_format(self, admin, factories):
+        """Test unknown format returns 400."""
+        assert _export(admin, type='pdf').status_code == 400
+
+    def test_export_requires_export_right(self, factories):
+        """Test readers (view only) cannot export."""
+        reader = get_user_model().objects.create_user(username='reader', password='pass12345', role='reader')
+        assert _export(reader, type='csv').status_code == 403
+
+    def test_service_direct(self, factories):
+        """Test ExportService.stream works on any queryset."""
+        response = ExportService.stream(Factory.objects.order_by('code'), 'factories', 'csv', fields=['code'])
+        assert _body(response).decode('utf-8-sig').split() == ['code', 'F1', 'F2', 'F3']
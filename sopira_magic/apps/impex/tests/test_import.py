@@ -0,0 +1,190 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/impex/tests/test_import.py
+#   Impex Import Tests
+#   Tests for importer.py and POST impex/import/
+#..............................................................
+
+"""
+   Impex Import Tests.
+
+   Tests for streaming readers, chunk validation, preloaded FK lookups,
+   bulk upserts, deferred side effects and progress reporting.
+"""
+
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.api.views_impex import impex_import_view
+from sopira_magic.apps.generator.progress_state import get_status
+from sopira_magic.apps.impex import importer
+from sopira_magic.apps.impex.export import XlsxExportWriter
+from sopira_magic.apps.impex.importer import ImportAborted, ImportConfigError, ImportService, read_xlsx
+from sopira_magic.apps.impex.models import ImportConfig
+from sopira_magic.apps.m_company.models import Company
+from sopira_magic.apps.m_factory.models import Factory
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+CSV = (
+    "Code,Name,Company,Remark\n"
+    "F1,Alpha plant,AC,x\n"
+    "F2,Bravo plant,BT,\n"
+    "F3,Charlie plant,ZZ,\n"
+    "F4,,AC,\n"
+)
+
+
+@pytest.fixture
+def admin():
+    return get_user_model().objects.create_superuser(username='importer', password='pass12345')
+
+
+@pytest.fixture
+def companies():
+    return {
+        'AC': Company.objects.create(code='AC', name='Acme'),
+        'BT': Company.objects.create(code='BT', name='Beta'),
+    }
+
+
+@pytest.fixture
+def csv_config():
+    return ImportConfig.objects.create(
+        name='factories-csv',
+        import_type='csv',
+        config={
+            'view': 'factories',
+            'columns': {'Code': 'code', 'Name': 'name', 'Company': 'company'},
+            'fk_lookup': {'company': ['code']},
+            'unique_fields': ['company', 'code'],
+            'batch_size': 2,
+        },
+    )
+
+
+def _file(content: str):
+    return io.BytesIO(content.encode('utf-8'))
+
+
+class TestImportPipeline:
+    """Test suite for ImportService.run."""
+
+    def test_csv_insert_with_row_errors(self, admin, companies, csv_config, django_assert_max_num_queries):
+        """Test valid rows are bulk created, invalid rows reported."""
+        with django_assert_max_num_queries(20):  # independent of row count
+            result = ImportService.run(_file(CSV), csv_config, user=admin)
+
+        assert (result['created'], result['updated'], result['skipped']) == (2, 0, 2)
+        assert result['ignored_columns'] == ['Remark']
+        assert {(e['row'], e['field']) for e in result['errors']} == {(3, 'company'), (4, 'name')}
+        alpha = Factory.objects.get(code='F1')
+        assert alpha.company == companies['AC']
+        assert alpha.human_id == 'F1'
+
+    def test_upsert_updates_existing_rows(self, admin, companies, csv_config):
+        """Test rows matching unique_fields are updated, not duplicated."""
+        Factory.objects.create(company=companies['AC'], code='F1', name='Old name')
+
+        result = ImportService.run(_file("Code,Name,Company\nF1,New name,AC\nF5,Echo,BT\n"), csv_config, user=admin)
+
+        assert (result['created'], result['updated']) == (1, 1)
+        assert Factory.objects.get(code='F1').name == 'New name'
+        assert Factory.objects.filter(code='F1').count() == 1
+
+    def test_side_effects_deferred_to_one_pass(self, admin, companies, csv_config, monkeypatch):
+        """Test FK cache / search indexing run once at the end."""
+        calls = []
+        monkeypatch.setattr(
+            'sopira_magic.apps.fk_options_cache.services.FKCacheService.invalidate_all',
+            lambda view_name: calls.append(('fk', view_name)),
+        )
+        monkeypatch.setattr(
+            'sopira_magic.apps.search.services.SearchService.index_pks',
+            lambda self, view_name, pks: calls.append(('search', view_name, len(pks))),
+        )
+        ImportService.run(_file(CSV), csv_config, user=admin)
+        assert calls == [('search', 'factories', 2), ('fk', 'factories')]
+
+    def test_progress_reported(self, admin, companies, csv_config):
+        """Test progress_state holds the final summary for the job."""
+        result = ImportService.run(_file(CSV), csv_config, user=admin, job_id='a' * 32)
+        status = get_status('a' * 32)
+        assert status['done'] is True
+        assert status['created'] == 2
+        assert result['job_id'] == 'a' * 32
+
+    def test_abort_on_error(self, admin, companies, csv_config):
+        """Test on_error=abort stops with the collected errors."""
+        csv_config.config = {**csv_config.config, 'on_error': 'abort', 'atomic': True}
+        with pytest.raises(ImportAborted) as exc_info:
+            ImportService.run(_file(CSV), csv_config, user=admin)
+        assert exc_info.value.errors
+        assert not Factory.objects.exists()
+
+    def test_json_and_fk_by_name_lookup(self, admin, companies):
+        """Test NDJSON input and custom FK lookup keys."""
+        config = ImportConfig.objects.create(
+            name='factories', import_type='json', config={'fk_lookup': {'company': ['name']}},
+        )
+        ndjson = '{"code": "J1", "name": "Json plant", "company": "Beta"}\n{"code": "J2", "name": "Other", "company": "Acme"}\n'
+        result = ImportService.run(_file(ndjson), config, user=admin)
+        assert result['created'] == 2
+        assert Factory.objects.get(code='J1').company == companies['BT']
+
+    def test_requires_add_right(self, companies, csv_config):
+        """Test readers cannot import."""
+        reader = get_user_model().objects.create_user(username='reader', password='pass12345', role='reader')
+        with pytest.raises(PermissionDenied):
+            ImportService.run(_file(CSV), csv_config, user=reader)
+
+    def test_unknown_unique_field(self, admin, companies):
+        """Test invalid config is rejected."""
+        config = ImportConfig.objects.create(
+            name='factories', import_type='csv', config={'unique_fields': ['bogus']},
+        )
+        with pytest.raises(ImportConfigError):
+            ImportService.run(_file(CSV), config, user=admin)
+
+
+class TestReaders:
+    """Test suite for file readers."""
+
+    def test_xlsx_roundtrip_with_export_writer(self):
+        """Test the xlsx reader reads what the export writer streams."""
+        body = b''.join(XlsxExportWriter().stream(['code', 'count'], iter([['A', 1], ['B', 2.5]]), 10))
+        assert list(read_xlsx(io.BytesIO(body), {})) == [{'code': 'A', 'count': 1}, {'code': 'B', 'count': 2.5}]
+
+    def test_xml_records(self):
+        """Test <row> elements with attributes and children."""
+        xml = b'<rows><row code="X1"><name>Xray</name></row><row code="X2"><name>Yankee</name></row></rows>'
+        assert list(importer.read_xml(io.BytesIO(xml), {})) == [
+            {'code': 'X1', 'name': 'Xray'},
+            {'code': 'X2', 'name': 'Yankee'},
+        ]
+
+
+class TestImportEndpoint:
+    """Test suite for POST /api/impex/import/."""
+
+    def test_upload(self, admin, companies, csv_config):
+        """Test multipart upload returns the import summary."""
+        upload = SimpleUploadedFile('factories.csv', CSV.encode(), content_type='text/csv')
+        request = factory.post('/api/impex/import/', {'file': upload, 'config': 'factories-csv'}, format='multipart')
+        force_authenticate(request, admin)
+        response = impex_import_view(request)
+        assert response.status_code == 200
+        assert response.data['created'] == 2
+
+    def test_unknown_config(self, admin):
+        """Test unknown config returns 400."""
+        upload = SimpleUploadedFile('x.csv', b'code\n', content_type='text/csv')
+        request = factory.post('/api/impex/import/', {'file': upload, 'config': 'nope'}, format='multipart')
+        force_authenticate(request, admin)
+        assert impex_import_view(request).status_code == 400
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('logging', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('DELETE', 'Delete'), ('VIEW', 'View'), ('LOGIN', 'Login'), ('LOGOUT', 'Logout'), ('SIGNUP', 'Signup'), ('LOGIN_FAILED', 'Login failed'), ('PASSWORD_RESET', 'Password reset'), ('PASSWORD_RESET_CONFIRM', 'Password reset confirm'), ('PASSWORD_CHANGE', 'Password change'), ('VERIFY_2FA', 'Verify 2FA'), ('CHECK_AUTH', 'Check auth')], db_index=True, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='content_type',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='contenttypes.contenttype'),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='object_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
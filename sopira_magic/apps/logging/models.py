@@ -20,15 +20,18 @@
 
    2. AuditLog
       - Audit log for data changes (GDPR, SOX compliance)
-      - Fields: action, model_name, object_id, user_id, timestamp, before_data, after_data, ip_address, user_agent
-      - Tracks: CREATE, UPDATE, DELETE, VIEW actions
-      - Stores before/after data for change tracking
+      - Fields: action, model_name, object_id, user_id, timestamp, field_name, old_value, new_value, ip_address, user_agent
+      - Tracks: CREATE, UPDATE, DELETE, VIEW actions and authentication events
+      - One row per changed field (UPDATE); written in batches by audit.pipeline
+      - content_type has no DB constraint (ContentType lives in PRIMARY database)
 
    3. PerformanceLog
       - Performance metrics and timing information
       - Fields: endpoint, method, duration_ms, timestamp, user_id, request_size, response_size, status_code
       - Indexed on: endpoint + timestamp, duration_ms
       - Tracks API performance and response times
+      - Written by logging.telemetry as aggregated rows (one per view/method/status
+        per flush window; histogram + per-alias DB time in extra_data)
 
    Database:
    - All models stored in LOGGING database (not PRIMARY)
@@ -42,6 +45,7 @@
 """
 
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -84,19 +88,31 @@ class AuditLog(models.Model):
         ('UPDATE', 'Update'),
         ('DELETE', 'Delete'),
         ('VIEW', 'View'),
+        # Authentication events (authentification.types.AuthAction)
+        ('LOGIN', 'Login'),
+        ('LOGOUT', 'Logout'),
+        ('SIGNUP', 'Signup'),
+        ('LOGIN_FAILED', 'Login failed'),
+        ('PASSWORD_RESET', 'Password reset'),
+        ('PASSWORD_RESET_CONFIRM', 'Password reset confirm'),
+        ('PASSWORD_CHANGE', 'Password change'),
+        ('VERIFY_2FA', 'Verify 2FA'),
+        ('CHECK_AUTH', 'Check auth'),
     ]
     
-    action = models.CharField(max_length=10, choices=ACTION_CHOICES, db_index=True)
+    action = models.CharField(max_length=32, choices=ACTION_CHOICES, db_index=True)
     user_id = models.UUIDField(null=True, blank=True, db_index=True)
     username = models.CharField(max_length=255, blank=True, default="")
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
-    object_id = models.UUIDField()
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.DO_NOTHING, null=True, blank=True, db_constraint=False
+    )
+    object_id = models.UUIDField(null=True, blank=True)
     content_object = GenericForeignKey('content_type', 'object_id')
     model_name = models.CharField(max_length=255, db_index=True)
     field_name = models.CharField(max_length=255, blank=True, default="")
     old_value = models.TextField(blank=True, null=True)
     new_value = models.TextField(blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)  # event time, not flush time
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.CharField(max_length=500, blank=True, default="")
     extra_data = models.JSONField(default=dict, blank=True)
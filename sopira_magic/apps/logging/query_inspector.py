@@ -0,0 +1,201 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/logging/query_inspector.py
+#   Query Inspector - Production N+1 detection
+#   execute_wrapper on all DB aliases, SQL fingerprints, view/field attribution
+#..............................................................
+
+"""
+   Query Inspector - Production N+1 Detection.
+
+   Replaces the DEBUG-only DatabaseDebugMiddleware (connection.queries, default
+   alias only, WARNING per query).
+
+   QueryInspectorMiddleware samples QUERY_INSPECTOR_SAMPLE_RATE of requests and
+   installs a connection.execute_wrapper on every alias (default/state/logging):
+   - each SQL statement is fingerprinted (literals → ?, IN lists collapsed,
+     whitespace normalized; LRU-cached because ORM SQL strings repeat)
+   - per request: count / time / alias per fingerprint
+   - when a fingerprint repeats, the Python stack is walked ONCE for that
+     fingerprint to find the DRF serializer + field being rendered
+   - fingerprints repeated >= QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD times are
+     reported as N+1, attributed to the view and serializer field
+
+   Requests with N+1 patterns or more than QUERY_INSPECTOR_QUERY_THRESHOLD
+   queries produce a structured report in api.views_db_watchdog (db-watchdog/).
+   Unsampled requests cost one random() call.
+"""
+
+import logging
+import os
+import random
+import re
+import sys
+import time
+from contextlib import ExitStack
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 0.0
+N_PLUS_ONE_THRESHOLD = 5
+QUERY_THRESHOLD = 50
+MAX_FINGERPRINTS = 500  # per request
+MAX_STACK_DEPTH = 60
+SQL_PREVIEW_LENGTH = 300
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_DRF_SERIALIZERS_FILE = os.path.join('rest_framework', 'serializers.py')
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so queries differing only in literals share one fingerprint."""
+    normalized = _STRING_RE.sub("?", sql)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("IN (...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def _serializer_field_from_stack() -> Optional[Dict[str, str]]:
+    """Find the DRF serializer field being rendered in the current call stack."""
+    frame = sys._getframe(2)
+    depth = 0
+    while frame is not None and depth < MAX_STACK_DEPTH:
+        code = frame.f_code
+        if code.co_name == "to_representation" and code.co_filename.endswith(_DRF_SERIALIZERS_FILE):
+            field = frame.f_locals.get("field")
+            serializer = frame.f_locals.get("self")
+            if field is not None and serializer is not None:
+                return {
+                    "serializer": type(serializer).__name__,
+                    "field": getattr(field, "field_name", "") or "",
+                }
+        frame = frame.f_back
+        depth += 1
+    return None
+
+
+class _Fingerprint:
+    __slots__ = ("count", "total_ms", "alias", "sql", "source")
+
+    def __init__(self, alias: str, sql: str):
+        self.count = 0
+        self.total_ms = 0.0
+        self.alias = alias
+        self.sql = sql
+        self.source: Optional[Dict[str, str]] = None
+
+
+class QueryInspection:
+    """Per-request query collector (one per sampled request)."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms: Dict[str, float] = {}
+        self.fingerprints: Dict[str, _Fingerprint] = {}
+
+    def wrapper(self, alias: str):
+        def inspect(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.record(alias, sql, (time.perf_counter() - start) * 1000)
+        return inspect
+
+    def record(self, alias: str, sql: str, duration_ms: float):
+        self.queries += 1
+        self.db_ms[alias] = self.db_ms.get(alias, 0.0) + duration_ms
+        key = fingerprint(sql)
+        entry = self.fingerprints.get(key)
+        if entry is None:
+            if len(self.fingerprints) >= MAX_FINGERPRINTS:
+                return
+            entry = self.fingerprints[key] = _Fingerprint(alias, sql)
+        entry.count += 1
+        entry.total_ms += duration_ms
+        if entry.count == 2:
+            # First repeat - attribute once (stack walk only for repeated fingerprints)
+            entry.source = _serializer_field_from_stack()
+
+    def n_plus_one(self, threshold: int) -> List[Dict]:
+        return [
+            {
+                "fingerprint": key[:SQL_PREVIEW_LENGTH],
+                "count": entry.count,
+                "total_ms": round(entry.total_ms, 3),
+                "alias": entry.alias,
+                "serializer": (entry.source or {}).get("serializer", ""),
+                "field": (entry.source or {}).get("field", ""),
+                "sample_sql": entry.sql[:SQL_PREVIEW_LENGTH],
+            }
+            for key, entry in sorted(self.fingerprints.items(), key=lambda item: -item[1].count)
+            if entry.count >= threshold
+        ]
+
+    def report(self, request, view: str, threshold: int) -> Dict:
+        slowest = sorted(self.fingerprints.values(), key=lambda entry: -entry.total_ms)[:3]
+        return {
+            "timestamp": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "query_count": self.queries,
+            "db_ms": {alias: round(ms, 3) for alias, ms in self.db_ms.items()},
+            "distinct_queries": len(self.fingerprints),
+            "n_plus_one": self.n_plus_one(threshold),
+            "top_queries": [
+                {"time": f"{entry.total_ms / 1000:.3f}s", "count": entry.count, "sql": entry.sql[:150]}
+                for entry in slowest
+            ],
+        }
+
+
+class QueryInspectorMiddleware:
+    """Sample requests, detect N+1 fingerprints, publish reports to the DB watchdog."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = float(getattr(settings, "QUERY_INSPECTOR_SAMPLE_RATE", SAMPLE_RATE))
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        inspection = QueryInspection()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(inspection.wrapper(alias)))
+            response = self.get_response(request)
+
+        self._publish(request, inspection)
+        return response
+
+    @staticmethod
+    def _publish(request, inspection: QueryInspection):
+        from sopira_magic.apps.api.views_db_watchdog import record_report
+        from .telemetry import view_name_for
+
+        threshold = getattr(settings, "QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD", N_PLUS_ONE_THRESHOLD)
+        query_threshold = getattr(settings, "QUERY_INSPECTOR_QUERY_THRESHOLD", QUERY_THRESHOLD)
+        has_n_plus_one = any(entry.count >= threshold for entry in inspection.fingerprints.values())
+        if not has_n_plus_one and inspection.queries <= query_threshold:
+            return
+
+        report = inspection.report(request, view_name_for(request), threshold)
+        record_report(report)
+        for item in report["n_plus_one"]:
+            source = f" ({item['serializer']}.{item['field']})" if item["field"] else ""
+            logger.warning(
+                f"[DB] N+1 in {report['view']}{source}: {item['count']}x on '{item['alias']}' "
+                f"{item['fingerprint'][:120]}"
+            )
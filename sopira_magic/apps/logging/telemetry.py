@@ -0,0 +1,368 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/logging/telemetry.py
+#   Request Telemetry - Sampled request metrics into PerformanceLog
+#   Per-endpoint histograms aggregated in-process, flushed in bulk
+#..............................................................
+
+"""
+   Request Telemetry - Sampled Request Metrics.
+
+   RequestTelemetryMiddleware samples TELEMETRY_SAMPLE_RATE of requests and
+   measures for each sampled request:
+   - total response time
+   - DB query count and DB time per database alias (default/state/logging),
+     via connection.execute_wrapper (works with DEBUG=False)
+   - serializer time (MySerializer.to_representation, outermost level only)
+   - response size
+
+   Samples are aggregated in-process per (view, method, status code) into a
+   fixed-bucket latency histogram. Every TELEMETRY_FLUSH_INTERVAL seconds a
+   background thread writes ONE PerformanceLog row per key (bulk_create):
+   - response_time_ms / query_count / query_time_ms = means over the window
+   - extra_data = {"aggregated": true, "count", "buckets", "db_ms", ...}
+
+   TelemetryService.percentiles() merges stored and in-memory histograms and
+   returns p50/p95/p99 per VIEWS_MATRIX view (API: performance/percentiles/).
+
+   Usage:
+   ```python
+   from sopira_magic.apps.logging.telemetry import TelemetryService
+   TelemetryService.percentiles(window_minutes=60)
+   ```
+"""
+
+import atexit
+import bisect
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 0.1
+FLUSH_INTERVAL = 60.0  # seconds
+
+# Histogram upper bounds in ms (last bucket = overflow)
+BUCKETS_MS: Tuple[float, ...] = (
+    1, 2, 3, 5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 200, 300,
+    500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000,
+)
+PERCENTILES = (50, 95, 99)
+
+# Active sample of the current request (None = request not sampled)
+current_sample: contextvars.ContextVar = contextvars.ContextVar('telemetry_sample', default=None)
+
+
+class RequestSample:
+    """Metrics of one sampled request."""
+
+    __slots__ = ('queries', 'db_ms', 'serializer_ms', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms: Dict[str, float] = {}
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+
+    def db_wrapper(self, alias: str):
+        """execute_wrapper counting queries and DB time for one alias."""
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries += 1
+                self.db_ms[alias] = self.db_ms.get(alias, 0.0) + (time.perf_counter() - start) * 1000
+        return wrapper
+
+
+class _Stats:
+    """Aggregated metrics for one (view, method, status) key."""
+
+    __slots__ = ('count', 'sum_ms', 'max_ms', 'buckets', 'queries', 'db_ms', 'serializer_ms', 'response_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.queries = 0
+        self.db_ms: Dict[str, float] = {}
+        self.serializer_ms = 0.0
+        self.response_bytes = 0
+
+    def add(self, duration_ms: float, sample: RequestSample, response_bytes: int):
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.queries += sample.queries
+        for alias, ms in sample.db_ms.items():
+            self.db_ms[alias] = self.db_ms.get(alias, 0.0) + ms
+        self.serializer_ms += sample.serializer_ms
+        self.response_bytes += response_bytes
+
+
+def percentile(buckets: List[int], q: float, max_ms: Optional[float] = None) -> Optional[float]:
+    """Estimate the q-th percentile (0-100) from histogram buckets (linear within bucket)."""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q / 100 * total
+    cumulative = 0
+    for index, count in enumerate(buckets):
+        if count and cumulative + count >= rank:
+            lower = BUCKETS_MS[index - 1] if index > 0 else 0.0
+            upper = BUCKETS_MS[index] if index < len(BUCKETS_MS) else (max_ms or lower)
+            if max_ms is not None:
+                upper = min(upper, max_ms)
+            value = lower + (upper - lower) * ((rank - cumulative) / count)
+            return round(max(value, 0.0), 2)
+        cumulative += count
+    return max_ms
+
+
+def view_name_for(request) -> str:
+    """VIEWS_MATRIX view / CUSTOM_ENDPOINTS name of the resolved route (bounded cardinality)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    url_name = match.url_name or ''
+    # Router names: '<view_name>-list' / '<view_name>-detail' / '<view_name>-<action>'
+    base, _, suffix = url_name.rpartition('-')
+    if base and suffix in ('list', 'detail'):
+        return base
+    return url_name or match.route or 'unresolved'
+
+
+class TelemetryAggregator:
+    """In-process aggregation + periodic bulk flush into PerformanceLog."""
+
+    _lock = threading.Lock()
+    _stats: Dict[Tuple[str, str, int], _Stats] = {}
+    _window_start = None
+    _flusher: Optional[threading.Thread] = None
+
+    @classmethod
+    def add(cls, view: str, method: str, status_code: int, duration_ms: float,
+            sample: RequestSample, response_bytes: int):
+        key = (view, method, status_code)
+        with cls._lock:
+            if cls._window_start is None:
+                cls._window_start = timezone.now()
+            stats = cls._stats.get(key)
+            if stats is None:
+                stats = cls._stats[key] = _Stats()
+            stats.add(duration_ms, sample, response_bytes)
+        cls._ensure_flusher()
+
+    @classmethod
+    def snapshot(cls) -> Dict[Tuple[str, str, int], _Stats]:
+        """Current (not yet flushed) aggregates."""
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def flush(cls) -> int:
+        """Write one PerformanceLog row per aggregated key. Returns number of rows."""
+        from .models import PerformanceLog
+
+        with cls._lock:
+            stats, cls._stats = cls._stats, {}
+            window_start, cls._window_start = cls._window_start, None
+        if not stats:
+            return 0
+
+        now = timezone.now()
+        rows = [
+            PerformanceLog(
+                endpoint=view[:500],
+                method=method,
+                status_code=status_code,
+                response_time_ms=s.sum_ms / s.count,
+                query_count=round(s.queries / s.count),
+                query_time_ms=sum(s.db_ms.values()) / s.count,
+                extra_data={
+                    'aggregated': True,
+                    'count': s.count,
+                    'sum_ms': round(s.sum_ms, 3),
+                    'max_ms': round(s.max_ms, 3),
+                    'buckets': s.buckets,
+                    'queries': s.queries,
+                    'db_ms': {alias: round(ms, 3) for alias, ms in s.db_ms.items()},
+                    'serializer_ms': round(s.serializer_ms, 3),
+                    'response_bytes': s.response_bytes,
+                    'window_start': window_start.isoformat() if window_start else None,
+                    'window_end': now.isoformat(),
+                    'sample_rate': _sample_rate(),
+                },
+            )
+            for (view, method, status_code), s in stats.items()
+        ]
+        try:
+            PerformanceLog.objects.bulk_create(rows)
+        except Exception as e:
+            logger.error(f"[TELEMETRY] Failed to write {len(rows)} PerformanceLog rows: {e}", exc_info=True)
+            return 0
+        return len(rows)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._stats = {}
+            cls._window_start = None
+
+    # -------------------------
+    # Background flusher thread
+    # -------------------------
+    @classmethod
+    def _ensure_flusher(cls):
+        if cls._flusher is not None and cls._flusher.is_alive():
+            return
+        # Start after the current transaction commits (never inside test transactions)
+        transaction.on_commit(cls._start_flusher)
+
+    @classmethod
+    def _start_flusher(cls):
+        with cls._lock:
+            if cls._flusher is not None and cls._flusher.is_alive():
+                return
+            cls._flusher = threading.Thread(target=cls._run_flusher, name='telemetry-flusher', daemon=True)
+            cls._flusher.start()
+        atexit.register(cls.flush)
+
+    @classmethod
+    def _run_flusher(cls):
+        interval = getattr(settings, 'TELEMETRY_FLUSH_INTERVAL', FLUSH_INTERVAL)
+        while True:
+            time.sleep(interval)
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"[TELEMETRY] Flusher iteration failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
+
+
+def _sample_rate() -> float:
+    return float(getattr(settings, 'TELEMETRY_SAMPLE_RATE', SAMPLE_RATE))
+
+
+class RequestTelemetryMiddleware:
+    """Sample requests and feed TelemetryAggregator (no-op for unsampled requests)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = _sample_rate()
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(sample.db_wrapper(alias)))
+                response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if getattr(response, 'streaming', False):
+            response_bytes = int(response.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content)
+        TelemetryAggregator.add(
+            view_name_for(request), request.method, response.status_code, duration_ms, sample, response_bytes
+        )
+        return response
+
+
+class SerializerTelemetryMixin:
+    """Adds outermost to_representation time to the current request sample."""
+
+    def to_representation(self, instance):
+        sample = current_sample.get()
+        if sample is None or sample.serializer_depth:
+            return super().to_representation(instance)
+        sample.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            sample.serializer_ms += (time.perf_counter() - start) * 1000
+            sample.serializer_depth -= 1
+
+
+class TelemetryService:
+    """Read side: percentiles per VIEWS_MATRIX view."""
+
+    @staticmethod
+    def percentiles(window_minutes: int = 60, views: Optional[Iterable[str]] = None,
+                    include_custom: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        p50/p95/p99 (+ mean, count, DB and serializer means) per view.
+
+        Merges PerformanceLog rows of the window with not yet flushed aggregates.
+        """
+        from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
+        from .models import PerformanceLog
+
+        since = timezone.now() - timedelta(minutes=window_minutes)
+        wanted = set(views) if views else None
+        merged: Dict[str, Dict[str, Any]] = {}
+
+        def accept(view: str) -> bool:
+            if wanted is not None:
+                return view in wanted
+            return include_custom or view in VIEWS_MATRIX
+
+        def merge(view, count, sum_ms, max_ms, buckets, queries, db_ms, serializer_ms):
+            if not accept(view) or not count:
+                return
+            entry = merged.setdefault(view, {
+                'count': 0, 'sum_ms': 0.0, 'max_ms': 0.0, 'buckets': [0] * (len(BUCKETS_MS) + 1),
+                'queries': 0, 'db_ms': {}, 'serializer_ms': 0.0,
+            })
+            entry['count'] += count
+            entry['sum_ms'] += sum_ms
+            entry['max_ms'] = max(entry['max_ms'], max_ms)
+            entry['buckets'] = [a + b for a, b in zip(entry['buckets'], buckets)]
+            entry['queries'] += queries
+            for alias, ms in db_ms.items():
+                entry['db_ms'][alias] = entry['db_ms'].get(alias, 0.0) + ms
+            entry['serializer_ms'] += serializer_ms
+
+        rows = PerformanceLog.objects.filter(timestamp__gte=since, extra_data__aggregated=True)
+        for endpoint, extra in rows.values_list('endpoint', 'extra_data'):
+            merge(endpoint, extra.get('count', 0), extra.get('sum_ms', 0.0), extra.get('max_ms', 0.0),
+                  extra.get('buckets', []), extra.get('queries', 0), extra.get('db_ms', {}),
+                  extra.get('serializer_ms', 0.0))
+        for (view, _method, _status), s in TelemetryAggregator.snapshot().items():
+            merge(view, s.count, s.sum_ms, s.max_ms, s.buckets, s.queries, s.db_ms, s.serializer_ms)
+
+        result = {}
+        for view, entry in sorted(merged.items()):
+            count = entry['count']
+            result[view] = {
+                'count': count,
+                **{f'p{q}': percentile(entry['buckets'], q, entry['max_ms']) for q in PERCENTILES},
+                'mean_ms': round(entry['sum_ms'] / count, 2),
+                'max_ms': round(entry['max_ms'], 2),
+                'queries_mean': round(entry['queries'] / count, 2),
+                'db_ms_mean': {alias: round(ms / count, 2) for alias, ms in entry['db_ms'].items()},
+                'serializer_ms_mean': round(entry['serializer_ms'] / count, 2),
+            }
+        return result
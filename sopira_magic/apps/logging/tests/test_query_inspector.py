@@ -0,0 +1,136 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/logging/tests/test_query_inspector.py
+#   Query Inspector Tests
+#   Tests for query_inspector.py module
+#..............................................................
+
+"""
+   Query Inspector Tests.
+
+   Tests for SQL fingerprinting, N+1 detection, serializer field attribution,
+   sampling and the db-watchdog report store.
+"""
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework import serializers
+
+from sopira_magic.apps.api import views_db_watchdog
+from sopira_magic.apps.logging.query_inspector import (
+    QueryInspection,
+    QueryInspectorMiddleware,
+    fingerprint,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_reports():
+    views_db_watchdog.clear_reports()
+    yield
+    views_db_watchdog.clear_reports()
+
+
+def _run_queries(count):
+    with connection.cursor() as cursor:
+        for i in range(count):
+            cursor.execute(f"SELECT {i}")
+
+
+class _RowSerializer(serializers.Serializer):
+    label = serializers.SerializerMethodField()
+
+    def get_label(self, obj):
+        _run_queries(1)
+        return str(obj)
+
+
+class TestFingerprint:
+    """Test suite for SQL normalization."""
+
+    def test_literals_are_normalized(self):
+        """Test numbers and strings collapse to placeholders."""
+        a = fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'x'")
+        b = fingerprint("SELECT *  FROM t\nWHERE id = 42 AND name = 'it''s'")
+        assert a == b == "SELECT * FROM t WHERE id = ? AND name = ?"
+
+    def test_in_lists_are_collapsed(self):
+        """Test IN lists of any length share one fingerprint."""
+        assert fingerprint("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == \
+            fingerprint("SELECT 1 FROM t WHERE id IN (%s)")
+
+    def test_identifiers_with_digits_kept(self):
+        """Test digits inside identifiers are not treated as literals."""
+        assert "m_company2" in fingerprint('SELECT "m_company2"."id" FROM "m_company2"')
+
+
+@pytest.mark.django_db
+class TestQueryInspection:
+    """Test suite for per-request collection and attribution."""
+
+    def test_repeated_fingerprint_reported_as_n_plus_one(self):
+        """Test N identical-shape queries produce one N+1 entry."""
+        inspection = QueryInspection()
+        with connection.execute_wrapper(inspection.wrapper('default')):
+            _run_queries(6)
+
+        items = inspection.n_plus_one(threshold=5)
+        assert inspection.queries == 6
+        assert len(items) == 1
+        assert items[0]['count'] == 6
+        assert items[0]['alias'] == 'default'
+
+    def test_attribution_to_serializer_field(self):
+        """Test queries triggered while rendering a field name serializer + field."""
+        inspection = QueryInspection()
+        with connection.execute_wrapper(inspection.wrapper('default')):
+            _RowSerializer(range(5), many=True).data
+
+        items = inspection.n_plus_one(threshold=5)
+        assert items[0]['serializer'] == '_RowSerializer'
+        assert items[0]['field'] == 'label'
+
+
+@pytest.mark.django_db
+class TestQueryInspectorMiddleware:
+    """Test suite for sampling and watchdog reports."""
+
+    def _call(self, query_count):
+        middleware = QueryInspectorMiddleware(lambda request: (_run_queries(query_count), HttpResponse('OK'))[1])
+        return middleware(RequestFactory().get('/api/things/'))
+
+    def test_report_recorded_for_n_plus_one(self, settings):
+        """Test a sampled request with N+1 lands in db-watchdog."""
+        settings.QUERY_INSPECTOR_SAMPLE_RATE = 1.0
+        settings.QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD = 3
+
+        assert self._call(4).status_code == 200
+
+        reports = list(views_db_watchdog._recent_warnings)
+        assert len(reports) == 1
+        assert reports[0]['path'] == '/api/things/'
+        assert reports[0]['query_count'] == 4
+        assert reports[0]['n_plus_one'][0]['count'] == 4
+
+    def test_no_report_below_thresholds(self, settings):
+        """Test clean requests do not produce reports."""
+        settings.QUERY_INSPECTOR_SAMPLE_RATE = 1.0
+        settings.QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD = 5
+
+        self._call(2)
+
+        assert len(views_db_watchdog._recent_warnings) == 0
+
+    def test_sampling_off_is_passthrough(self, settings):
+        """Test sample rate 0 installs no wrappers and records nothing."""
+        settings.QUERY_INSPECTOR_SAMPLE_RATE = 0.0
+        settings.QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD = 2
+
+        def view(request):
+            assert connection.execute_wrappers == []
+            _run_queries(5)
+            return HttpResponse('OK')
+
+        assert QueryInspectorMiddleware(view)(RequestFactory().get('/')).status_code == 200
+        assert len(views_db_watchdog._recent_warnings) == 0
@@ -0,0 +1,143 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/logging/tests/test_telemetry.py
+#   Request Telemetry Tests
+#   Tests for telemetry.py module
+#..............................................................
+
+"""
+   Request Telemetry Tests.
+
+   Tests for sampling, per-view histogram aggregation, bulk flush into
+   PerformanceLog and the percentile read side.
+"""
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from sopira_magic.apps.logging import telemetry
+from sopira_magic.apps.logging.models import PerformanceLog
+from sopira_magic.apps.logging.telemetry import (
+    BUCKETS_MS,
+    RequestSample,
+    RequestTelemetryMiddleware,
+    TelemetryAggregator,
+    TelemetryService,
+    percentile,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_aggregator():
+    TelemetryAggregator.clear()
+    yield
+    TelemetryAggregator.clear()
+
+
+def _add(view, duration_ms, queries=0, status_code=200):
+    sample = RequestSample()
+    sample.queries = queries
+    sample.db_ms = {'default': 1.0}
+    TelemetryAggregator.add(view, 'GET', status_code, duration_ms, sample, 100)
+
+
+class TestPercentile:
+    """Test suite for histogram percentile estimation."""
+
+    def test_empty_histogram(self):
+        """Test no samples -> None."""
+        assert percentile([0] * (len(BUCKETS_MS) + 1), 50) is None
+
+    def test_percentiles_follow_distribution(self):
+        """Test p50 lands in the bulk bucket, p99 in the tail bucket."""
+        buckets = [0] * (len(BUCKETS_MS) + 1)
+        buckets[BUCKETS_MS.index(10)] = 98   # 7.5-10 ms
+        buckets[BUCKETS_MS.index(500)] = 2   # 300-500 ms
+
+        assert 7.5 <= percentile(buckets, 50) <= 10
+        assert 300 <= percentile(buckets, 99) <= 500
+
+    def test_overflow_bucket_capped_by_max(self):
+        """Test overflow bucket uses observed max."""
+        buckets = [0] * (len(BUCKETS_MS) + 1)
+        buckets[-1] = 1
+
+        assert percentile(buckets, 99, max_ms=12000) <= 12000
+
+
+class TestRequestTelemetryMiddleware:
+    """Test suite for sampling."""
+
+    def test_sampling_off_records_nothing(self, settings):
+        """Test rate 0 bypasses instrumentation."""
+        settings.TELEMETRY_SAMPLE_RATE = 0
+        middleware = RequestTelemetryMiddleware(lambda request: HttpResponse('OK'))
+        middleware(RequestFactory().get('/'))
+
+        assert TelemetryAggregator.snapshot() == {}
+
+    @pytest.mark.django_db
+    def test_sampled_request_counts_queries_per_alias(self, settings):
+        """Test DB queries, size and status are aggregated."""
+        settings.TELEMETRY_SAMPLE_RATE = 1
+
+        def view(request):
+            from django.contrib.auth import get_user_model
+            list(get_user_model().objects.all())
+            return HttpResponse('x' * 42, status=201)
+
+        RequestTelemetryMiddleware(view)(RequestFactory().post('/'))
+
+        (key, stats), = TelemetryAggregator.snapshot().items()
+        assert key == ('unresolved', 'POST', 201)
+        assert stats.count == 1
+        assert stats.queries == 1
+        assert 'default' in stats.db_ms
+        assert stats.response_bytes == 42
+
+
+@pytest.mark.django_db(databases=['default', 'logging'])
+class TestTelemetryFlush:
+    """Test suite for bulk flush and read side."""
+
+    def test_flush_writes_one_row_per_key(self):
+        """Test aggregated rows are bulk-inserted."""
+        for duration in (5, 8, 400):
+            _add('factories', duration, queries=3)
+        _add('companies', 20)
+
+        assert TelemetryAggregator.flush() == 2
+        row = PerformanceLog.objects.get(endpoint='factories')
+        assert row.extra_data['count'] == 3
+        assert row.query_count == 3
+        assert row.response_time_ms == pytest.approx(413 / 3)
+        assert TelemetryAggregator.snapshot() == {}
+
+    def test_percentiles_merge_stored_and_pending(self):
+        """Test read side merges flushed rows with in-memory aggregates."""
+        for _ in range(10):
+            _add('factories', 9)
+        TelemetryAggregator.flush()
+        _add('factories', 450)
+        _add('not-a-view', 1)
+
+        result = TelemetryService.percentiles(window_minutes=5)
+
+        assert set(result) == {'factories'}
+        assert result['factories']['count'] == 11
+        assert result['factories']['p50'] <= 10
+        assert result['factories']['p99'] > 300
+
+    def test_include_custom_endpoints(self):
+        """Test include_custom adds non-VIEWS_MATRIX routes."""
+        _add('performance-percentiles', 3)
+
+        assert 'performance-percentiles' in TelemetryService.percentiles(include_custom=True)
+
+
+def test_view_name_for_router_routes():
+    """Test router url names map to VIEWS_MATRIX view names."""
+    request = RequestFactory().get('/')
+    request.resolver_match = type('Match', (), {'url_name': 'factories-detail', 'route': 'x'})()
+
+    assert telemetry.view_name_for(request) == 'factories'
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carrier', '0002_initial'),
+        ('company', '0002_initial'),
+        ('driver', '0001_initial'),
+        ('factory', '0001_initial'),
+        ('location', '0001_initial'),
+        ('machine', '0001_initial'),
+        ('measurement', '0002_measurement_code_measurement_human_id_and_more'),
+        ('pit', '0001_initial'),
+        ('pot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeasurementListEntry',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('uuid', models.UUIDField(null=True)),
+                ('code', models.CharField(blank=True, max_length=64, null=True)),
+                ('name', models.CharField(blank=True, max_length=255, null=True)),
+                ('human_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('label', models.CharField(blank=True, default='', max_length=512)),
+                ('comment', models.TextField(blank=True, default='')),
+                ('note', models.TextField(blank=True, default='')),
+                ('tags', models.JSONField(blank=True, default=list)),
+                ('active', models.BooleanField(default=True)),
+                ('visible', models.BooleanField(default=True)),
+                ('created', models.DateTimeField(null=True)),
+                ('updated', models.DateTimeField(null=True)),
+                ('factory_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('location_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('carrier_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('driver_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('pot_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('pit_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('machine_display_label', models.CharField(blank=True, max_length=512, null=True)),
+                ('dump_date', models.DateField()),
+                ('dump_time', models.TimeField()),
+                ('pit_number', models.CharField(blank=True, default='', max_length=50)),
+                ('pot_side', models.CharField(choices=[('FRONT', 'FRONT'), ('BACK', 'BACK'), ('NONE', 'NONE')], default='NONE', max_length=5)),
+                ('pot_knocks', models.PositiveIntegerField(default=0)),
+                ('pot_knocks_measurement', models.PositiveIntegerField(blank=True, null=True)),
+                ('pot_weight_kg', models.DecimalField(decimal_places=3, max_digits=9, null=True)),
+                ('roi_temp_max_c', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True)),
+                ('roi_temp_mean_c', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True)),
+                ('roi_temp_min_c', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True)),
+                ('roc_value_min_c', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True)),
+                ('roc_value_max_c', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True)),
+                ('video_local_file', models.FileField(blank=True, max_length=255, null=True, upload_to='videos/%Y/%m/')),
+                ('photo_local_file', models.FileField(blank=True, max_length=255, null=True, upload_to='photos/%Y/%m/')),
+                ('search_text', models.TextField(blank=True, default='')),
+                ('carrier', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='carrier.carrier')),
+                ('company', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='company.company')),
+                ('driver', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='driver.driver')),
+                ('factory', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='factory.factory')),
+                ('location', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='location.location')),
+                ('machine', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='machine.machine')),
+                ('pit', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pit.pit')),
+                ('pot', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pot.pot')),
+            ],
+            options={
+                'verbose_name': 'Measurement list entry',
+                'verbose_name_plural': 'Measurement list entries',
+                'ordering': ['-dump_date', '-dump_time', '-id'],
+                'indexes': [models.Index(fields=['company', 'dump_date', 'dump_time'], name='measurement_company_1e52a8_idx'), models.Index(fields=['factory', 'dump_date', 'dump_time'], name='measurement_factory_e10df8_idx'), models.Index(fields=['dump_date', 'dump_time'], name='measurement_dump_da_48d6c2_idx')],
+            },
+        ),
+    ]
@@ -12,6 +12,7 @@ Inherits from NamedWithCodeModel for code, name, human_id, tags support.
 Scoping: User → Company → Factory → Measurement
 FK Chain: factory, location, carrier, driver, pot, [pit], [machine]
 Children: Photo, Video (via MeasurementRelatedModel)
+Read model: MeasurementListEntry (denormalized list rows, api/read_model.py)
 """
 
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
@@ -209,3 +210,95 @@ class Measurement(NamedWithCodeModel):
     def __str__(self):
         return f"M#{self.pk} {self.dump_date} {self.dump_time}"
 
+
+
+class MeasurementListEntry(models.Model):
+    """
+    Denormalized list row of a Measurement (read model, see api/read_model.py).
+
+    One row per Measurement with the list columns, precomputed FK display
+    labels, tag names and scope keys - the list endpoint reads it without
+    joins. Maintained from Measurement / FK target / tag signals and bulk
+    writes; rebuild with `manage.py rebuild_read_models --view measurements`.
+
+    FKs carry no DB constraints (rows are written after their source and
+    may briefly outlive it); graph_roc / graph_temp stay on Measurement.
+    """
+
+    id = models.UUIDField(primary_key=True)  # = Measurement.id
+    uuid = models.UUIDField(null=True)
+    code = models.CharField(max_length=64, null=True, blank=True)
+    name = models.CharField(max_length=255, null=True, blank=True)
+    human_id = models.CharField(max_length=64, null=True, blank=True)
+    label = models.CharField(max_length=512, blank=True, default="")
+    comment = models.TextField(blank=True, default="")
+    note = models.TextField(blank=True, default="")
+    tags = models.JSONField(default=list, blank=True)
+    active = models.BooleanField(default=True)
+    visible = models.BooleanField(default=True)
+    created = models.DateTimeField(null=True)
+    updated = models.DateTimeField(null=True)
+
+    # Scope keys (ownership_hierarchy of "measurements" resolved to columns)
+    company = models.ForeignKey(
+        'company.Company', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    factory = models.ForeignKey(
+        'factory.Factory', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    location = models.ForeignKey(
+        'location.Location', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    carrier = models.ForeignKey(
+        'carrier.Carrier', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    driver = models.ForeignKey(
+        'driver.Driver', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    pot = models.ForeignKey(
+        'pot.Pot', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    pit = models.ForeignKey(
+        'pit.Pit', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    machine = models.ForeignKey(
+        'machine.Machine', on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    factory_display_label = models.CharField(max_length=512, null=True, blank=True)
+    location_display_label = models.CharField(max_length=512, null=True, blank=True)
+    carrier_display_label = models.CharField(max_length=512, null=True, blank=True)
+    driver_display_label = models.CharField(max_length=512, null=True, blank=True)
+    pot_display_label = models.CharField(max_length=512, null=True, blank=True)
+    pit_display_label = models.CharField(max_length=512, null=True, blank=True)
+    machine_display_label = models.CharField(max_length=512, null=True, blank=True)
+
+    dump_date = models.DateField()
+    dump_time = models.TimeField()
+    pit_number = models.CharField(max_length=50, blank=True, default="")
+    pot_side = models.CharField(max_length=5, choices=Measurement.PotSide.choices, default=Measurement.PotSide.NONE)
+    pot_knocks = models.PositiveIntegerField(default=0)
+    pot_knocks_measurement = models.PositiveIntegerField(null=True, blank=True)
+    pot_weight_kg = models.DecimalField(max_digits=9, decimal_places=3, null=True)
+    roi_temp_max_c = models.DecimalField(max_digits=7, decimal_places=3, null=True, blank=True)
+    roi_temp_mean_c = models.DecimalField(max_digits=7, decimal_places=3, null=True, blank=True)
+    roi_temp_min_c = models.DecimalField(max_digits=7, decimal_places=3, null=True, blank=True)
+    roc_value_min_c = models.DecimalField(max_digits=7, decimal_places=3, null=True, blank=True)
+    roc_value_max_c = models.DecimalField(max_digits=7, decimal_places=3, null=True, blank=True)
+    video_local_file = models.FileField(upload_to="videos/%Y/%m/", max_length=255, blank=True, null=True)
+    photo_local_file = models.FileField(upload_to="photos/%Y/%m/", max_length=255, blank=True, null=True)
+
+    # Own searchable columns (code, name, comment, ...) joined; FK parts are matched via *_display_label
+    search_text = models.TextField(blank=True, default="")
+
+    class Meta:
+        verbose_name = _("Measurement list entry")
+        verbose_name_plural = _("Measurement list entries")
+        ordering = ["-dump_date", "-dump_time", "-id"]
+        indexes = [
+            models.Index(fields=["company", "dump_date", "dump_time"]),
+            models.Index(fields=["factory", "dump_date", "dump_time"]),
+            models.Index(fields=["dump_date", "dump_time"]),
+        ]
+
+    def __str__(self):
+        return f"M#{self.pk} {self.dump_date} {self.dump_time}"
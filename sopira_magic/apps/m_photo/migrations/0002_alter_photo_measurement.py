@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0002_measurement_code_measurement_human_id_and_more'),
+        ('photo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='photo',
+            name='measurement',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Measurement this entity belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)ss', to='measurement.measurement'),
+        ),
+    ]
@@ -0,0 +1,203 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/m_tag/services.py
+#   Tag Services - Set-based tagging engine
+#   Bulk tag upsert, bulk TaggedItem insert, delete-by-join removal
+#..............................................................
+
+"""
+   Tag Services - Set-Based Tagging Engine.
+
+   Tags any number of objects with a constant number of queries instead of
+   get_or_create per object/tag pair:
+
+   1. Tag upsert pass: one SELECT of existing names, one bulk INSERT
+      (ignore_conflicts) of missing names, one SELECT of the inserted ones
+   2. TaggedItem links: one indexed SELECT of the targets' existing links,
+      then bulk_create(ignore_conflicts=True) of the new ones in batches -
+      concurrent duplicates are skipped by the (tag, content_type, object_id)
+      constraint
+   3. Removal: single DELETE filtered by content type + object subquery
+      (ROW_NUMBER window when only N tags per object are removed), no
+      per-row signals
+   4. Read models with a tags column are refreshed once per call for the
+      affected objects (bulk writes send no TaggedItem signals)
+
+   Usage:
+   ```python
+   from sopira_magic.apps.m_tag.services import TagService
+   TagService.assign(Factory, {factory.pk: ['urgent', 'qa']})
+   TagService.remove(Factory, object_ids=[factory.pk])
+   TagService.set_tags(factory, ['urgent'])
+   ```
+"""
+
+import logging
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import router, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Tag, TaggedItem
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class TagService:
+    """Set-based tag assignment/removal for any model."""
+
+    @staticmethod
+    def ensure_tags(names: Iterable[str], defaults: Optional[dict] = None) -> Dict[str, Tag]:
+        """
+        Return {name: Tag} for all names, creating missing tags in one bulk insert.
+
+        Args:
+            names: Tag names (stripped, empty names ignored)
+            defaults: Field values for newly created tags (e.g. color)
+        """
+        return TagService._upsert_tags(names, defaults)[0]
+
+    @staticmethod
+    def _upsert_tags(names: Iterable[str], defaults: Optional[dict] = None) -> Tuple[Dict[str, Tag], int]:
+        """ensure_tags() + number of tags created by this call."""
+        wanted = {str(name).strip() for name in names if name and str(name).strip()}
+        if not wanted:
+            return {}, 0
+
+        tags = {tag.name: tag for tag in Tag.objects.filter(name__in=wanted)}
+        missing = wanted - tags.keys()
+        if not missing:
+            return tags, 0
+        Tag.objects.bulk_create(
+            [Tag(name=name, **(defaults or {})) for name in missing],
+            ignore_conflicts=True,
+            batch_size=BATCH_SIZE,
+        )
+        # Re-read: with ignore_conflicts the in-memory PKs are not reliable.
+        # Names created concurrently by another request count as created here
+        # (no table-wide COUNT to tell them apart).
+        inserted = {tag.name: tag for tag in Tag.objects.filter(name__in=missing)}
+        tags.update(inserted)
+        return tags, len(inserted)
+
+    @staticmethod
+    def assign(model_class, assignments: Dict[Hashable, Iterable[str]], defaults: Optional[dict] = None) -> dict:
+        """
+        Link tags to objects: {object_pk: [tag names]}.
+
+        Existing links of the target objects are read first (indexed lookup by
+        content type + object ids), so only new links are inserted and counted.
+
+        Returns:
+            {"tags_created": int, "links_created": int}
+        """
+        to_uuid = TaggedItem._meta.get_field('object_id').to_python
+        assignments = {to_uuid(pk): list(names) for pk, names in assignments.items()}
+        all_names = {name for names in assignments.values() for name in names}
+        if not all_names:
+            return {"tags_created": 0, "links_created": 0}
+
+        content_type = ContentType.objects.get_for_model(model_class)
+        with transaction.atomic(using=router.db_for_write(TaggedItem)):
+            tags, tags_created = TagService._upsert_tags(all_names, defaults=defaults)
+            wanted = {
+                (tags[name.strip()].pk, pk)
+                for pk, names in assignments.items()
+                for name in names
+                if name and name.strip() in tags
+            }
+
+            object_ids = list(assignments)
+            tag_ids = {tag.pk for tag in tags.values()}
+            for start in range(0, len(object_ids), BATCH_SIZE):
+                wanted.difference_update(
+                    TaggedItem.objects.filter(
+                        content_type=content_type,
+                        object_id__in=object_ids[start:start + BATCH_SIZE],
+                        tag_id__in=tag_ids,
+                    ).values_list('tag_id', 'object_id')
+                )
+            TaggedItem.objects.bulk_create(
+                [TaggedItem(tag_id=tag_id, content_type=content_type, object_id=pk) for tag_id, pk in wanted],
+                ignore_conflicts=True,
+                batch_size=BATCH_SIZE,
+            )
+            links_created = len(wanted)
+            _refresh_read_models(model_class, {pk for _, pk in wanted})
+
+        logger.info(
+            f"[TAG] Assigned {links_created} links ({tags_created} new tags) "
+            f"to {len(assignments)} {model_class.__name__} objects"
+        )
+        return {"tags_created": tags_created, "links_created": links_created}
+
+    @staticmethod
+    def remove(model_class, object_ids: Optional[Iterable] = None, per_object: Optional[int] = None) -> int:
+        """
+        Remove tag links from objects of model_class.
+
+        Args:
+            object_ids: Target PKs (None = all objects of the model)
+            per_object: Remove only the N oldest links per object (None = all)
+
+        Returns:
+            Number of deleted TaggedItem rows
+        """
+        content_type = ContentType.objects.get_for_model(model_class)
+        links = TaggedItem.objects.filter(content_type=content_type)
+        if object_ids is not None:
+            links = links.filter(object_id__in=list(object_ids))
+        elif router.db_for_read(model_class) == router.db_for_read(TaggedItem):
+            links = links.filter(object_id__in=model_class.objects.values('pk'))
+        else:
+            links = links.filter(object_id__in=list(model_class.objects.values_list('pk', flat=True)))
+
+        track = bool(_tagged_read_model_views(model_class))
+        with transaction.atomic(using=router.db_for_write(TaggedItem)):
+            if per_object is None:
+                affected = set(links.values_list('object_id', flat=True).distinct()) if track else set()
+                deleted = links._raw_delete(links.db)
+            else:
+                # N oldest links per object via ROW_NUMBER() window
+                rows = list(
+                    links.annotate(
+                        row_number=Window(RowNumber(), partition_by=[F('object_id')], order_by=F('created').asc())
+                    ).filter(row_number__lte=per_object).values_list('pk', 'object_id')
+                )
+                affected = {object_id for _, object_id in rows}
+                pks = [pk for pk, _ in rows]
+                deleted = 0
+                for start in range(0, len(pks), BATCH_SIZE):
+                    batch = TaggedItem.objects.filter(pk__in=pks[start:start + BATCH_SIZE])
+                    deleted += batch._raw_delete(batch.db)
+            _refresh_read_models(model_class, affected)
+        return deleted
+
+    @staticmethod
+    def set_tags(instance, names: List[str]) -> None:
+        """Replace the tags of one object with `names` (serializer write path)."""
+        content_type = ContentType.objects.get_for_model(instance)
+        tags = TagService.ensure_tags(names or [])
+        links = TaggedItem.objects.filter(content_type=content_type, object_id=instance.pk)
+        links.exclude(tag_id__in=[tag.pk for tag in tags.values()]).delete()
+        TaggedItem.objects.bulk_create(
+            [TaggedItem(tag=tag, content_type=content_type, object_id=instance.pk) for tag in tags.values()],
+            ignore_conflicts=True,
+        )
+        _refresh_read_models(type(instance), [instance.pk])
+
+
+def _tagged_read_model_views(model_class) -> List[str]:
+    from sopira_magic.apps.api.read_model import tagged_read_model_views
+
+    return tagged_read_model_views(model_class)
+
+
+def _refresh_read_models(model_class, object_ids) -> None:
+    """Bulk link writes send no TaggedItem signals: refresh read models explicitly."""
+    from sopira_magic.apps.api.read_model import refresh_tagged
+
+    refresh_tagged(model_class, object_ids)
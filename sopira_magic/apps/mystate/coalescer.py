@@ -0,0 +1,317 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/mystate/coalescer.py
+#   MyState Coalescer - Write coalescing for preset state patches
+#   Merge bursts of PATCH deltas into one STATE-DB write
+#..............................................................
+
+"""
+   MyState Coalescer - Write Coalescing for Preset State Patches.
+
+   The frontend saves on debounce (get_debounce_ms), so resizing columns
+   produces a stream of small deltas for the same preset. Instead of one
+   full-document UPDATE per delta, patches are applied to an in-process
+   pending document and written once per MYSTATE_PATCH_COALESCE_MS window:
+
+   1. patch() applies the delta to the pending document (or the DB row when
+      nothing is pending), checks the client's version (optimistic
+      concurrency) and bumps the version immediately
+   2. the flusher thread writes due documents with a conditional UPDATE
+      (WHERE version = <version at first pending patch>)
+   3. any other access to the user's presets (list, GET, PUT, set-default,
+      default lookup, shared presets) flushes the pending writes first
+
+   A window of 0 (the default) writes synchronously with the same conditional
+   UPDATE, so every server process sees each version bump at once. The
+   pending documents and versions of a window > 0 exist only in this
+   process: use it only when the server runs a single process (runserver,
+   one ASGI worker). With several workers, the next debounced patch may land
+   on a worker that still sees the old DB version and answers 409, and reads
+   there miss the pending patches. Acknowledged
+   patches are never dropped silently:
+   - row changed concurrently (another worker wrote it): the pending patches
+     are re-applied on top of the current row and written again; a patch
+     whose 'test' no longer holds is skipped with a warning
+   - write failed (DB error): the pending write goes back to the queue and is
+     retried on the next flush, up to MYSTATE_PATCH_MAX_RETRIES times
+   The client sees the moved version as a 409 on its next versioned patch.
+
+   Usage:
+   ```python
+   from sopira_magic.apps.mystate.coalescer import StateWriteCoalescer
+
+   version, coalesced = StateWriteCoalescer.patch(preset, ops, 'json-patch', expected_version=3)
+   StateWriteCoalescer.flush()  # tests / shutdown
+   ```
+"""
+
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .config import get_child_scopes
+from .patch import PATCHABLE_FIELDS, PatchError, apply_patch
+
+logger = logging.getLogger(__name__)
+
+COALESCE_MS = 0
+MAX_RETRIES = 5
+REBASE_ATTEMPTS = 3
+
+
+class VersionConflict(Exception):
+    """Client version does not match the current preset version (HTTP 409)."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Version conflict, current version is {current_version}")
+        self.current_version = current_version
+
+
+class _PendingWrite:
+    __slots__ = ('base_version', 'version', 'doc', 'first_at', 'patches', 'ops', 'user_id', 'valid_children', 'retries')
+
+    def __init__(self, base_version: int, version: int, doc: dict, user_id=None, valid_children=None):
+        self.base_version = base_version  # version currently stored in the DB row
+        self.version = version
+        self.doc = doc
+        self.first_at = time.monotonic()
+        self.patches = 0
+        self.ops: List[Tuple[Any, str]] = []  # (patch, format) - re-applied on a concurrent row change
+        self.user_id = user_id
+        self.valid_children = valid_children
+        self.retries = 0
+
+
+class StateWriteCoalescer:
+    """Per-preset pending documents + background flusher (STATE database)."""
+
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    _pending: Dict[Any, _PendingWrite] = {}
+    _flushing: Dict[Any, _PendingWrite] = {}
+    _flusher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def window_ms() -> int:
+        return getattr(settings, 'MYSTATE_PATCH_COALESCE_MS', COALESCE_MS)
+
+    # -------------------------
+    # Request path
+    # -------------------------
+    @classmethod
+    def patch(cls, instance, patch: Any, patch_format: str,
+              expected_version: Optional[int] = None) -> Tuple[int, bool]:
+        """
+        Apply a delta to the preset. Returns (new_version, coalesced).
+
+        Raises VersionConflict or patch.PatchError.
+        """
+        key = str(instance.pk)
+        valid_children = get_child_scopes(instance.scope_type)
+        window = cls.window_ms()
+        with cls._lock:
+            current = cls._current(key)
+            if current is not None:
+                doc, version = current.doc, current.version
+            else:
+                doc = {field: getattr(instance, field) or {} for field in PATCHABLE_FIELDS}
+                version = instance.version
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version)
+
+            new_doc = apply_patch(doc, patch, patch_format, valid_children)
+            new_version = version + 1
+
+            if window > 0:
+                pending = cls._pending.get(key)
+                if pending is None:
+                    pending = cls._pending[key] = _PendingWrite(
+                        version, new_version, new_doc, str(instance.user_id), valid_children
+                    )
+                else:
+                    pending.version, pending.doc = new_version, new_doc
+                pending.patches += 1
+                pending.ops.append((patch, patch_format))
+                coalesced = pending.patches > 1
+
+        if window <= 0:
+            if not cls._write(key, version, new_version, new_doc, instance.user_id):
+                raise VersionConflict(cls._db_version(key))
+            return new_version, False
+
+        cls._ensure_flusher()
+        return new_version, coalesced
+
+    @classmethod
+    def _current(cls, pk) -> Optional[_PendingWrite]:
+        return cls._pending.get(pk) or cls._flushing.get(pk)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    @staticmethod
+    def _write(pk, base_version: int, version: int, doc: dict, user_id=None) -> bool:
+        from sopira_magic.apps.api.bootstrap import BootstrapService
+        from .models import SavedState
+
+        written = SavedState.objects.using('state').filter(pk=pk, version=base_version).update(
+            state_data=doc['state_data'],
+            children_state=doc['children_state'],
+            version=version,
+            updated=timezone.now(),
+        ) == 1
+        if written:
+            # .update() sends no post_save: invalidate the owner's bootstrap (default presets)
+            BootstrapService.bump(user_id)
+        return written
+
+    @staticmethod
+    def _db_version(pk) -> int:
+        from .models import SavedState
+
+        return SavedState.objects.using('state').filter(pk=pk).values_list('version', flat=True).first() or 0
+
+    @classmethod
+    def _rebase(cls, key, pending: _PendingWrite) -> bool:
+        """Re-apply pending patches on top of the current row (row changed concurrently)."""
+        from .models import SavedState
+
+        row = SavedState.objects.using('state').filter(pk=key).values(*PATCHABLE_FIELDS, 'version').first()
+        if row is None:
+            logger.warning(f"[MYSTATE] Preset {key} was deleted - pending patches discarded")
+            return True
+        doc = {field: row[field] or {} for field in PATCHABLE_FIELDS}
+        applied = 0
+        for patch, patch_format in pending.ops:
+            try:
+                doc = apply_patch(doc, patch, patch_format, pending.valid_children)
+                applied += 1
+            except PatchError as e:
+                logger.warning(f"[MYSTATE] Patch for preset {key} no longer applies after a concurrent change: {e}")
+        if not applied:
+            return True
+        with cls._lock:
+            pending.base_version, pending.version, pending.doc = row['version'], row['version'] + applied, doc
+        return cls._write(key, pending.base_version, pending.version, pending.doc, pending.user_id)
+
+    @classmethod
+    def _flush_one(cls, key, pending: _PendingWrite) -> bool:
+        if cls._write(key, pending.base_version, pending.version, pending.doc, pending.user_id):
+            return True
+        for _ in range(REBASE_ATTEMPTS):
+            logger.info(f"[MYSTATE] Preset {key} changed concurrently - re-applying {len(pending.ops)} patches")
+            if cls._rebase(key, pending):
+                return True
+        raise VersionConflict(cls._db_version(key))
+
+    @classmethod
+    def flush(cls, pk=None, due_only: bool = False, user_id=None) -> int:
+        """Write pending documents (all, one preset, one user's, or only those past the window)."""
+        deadline = time.monotonic() - cls.window_ms() / 1000
+        with cls._lock:
+            if pk is not None:
+                keys = [str(pk)] if str(pk) in cls._pending else []
+            elif user_id is not None:
+                keys = [key for key, pending in cls._pending.items() if pending.user_id == str(user_id)]
+            else:
+                keys = [key for key, pending in cls._pending.items()
+                        if not due_only or pending.first_at <= deadline]
+            batch = {key: cls._pending.pop(key) for key in keys}
+            cls._flushing.update(batch)
+
+        written = 0
+        failed: Dict[Any, _PendingWrite] = {}
+        try:
+            for key, pending in batch.items():
+                try:
+                    if cls._flush_one(key, pending):
+                        written += 1
+                except Exception as e:
+                    logger.error(f"[MYSTATE] Failed to write preset {key} (attempt {pending.retries + 1}): {e}", exc_info=True)
+                    failed[key] = pending
+        finally:
+            with cls._lock:
+                for key, pending in batch.items():
+                    # Patches that arrived meanwhile are pending with base_version = pending.version
+                    if cls._flushing.get(key) is pending:
+                        del cls._flushing[key]
+                for key, pending in failed.items():
+                    cls._requeue(key, pending)
+        return written
+
+    @classmethod
+    def _requeue(cls, key, failed: _PendingWrite) -> None:
+        """Put a failed write back in the queue, in front of patches that arrived meanwhile (lock held)."""
+        failed.retries += 1
+        if failed.retries > getattr(settings, 'MYSTATE_PATCH_MAX_RETRIES', MAX_RETRIES):
+            logger.error(
+                f"[MYSTATE] Giving up on preset {key} after {failed.retries - 1} retries - "
+                f"{len(failed.ops)} acknowledged patches lost"
+            )
+            return
+        newer = cls._pending.get(key)
+        if newer is not None:
+            # Patches that arrived meanwhile go on top of the failed document
+            # (which a rebase may have moved to the current row)
+            doc = failed.doc
+            for patch, patch_format in newer.ops:
+                try:
+                    doc = apply_patch(doc, patch, patch_format, newer.valid_children)
+                except PatchError as e:
+                    logger.warning(f"[MYSTATE] Patch for preset {key} no longer applies: {e}")
+            newer.base_version, newer.doc = failed.base_version, doc
+            newer.version = failed.version + len(newer.ops)
+            newer.ops = failed.ops + newer.ops
+            newer.first_at = failed.first_at
+            newer.retries = failed.retries
+        else:
+            cls._pending[key] = failed
+        cls._wakeup.set()
+
+    @classmethod
+    def pending(cls) -> int:
+        with cls._lock:
+            return len(cls._pending)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Discard pending documents (tests)."""
+        with cls._lock:
+            cls._pending.clear()
+            cls._flushing.clear()
+
+    # -------------------------
+    # Background flusher thread
+    # -------------------------
+    @classmethod
+    def _ensure_flusher(cls):
+        if cls._flusher is not None and cls._flusher.is_alive():
+            return
+        # Start after the request transaction commits (never inside test transactions)
+        transaction.on_commit(cls._start_flusher, using='state')
+
+    @classmethod
+    def _start_flusher(cls):
+        with cls._lock:
+            if cls._flusher is not None and cls._flusher.is_alive():
+                return
+            cls._flusher = threading.Thread(target=cls._run_flusher, name='mystate-flusher', daemon=True)
+            cls._flusher.start()
+        atexit.register(cls.flush)
+
+    @classmethod
+    def _run_flusher(cls):
+        while True:
+            cls._wakeup.wait(max(cls.window_ms(), 50) / 2000)
+            cls._wakeup.clear()
+            try:
+                cls.flush(due_only=True)
+            except Exception as e:
+                logger.error(f"[MYSTATE] Flusher iteration failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mystate', '0002_add_children_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savedstate',
+            name='version',
+            field=models.PositiveIntegerField(default=1, help_text='State version for optimistic concurrency (JSON patch updates)'),
+        ),
+    ]
@@ -68,6 +68,7 @@ class SavedState(TimeStampedModel):
         description: Optional description
         state_data: JSON containing the actual state (extensible schema)
         is_default: Whether this is the default preset for this scope
+        version: Incremented on every state write (optimistic concurrency)
     """
     
     # Cross-DB reference to User (UUID instead of ForeignKey)
@@ -121,6 +122,12 @@ class SavedState(TimeStampedModel):
         )
     )
     
+    # Optimistic concurrency - incremented on every state write (PATCH /state/)
+    version = models.PositiveIntegerField(
+        default=1,
+        help_text=_("State version for optimistic concurrency (JSON patch updates)")
+    )
+    
     # Default flag - only one default per user+scope_type+scope_key
     is_default = models.BooleanField(
         default=False,
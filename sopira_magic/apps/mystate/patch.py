@@ -0,0 +1,215 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/mystate/patch.py
+#   MyState Patch - JSON Patch / Merge Patch for saved presets
+#   Delta updates of state_data + children_state
+#..............................................................
+
+"""
+   MyState Patch - Delta Updates for Saved Presets.
+
+   Pure functions applying deltas to the patchable document of a SavedState:
+
+       {"state_data": {...}, "children_state": {...}}
+
+   Formats:
+   - RFC 6902 JSON Patch ('json-patch'): list of operations
+     add / remove / replace / move / copy / test, paths like
+     '/state_data/columnSizing/name'
+   - RFC 7386 JSON Merge Patch ('merge-patch'): partial document,
+     null removes a key, e.g. {"state_data": {"columnSizing": {"name": 120}}}
+
+   Both return a NEW document; the input is never mutated (pending documents
+   in the coalescer stay consistent when a patch fails half-way).
+
+   Usage:
+   ```python
+   from sopira_magic.apps.mystate.patch import apply_patch
+
+   doc = apply_patch(doc, [{'op': 'replace', 'path': '/state_data/pageSize', 'value': 50}])
+   doc = apply_patch(doc, {'state_data': {'pageSize': 50}}, 'merge-patch')
+   ```
+"""
+
+import copy
+from typing import Any, List
+
+PATCH_FORMATS = ('json-patch', 'merge-patch')
+PATCHABLE_FIELDS = ('state_data', 'children_state')
+
+_MISSING = object()
+
+
+class PatchError(ValueError):
+    """Invalid patch document or operation (HTTP 400 / 422 in views)."""
+
+
+class PatchTestFailed(PatchError):
+    """RFC 6902 'test' operation did not match (HTTP 409 in views)."""
+
+
+# =============================================================================
+# RFC 7386 - JSON MERGE PATCH
+# =============================================================================
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply RFC 7386 merge patch, returning a new value."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+# =============================================================================
+# RFC 6902 - JSON PATCH
+# =============================================================================
+
+def _parse_pointer(path: str) -> List[str]:
+    if not isinstance(path, str) or (path and not path.startswith('/')):
+        raise PatchError(f"Invalid JSON pointer: {path!r}")
+    if path == '':
+        return []
+    return [token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/')]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise PatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _resolve(doc: Any, tokens: List[str]) -> Any:
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node
+
+
+def _parent_for_write(doc: Any, tokens: List[str]):
+    """Copy-on-write walk to the parent container; returns (new_doc, parent, last_token)."""
+    if not tokens:
+        raise PatchError("Operations on the document root are not allowed")
+    root = copy.copy(doc)
+    node = root
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+            child = node[token] = copy.copy(node[token])
+        elif isinstance(node, list):
+            i = _index(node, token)
+            child = node[i] = copy.copy(node[i])
+        else:
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+        node = child
+    if not isinstance(node, (dict, list)):
+        raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+    return root, node, tokens[-1]
+
+
+def _add(doc, tokens, value):
+    doc, parent, token = _parent_for_write(doc, tokens)
+    if isinstance(parent, list):
+        parent.insert(_index(parent, token, allow_end=True), value)
+    else:
+        parent[token] = value
+    return doc
+
+
+def _remove(doc, tokens):
+    doc, parent, token = _parent_for_write(doc, tokens)
+    if isinstance(parent, list):
+        return doc, parent.pop(_index(parent, token))
+    if token not in parent:
+        raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+    return doc, parent.pop(token)
+
+
+def apply_json_patch(doc: Any, operations: list) -> Any:
+    """Apply RFC 6902 operations atomically, returning a new document."""
+    if not isinstance(operations, list):
+        raise PatchError("JSON patch must be a list of operations")
+
+    for operation in operations:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise PatchError(f"Invalid operation: {operation!r}")
+        op = operation['op']
+        tokens = _parse_pointer(operation['path'])
+        value = operation.get('value', _MISSING)
+        if op in ('add', 'replace', 'test') and value is _MISSING:
+            raise PatchError(f"'{op}' operation requires 'value'")
+
+        if op == 'add':
+            doc = _add(doc, tokens, copy.deepcopy(value))
+        elif op == 'remove':
+            doc, _ = _remove(doc, tokens)
+        elif op == 'replace':
+            _resolve(doc, tokens)  # target must exist
+            doc, _ = _remove(doc, tokens)
+            doc = _add(doc, tokens, copy.deepcopy(value))
+        elif op in ('move', 'copy'):
+            source = _parse_pointer(operation.get('from', ''))
+            if op == 'move' and tokens[:len(source)] == source and tokens != source:
+                raise PatchError("Cannot move a value into one of its children")
+            moved = copy.deepcopy(_resolve(doc, source))
+            if op == 'move':
+                doc, _ = _remove(doc, source)
+            doc = _add(doc, tokens, moved)
+        elif op == 'test':
+            if _resolve(doc, tokens) != value:
+                raise PatchTestFailed(f"Test failed at {operation['path']}")
+        else:
+            raise PatchError(f"Unknown operation: {op!r}")
+    return doc
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def apply_patch(doc: dict, patch: Any, patch_format: str = 'json-patch', valid_children=None) -> dict:
+    """
+    Apply a delta to the patchable SavedState document.
+
+    Raises PatchError if the patch is invalid, the result is not
+    {'state_data': dict, 'children_state': dict} or children_state contains
+    scopes outside valid_children (when given).
+    """
+    if patch_format == 'json-patch':
+        result = apply_json_patch(doc, patch)
+    elif patch_format == 'merge-patch':
+        if not isinstance(patch, dict):
+            raise PatchError("Merge patch must be an object")
+        result = apply_merge_patch(doc, patch)
+    else:
+        raise PatchError(f"Unknown patch format: {patch_format!r}. Must be one of: {PATCH_FORMATS}")
+
+    result = dict(result)
+    unknown = set(result) - set(PATCHABLE_FIELDS)
+    if unknown:
+        raise PatchError(f"Only {PATCHABLE_FIELDS} can be patched, got: {sorted(unknown)}")
+    for field in PATCHABLE_FIELDS:
+        result.setdefault(field, {})
+        if not isinstance(result[field], dict):
+            raise PatchError(f"'{field}' must remain an object")
+    if valid_children is not None:
+        invalid = [scope for scope in result['children_state'] if scope not in valid_children]
+        if invalid:
+            raise PatchError(f"Invalid child scopes {invalid}. Valid children are: {list(valid_children)}")
+    return result
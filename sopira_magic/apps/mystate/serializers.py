@@ -15,6 +15,7 @@
    - SavedStateListSerializer: Lightweight list serializer
    - SharedStateSerializer: Serializer for sharing relationships
    - ShareCreateSerializer: For creating new shares
+   - StatePatchSerializer: Delta update (JSON Patch / Merge Patch) request body
 
    Important:
    - NO HARDCODING: Validation uses MYSTATE_CONFIG
@@ -24,6 +25,7 @@
 from rest_framework import serializers
 from .models import SavedState, SharedState
 from .config import validate_scope_type, get_scope_types, get_child_scopes, SCOPE_HIERARCHY
+from .patch import PATCH_FORMATS
 
 
 # =============================================================================
@@ -89,13 +91,14 @@ class SavedStateSerializer(serializers.ModelSerializer):
             'state_data',
             'children_state',
             'is_default',
+            'version',
             'created',
             'updated',
             # Computed fields
             'scope_display',
             'child_preset_names',
         ]
-        read_only_fields = ['id', 'uuid', 'user_id', 'created', 'updated']
+        read_only_fields = ['id', 'uuid', 'user_id', 'version', 'created', 'updated']
     
     def get_scope_display(self, obj) -> str:
         """Human-readable scope identifier."""
@@ -194,6 +197,7 @@ class SavedStateListSerializer(serializers.ModelSerializer):
             'preset_name',
             'description',
             'is_default',
+            'version',
             'created',
             'updated',
             # Computed fields
@@ -283,6 +287,28 @@ class ShareCreateSerializer(serializers.Serializer):
         return attrs
 
 
+class StatePatchSerializer(serializers.Serializer):
+    """
+    Serializer for delta updates of state_data / children_state.
+    
+    Used for PATCH /api/mystate/saved/{id}/state/
+    """
+    
+    format = serializers.ChoiceField(
+        choices=PATCH_FORMATS,
+        default='json-patch',
+        help_text="'json-patch' (RFC 6902) or 'merge-patch' (RFC 7386)"
+    )
+    patch = serializers.JSONField(
+        help_text="Operations list (json-patch) or partial document (merge-patch)"
+    )
+    version = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text="Version the patch is based on (or If-Match header)"
+    )
+
+
 class ConfigSerializer(serializers.Serializer):
     """
     Serializer for exposing MYSTATE_CONFIG to frontend.
@@ -0,0 +1,240 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/mystate/tests/test_patch.py
+#   MyState Patch Tests
+#   Tests for patch.py, coalescer.py and PATCH saved/{id}/state/
+#..............................................................
+
+"""
+   MyState Patch Tests.
+
+   Tests for JSON Patch / Merge Patch application, version checks,
+   write coalescing and the delta update endpoint.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.mystate.coalescer import StateWriteCoalescer, VersionConflict
+from sopira_magic.apps.mystate.models import SavedState
+from sopira_magic.apps.mystate.patch import (
+    PatchError,
+    PatchTestFailed,
+    apply_json_patch,
+    apply_merge_patch,
+    apply_patch,
+)
+from sopira_magic.apps.mystate.views import SavedStateViewSet
+
+pytestmark = pytest.mark.django_db(databases=['default', 'state'])
+
+URL = '/api/mystate/saved/{}/state/'
+
+factory = APIRequestFactory()
+
+
+@pytest.fixture(autouse=True)
+def clean_coalescer():
+    StateWriteCoalescer.clear()
+    yield
+    StateWriteCoalescer.clear()
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username='stateuser', password='pass12345')
+
+
+@pytest.fixture
+def preset(user):
+    return SavedState.objects.using('state').create(
+        user_id=user.id,
+        scope_type='table',
+        scope_key='companies',
+        preset_name='Wide',
+        state_data={'columnSizing': {'name': 100}, 'sorting': [{'id': 'name'}]},
+    )
+
+
+class TestJsonPatch:
+    """Test suite for RFC 6902 operations."""
+
+    def test_operations(self):
+        """Test add/replace/remove/move/copy produce a new document."""
+        doc = {'a': {'b': 1}, 'list': [1, 2]}
+        result = apply_json_patch(doc, [
+            {'op': 'replace', 'path': '/a/b', 'value': 2},
+            {'op': 'add', 'path': '/list/-', 'value': 3},
+            {'op': 'add', 'path': '/list/0', 'value': 0},
+            {'op': 'copy', 'from': '/a', 'path': '/c'},
+            {'op': 'move', 'from': '/c/b', 'path': '/d'},
+            {'op': 'remove', 'path': '/list/1'},
+        ])
+        assert result == {'a': {'b': 2}, 'list': [0, 2, 3], 'c': {}, 'd': 2}
+        assert doc == {'a': {'b': 1}, 'list': [1, 2]}
+
+    def test_escaped_pointer(self):
+        """Test ~1 and ~0 escapes in paths."""
+        assert apply_json_patch({}, [{'op': 'add', 'path': '/a~1b~0', 'value': 1}]) == {'a/b~': 1}
+
+    def test_missing_path_raises(self):
+        """Test replace of a missing key is rejected."""
+        with pytest.raises(PatchError):
+            apply_json_patch({'a': 1}, [{'op': 'replace', 'path': '/b', 'value': 1}])
+
+    def test_failed_test_operation(self):
+        """Test 'test' op mismatch raises PatchTestFailed."""
+        with pytest.raises(PatchTestFailed):
+            apply_json_patch({'a': 1}, [{'op': 'test', 'path': '/a', 'value': 2}])
+
+
+class TestMergePatch:
+    """Test suite for RFC 7386 merge patch and result validation."""
+
+    def test_merge_and_remove(self):
+        """Test nested merge, null removes keys."""
+        result = apply_merge_patch({'a': {'b': 1, 'c': 2}, 'd': 1}, {'a': {'b': 5, 'c': None}})
+        assert result == {'a': {'b': 5}, 'd': 1}
+
+    def test_only_patchable_fields(self):
+        """Test patches cannot add other top-level fields."""
+        doc = {'state_data': {}, 'children_state': {}}
+        with pytest.raises(PatchError):
+            apply_patch(doc, {'preset_name': 'x'}, 'merge-patch')
+
+    def test_invalid_child_scope(self):
+        """Test children_state keys are validated against the hierarchy."""
+        doc = {'state_data': {}, 'children_state': {}}
+        with pytest.raises(PatchError):
+            apply_patch(doc, {'children_state': {'bogus': {}}}, 'merge-patch', valid_children=['table_columns'])
+
+
+class TestStateWriteCoalescer:
+    """Test suite for coalescing and optimistic concurrency."""
+
+    def test_burst_is_one_write(self, preset, settings, django_assert_num_queries):
+        """Test several patches produce one UPDATE on flush."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+        for width in (110, 120, 130):
+            StateWriteCoalescer.patch(
+                preset, {'state_data': {'columnSizing': {'name': width}}}, 'merge-patch'
+            )
+        assert StateWriteCoalescer.pending() == 1
+
+        with django_assert_num_queries(1, using='state'):
+            assert StateWriteCoalescer.flush() == 1
+
+        preset.refresh_from_db(using='state')
+        assert preset.state_data['columnSizing'] == {'name': 130}
+        assert preset.version == 4
+
+    def test_version_conflict(self, preset, settings):
+        """Test stale version is rejected with the current version."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+        StateWriteCoalescer.patch(preset, {'state_data': {'a': 1}}, 'merge-patch', expected_version=1)
+
+        with pytest.raises(VersionConflict) as exc_info:
+            StateWriteCoalescer.patch(preset, {'state_data': {'a': 2}}, 'merge-patch', expected_version=1)
+        assert exc_info.value.current_version == 2
+
+    def test_default_writes_through(self, preset):
+        """Test the default window is 0: other processes see the new version in the DB at once."""
+        version, coalesced = StateWriteCoalescer.patch(preset, {'state_data': {'a': 1}}, 'merge-patch', expected_version=1)
+
+        row = SavedState.objects.using('state').get(pk=preset.pk)
+        assert (version, coalesced) == (2, False)
+        assert (row.version, row.state_data['a']) == (2, 1)
+
+    def test_synchronous_write_detects_concurrent_update(self, preset, settings):
+        """Test window 0 writes immediately and conflicts on a changed row."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 0
+        SavedState.objects.using('state').filter(pk=preset.pk).update(version=7)
+
+        with pytest.raises(VersionConflict) as exc_info:
+            StateWriteCoalescer.patch(preset, {'state_data': {'a': 1}}, 'merge-patch')
+        assert exc_info.value.current_version == 7
+
+
+    def test_concurrent_row_change_reapplies_patches(self, preset, settings):
+        """Test an acknowledged patch survives another worker writing the row."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+        StateWriteCoalescer.patch(preset, {'state_data': {'columnSizing': {'name': 240}}}, 'merge-patch')
+        SavedState.objects.using('state').filter(pk=preset.pk).update(
+            state_data={'columnSizing': {'name': 100}, 'sorting': [{'id': 'code'}]}, version=5
+        )
+
+        assert StateWriteCoalescer.flush() == 1
+        preset.refresh_from_db(using='state')
+        assert preset.state_data == {'columnSizing': {'name': 240}, 'sorting': [{'id': 'code'}]}
+        assert preset.version == 6
+
+    def test_failed_write_is_retried(self, preset, settings, monkeypatch):
+        """Test a write that raises stays queued and lands on the next flush."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+        StateWriteCoalescer.patch(preset, {'state_data': {'a': 1}}, 'merge-patch')
+        original = StateWriteCoalescer._write
+
+        def broken(*args):
+            raise RuntimeError('database unavailable')
+        monkeypatch.setattr(StateWriteCoalescer, '_write', staticmethod(broken))
+        assert StateWriteCoalescer.flush() == 0
+        assert StateWriteCoalescer.pending() == 1
+
+        StateWriteCoalescer.patch(preset, {'state_data': {'b': 2}}, 'merge-patch', expected_version=2)
+        monkeypatch.setattr(StateWriteCoalescer, '_write', staticmethod(original))
+        assert StateWriteCoalescer.flush() == 1
+        preset.refresh_from_db(using='state')
+        assert preset.state_data['a'] == 1 and preset.state_data['b'] == 2
+        assert preset.version == 3
+
+
+class TestPatchStateEndpoint:
+    """Test suite for PATCH /api/mystate/saved/{id}/state/."""
+
+    def _patch(self, user, preset, data, **extra):
+        request = factory.patch(URL.format(preset.pk), data, format='json', **extra)
+        force_authenticate(request, user)
+        return SavedStateViewSet.as_view({'patch': 'patch_state'})(request, pk=str(preset.pk))
+
+    def test_patch_then_get_sees_pending_state(self, user, preset, settings):
+        """Test delta response is small and GET flushes the pending write."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+
+        response = self._patch(user, preset, {
+            'patch': [{'op': 'replace', 'path': '/state_data/columnSizing/name', 'value': 240}],
+            'version': 1,
+        })
+        assert response.status_code == 200
+        assert response.data['version'] == 2
+        assert response['ETag'] == '"2"'
+
+        request = factory.get(f'/api/mystate/saved/{preset.pk}/')
+        force_authenticate(request, user)
+        detail = SavedStateViewSet.as_view({'get': 'retrieve'})(request, pk=str(preset.pk))
+        assert detail.data['state_data']['columnSizing'] == {'name': 240}
+        assert detail.data['version'] == 2
+
+    def test_list_flushes_users_pending_writes(self, user, preset, settings):
+        """Test the preset list reflects acknowledged patches."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+        self._patch(user, preset, {'patch': {'state_data': {'density': 'compact'}}, 'format': 'merge-patch'})
+
+        request = factory.get('/api/mystate/saved/')
+        force_authenticate(request, user)
+        SavedStateViewSet.as_view({'get': 'list'})(request)
+        assert StateWriteCoalescer.pending() == 0
+        preset.refresh_from_db(using='state')
+        assert preset.state_data['density'] == 'compact'
+
+    def test_conflict_and_bad_patch(self, user, preset, settings):
+        """Test 409 for stale If-Match, 400 for invalid patch."""
+        settings.MYSTATE_PATCH_COALESCE_MS = 1000
+
+        stale = self._patch(
+            user, preset, {'patch': {'state_data': {}}, 'format': 'merge-patch'}, HTTP_IF_MATCH='"5"'
+        )
+        assert stale.status_code == 409
+        assert stale.data['version'] == 1
+
+        bad = self._patch(user, preset, {'patch': [{'op': 'remove', 'path': '/state_data/missing'}]})
+        assert bad.status_code == 400
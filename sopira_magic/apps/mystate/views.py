@@ -17,6 +17,8 @@
 
    Important:
    - All DB operations use .using('state')
+   - State deltas (PATCH saved/{id}/state/) are coalesced by StateWriteCoalescer;
+     every other read/write flushes the affected pending patches first
    - User validation done via cross-DB lookup
    - NO HARDCODING: Uses MYSTATE_CONFIG for validation
 """
@@ -34,8 +36,11 @@ from .serializers import (
     SavedStateListSerializer,
     SharedStateSerializer,
     ShareCreateSerializer,
+    StatePatchSerializer,
     ConfigSerializer,
 )
+from .coalescer import StateWriteCoalescer, VersionConflict
+from .patch import PatchError, PatchTestFailed
 from .config import MYSTATE_CONFIG, validate_scope_type, get_child_scopes, SCOPE_HIERARCHY
 
 logger = logging.getLogger(__name__)
@@ -50,6 +55,7 @@ class SavedStateViewSet(viewsets.ModelViewSet):
     - POST /api/mystate/saved/ - Create new saved state
     - GET /api/mystate/saved/{id}/ - Get specific saved state
     - PATCH /api/mystate/saved/{id}/ - Update saved state
+    - PATCH /api/mystate/saved/{id}/state/ - Delta update (JSON Patch / Merge Patch)
     - DELETE /api/mystate/saved/{id}/ - Delete saved state
     - POST /api/mystate/saved/{id}/set-default/ - Set as default
     - POST /api/mystate/saved/{id}/share/ - Share with another user
@@ -73,6 +79,9 @@ class SavedStateViewSet(viewsets.ModelViewSet):
         Uses STATE database.
         """
         user = self.request.user
+        if self.action != 'patch_state':
+            # Lists and reads see the user's coalesced state patches
+            StateWriteCoalescer.flush(user_id=user.id)
         queryset = SavedState.objects.using('state').filter(user_id=user.id)
         
         # Filter by scope_type if provided
@@ -139,6 +148,7 @@ class SavedStateViewSet(viewsets.ModelViewSet):
         # Update fields
         for attr, value in serializer.validated_data.items():
             setattr(instance, attr, value)
+        instance.version += 1
         instance.save(using='state')
         
         output_serializer = SavedStateSerializer(instance, context=self.get_serializer_context())
@@ -150,6 +160,56 @@ class SavedStateViewSet(viewsets.ModelViewSet):
         instance.delete(using='state')
         return Response(status=status.HTTP_204_NO_CONTENT)
     
+    @action(detail=True, methods=['patch'], url_path='state')
+    def patch_state(self, request, pk=None):
+        """
+        Delta update of state_data / children_state with optimistic concurrency.
+        
+        PATCH /api/mystate/saved/{id}/state/
+        Body: {
+            "format": "json-patch",   # or "merge-patch"
+            "patch": [{"op": "replace", "path": "/state_data/columnSizing/name", "value": 120}],
+            "version": 3              # or If-Match: "3"
+        }
+        
+        With MYSTATE_PATCH_COALESCE_MS > 0 (single-process servers only),
+        bursts of patches for the same preset are merged into one STATE-DB
+        write. Returns the new version only -
+        the client already has the document.
+        
+        Errors:
+        - 400: invalid patch / result
+        - 409: version mismatch or failed 'test' operation (body has current version)
+        """
+        instance = self.get_object()
+        
+        serializer = StatePatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        expected_version = data.get('version')
+        if_match = request.headers.get('If-Match', '').removeprefix('W/').strip('"')
+        if expected_version is None and if_match.isdigit():
+            expected_version = int(if_match)
+        
+        try:
+            version, coalesced = StateWriteCoalescer.patch(
+                instance, data['patch'], data['format'], expected_version
+            )
+        except VersionConflict as e:
+            return Response(
+                {'detail': str(e), 'version': e.current_version},
+                status=status.HTTP_409_CONFLICT
+            )
+        except PatchTestFailed as e:
+            return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
+        except PatchError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = Response({'id': str(instance.pk), 'version': version, 'coalesced': coalesced})
+        response['ETag'] = f'"{version}"'
+        return response
+    
     @action(detail=True, methods=['post'], url_path='set-default')
     def set_default(self, request, pk=None):
         """
@@ -270,6 +330,10 @@ class SharedStateViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = SharedState.objects.using('state').filter(
             shared_with_id=user.id
         ).select_related('source_preset')
+        if StateWriteCoalescer.pending():
+            # Source presets may have coalesced patches of their owners
+            for preset_id in queryset.values_list('source_preset_id', flat=True):
+                StateWriteCoalescer.flush(pk=preset_id)
         
         # Filter by scope_type if provided
         scope_type = self.request.query_params.get('scope_type')
@@ -338,6 +402,7 @@ def default_preset_view(request):
         )
     
     # First check user's own default
+    StateWriteCoalescer.flush(user_id=request.user.id)
     preset = SavedState.objects.using('state').filter(
         user_id=request.user.id,
         scope_type=scope_type,
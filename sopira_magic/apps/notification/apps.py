@@ -17,6 +17,8 @@
    
    Startup Behavior:
    - Automatically registers notification handler with Auth module
+   - Connects compiled template cache invalidation (NotificationTemplate save/delete)
+   - Connects recipient plan cache invalidation (NotificationMatrix/User/UserCompany)
    - Enables loose coupling via registry pattern
    
    Important:
@@ -43,3 +45,8 @@ class NotificationConfig(AppConfig):
             import logging
             logger = logging.getLogger(__name__)
             logger.warning(f"Could not register notification integration on startup: {e}")
+        
+        from .template_renderer import register_template_cache_invalidation
+        from .recipient_planner import register_recipient_cache_invalidation
+        register_template_cache_invalidation()
+        register_recipient_cache_invalidation()
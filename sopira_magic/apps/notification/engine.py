@@ -11,8 +11,8 @@ ConfigDriven orchestrator for notification sending:
 1. Validates notification config (NOTIFICATION_CONFIG)
 2. Resolves recipients (NotificationMatrix + ScopeResolver)
 3. Renders templates (TemplateRenderer)
-4. Sends emails via SMTP
-5. Logs results (NotificationLog)
+4. Queues emails in the outbox (NotificationLog, one bulk insert)
+5. Outbox worker delivers them via SMTP (see outbox.py)
 
 Usage:
 ```python
@@ -32,7 +32,6 @@ result = NotificationEngine.send_notification(
 
 import logging
 from typing import Dict, List, Optional, Tuple, Any
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 
@@ -41,12 +40,12 @@ from .config import (
     is_notification_enabled,
     get_template_config,
     get_default_recipients,
-    is_scope_aware,
     get_smtp_config,
     get_logging_config,
 )
 from .template_renderer import TemplateRenderer
 from .scope_resolver import ScopeResolver
+from .outbox import NotificationOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -117,20 +116,26 @@ class NotificationEngine:
     def send_notification(
         cls,
         notification_type: str,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        sync: bool = False
     ) -> Dict[str, Any]:
         """Send notification - main entry point.
         
+        Emails are queued in the outbox and delivered by the outbox worker,
+        so callers (login, signup) never wait on SMTP.
+        
         Args:
             notification_type: Notification type identifier (from NOTIFICATION_CONFIG)
             context: Context data for template rendering and recipient resolution
+            sync: Deliver the queued emails before returning (CLI/testing)
         
         Returns:
             Dictionary with result:
             {
                 'success': bool,
-                'sent_count': int,
-                'failed_count': int,
+                'queued_count': int,
+                'sent_count': int,      # only with sync=True
+                'failed_count': int,    # only with sync=True
                 'recipients': List[str],
                 'errors': List[str]
             }
@@ -147,6 +152,7 @@ class NotificationEngine:
         
         result = {
             'success': False,
+            'queued_count': 0,
             'sent_count': 0,
             'failed_count': 0,
             'recipients': [],
@@ -181,28 +187,31 @@ class NotificationEngine:
             subject, body = cls.render_template(notification_type, context, config)
             logger.debug(f"Rendered template - Subject: {subject}")
             
-            # 5. Send emails
-            for recipient in recipients:
-                send_result = cls.send_email(
-                    recipient=recipient,
-                    subject=subject,
-                    body=body,
-                    notification_type=notification_type,
-                    context=context
-                )
-                
-                if send_result['success']:
-                    result['sent_count'] += 1
-                else:
-                    result['failed_count'] += 1
-                    result['errors'].append(f"{recipient}: {send_result.get('error', 'Unknown error')}")
+            # 5. Queue emails (one bulk insert, delivered by the outbox worker)
+            logging_config = get_logging_config()
+            serialized_context = cls._serialize_context(context) if logging_config.get('include_context_data', True) else {}
+            entries = NotificationOutbox.enqueue(
+                notification_type=notification_type,
+                recipients=recipients,
+                subject=subject,
+                body=body,
+                context_data=serialized_context,
+            )
+            result['queued_count'] = len(entries)
+            
+            if sync:
+                delivery = NotificationOutbox.drain(ids=[entry.pk for entry in entries])
+                result['sent_count'] = delivery['sent']
+                result['failed_count'] = delivery['failed'] + delivery['retried']
+                if result['failed_count']:
+                    result['errors'].append(f"{result['failed_count']} emails not delivered (see NotificationLog)")
             
             # 6. Final result
-            result['success'] = result['sent_count'] > 0
+            result['success'] = result['sent_count'] > 0 if sync else result['queued_count'] > 0
             
             logger.info(
                 f"✅ Notification {notification_type} completed: "
-                f"sent={result['sent_count']}, failed={result['failed_count']}"
+                f"queued={result['queued_count']}, sent={result['sent_count']}, failed={result['failed_count']}"
             )
             
             return result
@@ -229,12 +238,10 @@ class NotificationEngine:
         Returns:
             List of email addresses
         """
-        from .models import NotificationMatrix
-        
         recipients = []
         user = context.get('user')
         
-        # Try to get recipients from NotificationMatrix
+        # Try to get recipients from NotificationMatrix (planner applies scope pattern)
         try:
             matrix_recipients = ScopeResolver.resolve_recipients_from_matrix(
                 notification_type=notification_type,
@@ -267,24 +274,6 @@ class NotificationEngine:
                         scope_admins = ScopeResolver.get_scope_admins(user)
                         recipients.extend(scope_admins)
         
-        # Apply scope filtering if scope_aware
-        if is_scope_aware(notification_type) and user:
-            # Get scope pattern from first matrix entry (if exists)
-            try:
-                matrix_entry = NotificationMatrix.objects.filter(
-                    notification_type=notification_type,
-                    enabled=True
-                ).first()
-                
-                if matrix_entry and matrix_entry.scope_pattern:
-                    recipients = ScopeResolver.filter_by_scope(
-                        recipients=recipients,
-                        user=user,
-                        scope_pattern=matrix_entry.scope_pattern
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to apply scope filtering: {e}")
-        
         # Remove duplicates and validate
         recipients = list(set(recipients))
         recipients = ScopeResolver.filter_valid_emails(recipients)
@@ -343,7 +332,7 @@ class NotificationEngine:
         notification_type: str,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Send single email via SMTP and log result.
+        """Send single email immediately (via the outbox) and log result.
         
         Args:
             recipient: Recipient email address
@@ -355,61 +344,21 @@ class NotificationEngine:
         Returns:
             Dictionary with {'success': bool, 'error': str}
         """
-        from .models import NotificationLog
-        
         result = {'success': False, 'error': ''}
-        log_entry = None
         
         try:
-            # Create log entry
             logging_config = get_logging_config()
-            if logging_config.get('log_all_notifications', True):
-                # Serialize context to JSON-safe format
-                serialized_context = cls._serialize_context(context) if logging_config.get('include_context_data', True) else {}
-                
-                log_entry = NotificationLog.objects.create(
-                    notification_type=notification_type,
-                    recipient_email=recipient,
-                    status='pending',
-                    template_used=get_template_config(notification_type).get('template_name', ''),
-                    context_data=serialized_context
-                )
-            
-            # Send email via Django's send_mail
-            from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com')
-            
-            sent_count = send_mail(
-                subject=subject,
-                message=body,  # Plain text version
-                from_email=from_email,
-                recipient_list=[recipient],
-                html_message=body,  # HTML version
-                fail_silently=False,
-            )
-            
-            if sent_count > 0:
-                result['success'] = True
-                if log_entry:
-                    log_entry.status = 'sent'
-                    log_entry.sent_at = timezone.now()
-                    log_entry.save()
-                
-                logger.info(f"✉️  Email sent successfully to {recipient}")
-            else:
-                result['error'] = 'send_mail returned 0'
-                if log_entry:
-                    log_entry.status = 'failed'
-                    log_entry.error_message = result['error']
-                    log_entry.save()
+            serialized_context = cls._serialize_context(context) if logging_config.get('include_context_data', True) else {}
+            entries = NotificationOutbox.enqueue(notification_type, [recipient], subject, body, serialized_context)
+            delivery = NotificationOutbox.drain(ids=[entry.pk for entry in entries])
+            result['success'] = delivery['sent'] > 0
+            if not result['success']:
+                entries[0].refresh_from_db(fields=['error_message'])
+                result['error'] = entries[0].error_message or 'Email not delivered'
         
         except Exception as e:
             result['error'] = str(e)
             logger.error(f"Failed to send email to {recipient}: {e}")
-            
-            if log_entry:
-                log_entry.status = 'failed'
-                log_entry.error_message = str(e)
-                log_entry.save()
         
         return result
     
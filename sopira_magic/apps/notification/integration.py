@@ -13,7 +13,8 @@ Allows auth module to trigger notifications without tight coupling.
 Integration Flow:
 1. Auth module triggers notification via registry callback
 2. Callback forwards to NotificationEngine
-3. NotificationEngine processes notification (resolve, render, send, log)
+3. NotificationEngine processes notification (resolve, render, queue in outbox)
+4. Outbox worker delivers emails - auth request never waits on SMTP
 
 Usage:
 This module is automatically loaded via apps.py ready() method.
@@ -59,13 +60,12 @@ def notification_handler(notification_type: str, data: Dict[str, Any]) -> None:
         
         if result['success']:
             logger.info(
-                f"✅ Notification {notification_type} sent successfully: "
-                f"{result['sent_count']} sent, {result['failed_count']} failed"
+                f"✅ Notification {notification_type} queued: "
+                f"{result['queued_count']} emails"
             )
         else:
             logger.warning(
-                f"⚠️  Notification {notification_type} partially failed: "
-                f"{result['sent_count']} sent, {result['failed_count']} failed, "
+                f"⚠️  Notification {notification_type} not queued, "
                 f"errors: {result['errors']}"
             )
     
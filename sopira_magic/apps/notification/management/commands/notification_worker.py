@@ -0,0 +1,65 @@
+#..............................................................
+#   notification_worker.py
+#   Management Command - Notification outbox worker
+#..............................................................
+
+"""
+Notification Worker - Management Command.
+
+Delivers queued notifications (NotificationLog status='pending') in batches,
+one SMTP connection per batch. Failed deliveries are retried with backoff.
+
+Usage:
+    python manage.py notification_worker
+    python manage.py notification_worker --batch-size 200 --poll-interval 5
+    python manage.py notification_worker --once  # Drain due messages and exit
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from sopira_magic.apps.notification.outbox import NotificationOutbox, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notifications from the outbox'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Messages per SMTP connection (default: {BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds between outbox polls when idle (default: 2.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain due messages and exit',
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(self.style.MIGRATE_HEADING('📤 Notification worker started'))
+        
+        try:
+            while True:
+                close_old_connections()
+                totals = NotificationOutbox.drain(batch_size=batch_size)
+                if any(totals.values()):
+                    self.stdout.write(
+                        f"   sent={totals['sent']}, retried={totals['retried']}, failed={totals['failed']}"
+                    )
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        
+        self.stdout.write(self.style.SUCCESS('✓ Notification worker stopped'))
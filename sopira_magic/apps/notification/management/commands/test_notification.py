@@ -125,7 +125,8 @@ class Command(BaseCommand):
         try:
             result = NotificationEngine.send_notification(
                 notification_type=notification_type,
-                context=sample_context
+                context=sample_context,
+                sync=True
             )
             
             if result['success']:
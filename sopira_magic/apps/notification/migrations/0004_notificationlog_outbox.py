@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0003_alter_notificationtemplate_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationlog',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, help_text='Delivery attempts so far'),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='body',
+            field=models.TextField(blank=True, default='', help_text='Rendered body (HTML)'),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Earliest time of the next delivery attempt (retry backoff / worker lease)', null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='subject',
+            field=models.CharField(blank=True, default='', help_text='Rendered subject', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='notificationlog',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='notificatio_status_2d34ca_idx'),
+        ),
+    ]
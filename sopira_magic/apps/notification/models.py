@@ -23,8 +23,9 @@
       - Supports: admin, user, custom recipients, scope-aware routing
 
    3. NotificationLog (extends TimeStampedModel)
-      - Audit log pre odoslané notifikácie
-      - Fields: notification_type, recipient_email, status, error_message, context_data
+      - Audit log pre odoslané notifikácie + outbox (status='pending' = vo fronte)
+      - Fields: notification_type, recipient_email, status, error_message, context_data,
+        subject, body, attempts, next_attempt_at
       - Tracks: všetky odoslané/failed notifikácie
 
    4. NotificationPreference (extends TimeStampedModel)
@@ -228,6 +229,28 @@ class NotificationLog(TimeStampedModel):
         help_text="Scope identifier if notification was scope-aware"
     )
     
+    # Outbox payload (rendered once at enqueue time, delivered by the worker)
+    subject = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Rendered subject"
+    )
+    body = models.TextField(
+        blank=True,
+        default="",
+        help_text="Rendered body (HTML)"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Delivery attempts so far"
+    )
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Earliest time of the next delivery attempt (retry backoff / worker lease)"
+    )
+    
     # Additional metadata
     sent_at = models.DateTimeField(
         null=True,
@@ -243,6 +266,7 @@ class NotificationLog(TimeStampedModel):
             models.Index(fields=['notification_type', 'status']),
             models.Index(fields=['recipient_email']),
             models.Index(fields=['-created']),
+            models.Index(fields=['status', 'next_attempt_at']),
         ]
     
     def __str__(self):
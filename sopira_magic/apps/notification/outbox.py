@@ -0,0 +1,220 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/notification/outbox.py
+#   Notification Outbox - Asynchronous email delivery
+#   Bulk enqueue into NotificationLog, batched SMTP delivery with retry
+#..............................................................
+
+"""
+Notification Outbox - Asynchronous Email Delivery.
+
+NotificationLog doubles as the outbox: status='pending' rows are queued
+messages (rendered subject/body stored on the row).
+
+Flow:
+1. NotificationEngine.send_notification() renders once and calls
+   NotificationOutbox.enqueue() → ONE bulk INSERT for all recipients
+2. A worker (`python manage.py notification_worker`, or the inline drain
+   thread in local dev) calls NotificationOutbox.drain():
+   - claims due rows (SELECT ... FOR UPDATE SKIP LOCKED + lease on next_attempt_at)
+   - opens ONE SMTP connection per batch (get_connection) and sends all messages over it
+   - writes results with bulk_update (sent / retry with backoff / failed)
+
+Login and signup therefore never wait on SMTP.
+
+Usage:
+```python
+from sopira_magic.apps.notification.outbox import NotificationOutbox
+
+NotificationOutbox.enqueue('login_notification', ['admin@example.com'], subject, body)
+NotificationOutbox.drain(batch_size=100)
+```
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .config import get_logging_config, get_smtp_config, get_template_config
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 60  # 1m, 2m, 4m, 8m ...
+LEASE_SECONDS = 300
+
+
+class NotificationOutbox:
+    """Outbox over NotificationLog: bulk enqueue + batched delivery."""
+
+    @staticmethod
+    def enqueue(
+        notification_type: str,
+        recipients: Iterable[str],
+        subject: str,
+        body: str,
+        context_data: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """Queue one message per recipient in a single bulk insert.
+
+        Returns:
+            List of created NotificationLog rows (status='pending')
+        """
+        from .models import NotificationLog
+
+        template_name = (get_template_config(notification_type) or {}).get('template_name', '')
+        entries = NotificationLog.objects.bulk_create([
+            NotificationLog(
+                notification_type=notification_type,
+                recipient_email=recipient,
+                status='pending',
+                template_used=template_name,
+                context_data=context_data or {},
+                subject=subject[:255],
+                body=body,
+            )
+            for recipient in recipients
+        ])
+        logger.info(f"📥 Queued {len(entries)} {notification_type} notifications")
+        _notify_inline_worker()
+        return entries
+
+    @staticmethod
+    def claim(batch_size: int = BATCH_SIZE, ids: Optional[Iterable] = None) -> List[Any]:
+        """Claim due pending rows and lease them to this worker."""
+        from .models import NotificationLog
+        from django.db.models import Q
+
+        now = timezone.now()
+        with transaction.atomic():
+            qs = NotificationLog.objects.select_for_update(skip_locked=True).filter(
+                Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+                status='pending',
+            )
+            if ids is not None:
+                qs = qs.filter(pk__in=list(ids))
+            entries = list(qs.order_by('created')[:batch_size])
+            if entries:
+                NotificationLog.objects.filter(pk__in=[e.pk for e in entries]).update(
+                    next_attempt_at=now + timedelta(seconds=LEASE_SECONDS)
+                )
+        return entries
+
+    @staticmethod
+    def deliver(entries: List[Any]) -> Dict[str, int]:
+        """Send claimed rows over one SMTP connection and bulk-update their status."""
+        from .models import NotificationLog
+
+        result = {'sent': 0, 'failed': 0, 'retried': 0}
+        if not entries:
+            return result
+
+        from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com')
+        timeout = get_smtp_config().get('timeout')
+        now = timezone.now()
+        sent, errors = [], {}
+
+        connection = get_connection(fail_silently=False, timeout=timeout)
+        try:
+            connection.open()
+            for entry in entries:
+                message = EmailMultiAlternatives(
+                    subject=entry.subject,
+                    body=entry.body,  # Plain text version
+                    from_email=from_email,
+                    to=[entry.recipient_email],
+                    connection=connection,
+                )
+                message.attach_alternative(entry.body, 'text/html')  # HTML version
+                try:
+                    if connection.send_messages([message]):
+                        sent.append(entry)
+                    else:
+                        errors[entry.pk] = 'send_messages returned 0'
+                except Exception as e:
+                    errors[entry.pk] = str(e)
+        except Exception as e:
+            # Connection could not be opened - whole batch is retried
+            for entry in entries:
+                errors.setdefault(entry.pk, str(e))
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+        for entry in sent:
+            entry.status = 'sent'
+            entry.sent_at = now
+            entry.attempts += 1
+            entry.next_attempt_at = None
+        failed = [entry for entry in entries if entry.pk in errors]
+        for entry in failed:
+            entry.attempts += 1
+            entry.error_message = errors[entry.pk]
+            if entry.attempts >= MAX_ATTEMPTS:
+                entry.status = 'failed'
+                entry.next_attempt_at = None
+                result['failed'] += 1
+                logger.error(f"Failed to send email to {entry.recipient_email}: {entry.error_message}")
+            else:
+                entry.next_attempt_at = now + timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (entry.attempts - 1))
+                result['retried'] += 1
+                logger.warning(f"Retrying email to {entry.recipient_email} (attempt {entry.attempts}): {entry.error_message}")
+        result['sent'] = len(sent)
+
+        logging_config = get_logging_config()
+        if sent and not logging_config.get('log_success', True):
+            NotificationLog.objects.filter(pk__in=[e.pk for e in sent]).delete()
+            sent = []
+        NotificationLog.objects.bulk_update(
+            sent + failed,
+            ['status', 'sent_at', 'attempts', 'error_message', 'next_attempt_at'],
+        )
+        logger.info(f"✉️  Outbox batch: sent={result['sent']}, retried={result['retried']}, failed={result['failed']}")
+        return result
+
+    @classmethod
+    def drain(cls, batch_size: int = BATCH_SIZE, ids: Optional[Iterable] = None) -> Dict[str, int]:
+        """Deliver due messages batch by batch until none is left."""
+        totals = {'sent': 0, 'failed': 0, 'retried': 0}
+        ids = list(ids) if ids is not None else None
+        while True:
+            entries = cls.claim(batch_size=batch_size, ids=ids)
+            if not entries:
+                return totals
+            for key, value in cls.deliver(entries).items():
+                totals[key] += value
+
+
+# -------------------------
+# Inline worker (local dev without a separate worker process)
+# -------------------------
+_inline_lock = threading.Lock()
+_inline_thread: Optional[threading.Thread] = None
+
+
+def _notify_inline_worker():
+    """Drain the outbox in a background thread when NOTIFICATION_OUTBOX_WORKER == 'inline'."""
+    global _inline_thread
+    if getattr(settings, 'NOTIFICATION_OUTBOX_WORKER', 'external') != 'inline':
+        return
+
+    def drain():
+        try:
+            NotificationOutbox.drain()
+        except Exception as e:
+            logger.error(f"❌ Inline outbox drain failed: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+
+    with _inline_lock:
+        if _inline_thread is None or not _inline_thread.is_alive():
+            _inline_thread = threading.Thread(target=drain, name='notification-outbox', daemon=True)
+            transaction.on_commit(_inline_thread.start)
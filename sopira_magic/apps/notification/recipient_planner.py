@@ -0,0 +1,230 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/notification/recipient_planner.py
+#   Recipient Planner - Set-based recipient resolution
+#   Compiles NotificationMatrix rows into one user query per scope
+#..............................................................
+
+"""
+Recipient Planner - Set-Based Recipient Resolution.
+
+Compiles all enabled NotificationMatrix rows of a notification type into a
+RecipientPlan:
+- static emails (admin from settings, custom identifiers) - validated once
+- context user flag ('user' rows)
+- roles ('role' rows + ADMIN/SUPERADMIN for 'scope_admins')
+- scope pattern (first non-empty scope_pattern, only for scope_aware types)
+
+Resolution runs ONE user query: role filter + email validation (regex in DB)
++ scope pattern joined through UserCompany. Plans and resolved email lists
+are cached in Django cache per (notification_type, scope fingerprint);
+NotificationMatrix / User / UserCompany changes bump a generation counter
+(signal-based invalidation). The bump reaches other processes only with a
+shared cache (settings.CACHE_URL); with the per-process default the counter
+expires after CACHE_VERSION_TIMEOUT seconds instead.
+
+Usage:
+```python
+from sopira_magic.apps.notification.recipient_planner import RecipientPlanner
+
+emails = RecipientPlanner.resolve('login_notification', context, user)
+```
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .config import is_scope_aware
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+SCOPE_ADMIN_ROLES = ('ADMIN', 'SUPERADMIN')
+CACHE_PREFIX = 'notification_recipients'
+CACHE_TTL = 3600  # seconds
+GENERATION_KEY = f'{CACHE_PREFIX}:generation'
+
+# User fields that affect recipient resolution (other updates, e.g. last_login, keep the cache)
+RELEVANT_USER_FIELDS = frozenset({'email', 'role', 'is_active'})
+
+
+def _company_ids(user):
+    from sopira_magic.apps.m_company.models import UserCompany
+    return UserCompany.objects.filter(user=user).values('company')
+
+
+def _same_company(user) -> Q:
+    return Q(user_companies__company__in=_company_ids(user))
+
+
+def _company_admins(user) -> Q:
+    from sopira_magic.apps.m_company.models import UserCompany
+    return Q(
+        user_companies__company__in=_company_ids(user),
+        user_companies__role__in=[UserCompany.CompanyRole.OWNER, UserCompany.CompanyRole.ADMIN],
+    )
+
+
+# scope_pattern -> Q builder (joined through UserCompany)
+SCOPE_PATTERNS: Dict[str, Callable[[Any], Q]] = {
+    'same_company': _same_company,
+    'company_admins': _company_admins,
+}
+
+
+@dataclass(frozen=True)
+class RecipientPlan:
+    """Compiled NotificationMatrix rows for one notification type."""
+    has_entries: bool
+    static_emails: Tuple[str, ...]
+    include_context_user: bool
+    roles: FrozenSet[str]
+    scope_pattern: str
+
+
+class RecipientPlanner:
+    """Plans and resolves notification recipients with one user query."""
+
+    @staticmethod
+    def _generation() -> int:
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            # Time-based start: a counter that expired (CACHE_VERSION_TIMEOUT)
+            # must not restart at a value older cache entries still carry
+            cache.add(GENERATION_KEY, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+            generation = cache.get(GENERATION_KEY, 0)
+        return generation
+
+    @staticmethod
+    def invalidate() -> None:
+        """Invalidate all cached plans and recipient lists."""
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            cache.set(GENERATION_KEY, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+
+    @classmethod
+    def get_plan(cls, notification_type: str) -> RecipientPlan:
+        """Compile (or fetch cached) plan for a notification type."""
+        key = f'{CACHE_PREFIX}:{cls._generation()}:plan:{notification_type}'
+        plan = cache.get(key)
+        if plan is None:
+            plan = cls._compile(notification_type)
+            cache.set(key, plan, CACHE_TTL)
+        return plan
+
+    @staticmethod
+    def _compile(notification_type: str) -> RecipientPlan:
+        from .models import NotificationMatrix
+
+        entries = list(
+            NotificationMatrix.objects.filter(notification_type=notification_type, enabled=True)
+            .values_list('recipient_type', 'recipient_identifier', 'scope_pattern')
+        )
+        static_emails, roles = [], set()
+        include_user = False
+        scope_pattern = ''
+        for recipient_type, identifier, pattern in entries:
+            if recipient_type == 'admin':
+                admin_email = getattr(settings, 'ADMIN_EMAIL', None)
+                if admin_email:
+                    static_emails.append(admin_email)
+            elif recipient_type == 'user':
+                include_user = True
+            elif recipient_type == 'scope_admins':
+                roles.update(SCOPE_ADMIN_ROLES)
+            elif recipient_type == 'custom' and identifier:
+                static_emails.append(identifier)
+            elif recipient_type == 'role' and identifier:
+                roles.add(identifier)
+            if pattern and not scope_pattern:
+                scope_pattern = pattern  # Apply only first scope pattern
+
+        if not is_scope_aware(notification_type):
+            scope_pattern = ''
+
+        return RecipientPlan(
+            has_entries=bool(entries),
+            static_emails=tuple(sorted({e for e in static_emails if EMAIL_RE.match(e)})),
+            include_context_user=include_user,
+            roles=frozenset(roles),
+            scope_pattern=scope_pattern,
+        )
+
+    @classmethod
+    def resolve(cls, notification_type: str, context: dict, user: Optional[Any] = None) -> List[str]:
+        """Resolve recipients for a notification (empty list = no matrix recipients)."""
+        plan = cls.get_plan(notification_type)
+        if not plan.has_entries:
+            return []
+
+        recipients = set(plan.static_emails)
+        if plan.roles:
+            recipients.update(cls._role_emails(notification_type, plan, user))
+
+        if plan.include_context_user:
+            email = getattr(context.get('user'), 'email', None) or context.get('email')
+            if email and EMAIL_RE.match(email):
+                recipients.add(email)
+
+        return sorted(recipients)
+
+    @classmethod
+    def _role_emails(cls, notification_type: str, plan: RecipientPlan, user: Optional[Any]) -> List[str]:
+        scope_builder = SCOPE_PATTERNS.get(plan.scope_pattern) if user is not None else None
+        if plan.scope_pattern and user is not None and scope_builder is None:
+            logger.debug(f"Unknown scope pattern '{plan.scope_pattern}' - no scope filtering")
+        fingerprint = f'{plan.scope_pattern}:{user.pk}' if scope_builder else 'global'
+        key = f'{CACHE_PREFIX}:{cls._generation()}:emails:{notification_type}:{fingerprint}'
+
+        emails = cache.get(key)
+        if emails is None:
+            emails = cls.user_emails(roles=plan.roles, scope=scope_builder(user) if scope_builder else None)
+            cache.set(key, emails, CACHE_TTL)
+        return emails
+
+    @staticmethod
+    def user_emails(roles=None, scope: Optional[Q] = None, emails=None) -> List[str]:
+        """One query: valid emails of users matching roles / scope / email list."""
+        from sopira_magic.apps.m_user.models import User
+
+        qs = User.objects.exclude(email='').filter(email__isnull=False, email__regex=EMAIL_PATTERN)
+        if roles is not None:
+            qs = qs.filter(role__in=list(roles))
+        if emails is not None:
+            qs = qs.filter(email__in=list(emails))
+        if scope is not None:
+            qs = qs.filter(scope)
+        return list(qs.values_list('email', flat=True).distinct())
+
+
+def _invalidate(sender, **kwargs):
+    RecipientPlanner.invalidate()
+
+
+def _invalidate_on_user_change(sender, update_fields=None, **kwargs):
+    if update_fields is not None and not (set(update_fields) & RELEVANT_USER_FIELDS):
+        return
+    RecipientPlanner.invalidate()
+
+
+def register_recipient_cache_invalidation() -> None:
+    """Connect model signals that invalidate cached plans/recipients (called from apps.ready)."""
+    from django.db.models.signals import post_save, post_delete
+    from sopira_magic.apps.m_company.models import UserCompany
+    from sopira_magic.apps.m_user.models import User
+    from .models import NotificationMatrix
+
+    for model in (NotificationMatrix, UserCompany):
+        post_save.connect(_invalidate, sender=model, dispatch_uid=f'notification_recipients_save_{model.__name__}')
+        post_delete.connect(_invalidate, sender=model, dispatch_uid=f'notification_recipients_delete_{model.__name__}')
+    post_save.connect(_invalidate_on_user_change, sender=User, dispatch_uid='notification_recipients_save_User')
+    post_delete.connect(_invalidate, sender=User, dispatch_uid='notification_recipients_delete_User')
@@ -14,6 +14,7 @@ Key Features:
 - Get admin emails in user's scope
 - Filter recipients based on scope patterns
 - Support for scope-aware notification routing
+- Matrix resolution delegates to RecipientPlanner (one cached user query)
 
 Usage:
 ```python
@@ -31,6 +32,8 @@ import logging
 from typing import List, Optional, Any
 from django.conf import settings
 
+from .recipient_planner import EMAIL_RE, SCOPE_ADMIN_ROLES, SCOPE_PATTERNS, RecipientPlanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,20 +56,11 @@ class ScopeResolver:
             # ['admin1@example.com', 'admin2@example.com']
             ```
         """
-        from sopira_magic.apps.m_user.models import User
-        
         try:
             # Get all users with ADMIN or SUPERADMIN role
-            admin_users = User.objects.filter(
-                role__in=['ADMIN', 'SUPERADMIN'],
-                email__isnull=False
-            ).exclude(email='')
-            
             # TODO: Apply scoping filter here when scoping is fully integrated
             # For now, return all admins (SUPERADMIN sees everything)
-            # In future: apply ScopingEngine.apply_rules to filter by scope
-            
-            admin_emails = list(admin_users.values_list('email', flat=True))
+            admin_emails = RecipientPlanner.user_emails(roles=SCOPE_ADMIN_ROLES)
             
             logger.debug(f"Found {len(admin_emails)} scope admins for user {user.username}")
             return admin_emails
@@ -105,17 +99,22 @@ class ScopeResolver:
             # No scope filtering
             return recipients
         
-        try:
-            # TODO: Implement scope-based filtering
-            # For now, return all recipients
-            # In future: use scoping engine to filter based on hierarchy
-            
+        scope_builder = SCOPE_PATTERNS.get(scope_pattern)
+        if scope_builder is None:
             logger.debug(
-                f"Scope filtering not yet implemented, pattern: {scope_pattern}, "
+                f"Unknown scope pattern: {scope_pattern}, "
                 f"returning all {len(recipients)} recipients"
             )
             return recipients
         
+        try:
+            from sopira_magic.apps.m_user.models import User
+            
+            # Users outside the scope are dropped; external addresses are kept
+            in_scope = set(RecipientPlanner.user_emails(emails=recipients, scope=scope_builder(user)))
+            known = set(User.objects.filter(email__in=recipients).values_list('email', flat=True))
+            return [email for email in recipients if email in in_scope or email not in known]
+        
         except Exception as e:
             logger.error(f"Error filtering by scope: {e}")
             return recipients
@@ -146,69 +145,10 @@ class ScopeResolver:
             )
             ```
         """
-        from .models import NotificationMatrix
-        
-        recipients = []
-        
         try:
-            # Get all enabled matrix entries for this notification type
-            matrix_entries = NotificationMatrix.objects.filter(
-                notification_type=notification_type,
-                enabled=True
-            )
-            
-            for entry in matrix_entries:
-                recipient_type = entry.recipient_type
-                
-                if recipient_type == 'admin':
-                    # Add admin email from settings
-                    admin_email = getattr(settings, 'ADMIN_EMAIL', None)
-                    if admin_email:
-                        recipients.append(admin_email)
-                
-                elif recipient_type == 'user':
-                    # Add user email from context
-                    user_obj = context.get('user')
-                    if user_obj and hasattr(user_obj, 'email'):
-                        recipients.append(user_obj.email)
-                    elif context.get('email'):
-                        recipients.append(context.get('email'))
-                
-                elif recipient_type == 'scope_admins':
-                    # Add scope admins
-                    if user:
-                        scope_admins = cls.get_scope_admins(user)
-                        recipients.extend(scope_admins)
-                
-                elif recipient_type == 'custom':
-                    # Add custom email from recipient_identifier
-                    if entry.recipient_identifier:
-                        recipients.append(entry.recipient_identifier)
-                
-                elif recipient_type == 'role':
-                    # Add all users with specific role
-                    if entry.recipient_identifier:
-                        role_emails = cls._get_users_by_role(entry.recipient_identifier)
-                        recipients.extend(role_emails)
-            
-            # Remove duplicates
-            recipients = list(set(recipients))
-            
-            # Apply scope filtering if needed
-            if user:
-                for entry in matrix_entries:
-                    if entry.scope_pattern:
-                        recipients = cls.filter_by_scope(
-                            recipients,
-                            user,
-                            entry.scope_pattern
-                        )
-                        break  # Apply only first scope pattern
-            
-            logger.info(
-                f"Resolved {len(recipients)} recipients for {notification_type} "
-                f"from {matrix_entries.count()} matrix entries"
-            )
+            # Compiled plan + one user query (cached per notification type and scope)
+            recipients = RecipientPlanner.resolve(notification_type, context, user)
+            logger.info(f"Resolved {len(recipients)} recipients for {notification_type} from matrix")
             return recipients
         
         except Exception as e:
@@ -225,15 +165,8 @@ class ScopeResolver:
         Returns:
             List of email addresses
         """
-        from sopira_magic.apps.m_user.models import User
-        
         try:
-            users = User.objects.filter(
-                role=role,
-                email__isnull=False
-            ).exclude(email='')
-            
-            return list(users.values_list('email', flat=True))
+            return RecipientPlanner.user_emails(roles=[role])
         
         except Exception as e:
             logger.error(f"Error getting users by role {role}: {e}")
@@ -263,10 +196,7 @@ class ScopeResolver:
         Returns:
             True if valid, False otherwise
         """
-        import re
-        
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(EMAIL_RE.match(email))
     
     @classmethod
     def filter_valid_emails(cls, emails: List[str]) -> List[str]:
@@ -284,7 +214,7 @@ class ScopeResolver:
             # ['test@example.com']
             ```
         """
-        valid_emails = [email for email in emails if cls.validate_email(email)]
+        valid_emails = [email for email in emails if email and EMAIL_RE.match(email)]
         
         if len(valid_emails) < len(emails):
             invalid_count = len(emails) - len(valid_emails)
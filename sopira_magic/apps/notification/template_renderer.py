@@ -14,6 +14,12 @@ Renders notification templates from two sources:
 ConfigDriven approach: template source is defined in NOTIFICATION_CONFIG,
 renderer automatically selects correct rendering method.
 
+Compiled template cache:
+- Database templates are compiled once per (notification_type, updated) and
+  kept in-process; NotificationTemplate post_save/post_delete invalidates the
+  entry (other processes revalidate `updated` every REVALIDATE_SECONDS)
+- File templates are loaded via get_template() once per path
+
 Usage:
 ```python
 from sopira_magic.apps.notification.template_renderer import TemplateRenderer
@@ -27,13 +33,37 @@ subject, body = TemplateRenderer.render(
 """
 
 import logging
-from typing import Dict, Tuple, Optional
-from django.template.loader import render_to_string
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from django.template.loader import get_template
 from django.template import Template, Context
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+REVALIDATE_SECONDS = 60
+
+
+@dataclass
+class CompiledTemplate:
+    """Compiled database template (cache entry)."""
+    updated: Any
+    subject: str
+    body: Optional[Template]
+    checked_at: float
+
+
+_TEMPLATE_CACHE: Dict[str, CompiledTemplate] = {}
+_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=128)
+def _get_file_template(template_path: str):
+    return get_template(template_path)
+
 
 class TemplateRenderer:
     """Hybrid template renderer - supports database and file-based templates."""
@@ -83,6 +113,59 @@ class TemplateRenderer:
             logger.error(f"Template rendering failed: {template_name}, source: {template_source}, error: {e}")
             raise
     
+    @classmethod
+    def get_compiled_template(cls, template_name: str) -> CompiledTemplate:
+        """Return compiled database template from cache (compile on miss/change).
+        
+        Raises:
+            NotificationTemplate.DoesNotExist: If template not found or disabled
+        """
+        from .models import NotificationTemplate
+        
+        now = time.monotonic()
+        entry = _TEMPLATE_CACHE.get(template_name)
+        if entry is not None and now - entry.checked_at < REVALIDATE_SECONDS:
+            return entry
+        
+        if entry is not None:
+            # Cheap revalidation (changes made by other processes)
+            updated = NotificationTemplate.objects.filter(
+                notification_type=template_name, enabled=True
+            ).values_list('updated', flat=True).first()
+            if updated == entry.updated:
+                entry.checked_at = now
+                return entry
+        
+        try:
+            template_obj = NotificationTemplate.objects.get(
+                notification_type=template_name,
+                enabled=True
+            )
+        except NotificationTemplate.DoesNotExist:
+            logger.error(f"Database template not found: {template_name}")
+            cls.invalidate(template_name)
+            raise
+        
+        entry = CompiledTemplate(
+            updated=template_obj.updated,
+            subject=template_obj.subject,
+            body=Template(template_obj.body) if template_obj.body else None,
+            checked_at=now,
+        )
+        with _cache_lock:
+            _TEMPLATE_CACHE[template_name] = entry
+        logger.debug(f"Compiled database template: {template_name} ({template_obj.updated})")
+        return entry
+    
+    @classmethod
+    def invalidate(cls, template_name: Optional[str] = None) -> None:
+        """Drop compiled template(s) from cache (None = all)."""
+        with _cache_lock:
+            if template_name is None:
+                _TEMPLATE_CACHE.clear()
+            else:
+                _TEMPLATE_CACHE.pop(template_name, None)
+    
     @classmethod
     def _render_database_template(
         cls,
@@ -103,35 +186,24 @@ class TemplateRenderer:
         Raises:
             NotificationTemplate.DoesNotExist: If template not found
         """
-        from .models import NotificationTemplate
-        
-        try:
-            template_obj = NotificationTemplate.objects.get(
-                notification_type=template_name,
-                enabled=True
-            )
-        except NotificationTemplate.DoesNotExist:
-            logger.error(f"Database template not found: {template_name}")
-            raise
+        compiled = cls.get_compiled_template(template_name)
         
         # Render subject
         if subject_template:
             subject = subject_template.format(**context)
-        elif template_obj.subject:
-            subject = template_obj.subject.format(**context)
+        elif compiled.subject:
+            subject = compiled.subject.format(**context)
         else:
             subject = f"Notification: {template_name}"
         
-        # Render body using Django template engine
-        if template_obj.body:
-            template = Template(template_obj.body)
-            django_context = Context(context)
-            body = template.render(django_context)
+        # Render body using the compiled Django template
+        if compiled.body is not None:
+            body = compiled.body.render(Context(context))
         else:
             body = f"Notification: {template_name}"
             logger.warning(f"Database template {template_name} has empty body")
         
-        logger.info(f"Rendered database template: {template_name}")
+        logger.debug(f"Rendered database template: {template_name}")
         return subject, body
     
     @classmethod
@@ -161,8 +233,8 @@ class TemplateRenderer:
             template_path = template_name
         
         try:
-            # Render body using Django template system
-            body = render_to_string(template_path, context)
+            # Render body using the (cached) compiled template
+            body = _get_file_template(template_path).render(context)
         except Exception as e:
             logger.error(f"File template not found or rendering failed: {template_path}, error: {e}")
             raise
@@ -174,7 +246,7 @@ class TemplateRenderer:
             subject = f"Notification: {template_name}"
             logger.warning(f"No subject_template provided for file template {template_name}")
         
-        logger.info(f"Rendered file template: {template_path}")
+        logger.debug(f"Rendered file template: {template_path}")
         return subject, body
     
     @classmethod
@@ -280,3 +352,18 @@ class TemplateRenderer:
             logger.warning(error_message)
             return False, error_message
 
+
+
+def _invalidate_template_cache(sender, instance, **kwargs):
+    TemplateRenderer.invalidate(instance.notification_type)
+
+
+def register_template_cache_invalidation() -> None:
+    """Connect NotificationTemplate save/delete to cache invalidation (called from apps.ready)."""
+    from django.db.models.signals import post_save, post_delete
+    from .models import NotificationTemplate
+    
+    post_save.connect(_invalidate_template_cache, sender=NotificationTemplate,
+                      dispatch_uid='notification_template_cache_save')
+    post_delete.connect(_invalidate_template_cache, sender=NotificationTemplate,
+                        dispatch_uid='notification_template_cache_delete')
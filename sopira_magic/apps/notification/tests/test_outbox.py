@@ -0,0 +1,90 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/notification/tests/test_outbox.py
+#   Notification Outbox Tests
+#   Tests for outbox.py module
+#..............................................................
+
+"""
+   Notification Outbox Tests.
+
+   Tests for NotificationOutbox: bulk enqueue, batched delivery over one
+   connection, retry with backoff and the engine's non-blocking send path.
+"""
+
+import pytest
+from django.core import mail
+from sopira_magic.apps.notification import outbox
+from sopira_magic.apps.notification.engine import NotificationEngine
+from sopira_magic.apps.notification.models import NotificationLog
+from sopira_magic.apps.notification.outbox import NotificationOutbox
+
+
+@pytest.fixture(autouse=True)
+def external_worker(settings):
+    """Disable the inline drain thread; tests drain explicitly."""
+    settings.NOTIFICATION_OUTBOX_WORKER = 'external'
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+@pytest.mark.django_db
+class TestNotificationOutbox:
+    """Test suite for enqueue / drain."""
+
+    def test_enqueue_does_not_send(self):
+        """Test enqueue only writes pending rows."""
+        entries = NotificationOutbox.enqueue('login_notification', ['a@example.com', 'b@example.com'], 'Hi', '<p>Hi</p>')
+
+        assert len(entries) == 2
+        assert NotificationLog.objects.filter(status='pending').count() == 2
+        assert len(mail.outbox) == 0
+
+    def test_drain_sends_batch_over_one_connection(self, monkeypatch):
+        """Test all due messages are sent with a single connection per batch."""
+        from django.core import mail as django_mail
+
+        opened = []
+        original = django_mail.get_connection
+        monkeypatch.setattr(outbox, 'get_connection', lambda **kw: opened.append(1) or original(**kw))
+        NotificationOutbox.enqueue('login_notification', [f'u{i}@example.com' for i in range(5)], 'Hi', '<p>Hi</p>')
+
+        result = NotificationOutbox.drain(batch_size=10)
+
+        assert result == {'sent': 5, 'failed': 0, 'retried': 0}
+        assert len(opened) == 1
+        assert len(mail.outbox) == 5
+        assert NotificationLog.objects.filter(status='sent', sent_at__isnull=False).count() == 5
+
+    def test_failed_delivery_is_retried_with_backoff(self, monkeypatch):
+        """Test failure increments attempts and defers the row, then gives up."""
+        from django.core.mail.backends.locmem import EmailBackend
+
+        def boom(self, messages):
+            raise ConnectionError('smtp down')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', boom)
+        entry = NotificationOutbox.enqueue('login_notification', ['a@example.com'], 'Hi', 'Hi')[0]
+
+        assert NotificationOutbox.drain() == {'sent': 0, 'failed': 0, 'retried': 1}
+        entry.refresh_from_db()
+        assert entry.status == 'pending'
+        assert entry.attempts == 1
+        assert entry.next_attempt_at is not None
+        # Not due yet
+        assert NotificationOutbox.drain() == {'sent': 0, 'failed': 0, 'retried': 0}
+
+        NotificationLog.objects.filter(pk=entry.pk).update(attempts=outbox.MAX_ATTEMPTS - 1, next_attempt_at=None)
+        assert NotificationOutbox.drain()['failed'] == 1
+        entry.refresh_from_db()
+        assert entry.status == 'failed'
+        assert entry.error_message == 'smtp down'
+
+    def test_engine_queues_without_sending(self):
+        """Test send_notification returns after enqueue (no SMTP on request path)."""
+        result = NotificationEngine.send_notification(
+            'signup_notification_user',
+            {'email': 'new@example.com', 'username': 'new'},
+        )
+
+        assert result['queued_count'] >= 1
+        assert len(mail.outbox) == 0
+        assert NotificationLog.objects.filter(status='pending').exists()
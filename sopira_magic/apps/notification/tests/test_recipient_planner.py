@@ -0,0 +1,87 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/notification/tests/test_recipient_planner.py
+#   Recipient Planner Tests
+#   Tests for recipient_planner.py module
+#..............................................................
+
+"""
+   Recipient Planner Tests.
+
+   Tests for RecipientPlanner: compiled matrix plan, single-query resolution,
+   scope patterns through UserCompany and signal-based cache invalidation.
+"""
+
+import pytest
+from django.core.cache import cache
+from sopira_magic.apps.m_company.models import Company, UserCompany
+from sopira_magic.apps.m_user.models import User
+from sopira_magic.apps.notification.models import NotificationMatrix
+from sopira_magic.apps.notification.recipient_planner import RecipientPlanner
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def users(db):
+    admin = User.objects.create_user(username='adm', email='adm@example.com', password='x', role='ADMIN')
+    other = User.objects.create_user(username='adm2', email='adm2@example.com', password='x', role='ADMIN')
+    broken = User.objects.create_user(username='bad', email='not-an-email', password='x', role='ADMIN')
+    staff = User.objects.create_user(username='stf', email='stf@example.com', password='x', role='STAFF')
+    return {'admin': admin, 'other': other, 'broken': broken, 'staff': staff}
+
+
+@pytest.mark.django_db
+class TestRecipientPlanner:
+    """Test suite for RecipientPlanner.resolve."""
+
+    def test_resolve_combines_matrix_rows(self, users):
+        """Test role, custom and context user rows resolve to validated emails."""
+        NotificationMatrix.objects.create(notification_type='signup_notification_admin', recipient_type='role', recipient_identifier='ADMIN')
+        NotificationMatrix.objects.create(notification_type='signup_notification_admin', recipient_type='custom', recipient_identifier='ops@example.com')
+        NotificationMatrix.objects.create(notification_type='signup_notification_admin', recipient_type='user')
+
+        recipients = RecipientPlanner.resolve('signup_notification_admin', {'user': users['staff']})
+
+        assert recipients == ['adm2@example.com', 'adm@example.com', 'ops@example.com', 'stf@example.com']
+
+    def test_resolve_is_cached(self, users, django_assert_num_queries):
+        """Test second resolution hits the cache (no queries)."""
+        NotificationMatrix.objects.create(notification_type='signup_notification_admin', recipient_type='scope_admins')
+        RecipientPlanner.resolve('signup_notification_admin', {}, users['staff'])
+
+        with django_assert_num_queries(0):
+            recipients = RecipientPlanner.resolve('signup_notification_admin', {}, users['staff'])
+
+        assert recipients == ['adm2@example.com', 'adm@example.com']
+
+    def test_scope_pattern_joins_user_company(self, users):
+        """Test same_company scope keeps only admins sharing a company with the user."""
+        company = Company.objects.create(code='C-1', name='C1')
+        UserCompany.objects.create(user=users['staff'], company=company)
+        UserCompany.objects.create(user=users['admin'], company=company)
+        NotificationMatrix.objects.create(
+            notification_type='login_notification', recipient_type='scope_admins', scope_pattern='same_company'
+        )
+
+        assert RecipientPlanner.resolve('login_notification', {}, users['staff']) == ['adm@example.com']
+
+    def test_signals_invalidate_cache(self, users):
+        """Test matrix and user changes are visible on the next resolution."""
+        NotificationMatrix.objects.create(notification_type='signup_notification_admin', recipient_type='role', recipient_identifier='STAFF')
+        assert RecipientPlanner.resolve('signup_notification_admin', {}) == ['stf@example.com']
+
+        users['other'].role = 'STAFF'
+        users['other'].save()
+        assert RecipientPlanner.resolve('signup_notification_admin', {}) == ['adm2@example.com', 'stf@example.com']
+
+        NotificationMatrix.objects.create(notification_type='signup_notification_admin', recipient_type='custom', recipient_identifier='ops@example.com')
+        assert 'ops@example.com' in RecipientPlanner.resolve('signup_notification_admin', {})
+
+    def test_no_matrix_entries_returns_empty(self, users):
+        """Test missing matrix rows return [] so the engine falls back to defaults."""
+        assert RecipientPlanner.resolve('password_reset', {'user': users['staff']}) == []
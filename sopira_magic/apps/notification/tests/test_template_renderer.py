@@ -0,0 +1,55 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/notification/tests/test_template_renderer.py
+#   Template Renderer Tests
+#   Tests for template_renderer.py module
+#..............................................................
+
+"""
+   Template Renderer Tests.
+
+   Tests for the compiled template cache (invalidation on save).
+"""
+
+import pytest
+from sopira_magic.apps.notification import template_renderer
+from sopira_magic.apps.notification.models import NotificationTemplate
+from sopira_magic.apps.notification.template_renderer import TemplateRenderer
+
+
+@pytest.fixture
+def db_template(db):
+    TemplateRenderer.invalidate()
+    return NotificationTemplate.objects.create(
+        name='Broadcast',
+        notification_type='broadcast_test',
+        template_source='database',
+        subject='Hello {username}',
+        body='<p>{{ title }} for {{ role }}</p>',
+    )
+
+
+class TestCompiledTemplateCache:
+    """Test suite for the compiled database template cache."""
+
+    def test_template_is_parsed_once(self, db_template, monkeypatch, django_assert_num_queries):
+        """Test repeated renders reuse the compiled template without DB queries."""
+        TemplateRenderer.render('database', 'broadcast_test', {'username': 'a', 'title': 'T', 'role': 'R'})
+        parsed = []
+        monkeypatch.setattr(template_renderer, 'Template', lambda body: parsed.append(body))
+
+        with django_assert_num_queries(0):
+            subject, body = TemplateRenderer.render('database', 'broadcast_test', {'username': 'b', 'title': 'T', 'role': 'R'})
+
+        assert subject == 'Hello b'
+        assert body == '<p>T for R</p>'
+        assert parsed == []
+
+    def test_save_invalidates_cache(self, db_template):
+        """Test editing the template is picked up on the next render."""
+        TemplateRenderer.render('database', 'broadcast_test', {'username': 'a', 'title': 'T', 'role': 'R'})
+
+        db_template.body = '<b>{{ title }}</b>'
+        db_template.save()
+
+        _, body = TemplateRenderer.render('database', 'broadcast_test', {'username': 'a', 'title': 'T', 'role': 'R'})
+        assert body == '<b>T</b>'
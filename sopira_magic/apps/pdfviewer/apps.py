@@ -32,3 +32,7 @@ class PdfViewerConfig(AppConfig):
     name = "sopira_magic.apps.pdfviewer"
     label = "pdfviewer"
     verbose_name = "PDF Viewer"
+
+    def ready(self):
+        # Annotation writes invalidate the cached annotations-by-document payload
+        from . import signals  # noqa: F401
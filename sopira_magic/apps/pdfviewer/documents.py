@@ -0,0 +1,119 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/pdfviewer/documents.py
+#   PdfViewer Documents - document resolution and page index cache
+#   Strong ETags + page index stored alongside each PDF
+#..............................................................
+
+"""
+PdfViewer Documents - document resolution and page index cache.
+
+A document_ref is a path relative to the document root
+(settings.PDFVIEWER_DOCUMENT_ROOT, DEV default: config.PDF_DEV_ROOT).
+
+For every PDF the page index (pdfindex.build_index) is computed once and
+stored alongside the file as "<file>.index.json". It carries the SHA-256
+of the content, which is used as the strong ETag for delivery. The index
+is rebuilt when the file size or mtime changes; the hot path per request
+is one stat() and one cache lookup.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .config import PDF_DEV_ROOT
+from .pdfindex import INDEX_VERSION, PdfIndexError, build_index
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".index.json"
+CACHE_PREFIX = "pdfviewer:index:"
+
+
+class DocumentNotFound(Exception):
+    """document_ref does not point to a PDF below the document root."""
+
+
+class PdfDocumentService:
+    """Resolve PDF documents and provide their (cached) page index."""
+
+    @staticmethod
+    def root() -> Path:
+        return Path(getattr(settings, "PDFVIEWER_DOCUMENT_ROOT", None) or PDF_DEV_ROOT)
+
+    @classmethod
+    def resolve(cls, document_ref: str) -> Path:
+        """Absolute path of a document; refuses traversal outside the root and non-PDF files."""
+        root = cls.root().resolve()
+        path = (root / document_ref).resolve()
+        if root not in path.parents or path.suffix.lower() != ".pdf" or not path.is_file():
+            raise DocumentNotFound(document_ref)
+        return path
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_name(path.name + INDEX_SUFFIX)
+
+    @classmethod
+    def get_index(cls, document_ref: str) -> Dict[str, Any]:
+        """Page index incl. sha256 / etag; built on first access and after file changes."""
+        path = cls.resolve(document_ref)
+        stat = path.stat()
+        if not stat.st_size:
+            raise DocumentNotFound(document_ref)
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+        cache_key = f"{CACHE_PREFIX}{path}"
+
+        index = cache.get(cache_key)
+        if index is not None and index.get("stamp") == stamp:
+            return index
+
+        index = cls._read_sidecar(path, stamp)
+        if index is None:
+            index = cls._build(path, stamp)
+        index["etag"] = f'"{index["sha256"]}"'
+        cache.set(cache_key, index, None)
+        return index
+
+    @classmethod
+    def _read_sidecar(cls, path: Path, stamp: str):
+        try:
+            with open(cls._index_path(path), encoding="utf-8") as handle:
+                index = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if index.get("stamp") != stamp or index.get("version") != INDEX_VERSION:
+            return None
+        return index
+
+    @classmethod
+    def _build(cls, path: Path, stamp: str) -> Dict[str, Any]:
+        with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                index = build_index(data)
+            except (PdfIndexError, IndexError, KeyError, TypeError, ValueError) as e:
+                # Unreadable structure: still deliverable, just without page metadata
+                logger.warning(f"[PDFVIEWER] Page index for {path.name} failed: {e}")
+                index = {"version": INDEX_VERSION, "sha256": hashlib.sha256(data).hexdigest(),
+                         "size": len(data), "page_count": None, "pages": [], "text": "", "error": str(e)}
+        index["stamp"] = stamp
+
+        sidecar = cls._index_path(path)
+        tmp = sidecar.with_name(sidecar.name + f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as handle:
+                json.dump(index, handle, separators=(",", ":"))
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            logger.warning(f"[PDFVIEWER] Cannot store page index for {path.name}: {e}")
+        logger.info(f"[PDFVIEWER] Indexed {path.name}: {index['page_count']} pages")
+        return index
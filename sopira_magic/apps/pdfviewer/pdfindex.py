@@ -0,0 +1,454 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/pdfviewer/pdfindex.py
+#   PdfViewer Page Index - page count, sizes, offsets, text per page
+#   Minimal stdlib PDF object reader (xref tables/streams, ObjStm)
+#..............................................................
+
+"""
+PdfViewer Page Index - precomputed per-document page metadata.
+
+build_index(data) reads the PDF structure once (no third-party parser):
+
+- cross-reference tables and streams incl. /Prev chains (incremental
+  updates, linearized files) and compressed object streams (/ObjStm)
+- page tree with inherited MediaBox / CropBox / Rotate
+- per page: size in points, rotation, byte offset of the page object and
+  (offset, length) of its content streams - the ranges a client has to
+  fetch to render that page
+- per page text from BT..ET blocks (literal strings of Tj / TJ / ' / ");
+  pages are joined into one document text and each page stores its
+  (text_start, text_length) slice
+
+Only FlateDecode streams (incl. PNG predictors) are decoded; text in
+hex-encoded (CID) fonts is not extracted. Unsupported structures raise
+PdfIndexError.
+"""
+
+import hashlib
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+INDEX_VERSION = 1
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+DELIMITERS = b"()<>[]{}/%"
+TOKEN_END = WHITESPACE + DELIMITERS
+NUMBER_RE = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+REGULAR_RE = re.compile(rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]+")
+OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+REF_RE = re.compile(rb"\s+(\d+)\s+R\b")
+XREF_SUBSECTION_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s*[\r\n]")
+XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+
+TEXT_BLOCK_RE = re.compile(rb"\bBT\b(.*?)\bET\b", re.S)
+TEXT_TOKEN_RE = re.compile(
+    rb"\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)"  # literal string (one nesting level)
+    rb"|T\*|\bT[dDm]\b|'|\"",
+    re.S,
+)
+ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+           b"(": b"(", b")": b")", b"\\": b"\\"}
+ESCAPE_RE = re.compile(rb"\\([nrtbf()\\]|[0-7]{1,3}|\r\n|\r|\n)")
+
+
+class PdfIndexError(ValueError):
+    """The file is not a PDF this reader understands."""
+
+
+class Name(str):
+    pass
+
+
+class Ref(tuple):
+    @property
+    def num(self) -> int:
+        return self[0]
+
+
+class Stream:
+    __slots__ = ("dict", "offset", "length", "data")
+
+    def __init__(self, dictionary: dict, offset: int, length: int, data: Optional[bytes] = None):
+        self.dict = dictionary
+        self.offset = offset
+        self.length = length
+        self.data = data
+
+
+def _find(data, needle: bytes, start: int) -> int:
+    position = data.find(needle, start)  # mmap has no index()
+    if position < 0:
+        raise PdfIndexError(f"{needle!r} not found after {start}")
+    return position
+
+
+def _unescape(raw: bytes) -> bytes:
+    def repl(match):
+        value = match.group(1)
+        if value in ESCAPES:
+            return ESCAPES[value]
+        if value[:1].isdigit():
+            return bytes([int(value, 8) & 0xFF])
+        return b""  # escaped line break = continuation
+    return ESCAPE_RE.sub(repl, raw)
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    row_size = columns + 1
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data) - columns, row_size):
+        kind, row = data[start], bytearray(data[start + 1:start + row_size])
+        if kind == 1:
+            for i in range(1, len(row)):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind == 2:
+            for i in range(len(row)):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif kind == 3:
+            for i in range(len(row)):
+                left = row[i - 1] if i else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(len(row)):
+                a, b, c = (row[i - 1] if i else 0), previous[i], (previous[i - 1] if i else 0)
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+        out += row
+        previous = row
+    return bytes(out)
+
+
+class PdfReader:
+    """Random-access reader for PDF objects in a bytes-like buffer (bytes or mmap)."""
+
+    def __init__(self, data):
+        if data[:5] != b"%PDF-":
+            raise PdfIndexError("Not a PDF file")
+        self.data = data
+        self.xref: Dict[int, Tuple] = {}
+        self.trailer: Dict[str, Any] = {}
+        self._objstm: Dict[int, Tuple[bytes, Dict[int, int]]] = {}
+        self._read_xref()
+
+    # -------------------------
+    # Lexer / parser
+    # -------------------------
+    def _skip(self, data, pos: int) -> int:
+        size = len(data)
+        while pos < size:
+            char = data[pos]
+            if char in WHITESPACE:
+                pos += 1
+            elif char == 0x25:  # % comment
+                while pos < size and data[pos] not in b"\r\n":
+                    pos += 1
+            else:
+                break
+        return pos
+
+    def parse(self, data, pos: int) -> Tuple[Any, int]:
+        pos = self._skip(data, pos)
+        char = data[pos:pos + 1]
+        if char == b"/":
+            match = REGULAR_RE.match(data, pos + 1)
+            raw = match.group(0) if match else b""
+            name = re.sub(rb"#([0-9A-Fa-f]{2})", lambda m: bytes([int(m.group(1), 16)]), raw)
+            return Name(name.decode("latin-1")), pos + 1 + len(raw)
+        if data[pos:pos + 2] == b"<<":
+            return self._parse_dict(data, pos + 2)
+        if char == b"<":
+            end = _find(data, b">", pos)
+            hexdata = re.sub(rb"\s", b"", data[pos + 1:end])
+            return bytes.fromhex((hexdata + b"0" * (len(hexdata) % 2)).decode()), end + 1
+        if char == b"(":
+            return self._parse_literal(data, pos + 1)
+        if char == b"[":
+            items, pos = [], pos + 1
+            while True:
+                pos = self._skip(data, pos)
+                if data[pos:pos + 1] == b"]":
+                    return items, pos + 1
+                value, pos = self.parse(data, pos)
+                items.append(value)
+        number = NUMBER_RE.match(data, pos)
+        if number and (number.end() >= len(data) or data[number.end()] in TOKEN_END):
+            token = number.group(0)
+            if b"." in token:
+                return float(token), number.end()
+            value = int(token)
+            ref = REF_RE.match(data, number.end())
+            if ref:
+                return Ref((value, int(ref.group(1)))), ref.end()
+            return value, number.end()
+        match = REGULAR_RE.match(data, pos)
+        if not match:
+            raise PdfIndexError(f"Unexpected token at {pos}")
+        keyword = match.group(0)
+        values = {b"true": True, b"false": False, b"null": None}
+        return values.get(keyword, keyword), match.end()
+
+    def _parse_dict(self, data, pos: int) -> Tuple[Any, int]:
+        result = {}
+        while True:
+            pos = self._skip(data, pos)
+            if data[pos:pos + 2] == b">>":
+                pos += 2
+                break
+            key, pos = self.parse(data, pos)
+            value, pos = self.parse(data, pos)
+            result[str(key)] = value
+        after = self._skip(data, pos)
+        if data[after:after + 6] != b"stream":
+            return result, pos
+        start = after + 6
+        if data[start:start + 2] == b"\r\n":
+            start += 2
+        elif data[start:start + 1] in (b"\n", b"\r"):
+            start += 1
+        length = self.resolve(result.get("Length"))
+        if not isinstance(length, int) or data[start + length:start + length + 20].find(b"endstream") < 0:
+            length = _find(data, b"endstream", start) - start  # broken /Length - trust the keyword
+        return Stream(result, start, length), start + length
+
+    def _parse_literal(self, data, pos: int) -> Tuple[bytes, int]:
+        depth, start = 1, pos
+        while depth:
+            char = data[pos]
+            if char == 0x5C:  # backslash
+                pos += 2
+                continue
+            if char == 0x28:
+                depth += 1
+            elif char == 0x29:
+                depth -= 1
+            pos += 1
+        return _unescape(data[start:pos - 1]), pos
+
+    # -------------------------
+    # Objects
+    # -------------------------
+    def resolve(self, value):
+        seen = 0
+        while isinstance(value, Ref):
+            value = self.get(value.num)
+            seen += 1
+            if seen > 32:
+                raise PdfIndexError("Reference loop")
+        return value
+
+    def offset_of(self, num: int) -> Optional[int]:
+        """Byte offset of the object, or of its object stream for compressed objects."""
+        entry = self.xref.get(num)
+        if entry is None:
+            return None
+        if entry[0] == 1:
+            return entry[1]
+        return self.offset_of(entry[1])
+
+    def get(self, num: int):
+        entry = self.xref.get(num)
+        if entry is None:
+            return None
+        if entry[0] == 1:
+            return self._object_at(entry[1])
+        data, offsets = self._object_stream(entry[1])
+        if num not in offsets:
+            return None
+        return self.parse(data, offsets[num])[0]
+
+    def _object_at(self, offset: int):
+        header = OBJ_HEADER_RE.match(self.data, offset)
+        if not header:
+            raise PdfIndexError(f"No object at offset {offset}")
+        return self.parse(self.data, header.end())[0]
+
+    def _object_stream(self, num: int):
+        if num not in self._objstm:
+            stream = self.get(num)
+            if not isinstance(stream, Stream):
+                raise PdfIndexError(f"Object stream {num} missing")
+            data = self.decode(stream)
+            first = self.resolve(stream.dict.get("First", 0))
+            pairs = data[:first].split()
+            offsets = {int(pairs[i]): first + int(pairs[i + 1]) for i in range(0, len(pairs) - 1, 2)}
+            self._objstm[num] = (data, offsets)
+        return self._objstm[num]
+
+    def decode(self, stream: Stream) -> bytes:
+        if stream.data is not None:
+            return stream.data
+        data = bytes(self.data[stream.offset:stream.offset + stream.length])
+        filters = self.resolve(stream.dict.get("Filter"))
+        params = self.resolve(stream.dict.get("DecodeParms"))
+        filters = filters if isinstance(filters, list) else [filters] if filters else []
+        params = params if isinstance(params, list) else [params] * len(filters)
+        for name, param in zip(filters, params):
+            if name not in ("FlateDecode", "Fl"):
+                raise PdfIndexError(f"Unsupported filter {name}")
+            data = zlib.decompressobj().decompress(data)
+            param = self.resolve(param) or {}
+            predictor = self.resolve(param.get("Predictor", 1))
+            if predictor >= 10:
+                colors = self.resolve(param.get("Colors", 1))
+                bits = self.resolve(param.get("BitsPerComponent", 8))
+                columns = self.resolve(param.get("Columns", 1))
+                data = _png_unpredict(data, (columns * colors * bits + 7) // 8)
+            elif predictor == 2:
+                raise PdfIndexError("TIFF predictor not supported")
+        stream.data = data
+        return data
+
+    # -------------------------
+    # Cross-reference
+    # -------------------------
+    def _read_xref(self) -> None:
+        position = self.data.rfind(b"startxref")
+        if position < 0:
+            raise PdfIndexError("startxref not found")
+        offset = int(self.data[position + 9:position + 40].split()[0])
+        seen = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            trailer = self._read_section(offset)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            if isinstance(trailer.get("XRefStm"), int):
+                self._read_section(trailer["XRefStm"])
+            offset = trailer.get("Prev")
+        if "Root" not in self.trailer:
+            raise PdfIndexError("Trailer without /Root")
+
+    def _read_section(self, offset: int) -> dict:
+        pos = self._skip(self.data, offset)
+        if self.data[pos:pos + 4] == b"xref":
+            return self._read_table(pos + 4)
+        header = OBJ_HEADER_RE.match(self.data, offset)
+        if not header:
+            raise PdfIndexError(f"Broken xref at {offset}")
+        stream = self.parse(self.data, header.end())[0]
+        if not isinstance(stream, Stream) or stream.dict.get("Type") != "XRef":
+            raise PdfIndexError(f"Broken xref stream at {offset}")
+        widths = stream.dict["W"]
+        index = stream.dict.get("Index") or [0, stream.dict["Size"]]
+        data = self.decode(stream)
+        row = sum(widths)
+        pos = 0
+        for first, count in zip(index[0::2], index[1::2]):
+            for num in range(first, first + count):
+                fields, cursor = [], pos
+                for width in widths:
+                    fields.append(int.from_bytes(data[cursor:cursor + width], "big") if width else None)
+                    cursor += width
+                pos += row
+                kind = 1 if fields[0] is None else fields[0]
+                if num not in self.xref and kind in (1, 2):
+                    self.xref[num] = (kind, fields[1], fields[2] or 0)
+        return stream.dict
+
+    def _read_table(self, pos: int) -> dict:
+        while True:
+            pos = self._skip(self.data, pos)
+            if self.data[pos:pos + 7] == b"trailer":
+                return self.parse(self.data, pos + 7)[0]
+            section = XREF_SUBSECTION_RE.match(self.data, pos)
+            if not section:
+                raise PdfIndexError("Broken xref table")
+            first, count = int(section.group(1)), int(section.group(2))
+            pos = section.end()
+            for num in range(first, first + count):
+                entry = XREF_ENTRY_RE.search(self.data, pos, pos + 24)
+                if not entry:
+                    raise PdfIndexError("Broken xref entry")
+                pos = entry.end()
+                if entry.group(3) == b"n" and num not in self.xref:
+                    self.xref[num] = (1, int(entry.group(1)), int(entry.group(2)))
+
+    # -------------------------
+    # Pages
+    # -------------------------
+    def pages(self) -> List[Tuple[int, dict]]:
+        """[(object number, page dict with inherited attributes)] in document order."""
+        root = self.resolve(self.trailer["Root"])
+        pages_ref = root.get("Pages")
+        result, stack, seen = [], [(pages_ref, {})], set()
+        while stack:
+            ref, inherited = stack.pop()
+            num = ref.num if isinstance(ref, Ref) else None
+            if num is not None:
+                if num in seen:
+                    continue
+                seen.add(num)
+            node = self.resolve(ref)
+            if not isinstance(node, dict):
+                continue
+            attrs = {**inherited, **{k: node[k] for k in ("MediaBox", "CropBox", "Rotate") if k in node}}
+            if node.get("Type") == "Pages" or "Kids" in node:
+                kids = self.resolve(node.get("Kids")) or []
+                stack.extend((kid, attrs) for kid in reversed(kids))
+            else:
+                result.append((num, {**node, **attrs}))
+        return result
+
+
+def _page_text(reader: PdfReader, contents) -> str:
+    chunks = []
+    for stream in contents:
+        try:
+            data = reader.decode(stream)
+        except (PdfIndexError, zlib.error):
+            continue
+        for block in TEXT_BLOCK_RE.finditer(data):
+            line = []
+            for token in TEXT_TOKEN_RE.finditer(block.group(1)):
+                value = token.group(0)
+                if value[:1] == b"(":
+                    line.append(_unescape(value[1:-1]).decode("latin-1"))
+                elif value in (b"T*", b"'", b'"', b"Td", b"TD", b"Tm") and line and not line[-1].endswith("\n"):
+                    line.append("\n")
+            text = "".join(line).strip()
+            if text:
+                chunks.append(text)
+    return "\n".join(chunks)
+
+
+def _box(reader: PdfReader, value) -> Optional[List[float]]:
+    box = reader.resolve(value)
+    if not isinstance(box, list) or len(box) != 4:
+        return None
+    return [float(reader.resolve(v)) for v in box]
+
+
+def build_index(data, extract_text: bool = True) -> Dict[str, Any]:
+    """Page index of a PDF in a bytes-like buffer; see module docstring for the layout."""
+    reader = PdfReader(data)
+    pages, texts, text_offset = [], [], 0
+    for number, (num, page) in enumerate(reader.pages(), start=1):
+        box = _box(reader, page.get("CropBox")) or _box(reader, page.get("MediaBox")) or [0, 0, 612, 792]
+        contents = reader.resolve(page.get("Contents"))
+        contents = contents if isinstance(contents, list) else [contents] if contents is not None else []
+        streams = [s for s in (reader.resolve(c) for c in contents) if isinstance(s, Stream)]
+        text = _page_text(reader, streams) if extract_text else ""
+        entry = {
+            "number": number,
+            "width": round(abs(box[2] - box[0]), 2),
+            "height": round(abs(box[3] - box[1]), 2),
+            "rotate": int(reader.resolve(page.get("Rotate", 0)) or 0) % 360,
+            "offset": reader.offset_of(num) if num is not None else None,
+            "content": [[s.offset, s.length] for s in streams],
+            "text_start": text_offset,
+            "text_length": len(text),
+        }
+        pages.append(entry)
+        texts.append(text)
+        text_offset += len(text) + 1  # pages joined with "\n"
+    return {
+        "version": INDEX_VERSION,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "page_count": len(pages),
+        "pages": pages,
+        "text": "\n".join(texts),
+    }
@@ -14,6 +14,11 @@ Key responsibilities:
 - Create/update a focused view for a given source object
 - Retrieve the focused view for a given source object (if any)
 - List and manage annotations for a given document/page/layer/owner
+- Serve all annotations of a document grouped by page from cache
+  (versioned per document, bumped by Annotation post_save/post_delete).
+  The version stamp expires like every other cache entry; other processes
+  see a bump only with the shared cache (settings.CACHE_URL), otherwise
+  after CACHE_VERSION_TIMEOUT seconds
 
 All APIs work with generic identifiers (model path + object id) and
 never depend on concrete domain models like device, lamp, motor, etc.
@@ -21,13 +26,29 @@ never depend on concrete domain models like device, lamp, motor, etc.
 
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import hashlib
+import uuid
+from typing import Any, Dict, Iterable, Optional
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 from .models import FocusedView, Annotation, AnnotationType
 from .config import DEFAULT_PDF_ZOOM
 
+ANNOTATIONS_CACHE_PREFIX = "pdfviewer:annotations:"
+ANNOTATIONS_CACHE_TIMEOUT = 60 * 60
+
+
+def _document_key(document_ref: str) -> str:
+    return hashlib.sha1(document_ref.encode("utf-8")).hexdigest()
+
+
+def _version_timeout() -> int:
+    # Per-process cache: short (CACHE_VERSION_TIMEOUT); shared cache: as long as the payloads
+    return getattr(settings, "CACHE_VERSION_TIMEOUT", None) or ANNOTATIONS_CACHE_TIMEOUT
+
 
 class PdfViewerService:
     """Service layer for pdfviewer models.
@@ -121,6 +142,60 @@ class PdfViewerService:
             qs = qs.filter(owner_object_id=str(owner_object_id))
         return qs.order_by("page_number", "created")
 
+    @staticmethod
+    def annotations_version(document_ref: str) -> str:
+        """Cache version of a document's annotations (changes on every Annotation write)."""
+        key = f"{ANNOTATIONS_CACHE_PREFIX}version:{_document_key(document_ref)}"
+        version = cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, _version_timeout()):
+                version = cache.get(key) or version
+        return version
+
+    @staticmethod
+    def invalidate_annotations(document_ref: str) -> None:
+        cache.set(f"{ANNOTATIONS_CACHE_PREFIX}version:{_document_key(document_ref)}", uuid.uuid4().hex, _version_timeout())
+
+    @classmethod
+    def annotations_by_document(
+        cls,
+        *,
+        document_ref: str,
+        layer_key: str | None = None,
+        owner_model_path: str | None = None,
+        owner_object_id: str | None = None,
+    ) -> Dict[str, Any]:
+        """All annotations of a document grouped by page - one query, cached per document version.
+
+        Returns {"version": "...", "document_ref": "...", "count": n, "pages": {"1": [...], ...}}.
+        """
+        from .serializers import AnnotationSerializer
+
+        version = cls.annotations_version(document_ref)
+        filters = f"{layer_key or ''}|{owner_model_path or ''}|{owner_object_id or ''}"
+        key = (
+            f"{ANNOTATIONS_CACHE_PREFIX}{_document_key(document_ref)}:{version}:"
+            f"{hashlib.sha1(filters.encode('utf-8')).hexdigest()[:16]}"
+        )
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+
+        pages: Dict[str, list] = {}
+        annotations = cls.list_annotations(
+            document_ref=document_ref,
+            layer_key=layer_key,
+            owner_model_path=owner_model_path,
+            owner_object_id=owner_object_id,
+        )
+        data = AnnotationSerializer(annotations, many=True).data
+        for item in data:
+            pages.setdefault(str(item["page_number"]), []).append(item)
+        payload = {"version": version, "document_ref": document_ref, "count": len(data), "pages": pages}
+        cache.set(key, payload, ANNOTATIONS_CACHE_TIMEOUT)
+        return payload
+
     @staticmethod
     @transaction.atomic
     def create_annotation(
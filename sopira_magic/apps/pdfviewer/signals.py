@@ -0,0 +1,41 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/pdfviewer/signals.py
+#   PdfViewer Signals - annotation cache invalidation
+#   Bumps the per-document annotations version on every write
+#..............................................................
+
+"""
+Signal handlers keeping the cached annotations-by-document payload in sync.
+
+Every Annotation save/delete bumps the version of its document (and of the
+previous document when document_ref changed), so the next read rebuilds
+the payload and clients holding the old ETag receive fresh data.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Annotation
+from .services import PdfViewerService
+
+
+@receiver(pre_save, sender=Annotation, dispatch_uid="pdfviewer_annotation_pre_save")
+def _remember_document(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._previous_document_ref = (
+        Annotation.objects.filter(pk=instance.pk).values_list("document_ref", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Annotation, dispatch_uid="pdfviewer_annotation_post_save")
+def _invalidate_on_save(sender, instance, raw=False, **kwargs):
+    PdfViewerService.invalidate_annotations(instance.document_ref)
+    previous = getattr(instance, "_previous_document_ref", None)
+    if previous and previous != instance.document_ref:
+        PdfViewerService.invalidate_annotations(previous)
+
+
+@receiver(post_delete, sender=Annotation, dispatch_uid="pdfviewer_annotation_post_delete")
+def _invalidate_on_delete(sender, instance, **kwargs):
+    PdfViewerService.invalidate_annotations(instance.document_ref)
@@ -0,0 +1,224 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/pdfviewer/tests/test_documents.py
+#   PdfViewer Document Tests
+#   Tests for pdfindex.py, documents.py and pdfviewer endpoints
+#..............................................................
+
+"""
+   PdfViewer Document Tests.
+
+   Tests for the page index reader, sidecar caching, range delivery with
+   strong ETags and the cached annotations-by-document endpoint.
+"""
+
+import shutil
+import zlib
+
+import pytest
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sopira_magic.apps.pdfviewer import documents
+from sopira_magic.apps.pdfviewer.config import PDF_DEV_ROOT
+from sopira_magic.apps.pdfviewer.documents import DocumentNotFound, PdfDocumentService
+from sopira_magic.apps.pdfviewer.pdfindex import build_index
+from sopira_magic.apps.pdfviewer.services import PdfViewerService
+from sopira_magic.apps.pdfviewer.views import (
+    annotations_by_document_view,
+    document_file_view,
+    document_index_view,
+)
+
+factory = APIRequestFactory()
+
+
+def _authenticated_get(*args, **kwargs):
+    request = factory.get(*args, **kwargs)
+    force_authenticate(request, get_user_model()(username='pdfreader'))
+    return request
+
+
+def make_pdf() -> bytes:
+    """Two pages, inherited MediaBox, compressed content with text on page 1."""
+    content = zlib.compress(b"BT /F1 12 Tf 72 712 Td (Hello \\(PDF\\)) Tj T* [(Wor) -20 (ld)] TJ ET")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 /MediaBox [0 0 595 842] >>",
+        b"<< /Type /Page /Parent 2 0 R /Contents 5 0 R >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 842 595] /Rotate 90 >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream",
+    ]
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture
+def doc_root(settings, tmp_path):
+    settings.PDFVIEWER_DOCUMENT_ROOT = str(tmp_path)
+    (tmp_path / 'plans').mkdir()
+    (tmp_path / 'plans' / 'test.pdf').write_bytes(make_pdf())
+    cache.clear()
+    yield tmp_path
+    cache.clear()
+
+
+class TestPageIndex:
+    """Test suite for pdfindex.build_index."""
+
+    def test_classic_xref(self):
+        """Test page sizes, inheritance, offsets and text slices."""
+        data = make_pdf()
+        index = build_index(data)
+        first, second = index['pages']
+
+        assert index['page_count'] == 2
+        assert (first['width'], first['height'], first['rotate']) == (595, 842, 0)
+        assert (second['width'], second['height'], second['rotate']) == (842, 595, 90)
+        assert data[first['offset']:].startswith(b'3 0 obj')
+        offset, length = first['content'][0]
+        assert zlib.decompress(data[offset:offset + length]).startswith(b'BT')
+        text = index['text'][first['text_start']:first['text_start'] + first['text_length']]
+        assert text == 'Hello (PDF)\nWorld'
+        assert second['content'] == [] and second['text_length'] == 0
+
+    def test_xref_streams_and_object_streams(self):
+        """Test the bundled (linearized, compressed xref) sample document."""
+        sample = next(PDF_DEV_ROOT.glob('*.pdf'))
+        index = build_index(sample.read_bytes())
+        assert index['page_count'] == 1
+        assert (index['pages'][0]['width'], index['pages'][0]['height']) == (842, 1191)
+        assert len(index['pages'][0]['content']) == 8
+
+
+class TestDocumentService:
+    """Test suite for PdfDocumentService."""
+
+    def test_index_stored_alongside_and_reused(self, doc_root, monkeypatch):
+        """Test the sidecar index is built once and reused across processes."""
+        index = PdfDocumentService.get_index('plans/test.pdf')
+        assert (doc_root / 'plans' / 'test.pdf.index.json').exists()
+        assert index['etag'] == f'"{index["sha256"]}"'
+
+        cache.clear()  # new process: only the sidecar is left
+        monkeypatch.setattr(documents, 'build_index', lambda data: pytest.fail('index rebuilt'))
+        assert PdfDocumentService.get_index('plans/test.pdf')['sha256'] == index['sha256']
+
+    def test_rebuilt_after_change(self, doc_root):
+        """Test a changed file gets a new index and ETag."""
+        before = PdfDocumentService.get_index('plans/test.pdf')['etag']
+        (doc_root / 'plans' / 'test.pdf').write_bytes(make_pdf() + b'\n% appended\n')
+        assert PdfDocumentService.get_index('plans/test.pdf')['etag'] != before
+
+    def test_traversal_refused(self, doc_root):
+        """Test refs outside the root or to non-PDF files are rejected."""
+        (doc_root.parent / 'secret.pdf').write_bytes(make_pdf())
+        shutil.copy(doc_root / 'plans' / 'test.pdf', doc_root / 'plans' / 'test.txt')
+        for ref in ('../secret.pdf', 'plans/test.txt', 'missing.pdf'):
+            with pytest.raises(DocumentNotFound):
+                PdfDocumentService.resolve(ref)
+
+
+class TestDocumentEndpoints:
+    """Test suite for pdfviewer/documents/ and pdfviewer/document-index/."""
+
+    def test_range_and_strong_etag(self, doc_root):
+        """Test byte ranges for pdf.js and 304 on the content hash."""
+        body = make_pdf()
+        response = document_file_view(
+            _authenticated_get('/api/pdfviewer/documents/plans/test.pdf', HTTP_RANGE='bytes=0-7'),
+            document_ref='plans/test.pdf',
+        )
+        assert response.status_code == 206
+        assert b''.join(response.streaming_content) == body[:8]
+        assert response['Content-Range'] == f'bytes 0-7/{len(body)}'
+        assert not response['ETag'].startswith('W/')
+
+        cached = document_file_view(
+            _authenticated_get('/api/pdfviewer/documents/plans/test.pdf', HTTP_IF_NONE_MATCH=response['ETag']),
+            document_ref='plans/test.pdf',
+        )
+        assert cached.status_code == 304
+
+    def test_index_if_none_match_weak(self, doc_root):
+        """Test the index endpoint answers 304 for a weak or listed validator."""
+        request = _authenticated_get('/api/pdfviewer/document-index/x')
+        etag = document_index_view(request, document_ref='plans/test.pdf')['ETag']
+
+        request = _authenticated_get('/api/pdfviewer/document-index/x', HTTP_IF_NONE_MATCH=f'"x", W/{etag}')
+        assert document_index_view(request, document_ref='plans/test.pdf').status_code == 304
+
+    def test_anonymous_refused_without_opt_in(self, doc_root):
+        """Test documents need authentication unless PDFVIEWER_ALLOW_ANONYMOUS is set."""
+        response = document_file_view(factory.get('/api/pdfviewer/documents/plans/test.pdf'), document_ref='plans/test.pdf')
+        assert response.status_code in (401, 403)
+
+    def test_index_endpoint(self, doc_root):
+        """Test page metadata without text by default."""
+        response = document_index_view(_authenticated_get('/api/pdfviewer/document-index/x'), document_ref='plans/test.pdf')
+        assert response.status_code == 200
+        assert response.data['page_count'] == 2
+        assert 'text' not in response.data
+        missing = document_index_view(_authenticated_get('/api/pdfviewer/document-index/x'), document_ref='nope.pdf')
+        assert missing.status_code == 404
+
+
+@pytest.mark.django_db
+class TestAnnotationsByDocument:
+    """Test suite for the cached annotations-by-document endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def clean_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def _annotate(self, page):
+        return PdfViewerService.create_annotation(
+            document_ref='plan.pdf', page_number=page, x=0.1, y=0.1, width=0.2, height=0.2,
+            annotation_type='rectangle',
+        )
+
+    def _get(self, **headers):
+        return annotations_by_document_view(
+            _authenticated_get('/api/pdfviewer/annotations/by-document/', {'document_ref': 'plan.pdf'}, **headers)
+        )
+
+    def test_grouped_cached_and_invalidated(self, django_assert_num_queries):
+        """Test one query for all pages, cache hits, invalidation on writes."""
+        self._annotate(1)
+        self._annotate(3)
+        with django_assert_num_queries(1):
+            first = self._get()
+        assert first.data['count'] == 2
+        assert set(first.data['pages']) == {'1', '3'}
+
+        with django_assert_num_queries(0):
+            assert self._get().data == first.data
+        assert self._get(HTTP_IF_NONE_MATCH=first['ETag']).status_code == 304
+
+        annotation = self._annotate(3)
+        assert self._get().data['count'] == 3
+        annotation.delete()
+        assert self._get().data['count'] == 2
+
+    def test_if_none_match_lists_and_wildcard(self):
+        """Test If-None-Match with a list of ETags, a strong form of the weak ETag and '*'."""
+        etag = self._get()['ETag']
+
+        assert self._get(HTTP_IF_NONE_MATCH=f'"other", {etag}').status_code == 304
+        assert self._get(HTTP_IF_NONE_MATCH=etag.removeprefix('W/')).status_code == 304
+        assert self._get(HTTP_IF_NONE_MATCH='*').status_code == 304
+        assert self._get(HTTP_IF_NONE_MATCH='"other"').status_code == 200
+
+    def test_document_ref_required(self):
+        """Test missing document_ref returns 400."""
+        assert annotations_by_document_view(_authenticated_get('/api/pdfviewer/annotations/by-document/')).status_code == 400
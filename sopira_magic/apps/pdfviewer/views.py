@@ -10,18 +10,33 @@ PdfViewer Views - DRF viewsets and endpoints.
 In the first iteration most endpoints for pdfviewer will be wired
 through the config-driven API gateway (VIEWS_MATRIX + view_factory).
 
-This module exists as a placeholder for:
-- potential specialized endpoints (e.g. assign-focused-view helpers),
-- or direct registration of viewsets if needed in the future.
+This module holds the specialized endpoints (registered via
+CUSTOM_ENDPOINTS):
+- document delivery with byte ranges for pdf.js progressive loading
+- precomputed page index (page count, sizes, offsets, text slices)
+- all annotations of a document in one cached response
 
-For now, core CRUD for FocusedView and Annotation is expected to be
-provided via dynamically created viewsets in the api app.
+Core CRUD for FocusedView and Annotation is provided via dynamically
+created viewsets in the api app.
 """
 
-from rest_framework import viewsets, permissions
+from django.conf import settings
+from rest_framework import status, viewsets, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
 
+from sopira_magic.apps.api.bootstrap import etag_matches
+from sopira_magic.apps.file_storage.serving import file_response
+
+from .documents import DocumentNotFound, PdfDocumentService
 from .models import FocusedView, Annotation
 from .serializers import FocusedViewSerializer, AnnotationSerializer
+from .services import PdfViewerService
+
+# Anonymous document access only with the explicit PDFVIEWER_ALLOW_ANONYMOUS opt-in
+DOCUMENT_PERMISSIONS = (
+    [permissions.AllowAny] if getattr(settings, "PDFVIEWER_ALLOW_ANONYMOUS", False) else [permissions.IsAuthenticated]
+)
 
 
 class FocusedViewViewSet(viewsets.ModelViewSet):
@@ -42,3 +57,92 @@ class AnnotationViewSet(viewsets.ModelViewSet):
     queryset = Annotation.objects.all()
     serializer_class = AnnotationSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+
+def _not_found(document_ref):
+    return Response({"detail": f"Document not found: {document_ref}"}, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(["GET", "HEAD"])
+@permission_classes(DOCUMENT_PERMISSIONS)
+def document_file_view(request, document_ref):
+    """
+    PDF delivery for pdf.js: Range requests (206), strong ETag (content
+    SHA-256), If-None-Match / If-Range, sendfile via FileResponse.
+    """
+    try:
+        index = PdfDocumentService.get_index(document_ref)
+        path = PdfDocumentService.resolve(document_ref)
+    except DocumentNotFound:
+        return _not_found(document_ref)
+    return file_response(
+        request, path, "application/pdf",
+        etag=index["etag"], filename=path.name,
+        max_age=getattr(settings, "PDFVIEWER_CACHE_MAX_AGE", 3600),
+        inline_types=frozenset({"application/pdf"}),  # server-side documents, not uploads
+    )
+
+
+@api_view(["GET"])
+@permission_classes(DOCUMENT_PERMISSIONS)
+def document_index_view(request, document_ref):
+    """
+    Precomputed page index of a document.
+
+    Query params:
+    - text: "1" to include the document text (pages slice it via text_start / text_length)
+
+    Response format:
+    {
+        "document_ref": "plan.pdf", "sha256": "3980...", "size": 481739, "page_count": 1,
+        "pages": [{"number": 1, "width": 842.0, "height": 1191.0, "rotate": 270,
+                   "offset": 480884, "content": [[965, 65168], ...],
+                   "text_start": 0, "text_length": 0}]
+    }
+    """
+    try:
+        index = PdfDocumentService.get_index(document_ref)
+    except DocumentNotFound:
+        return _not_found(document_ref)
+    headers = {"ETag": index["etag"], "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("If-None-Match", ""), index["etag"]):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    exclude = {"stamp", "etag", "version"} | (set() if request.query_params.get("text") == "1" else {"text"})
+    data = {"document_ref": document_ref, **{k: v for k, v in index.items() if k not in exclude}}
+    return Response(data, headers=headers)
+
+
+@api_view(["GET"])
+@permission_classes(DOCUMENT_PERMISSIONS)
+def annotations_by_document_view(request):
+    """
+    All annotations of one document grouped by page (replaces per-page list calls).
+
+    Query params:
+    - document_ref (required), layer_key, owner_model_path, owner_object_id
+
+    Cached per document; Annotation writes change "version" (also the ETag).
+
+    Response format:
+    {"version": "9b1e...", "document_ref": "plan.pdf", "count": 3,
+     "pages": {"1": [{<Annotation>}, ...], "4": [...]}}
+    """
+    params = request.query_params
+    document_ref = params.get("document_ref")
+    if not document_ref:
+        return Response({"detail": "document_ref is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    etag = f'W/"{PdfViewerService.annotations_version(document_ref)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("If-None-Match", ""), etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    payload = PdfViewerService.annotations_by_document(
+        document_ref=document_ref,
+        layer_key=params.get("layer_key"),
+        owner_model_path=params.get("owner_model_path"),
+        owner_object_id=params.get("owner_object_id"),
+    )
+    headers["ETag"] = f'W/"{payload["version"]}"'
+    return Response(payload, headers=headers)
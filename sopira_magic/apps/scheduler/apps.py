@@ -9,6 +9,7 @@
 
    Django AppConfig for scheduler application.
    Manages scheduled tasks, execution tracking, and retry logic.
+   Registers the built-in task handlers (handlers.py) on startup.
 
    Configuration:
    - App name: sopira_magic.apps.scheduler
@@ -27,3 +28,7 @@ class SchedulerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sopira_magic.apps.scheduler'
     verbose_name = 'Scheduler'
+
+    def ready(self):
+        from .handlers import register_builtin_handlers
+        register_builtin_handlers()
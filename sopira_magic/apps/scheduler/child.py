@@ -0,0 +1,43 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/child.py
+#   Scheduler Child - process pool entry point
+#   Runs one task handler in a spawned child process
+#..............................................................
+
+"""
+   Scheduler Child - Process Pool Entry Point.
+
+   Target of the spawned child processes of SCHEDULER_POOL='process'
+   (engine._run_in_process). A spawned child starts from a fresh
+   interpreter, so this module must not import models at import time: it
+   runs django.setup() first (AppConfig.ready() registers the handlers),
+   then looks the handler up by task_type.
+
+   The child sends one string back over the pipe: '' on success, the
+   formatted error otherwise.
+"""
+
+from typing import Any, Dict
+
+MAX_ERROR_LENGTH = 10000
+
+
+def run_task(task_type: str, config: Dict[str, Any], writer) -> None:
+    import django
+    from django.db import connections
+
+    error = ""
+    try:
+        django.setup()
+        from .registry import get_task_handler
+
+        handler = get_task_handler(task_type)
+        if handler is None:
+            raise LookupError(f"No handler registered for task type '{task_type}'")
+        handler(config)
+    except BaseException as e:  # noqa: BLE001 - reported to the parent
+        error = (f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)[:MAX_ERROR_LENGTH]
+    finally:
+        connections.close_all()
+    writer.send(error)
+    writer.close()
@@ -0,0 +1,164 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/cron.py
+#   Scheduler Cron - cron expression parsing
+#   5-field cron schedules and next-run computation
+#..............................................................
+
+"""
+   Scheduler Cron - Cron Expression Parsing.
+
+   Parses ScheduledTask.schedule (standard 5-field cron) into sets of allowed
+   values and computes the next run after a given moment.
+
+   Syntax:
+   - fields: minute hour day-of-month month day-of-week
+   - values: *, 5, 1-5, */15, 10-40/10, 1,15,30; month/day names (jan, mon)
+   - day-of-week: 0-7 (0 and 7 = Sunday)
+   - macros: @yearly, @annually, @monthly, @weekly, @daily, @midnight, @hourly
+   - when both day-of-month and day-of-week are restricted, a day matches if
+     either matches (Vixie cron semantics)
+
+   Times are evaluated in the current Django time zone (settings.TIME_ZONE).
+
+   Usage:
+   ```python
+   from sopira_magic.apps.scheduler.cron import CronSchedule
+
+   schedule = CronSchedule.parse('*/15 6-18 * * mon-fri')
+   next_run = schedule.next_after(timezone.now())
+   ```
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+from django.utils import timezone
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+DAY_NAMES = {name: i for i, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+
+# (name, min, max, names)
+FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day", 1, 31, {}),
+    ("month", 1, 12, MONTH_NAMES),
+    ("weekday", 0, 7, DAY_NAMES),
+)
+
+# Upper bound for the next-run search (covers Feb 29 schedules)
+SEARCH_YEARS = 8
+
+
+class CronError(ValueError):
+    """Invalid cron expression or a schedule that never fires."""
+
+
+def _value(token: str, low: int, high: int, names: dict, expr: str) -> int:
+    token = token.lower()
+    if token in names:
+        return names[token]
+    if not token.isdigit():
+        raise CronError(f"Invalid value '{token}' in '{expr}'")
+    value = int(token)
+    if not low <= value <= high:
+        raise CronError(f"Value {value} out of range {low}-{high} in '{expr}'")
+    return value
+
+
+def _parse_field(text: str, low: int, high: int, names: dict, expr: str) -> Tuple[FrozenSet[int], bool]:
+    """Allowed values of one field and whether the field is unrestricted ('*')."""
+    values = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise CronError(f"Invalid step '{step_text}' in '{expr}'")
+            step = int(step_text)
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            first, _, last = base.partition("-")
+            start, end = _value(first, low, high, names, expr), _value(last, low, high, names, expr)
+            if start > end:
+                raise CronError(f"Invalid range '{base}' in '{expr}'")
+        else:
+            start = _value(base, low, high, names, expr)
+            end = high if step_text else start
+        values.update(range(start, end + 1, step))
+    return frozenset(values), text == "*"
+
+
+class CronSchedule:
+    """Parsed cron expression (immutable, cached per expression)."""
+
+    __slots__ = ("expression", "minutes", "hours", "days", "months", "weekdays", "any_day", "any_weekday")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        text = MACROS.get(expression.strip().lower(), expression)
+        parts = text.split()
+        if len(parts) != len(FIELDS):
+            raise CronError(f"Expected {len(FIELDS)} fields in '{expression}'")
+        parsed = [_parse_field(part, low, high, names, expression)
+                  for part, (_, low, high, names) in zip(parts, FIELDS)]
+        self.minutes, self.hours = parsed[0][0], parsed[1][0]
+        self.days, self.any_day = parsed[2]
+        self.months = parsed[3][0]
+        weekdays, self.any_weekday = parsed[4]
+        # 7 = Sunday; stored in datetime.weekday() numbering (Monday = 0)
+        self.weekdays = frozenset((d - 1) % 7 for d in weekdays)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def parse(cls, expression: str) -> "CronSchedule":
+        return cls(expression)
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after `moment` (aware in, aware out)."""
+        tz = timezone.get_current_timezone()
+        local = timezone.localtime(moment, tz) if timezone.is_aware(moment) else moment
+        current = local.replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current.replace(year=current.year + SEARCH_YEARS, month=1, day=1)
+
+        while current < limit:
+            if current.month not in self.months:
+                year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+                current = current.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(current):
+                current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if current.hour not in self.hours:
+                current = (current + timedelta(hours=1)).replace(minute=0)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return timezone.make_aware(current, tz)
+        raise CronError(f"Schedule '{self.expression}' never fires")
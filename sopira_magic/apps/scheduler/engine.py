@@ -0,0 +1,465 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/engine.py
+#   Scheduler Engine - cron task runner
+#   In-memory next_run heap, SKIP LOCKED claims, bounded worker pool
+#..............................................................
+
+"""
+   Scheduler Engine - Cron Task Runner.
+
+   Runs enabled ScheduledTask rows that have a cron schedule (schedule != '').
+   One-shot rows (schedule '', e.g. generator jobs) are left to their own
+   workers (generator_worker).
+
+   Flow (one daemon per node: `python manage.py scheduler`):
+   1. refresh() loads (next_run, task id) of all cron tasks into an in-memory
+      min-heap; tasks without next_run get it computed from their schedule.
+      Repeated every SCHEDULER_REFRESH_INTERVAL seconds to pick up edits and
+      runs claimed by other nodes.
+   2. The main thread sleeps on a single condition variable until the
+      earliest of: heap top due, a running task finished, a thread timeout
+      deadline, the next refresh. There is no polling in between.
+   3. Due tasks (at most the free pool slots) are claimed in one transaction
+      with SELECT ... FOR UPDATE SKIP LOCKED; next_run is advanced to the
+      next cron slot in the same transaction, so no other node claims the
+      same run. The 'running' TaskExecution rows of a claim batch are
+      inserted with one bulk_create.
+   4. Claimed tasks run on a bounded pool of SCHEDULER_WORKERS slots
+      (SCHEDULER_POOL):
+      - thread:  handlers run in pool threads; a timeout marks the execution
+                 failed but cannot interrupt the thread, its slot stays busy
+                 until the handler returns
+      - process: every run is a spawned child process (django.setup(), handler
+                 looked up by task_type), terminated on timeout; handlers
+                 must be registered in AppConfig.ready() to exist there
+   5. Finished executions are written back with bulk_update once per wake-up.
+      Retry state is merged into the re-read (locked) task rows: only
+      config['retry_count'] and an earlier next_run are written, so admin
+      edits and slots advanced by other nodes in the meantime are kept.
+
+   Semantics:
+   - Missed runs (daemon down) are coalesced: the task runs once, then
+     continues at the next cron slot after now.
+   - A task never overlaps itself across nodes: a running execution younger
+     than the task timeout skips the slot; older ones are marked failed
+     ('abandoned', the node running it died).
+
+   ScheduledTask.config keys read by the engine:
+   - timeout:     seconds (default SCHEDULER_TASK_TIMEOUT)
+   - max_retries: retries after a failure (default SCHEDULER_MAX_RETRIES)
+   - retry_delay: seconds before a retry (default SCHEDULER_RETRY_DELAY)
+   - retry_count: maintained by the engine (current retry streak)
+
+   Handlers are looked up by task_type in registry.py (in the child process
+   by child.run_task for the process pool).
+
+   Usage:
+   ```python
+   engine = SchedulerEngine(workers=4, pool='process')
+   engine.run()            # until engine.stop()
+   engine.run(once=True)   # run currently due tasks and return
+   ```
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+
+from .child import MAX_ERROR_LENGTH, run_task
+from .cron import CronError, CronSchedule
+from .models import ScheduledTask, TaskExecution
+from .registry import TaskHandler, get_task_handler
+
+logger = logging.getLogger(__name__)
+
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+POOLS = ("thread", "process")
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _error_text(error: BaseException) -> str:
+    text = str(error) if isinstance(error, (TimeoutError, _ChildError)) else f"{type(error).__name__}: {error}"
+    return text[:MAX_ERROR_LENGTH]
+
+
+class _ChildError(Exception):
+    """Failure reported by a task process (message already formatted)."""
+
+
+@dataclass
+class _Run:
+    """A claimed task execution in flight."""
+    task: ScheduledTask
+    execution: TaskExecution
+    timeout: float
+    deadline: float = 0.0  # time.monotonic()
+    future: Optional[Future] = None
+
+
+# -------------------------
+# Process pool: one spawned child per run
+# -------------------------
+def _run_in_process(task_type: str, config: Dict[str, Any], timeout: float) -> None:
+    """Run the task_type handler in a spawned child; terminate it when it exceeds timeout."""
+    # spawn, not fork: the scheduler is multi-threaded (pool threads hold
+    # locks and DB connections a forked child would inherit mid-use)
+    ctx = multiprocessing.get_context("spawn")
+    reader, writer = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=run_task, args=(task_type, config, writer), name="scheduler-task")
+    process.start()
+    writer.close()
+    try:
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+            raise TimeoutError(f"Timed out after {timeout:g}s (process terminated)")
+        try:
+            error = reader.recv() if reader.poll() else None
+        except EOFError:  # child died before reporting
+            error = None
+    finally:
+        reader.close()
+    if error is None:
+        raise _ChildError(f"Task process exited with code {process.exitcode}")
+    if error:
+        raise _ChildError(error)
+
+
+class SchedulerEngine:
+    """Cron scheduler: next_run heap + SKIP LOCKED claims + bounded worker pool."""
+
+    def __init__(self, workers: Optional[int] = None, pool: Optional[str] = None,
+                 refresh_interval: Optional[float] = None):
+        self.workers = max(int(workers or _setting("SCHEDULER_WORKERS", 4)), 1)
+        self.pool = pool or _setting("SCHEDULER_POOL", "thread")
+        if self.pool not in POOLS:
+            raise ValueError(f"Unknown scheduler pool '{self.pool}' (expected one of {', '.join(POOLS)})")
+        self.refresh_interval = float(refresh_interval or _setting("SCHEDULER_REFRESH_INTERVAL", 60.0))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+
+        self._heap: List[Tuple[datetime, str]] = []
+        self._scheduled: Dict[str, datetime] = {}  # task id → next_run of its live heap entry
+        self._running: Dict[str, _Run] = {}  # execution id → run
+        self._orphans: Set[Future] = set()  # timed-out thread runs still holding a slot
+        self._finished: deque = deque()  # (run, future) appended by pool threads
+        self._wake = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._next_refresh = 0.0
+        self._invalid: Set[str] = set()
+
+        # Pending bulk writes
+        self._executions: List[TaskExecution] = []
+        self._retries: Dict[str, Tuple[Optional[int], Optional[datetime]]] = {}  # task id → (retry_count, retry_at)
+
+    # -------------------------
+    # Cron index (min-heap of next_run)
+    # -------------------------
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """Reload the heap from the database; returns the number of indexed tasks."""
+        now = now or timezone.now()
+        rows = (
+            ScheduledTask.objects.filter(enabled=True, active=True)
+            .exclude(schedule="")
+            .values_list("id", "schedule", "next_run")
+        )
+        initialized = []
+        self._heap, self._scheduled = [], {}
+        for pk, schedule, next_run in rows:
+            if next_run is None:
+                next_run = self._next_slot(pk, schedule, now)
+                if next_run is None:
+                    continue
+                initialized.append(ScheduledTask(pk=pk, next_run=next_run, updated=now))
+            self._push(str(pk), next_run)
+        if initialized:
+            ScheduledTask.objects.bulk_update(initialized, ["next_run", "updated"])
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        return len(self._scheduled)
+
+    def _next_slot(self, pk, schedule: str, now: datetime) -> Optional[datetime]:
+        try:
+            return CronSchedule.parse(schedule).next_after(now)
+        except CronError as e:
+            if schedule not in self._invalid:
+                self._invalid.add(schedule)
+                logger.warning(f"[SCHEDULER] Task {pk} skipped: {e}")
+            return None
+
+    def _push(self, task_id: str, next_run: datetime) -> None:
+        current = self._scheduled.get(task_id)
+        if current is None or next_run < current:
+            self._scheduled[task_id] = next_run
+            heapq.heappush(self._heap, (next_run, task_id))
+
+    def _peek(self) -> Optional[datetime]:
+        """next_run of the heap top, dropping stale entries."""
+        while self._heap:
+            next_run, task_id = self._heap[0]
+            if self._scheduled.get(task_id) == next_run:
+                return next_run
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime, limit: int) -> List[str]:
+        due = []
+        while len(due) < limit:
+            next_run = self._peek()
+            if next_run is None or next_run > now:
+                break
+            _, task_id = heapq.heappop(self._heap)
+            del self._scheduled[task_id]
+            due.append(task_id)
+        return due
+
+    # -------------------------
+    # Claim (SELECT ... FOR UPDATE SKIP LOCKED)
+    # -------------------------
+    def _timeout(self, task: ScheduledTask) -> float:
+        return float(task.config.get("timeout") or _setting("SCHEDULER_TASK_TIMEOUT", 3600))
+
+    def claim(self, task_ids: List[str], now: Optional[datetime] = None) -> List[_Run]:
+        """Lock due tasks, advance their next_run and open running executions."""
+        now = now or timezone.now()
+        runs: List[_Run] = []
+        with transaction.atomic():
+            tasks = list(
+                ScheduledTask.objects.select_for_update(skip_locked=True)
+                .filter(pk__in=task_ids, enabled=True, active=True, next_run__lte=now)
+                .exclude(schedule="")
+            )
+            if not tasks:
+                return runs
+
+            running = defaultdict(list)
+            for execution in TaskExecution.objects.filter(task__in=tasks, status=STATUS_RUNNING):
+                running[execution.task_id].append(execution)
+
+            abandoned: List[TaskExecution] = []
+            executions: List[TaskExecution] = []
+            for task in tasks:
+                timeout = self._timeout(task)
+                started_after = now - timedelta(seconds=timeout)
+                active = [e for e in running[task.pk] if e.started_at and e.started_at > started_after]
+                for execution in running[task.pk]:
+                    if execution not in active:
+                        execution.status = STATUS_FAILED
+                        execution.completed_at = now
+                        execution.updated = now
+                        execution.error_message = "abandoned (no result within timeout)"
+                        abandoned.append(execution)
+
+                task.next_run = self._next_slot(task.pk, task.schedule, now)
+                task.updated = now
+                if active:
+                    logger.info(f"[SCHEDULER] Task '{task.name}' still running elsewhere, slot skipped")
+                    continue
+                task.last_run = now
+                execution = TaskExecution(
+                    task=task,
+                    status=STATUS_RUNNING,
+                    started_at=now,
+                    retry_count=int(task.config.get("retry_count", 0)),
+                    error_message=f"worker={self.worker_id}",
+                )
+                executions.append(execution)
+                runs.append(_Run(task=task, execution=execution, timeout=timeout))
+
+            ScheduledTask.objects.bulk_update(tasks, ["last_run", "next_run", "updated"])
+            if abandoned:
+                TaskExecution.objects.bulk_update(abandoned, ["status", "completed_at", "error_message", "updated"])
+            if executions:
+                TaskExecution.objects.bulk_create(executions)
+
+        for task in tasks:
+            if task.next_run is not None:
+                self._push(str(task.pk), task.next_run)
+        return runs
+
+    # -------------------------
+    # Execution
+    # -------------------------
+    def _execute(self, task_type: str, handler: TaskHandler, config: Dict[str, Any], timeout: float) -> None:
+        if self.pool == "process":
+            _run_in_process(task_type, config, timeout)
+            return
+        close_old_connections()
+        try:
+            handler(config)
+        finally:
+            close_old_connections()
+
+    def _dispatch(self, run: _Run) -> None:
+        run.deadline = time.monotonic() + run.timeout
+        self._running[str(run.execution.pk)] = run
+        handler = get_task_handler(run.task.task_type)
+        if handler is None:
+            future: Future = Future()
+            future.set_exception(LookupError(f"No handler registered for task type '{run.task.task_type}'"))
+            self._done(run, future)
+            return
+        logger.info(f"[SCHEDULER] Running '{run.task.name}' ({run.task.task_type})")
+        run.future = self._executor.submit(
+            self._execute, run.task.task_type, handler, dict(run.task.config), run.timeout
+        )
+        run.future.add_done_callback(lambda future, run=run: self._done(run, future))
+
+    def _done(self, run: _Run, future: Future) -> None:
+        """Pool thread callback: hand the result to the main thread and wake it."""
+        with self._wake:
+            self._finished.append((run, future))
+            self._wake.notify()
+
+    def _collect(self) -> None:
+        """Record finished runs and thread runs past their deadline."""
+        with self._wake:
+            finished = list(self._finished)
+            self._finished.clear()
+        for run, future in finished:
+            self._orphans.discard(future)
+            if self._running.pop(str(run.execution.pk), None) is not None:
+                self._complete(run, future.exception())
+
+        if self.pool == "thread":
+            now = time.monotonic()
+            for key, run in list(self._running.items()):
+                if run.deadline <= now:
+                    del self._running[key]
+                    self._orphans.add(run.future)
+                    logger.warning(f"[SCHEDULER] Task '{run.task.name}' timed out; thread keeps its slot until it returns")
+                    self._complete(run, TimeoutError(f"Timed out after {run.timeout:g}s"))
+
+    def _complete(self, run: _Run, error: Optional[BaseException]) -> None:
+        now = timezone.now()
+        execution, task = run.execution, run.task
+        execution.status = STATUS_SUCCESS if error is None else STATUS_FAILED
+        execution.completed_at = now
+        execution.updated = now
+        if error is not None:
+            execution.error_message = _error_text(error)
+            logger.warning(f"[SCHEDULER] Task '{task.name}' failed: {execution.error_message}")
+        self._executions.append(execution)
+
+        max_retries = int(task.config.get("max_retries", _setting("SCHEDULER_MAX_RETRIES", 0)))
+        if error is not None and execution.retry_count < max_retries:
+            delay = float(task.config.get("retry_delay", _setting("SCHEDULER_RETRY_DELAY", 60)))
+            retry_at = now + timedelta(seconds=delay)
+            if task.next_run is not None and retry_at >= task.next_run:
+                retry_at = None
+            else:
+                self._push(str(task.pk), retry_at)
+            self._retries[str(task.pk)] = (execution.retry_count + 1, retry_at)
+        elif "retry_count" in task.config:
+            self._retries[str(task.pk)] = (None, None)
+
+    def _write_retries(self) -> None:
+        """Merge pending retry state into the current task rows."""
+        now = timezone.now()
+        tasks = list(ScheduledTask.objects.select_for_update().filter(pk__in=list(self._retries)))
+        for task in tasks:
+            retry_count, retry_at = self._retries[str(task.pk)]
+            if retry_count is None:
+                task.config.pop("retry_count", None)
+            else:
+                task.config["retry_count"] = retry_count
+            if retry_at is not None and (task.next_run is None or retry_at < task.next_run):
+                task.next_run = retry_at
+            task.updated = now
+        if tasks:
+            ScheduledTask.objects.bulk_update(tasks, ["config", "next_run", "updated"])
+
+    def _flush(self) -> None:
+        """Write finished executions and retry state in bulk."""
+        if not self._executions and not self._retries:
+            return
+        try:
+            with transaction.atomic():
+                if self._executions:
+                    TaskExecution.objects.bulk_update(
+                        self._executions, ["status", "completed_at", "error_message", "updated"]
+                    )
+                if self._retries:
+                    self._write_retries()
+        except DatabaseError as e:
+            # Keep the batch, retry on the next wake-up
+            logger.error(f"[SCHEDULER] Cannot record {len(self._executions)} executions: {e}")
+            return
+        self._executions, self._retries = [], {}
+
+    # -------------------------
+    # Main loop (single sleeping waiter)
+    # -------------------------
+    def _free_slots(self) -> int:
+        return self.workers - len(self._running) - len(self._orphans)
+
+    def _wait(self, now: datetime) -> None:
+        timeouts = [self._next_refresh - time.monotonic()]
+        next_run = self._peek()
+        if next_run is not None and self._free_slots() > 0:
+            timeouts.append((next_run - now).total_seconds())
+        if self.pool == "thread":
+            timeouts.extend(run.deadline - time.monotonic() for run in self._running.values())
+        with self._wake:
+            if not self._finished and not self.stop_event.is_set():
+                self._wake.wait(max(min(timeouts), 0.0))
+
+    def stop(self) -> None:
+        """Stop claiming new tasks; run() returns once running tasks finish."""
+        self.stop_event.set()
+        with self._wake:
+            self._wake.notify()
+
+    def run(self, once: bool = False) -> None:
+        """Scheduler loop; once=True runs the currently due tasks and returns."""
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler")
+        self._next_refresh = 0.0
+        logger.info(f"[SCHEDULER] Started {self.worker_id} ({self.pool} pool, {self.workers} workers)")
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                now = timezone.now()
+                if time.monotonic() >= self._next_refresh and not (once and self._next_refresh):
+                    self.refresh(now)
+                self._collect()
+                free = self._free_slots()
+                if free > 0:
+                    due = self._pop_due(now, free)
+                    if due:
+                        for run in self.claim(due, now):
+                            self._dispatch(run)
+                        self._collect()
+                self._flush()
+                if once and not self._running and not self._orphans:
+                    next_run = self._peek()
+                    if next_run is None or next_run > timezone.now():
+                        break
+                self._wait(now)
+        finally:
+            if self._running or self._orphans:
+                logger.info(f"[SCHEDULER] Waiting for {len(self._running) + len(self._orphans)} running tasks")
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._collect()
+            self._flush()
+            logger.info(f"[SCHEDULER] Stopped {self.worker_id}")
@@ -0,0 +1,48 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/handlers.py
+#   Scheduler Handlers - built-in task handlers
+#   Generic handlers registered by SchedulerConfig.ready()
+#..............................................................
+
+"""
+   Scheduler Handlers - Built-in Task Handlers.
+
+   management_command:
+   Runs any Django management command, which covers the existing periodic
+   jobs without scheduler-specific code (read model rebuilds, search
+   reindexes, partition maintenance, ...).
+
+   ScheduledTask.config:
+   - command: command name (required)
+   - args: positional arguments (list, optional)
+   - options: keyword options (dict, optional)
+
+   Example:
+   ```python
+   ScheduledTask.objects.create(
+       name='Ensure measurement partitions',
+       task_type='management_command',
+       schedule='0 3 * * *',
+       config={'command': 'partitions', 'args': ['ensure']},
+   )
+   ```
+"""
+
+from typing import Any, Dict
+
+from .registry import register_task_handler
+
+MANAGEMENT_COMMAND = "management_command"
+
+
+def run_management_command(config: Dict[str, Any]) -> None:
+    from django.core.management import call_command
+
+    command = config.get("command")
+    if not command:
+        raise ValueError("management_command task requires config['command']")
+    call_command(command, *config.get("args", []), **config.get("options", {}))
+
+
+def register_builtin_handlers() -> None:
+    register_task_handler(MANAGEMENT_COMMAND, run_management_command)
@@ -0,0 +1 @@
+# Scheduler management commands
@@ -0,0 +1,84 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/management/commands/scheduler.py
+#   Scheduler Command - Management command
+#   Runs cron ScheduledTask rows (SchedulerEngine daemon)
+#..............................................................
+
+"""
+   Scheduler Command - Management Command.
+
+   Long-running daemon that executes ScheduledTask rows with a cron schedule
+   (scheduler/engine.py). Tasks are claimed with SELECT ... FOR UPDATE SKIP
+   LOCKED, so one daemon per node can run side by side.
+
+   Usage:
+   ```bash
+   # Daemon with 4 spawned worker processes (hard timeouts)
+   python manage.py scheduler --workers 4 --pool process
+
+   # Run currently due tasks and exit
+   python manage.py scheduler --once
+
+   # Show cron tasks, their next run and registered task types
+   python manage.py scheduler --list
+   ```
+
+   Arguments:
+   - --workers: Pool size (default: settings.SCHEDULER_WORKERS)
+   - --pool: thread | process (default: settings.SCHEDULER_POOL)
+   - --refresh-interval: Seconds between task reloads (default: settings.SCHEDULER_REFRESH_INTERVAL)
+   - --once: Exit when no due task is left
+   - --list: Print tasks and exit
+
+   SIGTERM / SIGINT stop claiming and wait for running tasks.
+"""
+
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sopira_magic.apps.scheduler.engine import POOLS, SchedulerEngine
+from sopira_magic.apps.scheduler.models import ScheduledTask
+from sopira_magic.apps.scheduler.registry import registered_task_types
+
+
+class Command(BaseCommand):
+    help = 'Run the cron scheduler (executes due ScheduledTask rows)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker pool size')
+        parser.add_argument('--pool', choices=POOLS, default=None, help='thread | process')
+        parser.add_argument('--refresh-interval', type=float, default=None, help='Seconds between task reloads')
+        parser.add_argument('--once', action='store_true', help='Run currently due tasks and exit')
+        parser.add_argument('--list', action='store_true', help='List cron tasks and exit')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            self._list()
+            return
+
+        try:
+            engine = SchedulerEngine(
+                workers=options['workers'],
+                pool=options['pool'],
+                refresh_interval=options['refresh_interval'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if not options['once']:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: engine.stop())
+
+        self.stdout.write(f'Starting scheduler ({engine.pool} pool, workers={engine.workers})...')
+        engine.run(once=options['once'])
+        self.stdout.write(self.style.SUCCESS('Scheduler stopped'))
+
+    def _list(self):
+        types = registered_task_types()
+        tasks = ScheduledTask.objects.exclude(schedule='').order_by('next_run', 'name')
+        for task in tasks:
+            state = 'enabled' if task.enabled and task.active else 'disabled'
+            handler = '' if task.task_type in types else '  [no handler]'
+            self.stdout.write(f"{task.name:40} {task.schedule:20} {state:9} next={task.next_run or '-'}{handler}")
+        self.stdout.write(f"Task types: {', '.join(types) or '-'}")
@@ -17,6 +17,8 @@
       - Fields: name, task_type, schedule (cron), config (JSON), enabled, last_run, next_run
       - Schedule: cron expression for task scheduling
       - Tracks last and next execution times
+      - Executed by SchedulerEngine (engine.py, `manage.py scheduler`);
+        schedule '' = one-shot row owned by another worker (generator jobs)
 
    2. TaskExecution (extends TimeStampedModel)
       - Task execution log model
@@ -56,6 +58,16 @@ class ScheduledTask(TimeStampedModel):
         verbose_name = _("Scheduled Task")
         verbose_name_plural = _("Scheduled Tasks")
 
+    def clean(self):
+        super().clean()
+        if self.schedule:
+            from django.core.exceptions import ValidationError
+            from .cron import CronError, CronSchedule
+            try:
+                CronSchedule.parse(self.schedule)
+            except CronError as e:
+                raise ValidationError({"schedule": str(e)})
+
 
 class TaskExecution(TimeStampedModel):
     """Task execution log model."""
@@ -0,0 +1,52 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/registry.py
+#   Scheduler Registry - task handler callbacks
+#   Maps ScheduledTask.task_type to the callable that runs it
+#..............................................................
+
+"""
+Registry for scheduled task handlers.
+
+A handler is a callable taking the task's config dict; its return value is
+ignored and any exception marks the execution as failed. Apps register their
+handlers in AppConfig.ready(); the scheduler app itself registers the
+generic 'management_command' handler (see handlers.py).
+
+This keeps the scheduler engine independent from the apps whose periodic
+work it runs (cache warmups, reindexes, rollups, reports).
+
+Usage:
+```python
+from sopira_magic.apps.scheduler.registry import register_task_handler
+
+register_task_handler('reports.daily', lambda config: build_daily_report(**config))
+```
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+TaskHandler = Callable[[Dict[str, Any]], Any]
+
+# Global callback storage: task_type → handler
+_handlers: Dict[str, TaskHandler] = {}
+
+
+def register_task_handler(task_type: str, callback: TaskHandler) -> None:
+    """
+    Register the handler executed for ScheduledTask rows of `task_type`.
+
+    Args:
+        task_type: ScheduledTask.task_type value
+        callback: Function(config) → Any
+    """
+    _handlers[task_type] = callback
+
+
+def get_task_handler(task_type: str) -> Optional[TaskHandler]:
+    """Handler registered for `task_type` (None = unknown task type)."""
+    return _handlers.get(task_type)
+
+
+def registered_task_types() -> List[str]:
+    """All task types with a registered handler."""
+    return sorted(_handlers)
@@ -0,0 +1,84 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/tests/test_cron.py
+#   Scheduler Cron Tests
+#   Tests for cron.py module
+#..............................................................
+
+"""
+   Scheduler Cron Tests.
+
+   Tests for cron expression parsing and next-run computation.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+
+from sopira_magic.apps.scheduler.cron import CronError, CronSchedule
+
+
+def _at(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class TestParse:
+    """Test suite for CronSchedule parsing."""
+
+    def test_fields(self):
+        """Test lists, ranges, steps and names are expanded."""
+        schedule = CronSchedule.parse('*/15 6-8 1,15 jan-mar mon-fri')
+        assert schedule.minutes == {0, 15, 30, 45}
+        assert schedule.hours == {6, 7, 8}
+        assert schedule.days == {1, 15}
+        assert schedule.months == {1, 2, 3}
+        assert schedule.weekdays == {0, 1, 2, 3, 4}
+
+    def test_sunday_aliases(self):
+        """Test 0 and 7 both mean Sunday."""
+        assert CronSchedule.parse('0 0 * * 0').weekdays == CronSchedule.parse('0 0 * * 7').weekdays == {6}
+
+    def test_macro(self):
+        """Test @daily expands to midnight."""
+        assert CronSchedule.parse('@daily').next_after(_at(2025, 3, 4, 10, 0)) == _at(2025, 3, 5, 0, 0)
+
+    @pytest.mark.parametrize('expression', ['', '* * * *', '60 * * * *', '*/0 * * * *', '5-1 * * * *', 'x * * * *'])
+    def test_invalid(self, expression):
+        """Test malformed expressions raise CronError."""
+        with pytest.raises(CronError):
+            CronSchedule.parse(expression)
+
+
+class TestNextAfter:
+    """Test suite for CronSchedule.next_after."""
+
+    def test_strictly_after(self):
+        """Test a matching moment returns the following slot."""
+        schedule = CronSchedule.parse('*/15 * * * *')
+        assert schedule.next_after(_at(2025, 3, 4, 10, 15)) == _at(2025, 3, 4, 10, 30)
+        assert schedule.next_after(_at(2025, 3, 4, 10, 15, 30)) == _at(2025, 3, 4, 10, 30)
+
+    def test_rolls_over_month_and_year(self):
+        """Test hour / day / month carry into the next year."""
+        schedule = CronSchedule.parse('30 2 1 1 *')
+        assert schedule.next_after(_at(2025, 1, 1, 2, 30)) == _at(2026, 1, 1, 2, 30)
+
+    def test_weekday(self):
+        """Test day-of-week restriction (2025-03-08 is a Saturday)."""
+        schedule = CronSchedule.parse('0 9 * * mon')
+        assert schedule.next_after(_at(2025, 3, 8, 12, 0)) == _at(2025, 3, 10, 9, 0)
+
+    def test_day_or_weekday(self):
+        """Test restricted day-of-month and day-of-week match either."""
+        schedule = CronSchedule.parse('0 0 13 * fri')
+        # 2025-03-07 is a Friday, before the 13th
+        assert schedule.next_after(_at(2025, 3, 1, 0, 0)) == _at(2025, 3, 7, 0, 0)
+        assert schedule.next_after(_at(2025, 3, 10, 0, 0)) == _at(2025, 3, 13, 0, 0)
+
+    def test_leap_day(self):
+        """Test Feb 29 is found in the next leap year."""
+        assert CronSchedule.parse('0 0 29 2 *').next_after(_at(2025, 1, 1)) == _at(2028, 2, 29)
+
+    def test_never_fires(self):
+        """Test an impossible date raises CronError."""
+        with pytest.raises(CronError):
+            CronSchedule.parse('0 0 30 2 *').next_after(_at(2025, 1, 1))
@@ -0,0 +1,306 @@
+#..............................................................
+#   ~/sopira.magic/version_01/sopira_magic/apps/scheduler/tests/test_engine.py
+#   Scheduler Engine Tests
+#   Tests for engine.py, handlers and the scheduler command
+#..............................................................
+
+"""
+   Scheduler Engine Tests.
+
+   Tests for SchedulerEngine: cron index refresh, claims (next_run advance,
+   overlap protection), thread / process pool execution with timeouts,
+   retries and bulk execution records.
+   SQLite ignores FOR UPDATE SKIP LOCKED; claim semantics are still covered.
+"""
+
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.utils import timezone
+
+from sopira_magic.apps.scheduler import registry
+from sopira_magic.apps.scheduler.engine import (
+    STATUS_FAILED, STATUS_RUNNING, STATUS_SUCCESS, SchedulerEngine,
+)
+from sopira_magic.apps.scheduler.models import ScheduledTask, TaskExecution
+
+
+# Child processes take seconds; keep the next cron slot out of the test run
+YEARLY = '0 0 1 1 *'
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Register test handlers without leaking them into the global registry."""
+    calls = []
+
+    def register(task_type, callback=None):
+        def handler(config):
+            calls.append((task_type, config))
+            if callback:
+                callback(config)
+        monkeypatch.setitem(registry._handlers, task_type, handler)
+
+    register.calls = calls
+    return register
+
+
+def _task(task_type='test.noop', schedule='*/5 * * * *', due=True, **config):
+    return ScheduledTask.objects.create(
+        name=task_type,
+        task_type=task_type,
+        schedule=schedule,
+        config=config,
+        next_run=timezone.now() - timedelta(seconds=1) if due else None,
+    )
+
+
+def _statuses(task):
+    return list(task.executions.order_by('created', 'retry_count').values_list('status', 'retry_count'))
+
+
+@pytest.mark.django_db
+class TestRefresh:
+    """Test suite for the next_run heap."""
+
+    def test_initializes_missing_next_run(self):
+        """Test cron tasks without next_run get it computed; one-shot and disabled rows are ignored."""
+        cron = _task(due=False)
+        ScheduledTask.objects.create(name='job', task_type='generator.generate', schedule='', next_run=timezone.now())
+        ScheduledTask.objects.create(name='off', task_type='x', schedule='* * * * *', enabled=False)
+
+        engine = SchedulerEngine(workers=1)
+        assert engine.refresh() == 1
+
+        cron.refresh_from_db()
+        assert cron.next_run > timezone.now()
+        assert cron.next_run.minute % 5 == 0
+
+    def test_invalid_schedule_is_skipped(self):
+        """Test a broken cron expression does not stop the refresh."""
+        _task(schedule='not a cron', due=False)
+        assert SchedulerEngine(workers=1).refresh() == 0
+
+    def test_pop_due_respects_limit(self):
+        """Test only as many due tasks as free slots are taken from the heap."""
+        for _ in range(3):
+            _task()
+        engine = SchedulerEngine(workers=2)
+        engine.refresh()
+        assert len(engine._pop_due(timezone.now(), 2)) == 2
+        assert len(engine._pop_due(timezone.now(), 2)) == 1
+
+
+@pytest.mark.django_db
+class TestRun:
+    """Test suite for SchedulerEngine.run(once=True)."""
+
+    def test_runs_due_task(self, handlers):
+        """Test a due task runs once, is recorded and moves to the next slot."""
+        handlers('test.noop')
+        task = _task(target='cache')
+
+        SchedulerEngine(workers=2).run(once=True)
+
+        task.refresh_from_db()
+        assert handlers.calls == [('test.noop', {'target': 'cache'})]
+        assert _statuses(task) == [(STATUS_SUCCESS, 0)]
+        assert task.last_run is not None
+        assert task.next_run > timezone.now()
+        execution = task.executions.get()
+        assert execution.completed_at >= execution.started_at
+
+    def test_not_due_task_is_not_run(self, handlers):
+        """Test tasks whose next_run is in the future are left alone."""
+        handlers('test.noop')
+        task = _task(due=False)
+        SchedulerEngine(workers=1).run(once=True)
+        assert handlers.calls == []
+        assert not task.executions.exists()
+
+    def test_failure_is_retried(self, handlers):
+        """Test a failed run is retried after retry_delay and the streak is reset on success."""
+        def flaky(config):
+            if len(handlers.calls) == 1:
+                raise RuntimeError('boom')
+        handlers('test.flaky', flaky)
+        task = _task('test.flaky', max_retries=2, retry_delay=0)
+
+        SchedulerEngine(workers=1).run(once=True)
+
+        task.refresh_from_db()
+        assert _statuses(task) == [(STATUS_FAILED, 0), (STATUS_SUCCESS, 1)]
+        assert 'RuntimeError: boom' in task.executions.get(status=STATUS_FAILED).error_message
+        assert 'retry_count' not in task.config
+        assert task.next_run > timezone.now()
+
+    def test_retry_keeps_concurrent_task_edits(self):
+        """Test retry state is merged into the current row, not written over admin edits."""
+        task = _task('test.edited', max_retries=1, retry_delay=3600)
+        engine = SchedulerEngine(workers=1)
+        [run] = engine.claim([str(task.pk)])
+        ScheduledTask.objects.filter(pk=task.pk).update(
+            config={'max_retries': 1, 'retry_delay': 3600, 'target': 'edited'}, schedule='0 4 * * *',
+        )
+
+        engine._complete(run, RuntimeError('boom'))
+        engine._flush()
+
+        task.refresh_from_db()
+        assert task.schedule == '0 4 * * *'
+        assert task.config == {'max_retries': 1, 'retry_delay': 3600, 'target': 'edited', 'retry_count': 1}
+        assert task.next_run == run.task.next_run
+
+    def test_failure_without_retries(self, handlers):
+        """Test max_retries=0 records the failure and waits for the next slot."""
+        handlers('test.fail', lambda config: 1 / 0)
+        task = _task('test.fail')
+
+        SchedulerEngine(workers=1).run(once=True)
+
+        task.refresh_from_db()
+        assert _statuses(task) == [(STATUS_FAILED, 0)]
+        assert task.next_run > timezone.now()
+
+    def test_unknown_task_type(self):
+        """Test a task without a registered handler fails with a clear message."""
+        task = _task('test.unknown')
+        SchedulerEngine(workers=1).run(once=True)
+        assert "No handler registered for task type 'test.unknown'" in task.executions.get().error_message
+
+    def test_thread_timeout(self, handlers):
+        """Test a thread run past its timeout is recorded as failed."""
+        handlers('test.slow', lambda config: time.sleep(0.5))
+        task = _task('test.slow', timeout=0.1)
+
+        SchedulerEngine(workers=1).run(once=True)
+
+        execution = task.executions.get()
+        assert execution.status == STATUS_FAILED
+        assert 'Timed out after 0.1s' in execution.error_message
+
+    def test_executions_written_in_bulk(self, handlers, django_assert_max_num_queries):
+        """Test claim and completion use a constant number of queries for many tasks."""
+        handlers('test.noop')
+        for _ in range(10):
+            _task()
+        engine = SchedulerEngine(workers=10)
+        engine.refresh()
+        engine._executor = ThreadPoolExecutor(max_workers=10)
+        with django_assert_max_num_queries(8):
+            runs = engine.claim(engine._pop_due(timezone.now(), 10))
+        for run in runs:
+            engine._dispatch(run)
+        engine._executor.shutdown(wait=True)
+        engine._collect()
+        with django_assert_max_num_queries(4):
+            engine._flush()
+        assert TaskExecution.objects.filter(status=STATUS_SUCCESS).count() == 10
+
+
+@pytest.mark.django_db
+class TestClaim:
+    """Test suite for SchedulerEngine.claim."""
+
+    def test_running_elsewhere_skips_slot(self, handlers):
+        """Test a recent running execution prevents overlapping runs."""
+        handlers('test.noop')
+        task = _task()
+        TaskExecution.objects.create(task=task, status=STATUS_RUNNING, started_at=timezone.now())
+
+        runs = SchedulerEngine(workers=1).claim([str(task.pk)])
+
+        task.refresh_from_db()
+        assert runs == []
+        assert task.next_run > timezone.now()
+        assert task.executions.count() == 1
+
+    def test_abandoned_execution_is_closed(self, handlers):
+        """Test a running execution older than the timeout is marked failed and the task runs."""
+        handlers('test.noop')
+        task = _task(timeout=60)
+        stale = TaskExecution.objects.create(
+            task=task, status=STATUS_RUNNING, started_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        runs = SchedulerEngine(workers=1).claim([str(task.pk)])
+
+        stale.refresh_from_db()
+        assert len(runs) == 1
+        assert stale.status == STATUS_FAILED
+        assert 'abandoned' in stale.error_message
+        assert task.executions.filter(status=STATUS_RUNNING).count() == 1
+
+    def test_claimed_task_not_claimed_again(self):
+        """Test next_run is advanced inside the claim, so a second claim gets nothing."""
+        task = _task()
+        engine = SchedulerEngine(workers=1)
+        assert len(engine.claim([str(task.pk)])) == 1
+        assert engine.claim([str(task.pk)]) == []
+
+
+@pytest.mark.django_db
+class TestProcessPool:
+    """Test suite for the spawned process pool.
+
+    The child runs django.setup() and looks the handler up by task_type, so
+    these tests use the built-in management_command handler.
+    """
+
+    def test_process_success_and_failure(self, tmp_path):
+        """Test handler side effects happen in the child and errors are reported back."""
+        marker = tmp_path / 'ran'
+        ok = _task('management_command', schedule=YEARLY, command='shell',
+                   options={'command': f"open({str(marker)!r}, 'w').write('ok')"})
+        bad = _task('management_command', schedule=YEARLY, command='no_such_command')
+
+        SchedulerEngine(workers=2, pool='process').run(once=True)
+
+        assert marker.read_text() == 'ok'
+        assert _statuses(ok) == [(STATUS_SUCCESS, 0)]
+        assert 'no_such_command' in bad.executions.get().error_message
+
+    def test_process_timeout_terminates(self):
+        """Test a child exceeding its timeout is terminated."""
+        task = _task('management_command', schedule=YEARLY, timeout=5, command='shell',
+                     options={'command': 'import time; time.sleep(60)'})
+
+        started = time.monotonic()
+        SchedulerEngine(workers=1, pool='process').run(once=True)
+
+        assert time.monotonic() - started < 30
+        assert 'process terminated' in task.executions.get().error_message
+
+
+@pytest.mark.django_db
+class TestIntegration:
+    """Test suite for built-in handlers, model validation and the command."""
+
+    def test_management_command_handler(self, monkeypatch):
+        """Test management_command tasks call the configured command."""
+        called = []
+        monkeypatch.setattr('django.core.management.call_command', lambda *a, **kw: called.append((a, kw)))
+        task = _task('management_command', command='partitions', args=['ensure'], options={'view': 'measurements'})
+
+        SchedulerEngine(workers=1).run(once=True)
+
+        assert called == [(('partitions', 'ensure'), {'view': 'measurements'})]
+        assert _statuses(task) == [(STATUS_SUCCESS, 0)]
+
+    def test_clean_validates_schedule(self):
+        """Test invalid cron expressions are rejected by model validation."""
+        with pytest.raises(ValidationError):
+            ScheduledTask(name='x', task_type='x', schedule='61 * * * *').clean()
+        ScheduledTask(name='x', task_type='x', schedule='').clean()
+
+    def test_command_list(self):
+        """Test --list prints cron tasks and registered task types."""
+        _task('management_command', command='rebuild_read_models')
+        out = io.StringIO()
+        call_command('scheduler', '--list', stdout=out)
+        assert 'management_command' in out.getvalue()
@@ -18,7 +18,13 @@ Usage:
 """
 
 from .engine import ScopingEngine
-from .registry import register_role_provider, register_scope_resolver, get_scope_values, get_role
+from .registry import (
+    register_role_provider,
+    register_scope_resolver,
+    get_scope_values,
+    get_role,
+    shared_scope_resolution,
+)
 from .middleware import ScopingViewSetMixin
 
 __all__ = [
@@ -27,6 +33,7 @@ __all__ = [
     'register_scope_resolver',
     'get_scope_values',
     'get_role',
+    'shared_scope_resolution',
     'ScopingViewSetMixin',
 ]
 
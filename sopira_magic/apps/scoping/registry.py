@@ -11,14 +11,23 @@ Core/apps.py registers two callbacks:
 2. scope_resolver: (level, user, type) → List[scope IDs]
 
 This keeps scoping module independent from specific models.
+
+shared_scope_resolution() memoizes scope values for the enclosed block, so
+several consumers in one request (menu dependencies, FK options, ...) resolve
+each (level, user, scope_type) only once.
 """
 
+import contextvars
+from contextlib import contextmanager
 from typing import List, Callable, Optional
 
 # Global callback storage
 _role_provider: Optional[Callable] = None
 _scope_resolver: Optional[Callable] = None
 
+# Per-block memo of resolved scope values (None = no sharing)
+_scope_memo: contextvars.ContextVar = contextvars.ContextVar('scope_memo', default=None)
+
 
 def register_role_provider(callback: Callable[[object], str]) -> None:
     """
@@ -69,10 +78,32 @@ def get_scope_values(level: int, user: object, scope_type: str) -> List[str]:
     Returns:
         List of scope IDs (as strings)
     """
-    if _scope_resolver:
+    if not _scope_resolver:
+        return []  # Safe default - empty scope
+    memo = _scope_memo.get()
+    if memo is None:
         return _scope_resolver(level, user, scope_type)
-    return []  # Safe default - empty scope
-
-
+    key = (level, getattr(user, 'pk', id(user)), scope_type)
+    if key not in memo:
+        memo[key] = _scope_resolver(level, user, scope_type)
+    return list(memo[key])
 
 
+@contextmanager
+def shared_scope_resolution():
+    """
+    Resolve each scope at most once inside the block.
+    
+    Usage:
+        with shared_scope_resolution():
+            check_menu_dependencies(user)
+            FKCacheService.get_all_fk_options(user)
+    """
+    if _scope_memo.get() is not None:
+        yield  # Nested - reuse outer memo
+        return
+    token = _scope_memo.set({})
+    try:
+        yield
+    finally:
+        _scope_memo.reset(token)
@@ -24,6 +24,7 @@ except Exception:  # pragma: no cover - optional dependency
     es_exceptions = None  # type: ignore
 
 from sopira_magic.apps.api.serializers import MySerializer, get_fk_display_label
+from sopira_magic.apps.api.read_model import ReadModelService
 from sopira_magic.apps.api.view_configs import VIEWS_MATRIX
 from sopira_magic.apps.scoping import registry as scoping_registry
 
@@ -223,6 +224,35 @@ class SearchService:
                 self.disabled_after_error = True
                 logger.warning("[Search] Disabling search indexing after connection failure")
 
+    def index_pks(self, view_name: str, pks: List[Any], chunk_size: int = 500) -> Tuple[int, int]:
+        """
+        Bulk (re)index given rows of one view (deferred indexing after bulk writes).
+        Returns (indexed, failed).
+        """
+        client = self._client_or_none()
+        if not client or not pks:
+            return (0, 0)
+
+        cfg = VIEWS_MATRIX.get(view_name)
+        if not cfg:
+            raise ValueError(f"View '{view_name}' nie je vo VIEWS_MATRIX")
+        model: Model = cfg["model"]
+        index_name = self.index_name(view_name)
+
+        def _gen():
+            for start in range(0, len(pks), chunk_size):
+                for obj in model.objects.filter(pk__in=pks[start:start + chunk_size]):
+                    doc = self._serialize_instance(view_name, obj)
+                    yield {"_index": index_name, "_id": doc["id"], "_source": doc}
+
+        try:
+            success, failed = helpers.bulk(client, _gen(), raise_on_error=False)  # type: ignore
+        except Exception as exc:  # pragma: no cover - runtime path
+            logger.warning("[Search] Bulk index failed for %s – %s", view_name, exc)
+            return (0, len(pks))
+        logger.info("[Search] Bulk indexed %s (%s ok, %s failed)", view_name, success, len(failed) if failed else 0)
+        return (success, len(failed) if failed else 0)
+
     def recreate_index(self, view_name: str) -> Tuple[int, int]:
         """
         Drop & rebuild index for one view. Returns (indexed, failed).
@@ -400,7 +430,9 @@ class SearchService:
             return None
         model: Model = cfg["model"]
 
-        qs = model.objects.all()
+        # Read model: flat table with precomputed FK labels (no joins)
+        read_model = ReadModelService.enabled(view_name, "search")
+        qs = ReadModelService.queryset(view_name) if read_model else model.objects.all()
 
         # Base filters
         base_filters = cfg.get("base_filters", {}) or {}
@@ -409,13 +441,14 @@ class SearchService:
 
         # Apply scope filters
         scope_filters = scope_filters or self.get_scope_filters(user, cfg, request)
+        scope_paths = ReadModelService.spec(view_name).scope if read_model else {}
         for field_name, values in scope_filters.items():
             if values:
-                qs = qs.filter(**{f"{field_name}__in": values})
+                qs = qs.filter(**{f"{scope_paths.get(field_name, field_name)}__in": values})
 
         # Global search across all fields
         if query:
-            search_fields = cfg.get("search_fields") or []
+            search_fields = ReadModelService.search_fields(view_name) if read_model else cfg.get("search_fields") or []
             # Include fk label helpers if present in serializer
             search_q = Q()
             terms = [t for t in query.split() if t]
@@ -438,7 +471,7 @@ class SearchService:
         paginator = Paginator(qs, page_size)
         page_obj = paginator.get_page(page)
 
-        serializer_cls = self._serializer_for(view_name)
+        serializer_cls = ReadModelService.serializer(view_name) if read_model else self._serializer_for(view_name)
         results = [serializer_cls(obj).data for obj in page_obj.object_list]  # type: ignore
 
         return {
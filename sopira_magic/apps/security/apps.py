@@ -64,6 +64,9 @@ class SecurityConfig(AppConfig):
 
             register_environment_detector(_env_detector)
 
+            # Predkompiluj per-environment security plány (headers, CORS matcher)
+            SecurityEngine.compile_plans()
+
             errors = validate_security_config()
             if errors:
                 logger.error(
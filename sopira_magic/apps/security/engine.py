@@ -1,6 +1,9 @@
 """Security engine - ConfigDriven & SSOT security management.
 
 Hlavná trieda, ktorá spravuje všetky security operácie.
+
+Per-request rozhodnutia idú cez predkompilovaný ``SecurityPlan`` (viď
+``plan.py``): config sa rieši raz za request, headers sú hotové tuple.
 """
 
 import logging
@@ -10,7 +13,13 @@ from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 
 from .config import SECURITY_CONFIG_MATRIX
-from .registry import get_certificate_info, get_custom_headers, get_environment
+from .plan import SecurityPlan, clear_cache, get_plan
+from .registry import (
+    get_certificate_info,
+    get_custom_headers,
+    get_environment,
+    get_registry_version,
+)
 from .types import EnvironmentConfig, EnvironmentType
 from .validators.cors import CorsValidator
 from .validators.csp import CspValidator
@@ -20,6 +29,18 @@ from .validators.ssl import SslValidator
 
 logger = logging.getLogger(__name__)
 
+# Atribút requestu, na ktorom je uložený plán (config sa rieši raz za request)
+REQUEST_PLAN_ATTR = "_security_plan"
+
+SENSITIVE_HEADERS = (
+    "Server",
+    "X-Powered-By",
+    "X-AspNet-Version",
+    "X-AspNetMvc-Version",
+)
+
+_compiled_version: Optional[int] = None
+
 
 class SecurityEngine:
     """Security engine - SINGLE SOURCE OF TRUTH pre všetky security decisions.
@@ -49,6 +70,42 @@ class SecurityEngine:
 
         return config
 
+    # ------------------------------------------------------------------
+    # PREDKOMPILOVANÝ PLÁN
+    # ------------------------------------------------------------------
+    @classmethod
+    def get_plan(cls, request: Optional[HttpRequest] = None) -> SecurityPlan:
+        """Vráť ``SecurityPlan`` pre request (memoizovaný na requeste).
+
+        Config sa rieši cez ``get_config`` iba raz za request; plán samotný
+        je cachovaný podľa configu a invalidovaný pri zmene registry.
+        """
+
+        if request is not None:
+            plan = request.__dict__.get(REQUEST_PLAN_ATTR)
+            if plan is not None:
+                return plan
+
+        global _compiled_version
+        version = get_registry_version()
+        if version != _compiled_version:
+            clear_cache()
+            _compiled_version = version
+
+        plan = get_plan(cls.get_config(request))
+        if request is not None:
+            request.__dict__[REQUEST_PLAN_ATTR] = plan
+        return plan
+
+    @classmethod
+    def compile_plans(cls) -> Dict[EnvironmentType, SecurityPlan]:
+        """Predkompiluj plány pre všetky environmenty (štart / zmena configu)."""
+
+        global _compiled_version
+        clear_cache()
+        _compiled_version = get_registry_version()
+        return {env: get_plan(config) for env, config in SECURITY_CONFIG_MATRIX.items()}
+
     # ------------------------------------------------------------------
     # HEADERS & RESPONSE úroveň
     # ------------------------------------------------------------------
@@ -58,29 +115,14 @@ class SecurityEngine:
     ) -> HttpResponse:
         """Aplikuj všetky security headers podľa SSOT konfigurácie."""
 
-        config = cls.get_config(request)
-
-        # 1) CSP header
-        csp_header = CspValidator.build_csp_header(config["csp"])
-        if csp_header:
-            response["Content-Security-Policy"] = csp_header
-
-        # 2) HSTS
-        if config["ssl"]["enabled"] and config["ssl"]["hsts_max_age"] > 0:
-            hsts_value = f"max-age={config['ssl']['hsts_max_age']}"
-            if config["ssl"]["hsts_include_subdomains"]:
-                hsts_value += "; includeSubDomains"
-            if config["ssl"].get("hsts_preload"):
-                hsts_value += "; preload"
-            response["Strict-Transport-Security"] = hsts_value
-
-        # 3) Základné security headers
-        headers = SecurityHeadersValidator.get_headers(config["headers"])
-        for header_name, header_value in headers.items():
+        plan = cls.get_plan(request)
+
+        # 1-3) CSP, HSTS a základné security headers (predkompilované)
+        for header_name, header_value in plan.static_headers:
             response[header_name] = header_value
 
         # 4) CORS headers
-        cors_headers = CorsValidator.get_headers(request, config["cors"])
+        cors_headers = CorsValidator.get_headers(request, plan.config.get("cors", {}))
         for header_name, header_value in cors_headers.items():
             response[header_name] = header_value
 
@@ -90,7 +132,7 @@ class SecurityEngine:
             response[header_name] = header_value
 
         # 6) Odstránenie sensitívnych headers v dev móde
-        if config["env_type"] in [EnvironmentType.LOCAL, EnvironmentType.DEVELOPMENT]:
+        if plan.remove_sensitive:
             cls._remove_sensitive_headers(response)
 
         return response
@@ -104,33 +146,21 @@ class SecurityEngine:
     ) -> bool:
         """Validuj CORS request podľa SSOT konfigurácie."""
 
-        config = cls.get_config(request)
-        cors_config = custom_config or config["cors"]
+        cors_config = custom_config or cls.get_plan(request).config["cors"]
         return CorsValidator.validate(request, cors_config)
 
     @classmethod
     def validate_csrf(cls, request: HttpRequest) -> bool:
         """Validuj CSRF token podľa security level."""
 
-        config = cls.get_config(request)
-        from .types import SecurityLevel  # lazy import, aby sa predišlo cyklom
-
-        level = config["security_level"]
-        # normalizuj na SecurityLevel enum (ak by prišiel string)
-        if not isinstance(level, SecurityLevel):
-            try:
-                level = SecurityLevel(str(level))
-            except ValueError:
-                level = SecurityLevel.STANDARD
-
-        return CsrfValidator.validate(request, level)
+        # security_level je v pláne už normalizovaný na SecurityLevel enum
+        return CsrfValidator.validate(request, cls.get_plan(request).security_level)
 
     @classmethod
     def get_cors_headers(cls, request: HttpRequest) -> Dict[str, str]:
         """Získaj CORS headers pre response."""
 
-        config = cls.get_config(request)
-        return CorsValidator.get_headers(request, config["cors"])
+        return CorsValidator.get_headers(request, cls.get_plan(request).config["cors"])
 
     # ------------------------------------------------------------------
     # SSL / HTTPS
@@ -151,10 +181,7 @@ class SecurityEngine:
     def enforce_https_redirect(cls, request: HttpRequest) -> Optional[str]:
         """Vráť HTTPS redirect URL ak je potrebné presmerovanie, inak ``None``."""
 
-        config = cls.get_config(request)
-        ssl_cfg = config["ssl"]
-
-        if ssl_cfg.get("enabled") and ssl_cfg.get("redirect_http") and not request.is_secure():
+        if cls.get_plan(request).redirect_https and not request.is_secure():
             host = request.get_host()
             if ":" in host:
                 host = host.split(":")[0]
@@ -189,12 +216,6 @@ class SecurityEngine:
     def _remove_sensitive_headers(cls, response: HttpResponse) -> None:
         """Odstráň sensitívne headers v dev móde pre jednoduchší debugging."""
 
-        headers_to_remove = [
-            "Server",
-            "X-Powered-By",
-            "X-AspNet-Version",
-            "X-AspNetMvc-Version",
-        ]
-        for header in headers_to_remove:
+        for header in SENSITIVE_HEADERS:
             if header in response:
                 del response[header]
@@ -0,0 +1,71 @@
+"""Security benchmark command - microbenchmark SecurityMiddleware per-request cost."""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from sopira_magic.apps.security.engine import SecurityEngine
+from sopira_magic.apps.security.middleware import SecurityMiddleware
+from sopira_magic.apps.security.plan import clear_cache
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark SecurityMiddleware (precompiled plan vs. cold compile per request)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10000,
+            help="Requests per scenario (default: 10000)",
+        )
+        parser.add_argument(
+            "--origin",
+            type=str,
+            default="http://localhost:5173",
+            help="Origin header used for CORS scenarios",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Also measure with plan/matcher caches cleared before every request",
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(options["iterations"], 1)
+        origin = options["origin"]
+        rf = RequestFactory()
+        middleware = SecurityMiddleware(lambda request: HttpResponse("OK"))
+
+        scenarios = {
+            "GET": lambda: rf.get("/api/ping/"),
+            "GET+Origin": lambda: rf.get("/api/ping/", HTTP_ORIGIN=origin),
+            "OPTIONS preflight": lambda: rf.options("/api/ping/", HTTP_ORIGIN=origin),
+        }
+
+        SecurityEngine.compile_plans()
+        self.stdout.write(self.style.MIGRATE_HEADING(f"SecurityMiddleware benchmark ({iterations} requests/scenario)"))
+        for name, make_request in scenarios.items():
+            requests = [make_request() for _ in range(iterations)]
+            warm = self._measure(middleware, requests)
+            line = f"  {name:<18} {warm:8.2f} µs/request"
+            if options["cold"]:
+                requests = [make_request() for _ in range(iterations)]
+                cold = self._measure(middleware, requests, before_each=clear_cache)
+                line += f"   cold: {cold:8.2f} µs/request"
+            self.stdout.write(line)
+
+        SecurityEngine.compile_plans()
+
+    @staticmethod
+    def _measure(middleware, requests, before_each=None) -> float:
+        """Priemerný čas jedného prechodu middleware v mikrosekundách."""
+
+        start = time.perf_counter()
+        for request in requests:
+            if before_each is not None:
+                before_each()
+            middleware(request)
+        return (time.perf_counter() - start) * 1_000_000 / len(requests)
@@ -1,4 +1,8 @@
-"""Security middleware - ConfigDriven security middleware."""
+"""Security middleware - ConfigDriven security middleware.
+
+Všetky rozhodnutia idú cez ``SecurityEngine.get_plan`` - config sa rieši
+raz za request, zvyšok sú lookupy v predkompilovanom ``SecurityPlan``.
+"""
 
 import logging
 
@@ -46,8 +50,7 @@ class SecurityMiddleware(MiddlewareMixin):
                 return HttpResponse("CSRF validation failed", status=403)
 
         # 4) Debug logging v nízkych environmentoch
-        config = SecurityEngine.get_config(request)
-        if config["env_type"].value in {"local", "dev"}:
+        if SecurityEngine.get_plan(request).env_value in {"local", "dev"}:
             logger.debug("Security check passed for %s %s", request.method, request.path)
 
         return None
@@ -60,9 +63,9 @@ class SecurityMiddleware(MiddlewareMixin):
         response = SecurityEngine.apply_security_headers(response, request)
 
         if request.GET.get("_security_debug"):
-            config = SecurityEngine.get_config(request)
+            plan = SecurityEngine.get_plan(request)
             response["X-Security-Config"] = (
-                f"env={config['env_type'].value}, level={config['security_level'].value}"
+                f"env={plan.env_value}, level={plan.security_level.value}"
             )
 
         return response
@@ -0,0 +1,211 @@
+#..............................................................
+#   sopira_magic/apps/security/plan.py
+#   Security Plan - precompiled per-environment security plan
+#..............................................................
+
+"""Security plan - predkompilovaný plán pre jeden environment.
+
+``SecurityPlan`` je nemenná (frozen) reprezentácia ``EnvironmentConfig``,
+ktorá sa zostaví raz pri štarte (``SecurityEngine.compile_plans``) a znovu
+len pri zmene registry. Middleware potom per request robí iba dict lookupy:
+
+- ``static_headers``: hotové (name, value) tuple pre CSP, HSTS a základné headers
+- ``cors_matcher``: ``OriginMatcher`` (set presných originov + jeden regex + LRU)
+- ``preflight_headers``: hotové CORS headers pre OPTIONS preflight
+- ``security_level`` / ``env_value`` / ``redirect_https`` / ``remove_sensitive``
+
+Plány sú cachované podľa identity config dictu (``id`` + ``is`` kontrola),
+takže náhrada ``SECURITY_CONFIG_MATRIX`` automaticky vedie k novému plánu.
+Zmena config dictu *in-place* vyžaduje ``SecurityEngine.compile_plans()``.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from .types import EnvironmentType, SecurityLevel
+from .validators.csp import CspValidator
+from .validators.headers import SecurityHeadersValidator
+
+HeaderTuple = Tuple[Tuple[str, str], ...]
+
+ORIGIN_CACHE_SIZE = 1024
+MAX_CACHED_CONFIGS = 64
+
+SENSITIVE_ENV_TYPES = frozenset({EnvironmentType.LOCAL, EnvironmentType.DEVELOPMENT})
+
+
+class OriginMatcher:
+    """Skompilovaný matcher povolených originov.
+
+    - presná zhoda: ``frozenset``
+    - wildcard ("https://*.sopira.com"): jeden kombinovaný regex (fullmatch,
+      ``*`` nepokrýva "/" ani ":")
+    - suffix (".sopira.com"): voliteľne, pre ``SecurityUtils.is_safe_origin``
+    - rozhodnutia sú cachované v LRU per matcher
+    """
+
+    def __init__(self, allowed_origins, allow_suffixes: bool = False):
+        origins = tuple(o for o in (allowed_origins or ()) if o)
+        self.exact: FrozenSet[str] = frozenset(o for o in origins if "*" not in o)
+        wildcards = [o for o in origins if "*" in o]
+        self.regex = (
+            re.compile("|".join(
+                f"(?:{re.escape(o).replace(re.escape('*'), '[^/:]*')})" for o in wildcards
+            ))
+            if wildcards
+            else None
+        )
+        self.suffixes: Tuple[str, ...] = (
+            tuple(o for o in origins if o.startswith(".")) if allow_suffixes else ()
+        )
+        self.allows = lru_cache(maxsize=ORIGIN_CACHE_SIZE)(self._allows)
+
+    def _allows(self, origin: str) -> bool:
+        if origin in self.exact:
+            return True
+        if self.regex is not None and self.regex.fullmatch(origin):
+            return True
+        for suffix in self.suffixes:
+            if origin.endswith(suffix) or origin == suffix[1:]:
+                return True
+        return False
+
+
+_cache_lock = threading.Lock()
+_identity_cache: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+
+
+def cached_for(kind: str, obj: Any, builder: Callable[[Any], Any]) -> Any:
+    """Vráť ``builder(obj)`` cachované podľa identity ``obj``.
+
+    Referencia na ``obj`` je držaná v cache, takže ``id`` nemôže byť
+    recyklované pre iný objekt; cache je ohraničená ``MAX_CACHED_CONFIGS``.
+    """
+
+    key = (kind, id(obj))
+    entry = _identity_cache.get(key)
+    if entry is not None and entry[0] is obj:
+        return entry[1]
+
+    value = builder(obj)
+    with _cache_lock:
+        if len(_identity_cache) >= MAX_CACHED_CONFIGS:
+            _identity_cache.clear()
+        _identity_cache[key] = (obj, value)
+    return value
+
+
+def clear_cache() -> None:
+    """Vyprázdni cache matcherov a plánov (po zmene registry / configu)."""
+
+    with _cache_lock:
+        _identity_cache.clear()
+
+
+def get_origin_matcher(allowed_origins, allow_suffixes: bool = False) -> OriginMatcher:
+    """Vráť (cachovaný) matcher pre daný zoznam originov."""
+
+    return cached_for(
+        "suffix_matcher" if allow_suffixes else "matcher",
+        allowed_origins,
+        lambda origins: OriginMatcher(origins, allow_suffixes=allow_suffixes),
+    )
+
+
+def get_plan(config: Mapping[str, Any]) -> "SecurityPlan":
+    """Vráť (cachovaný) ``SecurityPlan`` pre daný config."""
+
+    return cached_for("plan", config, SecurityPlan.compile)
+
+
+@dataclass(frozen=True)
+class SecurityPlan:
+    """Nemenný, predkompilovaný security plán pre jeden environment."""
+
+    config: Mapping[str, Any] = field(repr=False)
+    env_type: Optional[EnvironmentType]
+    env_value: str
+    security_level: SecurityLevel
+    redirect_https: bool
+    remove_sensitive: bool
+    static_headers: HeaderTuple
+    cors_matcher: OriginMatcher = field(repr=False)
+    preflight_headers: HeaderTuple
+
+    @classmethod
+    def compile(cls, config: Mapping[str, Any]) -> "SecurityPlan":
+        """Zostav plán z ``EnvironmentConfig`` (tolerantne k neúplným configom)."""
+
+        env_type = config.get("env_type")
+        level = config.get("security_level", SecurityLevel.STANDARD)
+        if not isinstance(level, SecurityLevel):
+            try:
+                level = SecurityLevel(str(level))
+            except ValueError:
+                level = SecurityLevel.STANDARD
+
+        ssl_cfg = config.get("ssl") or {}
+        cors_cfg = config.get("cors") or {}
+
+        return cls(
+            config=config,
+            env_type=env_type,
+            env_value=getattr(env_type, "value", str(env_type or "")),
+            security_level=level,
+            redirect_https=bool(ssl_cfg.get("enabled") and ssl_cfg.get("redirect_http")),
+            remove_sensitive=env_type in SENSITIVE_ENV_TYPES,
+            static_headers=_static_headers(config),
+            cors_matcher=get_origin_matcher(cors_cfg.get("allowed_origins", [])),
+            preflight_headers=get_preflight_headers(cors_cfg),
+        )
+
+
+def _static_headers(config: Mapping[str, Any]) -> HeaderTuple:
+    headers = []
+
+    # 1) CSP header
+    csp_header = CspValidator.build_csp_header(config.get("csp") or {})
+    if csp_header:
+        headers.append(("Content-Security-Policy", csp_header))
+
+    # 2) HSTS
+    ssl_cfg = config.get("ssl") or {}
+    if ssl_cfg.get("enabled") and ssl_cfg.get("hsts_max_age", 0) > 0:
+        hsts_value = f"max-age={ssl_cfg['hsts_max_age']}"
+        if ssl_cfg.get("hsts_include_subdomains"):
+            hsts_value += "; includeSubDomains"
+        if ssl_cfg.get("hsts_preload"):
+            hsts_value += "; preload"
+        headers.append(("Strict-Transport-Security", hsts_value))
+
+    # 3) Základné security headers
+    if "headers" in config:
+        headers.extend(SecurityHeadersValidator.get_headers(config["headers"]).items())
+
+    return tuple(headers)
+
+
+def get_preflight_headers(cors_config: Mapping[str, Any]) -> HeaderTuple:
+    """Predpočítané CORS headers pre OPTIONS preflight (bez Origin/Credentials)."""
+
+    return cached_for("preflight", cors_config, _preflight_headers)
+
+
+def _preflight_headers(cors_config: Mapping[str, Any]) -> HeaderTuple:
+    headers = []
+    allowed_methods = cors_config.get("allowed_methods", [])
+    allowed_headers = cors_config.get("allowed_headers", [])
+    exposed_headers = cors_config.get("exposed_headers", [])
+
+    if allowed_methods:
+        headers.append(("Access-Control-Allow-Methods", ", ".join(allowed_methods)))
+    if allowed_headers:
+        headers.append(("Access-Control-Allow-Headers", ", ".join(allowed_headers)))
+    if exposed_headers:
+        headers.append(("Access-Control-Expose-Headers", ", ".join(exposed_headers)))
+    headers.append(("Access-Control-Max-Age", str(cors_config.get("max_age", 86400))))
+
+    return tuple(headers)
@@ -21,6 +21,22 @@ _certificate_provider: Optional[Callable[[str, Optional[str]], Dict[str, Any]]]
 _security_auditor: Optional[Callable[[str], Dict[str, Any]]] = None
 _custom_header_provider: Optional[Callable[[Any], Dict[str, str]]] = None
 
+# Verzia registry - zvýši sa pri každej registrácii (invalidácia SecurityPlan cache)
+_registry_version = 0
+
+
+def _bump_version() -> None:
+    """Zvýš verziu registry (volané pod ``_registry_lock``)."""
+
+    global _registry_version
+    _registry_version += 1
+
+
+def get_registry_version() -> int:
+    """Vráť aktuálnu verziu registry (mení sa pri každom ``register_*``)."""
+
+    return _registry_version
+
 
 def register_environment_detector(callback: Callable[[Optional[Any]], str]) -> None:
     """Zaregistruj callback pre environment detection.
@@ -33,6 +49,7 @@ def register_environment_detector(callback: Callable[[Optional[Any]], str]) -> N
     global _environment_detector
     with _registry_lock:
         _environment_detector = callback
+        _bump_version()
 
 
 def register_certificate_provider(callback: Callable[[str, Optional[str]], Dict[str, Any]]) -> None:
@@ -45,6 +62,7 @@ def register_certificate_provider(callback: Callable[[str, Optional[str]], Dict[
     global _certificate_provider
     with _registry_lock:
         _certificate_provider = callback
+        _bump_version()
 
 
 def register_security_auditor(callback: Callable[[str], Dict[str, Any]]) -> None:
@@ -57,6 +75,7 @@ def register_security_auditor(callback: Callable[[str], Dict[str, Any]]) -> None
     global _security_auditor
     with _registry_lock:
         _security_auditor = callback
+        _bump_version()
 
 
 def register_custom_header_provider(callback: Callable[[Any], Dict[str, str]]) -> None:
@@ -68,6 +87,7 @@ def register_custom_header_provider(callback: Callable[[Any], Dict[str, str]]) -
     global _custom_header_provider
     with _registry_lock:
         _custom_header_provider = callback
+        _bump_version()
 
 
 def get_environment(request: Optional[Any] = None) -> str:
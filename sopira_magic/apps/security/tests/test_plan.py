@@ -0,0 +1,106 @@
+"""Tests for the precompiled SecurityPlan, OriginMatcher and plan invalidation."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+import sopira_magic.apps.security.engine as engine_mod
+from sopira_magic.apps.security import registry
+from sopira_magic.apps.security.config import SECURITY_CONFIG_MATRIX
+from sopira_magic.apps.security.engine import SecurityEngine
+from sopira_magic.apps.security.middleware import SecurityMiddleware
+from sopira_magic.apps.security.plan import OriginMatcher, SecurityPlan, get_plan
+from sopira_magic.apps.security.types import EnvironmentType, SecurityLevel
+
+
+rf = RequestFactory()
+
+
+def test_compile_production_plan_prebuilds_headers():
+    plan = SecurityPlan.compile(SECURITY_CONFIG_MATRIX[EnvironmentType.PRODUCTION])
+    headers = dict(plan.static_headers)
+
+    assert "Content-Security-Policy" in headers
+    assert headers["Strict-Transport-Security"].startswith("max-age=")
+    assert headers["X-Frame-Options"]
+    assert plan.redirect_https is True
+    assert plan.remove_sensitive is False
+    assert plan.env_value == "production"
+
+
+def test_compile_tolerates_partial_config():
+    plan = SecurityPlan.compile({"security_level": "INVALID"})
+
+    assert plan.security_level is SecurityLevel.STANDARD
+    assert plan.static_headers == ()
+    assert plan.redirect_https is False
+
+
+def test_get_plan_is_cached_by_config_identity():
+    config = SECURITY_CONFIG_MATRIX[EnvironmentType.LOCAL]
+
+    assert get_plan(config) is get_plan(config)
+    assert get_plan(dict(config)) is not get_plan(config)
+
+
+def test_origin_matcher_exact_wildcard_and_full_match():
+    matcher = OriginMatcher(["https://app.example.com", "https://*.sopira.com"])
+
+    assert matcher.allows("https://app.example.com") is True
+    assert matcher.allows("https://foo.sopira.com") is True
+    # Wildcard must match the whole origin, not just a prefix
+    assert matcher.allows("https://foo.sopira.com.evil.com") is False
+    assert matcher.allows("https://evil.com/.sopira.com") is False
+    assert matcher.allows("http://foo.sopira.com") is False
+
+
+def test_origin_matcher_suffixes_only_when_enabled():
+    allowed = [".trusted.local"]
+
+    assert OriginMatcher(allowed).allows("https://my.trusted.local") is False
+    assert OriginMatcher(allowed, allow_suffixes=True).allows("https://my.trusted.local") is True
+
+
+def test_get_plan_resolves_config_once_per_request(monkeypatch):
+    calls = []
+    real_get_config = SecurityEngine.get_config.__func__
+
+    def counting_get_config(cls, request=None):  # pragma: no cover - trivial
+        calls.append(request)
+        return real_get_config(cls, request)
+
+    monkeypatch.setattr(engine_mod, "get_environment", lambda request=None: "production")
+    monkeypatch.setattr(SecurityEngine, "get_config", classmethod(counting_get_config))
+
+    middleware = SecurityMiddleware(lambda request: HttpResponse("OK"))
+    response = middleware(rf.get("/path", secure=True, HTTP_ORIGIN="https://evil.com"))
+
+    assert response.status_code == 200
+    assert "Strict-Transport-Security" in response
+    assert "Access-Control-Allow-Origin" not in response
+    assert len(calls) == 1
+
+
+def test_registry_change_invalidates_compiled_plans(monkeypatch):
+    monkeypatch.setattr(registry, "_environment_detector", None)
+    SecurityEngine.compile_plans()
+    config = SECURITY_CONFIG_MATRIX[EnvironmentType.LOCAL]
+    before = get_plan(config)
+
+    registry.register_custom_header_provider(lambda request: {})
+    try:
+        SecurityEngine.get_plan(None)
+        assert get_plan(config) is not before
+    finally:
+        monkeypatch.setattr(registry, "_custom_header_provider", None)
+
+
+def test_security_benchmark_command_reports_timings():
+    out = StringIO()
+    call_command("security_benchmark", "--iterations", "5", "--cold", stdout=out)
+
+    output = out.getvalue()
+    assert "OPTIONS preflight" in output
+    assert "µs/request" in output
@@ -1,7 +1,6 @@
 """Security utilities - ConfigDriven pomocné funkcie."""
 
 import ipaddress
-import re
 from typing import List, Optional
 from urllib.parse import urlparse
 
@@ -21,21 +20,10 @@ class SecurityUtils:
             if parsed.scheme not in {"http", "https"}:
                 return False
 
-            if origin in allowed_patterns:
-                return True
+            from .plan import get_origin_matcher  # lazy import
 
-            for pattern in allowed_patterns:
-                if "*" in pattern:
-                    regex_pattern = pattern.replace(".", r"\.").replace("*", ".*")
-                    if re.match(regex_pattern, origin):
-                        return True
-
-            for pattern in allowed_patterns:
-                if pattern.startswith("."):
-                    if origin.endswith(pattern) or origin == pattern[1:]:
-                        return True
-
-            return False
+            # presná zhoda, wildcard (celý origin) a suffix ".domena.sk"
+            return get_origin_matcher(allowed_patterns, allow_suffixes=True).allows(origin)
         except Exception:  # pragma: no cover
             return False
 
@@ -1,6 +1,9 @@
-"""CORS validator - ConfigDriven CORS validácia."""
+"""CORS validator - ConfigDriven CORS validácia.
+
+Povolené originy sú skompilované do ``OriginMatcher`` (set + jeden regex +
+LRU rozhodnutí), cachovaného podľa identity zoznamu v konfigurácii.
+"""
 
-import re
 from typing import Dict
 
 from django.http import HttpRequest
@@ -18,20 +21,10 @@ class CorsValidator:
             # Bez Origin headera to typicky nie je cross-origin request
             return True
 
-        allowed_origins = cors_config.get("allowed_origins", [])
-
-        # Presná zhoda
-        if origin in allowed_origins:
-            return True
+        from ..plan import get_origin_matcher  # lazy import, aby sa predišlo cyklom
 
-        # Wildcard matching typu "https://*.onrender.com"
-        for allowed in allowed_origins:
-            if "*" in allowed:
-                pattern = allowed.replace(".", r"\.").replace("*", ".*")
-                if re.match(pattern, origin):
-                    return True
-
-        return False
+        # Presná zhoda alebo wildcard typu "https://*.onrender.com" (celý origin)
+        return get_origin_matcher(cors_config.get("allowed_origins", [])).allows(origin)
 
     @staticmethod
     def get_headers(request: HttpRequest, cors_config: Dict) -> Dict[str, str]:
@@ -46,18 +39,8 @@ class CorsValidator:
             headers["Access-Control-Allow-Credentials"] = "true"
 
             if request.method == "OPTIONS":
-                allowed_methods = cors_config.get("allowed_methods", [])
-                allowed_headers = cors_config.get("allowed_headers", [])
-                exposed_headers = cors_config.get("exposed_headers", [])
-                max_age = cors_config.get("max_age", 86400)
-
-                if allowed_methods:
-                    headers["Access-Control-Allow-Methods"] = ", ".join(allowed_methods)
-                if allowed_headers:
-                    headers["Access-Control-Allow-Headers"] = ", ".join(allowed_headers)
-                if exposed_headers:
-                    headers["Access-Control-Expose-Headers"] = ", ".join(exposed_headers)
-
-                headers["Access-Control-Max-Age"] = str(max_age)
+                from ..plan import get_preflight_headers
+
+                headers.update(get_preflight_headers(cors_config))
 
         return headers
@@ -155,18 +155,21 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Sampled request telemetry → logging.PerformanceLog (see logging/telemetry.py)
+    "sopira_magic.apps.logging.telemetry.RequestTelemetryMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "sopira_magic.apps.security.middleware.SecurityMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "sopira_magic.apps.audit.middleware.AuditContextMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     # X-Frame-Options disabled for local dev PDF viewing in iframe
     # "django.middleware.clickjacking.XFrameOptionsMiddleware",
     
-    # 🔍 TEMPORARY: DB Watchdog - sleduje DB query count per request
-    "sopira_magic.middleware_db_debug.DatabaseDebugMiddleware",
+    # 🔍 DB Watchdog - sampled N+1 detection across all DB aliases
+    "sopira_magic.apps.logging.query_inspector.QueryInspectorMiddleware",
 ]
 
 ROOT_URLCONF = "sopira_magic.urls"
@@ -188,6 +191,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "sopira_magic.wsgi.application"
+ASGI_APPLICATION = "sopira_magic.asgi.application"
 
 # -----------------------------------------------------------------------------
 # DATABÁZA - MULTI-DATABASE ARCHITECTURE
@@ -229,6 +233,32 @@ for db_name in DATABASES:
 # Database router
 DATABASE_ROUTERS = ['sopira_magic.db_router.DatabaseRouter']
 
+# -----------------------------------------------------------------------------
+# CACHE
+# -----------------------------------------------------------------------------
+# Cache-version stamps (notification recipient plans, analytics, alarm rules,
+# pdfviewer annotations) invalidate other processes only through a SHARED
+# cache. Set CACHE_URL (redis://...) in every multi-process deployment.
+# Without it the cache is per-process locmem: version stamps then expire
+# after CACHE_VERSION_TIMEOUT seconds, which bounds how long another process
+# can serve stale data.
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+CACHE_SHARED = bool(CACHE_URL)
+CACHE_VERSION_TIMEOUT = None if CACHE_SHARED else int(os.getenv("CACHE_VERSION_TIMEOUT", "30"))
+
 # -----------------------------------------------------------------------------
 # PASSWORD VALIDATION
 # -----------------------------------------------------------------------------
@@ -274,6 +304,8 @@ MEDIA_ROOT = BASE_DIR / "media"
 # -----------------------------------------------------------------------------
 CORS_ALLOWED_ORIGINS = get_cors_origins()
 CORS_ALLOW_CREDENTIALS = True
+# pdf.js / media players read these on cross-origin range requests
+CORS_EXPOSE_HEADERS = ["Accept-Ranges", "Content-Range", "Content-Length", "ETag"]
 
 # -----------------------------------------------------------------------------
 # BEZPEČNOSŤ
@@ -317,6 +349,119 @@ SEARCH_MAX_PAGE_SIZE = _es_cfg["max_page_size"]
 ELASTICSEARCH_CA_CERT = os.getenv("ELASTICSEARCH_CA_CERT")
 ELASTICSEARCH_VERIFY_CERTS = os.getenv("ELASTICSEARCH_VERIFY_CERTS", "0") == "1"
 
+# -----------------------------------------------------------------------------
+# GENERATOR JOBS + PROGRESS BUS (push-based SSE progress)
+# -----------------------------------------------------------------------------
+# Generator job queue (scheduler.ScheduledTask rows, see generator/jobs.py)
+# "inline" = web process drains the queue in a background thread (local dev)
+# "external" = run `python manage.py generator_worker --concurrency N`
+GENERATOR_JOB_WORKER = os.getenv("GENERATOR_JOB_WORKER", "inline" if ENV == "local" else "external")
+GENERATOR_JOB_MAX_RUNNING = int(os.getenv("GENERATOR_JOB_MAX_RUNNING", "2"))
+
+# inprocess = single process | redis = any Redis-compatible server
+# An external worker writes progress/cancel flags in another process, so it
+# requires "redis" (GeneratorConfig.ready() refuses to start otherwise).
+GENERATOR_PROGRESS_BACKEND = os.getenv(
+    "GENERATOR_PROGRESS_BACKEND", "redis" if GENERATOR_JOB_WORKER == "external" else "inprocess"
+)
+GENERATOR_PROGRESS_REDIS_URL = os.getenv("GENERATOR_PROGRESS_REDIS_URL", "redis://localhost:6379/0")
+
+# -----------------------------------------------------------------------------
+# SCHEDULER (cron ScheduledTask rows, `python manage.py scheduler`, see scheduler/engine.py)
+# -----------------------------------------------------------------------------
+# thread = handlers in pool threads (soft timeout) | process = spawned child per run (hard timeout)
+SCHEDULER_POOL = os.getenv("SCHEDULER_POOL", "thread")
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+SCHEDULER_REFRESH_INTERVAL = float(os.getenv("SCHEDULER_REFRESH_INTERVAL", "60"))  # seconds
+SCHEDULER_TASK_TIMEOUT = float(os.getenv("SCHEDULER_TASK_TIMEOUT", "3600"))  # seconds, per task: config["timeout"]
+SCHEDULER_MAX_RETRIES = int(os.getenv("SCHEDULER_MAX_RETRIES", "0"))  # per task: config["max_retries"]
+SCHEDULER_RETRY_DELAY = float(os.getenv("SCHEDULER_RETRY_DELAY", "60"))  # seconds, per task: config["retry_delay"]
+
+# -----------------------------------------------------------------------------
+# ALARMS (AlarmRule evaluation on measurement writes, see alarm/engine.py)
+# -----------------------------------------------------------------------------
+# async = background evaluator thread | sync = on the committing thread | off
+ALARM_EVALUATION = os.getenv("ALARM_EVALUATION", "async")
+ALARM_BATCH_SIZE = int(os.getenv("ALARM_BATCH_SIZE", "1000"))  # rows per query for bulk writes / imports
+ALARM_RULES_CHECK_INTERVAL = float(os.getenv("ALARM_RULES_CHECK_INTERVAL", "1.0"))  # seconds between rule version checks
+
+# -----------------------------------------------------------------------------
+# AUDIT PIPELINE (ring buffer + background flusher into logging.AuditLog)
+# -----------------------------------------------------------------------------
+# Overflow policy: drop_oldest | drop_newest | block | flush (see audit/pipeline.py)
+AUDIT_PIPELINE_ENABLED = os.getenv("AUDIT_PIPELINE_ENABLED", "1") == "1"
+AUDIT_MODEL_CHANGES = os.getenv("AUDIT_MODEL_CHANGES", "1") == "1"
+AUDIT_BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_OVERFLOW_POLICY = os.getenv("AUDIT_OVERFLOW_POLICY", "drop_oldest")
+AUDIT_MASKED_FIELDS = ("password",)
+
+# -----------------------------------------------------------------------------
+# REQUEST TELEMETRY (sampled, aggregated per view, flushed into PerformanceLog)
+# -----------------------------------------------------------------------------
+TELEMETRY_SAMPLE_RATE = float(os.getenv("TELEMETRY_SAMPLE_RATE", "0.1"))  # 0 = off, 1 = every request
+TELEMETRY_FLUSH_INTERVAL = float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "60"))  # seconds
+
+# Query inspector (apps/logging/query_inspector.py) - N+1 reports in db-watchdog/
+QUERY_INSPECTOR_SAMPLE_RATE = float(os.getenv("QUERY_INSPECTOR_SAMPLE_RATE", "1.0" if ENV == "local" else "0.0"))
+QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD", "5"))
+QUERY_INSPECTOR_QUERY_THRESHOLD = int(os.getenv("QUERY_INSPECTOR_QUERY_THRESHOLD", "50"))
+
+# -----------------------------------------------------------------------------
+# MYSTATE (delta updates of saved presets, see mystate/coalescer.py)
+# -----------------------------------------------------------------------------
+# Pending coalesced state lives in process memory: another server process would
+# check patches against the stale DB version (spurious 409) and read stale
+# presets. Keep 0 (write synchronously) unless the server runs ONE process.
+MYSTATE_PATCH_COALESCE_MS = int(os.getenv("MYSTATE_PATCH_COALESCE_MS", "0"))
+MYSTATE_PATCH_MAX_RETRIES = int(os.getenv("MYSTATE_PATCH_MAX_RETRIES", "5"))  # failed coalesced writes are retried
+
+# -----------------------------------------------------------------------------
+# IMPEX (streaming exports, see impex/export.py)
+# -----------------------------------------------------------------------------
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))  # rows per server-side cursor fetch
+
+# Bulk CRUD (<view>/bulk/, see api/bulk.py)
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+# Read models (denormalized list tables, see api/read_model.py)
+READ_MODEL_CHUNK_SIZE = int(os.getenv("READ_MODEL_CHUNK_SIZE", "2000"))
+
+# -----------------------------------------------------------------------------
+# FILE STORAGE (content-addressed media store, see file_storage/engine.py)
+# -----------------------------------------------------------------------------
+FILE_STORAGE_ROOT = os.getenv("FILE_STORAGE_ROOT", str(MEDIA_ROOT / "cas"))  # StorageConfig.config["root"] wins
+MEDIA_THUMBNAIL_SIZES = (128, 256, 512)
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", "3600"))
+MEDIA_THUMBNAIL_MAX_AGE = int(os.getenv("MEDIA_THUMBNAIL_MAX_AGE", "86400"))
+# Web server sendfile (nginx: "X-Accel-Redirect"), roots map local dirs to internal locations
+FILE_STORAGE_SENDFILE_HEADER = os.getenv("FILE_STORAGE_SENDFILE_HEADER", "")
+FILE_STORAGE_SENDFILE_ROOTS = {FILE_STORAGE_ROOT: "/protected/cas/", str(MEDIA_ROOT): "/protected/media/"}
+
+# -----------------------------------------------------------------------------
+# PDFVIEWER (document delivery + page index, see pdfviewer/documents.py)
+# -----------------------------------------------------------------------------
+PDFVIEWER_DOCUMENT_ROOT = os.getenv("PDFVIEWER_DOCUMENT_ROOT", "")  # "" = pdfviewer/pdfdocuments (DEV)
+PDFVIEWER_CACHE_MAX_AGE = int(os.getenv("PDFVIEWER_CACHE_MAX_AGE", "3600"))
+# Opt-in: serve documents / page index without authentication (demo setups only)
+PDFVIEWER_ALLOW_ANONYMOUS = os.getenv("PDFVIEWER_ALLOW_ANONYMOUS", "0") == "1"
+
+# -----------------------------------------------------------------------------
+# PARTITIONING (monthly range partitions, see core/partitioning.py + manage.py partitions)
+# -----------------------------------------------------------------------------
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))  # 0 = keep all; detach older
+PARTITION_DEFAULT_WINDOW_DAYS = int(os.getenv("PARTITION_DEFAULT_WINDOW_DAYS", "400"))  # bound when request has none
+
+# -----------------------------------------------------------------------------
+# ANALYTICS (grouped metrics endpoint analytics/query/, see analytics/query.py)
+# -----------------------------------------------------------------------------
+ANALYTICS_VIEWS = ("measurements",)  # VIEWS_MATRIX views open for analytics queries
+ANALYTICS_MAX_GROUPS = int(os.getenv("ANALYTICS_MAX_GROUPS", "10000"))
+ANALYTICS_MAX_ROWS = int(os.getenv("ANALYTICS_MAX_ROWS", "1000000"))  # column fetch for percentiles
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv("ANALYTICS_CACHE_TIMEOUT", "600"))
+
 # -----------------------------------------------------------------------------
 # DEFAULT PRIMARY KEY
 # -----------------------------------------------------------------------------
@@ -385,6 +530,11 @@ if hasattr(ssl, '_create_default_https_context'):
 # Admin email for notifications
 ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'sopira@me.com')
 
+# Notification outbox delivery (NotificationLog rows with status='pending')
+# "inline" = web process drains the outbox in a background thread (local dev)
+# "external" = run `python manage.py notification_worker`
+NOTIFICATION_OUTBOX_WORKER = os.getenv('NOTIFICATION_OUTBOX_WORKER', 'inline' if ENV == 'local' else 'external')
+
 # For development, you can use console backend to see emails in console
 # Uncomment below if you want to test without sending real emails:
 # if DEBUG and ENV == "local":